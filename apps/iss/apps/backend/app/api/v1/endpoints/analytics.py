@@ -98,44 +98,23 @@ async def get_kpi_dashboard(db: AsyncSession = Depends(get_db)):
     - Success rate candidature
     """
     try:
-        # Conta bandi per stato
-        total_result = await db.execute(select(func.count(Bando.id)))
-        total_bandi = total_result.scalar() or 0
-        
-        active_result = await db.execute(
-            select(func.count(Bando.id)).where(Bando.status == 'attivo')
-        )
-        active_bandi = active_result.scalar() or 0
-        
-        expired_result = await db.execute(
-            select(func.count(Bando.id)).where(Bando.status == 'scaduto')
-        )
-        expired_bandi = expired_result.scalar() or 0
-        
-        # Crescita settimanale
-        week_ago = datetime.now() - timedelta(days=7)
-        weekly_result = await db.execute(
-            select(func.count(Bando.id)).where(Bando.data_trovato >= week_ago)
-        )
-        weekly_new = weekly_result.scalar() or 0
-        weekly_growth = (weekly_new / total_bandi * 100) if total_bandi > 0 else 0
-        
-        # Crescita mensile
-        month_ago = datetime.now() - timedelta(days=30)
-        monthly_result = await db.execute(
-            select(func.count(Bando.id)).where(Bando.data_trovato >= month_ago)
-        )
-        monthly_new = monthly_result.scalar() or 0
-        monthly_growth = (monthly_new / total_bandi * 100) if total_bandi > 0 else 0
-        
-        # Success rate candidature
-        total_apps_result = await db.execute(select(func.count(BandoApplication.id)))
-        total_apps = total_apps_result.scalar() or 0
-        
-        approved_apps_result = await db.execute(
-            select(func.count(BandoApplication.id)).where(BandoApplication.status == 'approved')
-        )
-        approved_apps = approved_apps_result.scalar() or 0
+        # Contatori bandi: stesse statistiche (in cache) di /bandi/stats
+        stats = await bando_crud.get_stats(db)
+        total_bandi = stats["totali"]
+        active_bandi = stats["attivi"]
+        expired_bandi = stats["scaduti"]
+
+        # Crescita settimanale/mensile
+        weekly_growth = (stats["nuovi_settimana"] / total_bandi * 100) if total_bandi > 0 else 0
+        monthly_growth = (stats["nuovi_mese"] / total_bandi * 100) if total_bandi > 0 else 0
+
+        # Success rate candidature (una sola query)
+        apps = (await db.execute(select(
+            func.count(BandoApplication.id).label("total"),
+            func.count(BandoApplication.id).filter(BandoApplication.status == 'approved').label("approved"),
+        ))).one()
+        total_apps = apps.total or 0
+        approved_apps = apps.approved or 0
         success_rate = (approved_apps / total_apps * 100) if total_apps > 0 else 0
         
         # Durata media bandi (giorni tra data_trovato e scadenza)
@@ -75,7 +75,7 @@ async def get_bandi(
     ) if any([search_term, fonte_filter, categoria_filter, status_filter,
               importo_min, importo_max, data_scadenza_da, data_scadenza_a]) else None
 
-    bandi, total = await bando_crud.get_bandi(
+    bandi, total, total_estimated = await bando_crud.search_bandi(
         db, skip=skip, limit=limit, search=search_params
     )
 
@@ -87,7 +87,8 @@ async def get_bandi(
         total=total,
         page=current_page,
         size=limit,
-        pages=pages
+        pages=pages,
+        total_estimated=total_estimated
     )
 
 
@@ -116,8 +117,8 @@ async def get_best_matches(
     # Autenticazione admin opzionale per demo, ma consigliata
 ):
     """
-    🧠 Analizza i bandi attivi e trova i 'Perfect Match' per ISS.
-    Usa il profilo associazione predefinito (Mission, Target, Progetti).
+    🧠 I 'Perfect Match' per ISS tra i bandi attivi.
+    Legge gli score calcolati in background sul profilo associazione predefinito.
     """
     from app.services.match_service import match_service
     
@@ -320,14 +321,19 @@ async def save_bando(
 @router.post("/{bando_id}/analyze")
 async def analyze_bando_deep(
     bando_id: int,
+    refresh: bool = Query(False, description="Ricalcola anche se il bando non è cambiato"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     🧠 Avvia un'analisi profonda (Agent Analyst) su un bando specifico.
     Recupera contesto dal RAG e fornisce SWOT, Checklist e Strategia.
+
+    Il risultato è memoizzato sul contenuto del bando e sul modello: se il
+    testo non è cambiato viene restituita l'analisi salvata (o precalcolata
+    dopo il monitoraggio); se uno stage fallisce si riprende da quello.
     """
-    from app.services.analyst_service import analyst_service
-    from app.services.ai_bandi_agent import ai_bandi_agent
+    from app.services.analyst_service import analyst_service, bando_analysis_text
+    from app.services.match_service import ISS_PROFILE
     
     bando = await bando_crud.get_bando(db, bando_id=bando_id)
     if not bando:
@@ -335,19 +341,25 @@ async def analyze_bando_deep(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bando non trovato"
         )
+
+    bando_text = bando_analysis_text(bando)
+    if not refresh and analyst_service.is_current(bando.deep_analysis, bando_text, ISS_PROFILE):
+        return bando.deep_analysis
         
     # Esegue l'analisi profonda
     analysis_result = await analyst_service.analyze_bando(
-        bando_text=f"{bando.titolo}\n{bando.descrizione}\n{bando.requisiti}",
-        association_profile=ai_bandi_agent.association_profile
+        bando_text=bando_text,
+        association_profile=ISS_PROFILE,
+        refresh=refresh
     )
     
-    # Salva il risultato nel database
-    await bando_crud.update_bando(
-        db, 
-        bando_id=bando_id, 
-        bando_update=BandoUpdate(deep_analysis=analysis_result)
-    )
+    # Salva il risultato nel database (solo se completo)
+    if "error" not in analysis_result:
+        await bando_crud.update_bando(
+            db, 
+            bando_id=bando_id, 
+            bando_update=BandoUpdate(deep_analysis=analysis_result)
+        )
     
     return analysis_result
 
@@ -360,9 +372,11 @@ async def generate_bando_draft(
     """
     ✍️ Genera una bozza di progetto (Grant Writing) basata sul bando e sul profilo ISS.
     Usa il RAG per recuperare template e contestualizzare la proposta.
+    Riusa i requisiti già estratti dall'analisi profonda.
     """
+    from app.services.analyst_service import analyst_service, bando_analysis_text
     from app.services.draft_service import draft_service
-    from app.services.ai_bandi_agent import ai_bandi_agent
+    from app.services.match_service import ISS_PROFILE
     
     bando = await bando_crud.get_bando(db, bando_id=bando_id)
     if not bando:
@@ -370,11 +384,18 @@ async def generate_bando_draft(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bando non trovato"
         )
+
+    bando_text = bando_analysis_text(bando)
+    if analyst_service.is_current(bando.deep_analysis, bando_text, ISS_PROFILE):
+        requirements = bando.deep_analysis.get("requirements", [])
+    else:
+        requirements = await analyst_service.get_requirements(bando_text, ISS_PROFILE)
         
     # Genera la bozza
     draft = await draft_service.generate_draft(
-        bando_text=f"{bando.titolo}\n{bando.descrizione}\n{bando.requisiti}",
-        association_profile=ai_bandi_agent.association_profile
+        bando_text=bando_text,
+        association_profile=ISS_PROFILE,
+        requirements=requirements
     )
     
     return {"draft": draft}
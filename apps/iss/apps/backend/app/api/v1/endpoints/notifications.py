@@ -254,7 +254,7 @@ async def preview_user_notifications(
     if notification_type == "newsletter":
         # Preview newsletter
         stats = await alert_system._calculate_weekly_stats(db)
-        user_stats = await alert_system._personalize_stats_for_user(db, user, stats)
+        user_stats = await alert_system._user_newsletter_stats(db, user, stats)
         
         return {
             "user": {
@@ -1,7 +1,8 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 import os
-from typing import List
+import re
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -97,6 +98,30 @@ class Settings(BaseSettings):
     use_ollama: bool = Field(default=True, alias="USE_OLLAMA")
     llm_provider: str = Field(default="ollama", alias="LLM_PROVIDER")
 
+    # RAG (ChromaDB + Ollama embeddings)
+    chroma_url: str = Field(default="http://central-chromadb:8000", alias="CHROMA_URL")
+    # Vuoto = collection derivata dal modello di embedding (vedi rag_collection_name)
+    rag_collection: Optional[str] = Field(default=None, alias="RAG_COLLECTION")
+    ollama_embedding_model: str = Field(default="all-minilm", alias="OLLAMA_EMBEDDING_MODEL")
+    embedding_batch_size: int = Field(default=32, alias="EMBEDDING_BATCH_SIZE")
+    embedding_concurrency: int = Field(default=4, alias="EMBEDDING_CONCURRENCY")
+
+    # Deep analysis dei nuovi bandi in background dopo il monitoraggio
+    analysis_precompute: bool = Field(default=True, alias="ANALYSIS_PRECOMPUTE")
+
+    # Match score dei bandi (pipeline in background, più bandi per prompt)
+    match_scoring: bool = Field(default=True, alias="MATCH_SCORING")
+    scoring_batch_size: int = Field(default=5, alias="SCORING_BATCH_SIZE")
+    scoring_concurrency: int = Field(default=2, alias="SCORING_CONCURRENCY")
+
+    @property
+    def rag_collection_name(self) -> str:
+        """Collection RAG: un modello di embedding diverso non riusa vettori incompatibili."""
+        if self.rag_collection:
+            return self.rag_collection
+        model = re.sub(r"[^A-Za-z0-9._-]+", "-", self.ollama_embedding_model).strip("-._")
+        return f"iss_knowledge_base_{model}"
+
     @property
     def is_production(self) -> bool:
         return self.environment.lower() == "production"
@@ -1,16 +1,50 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import select, func, and_, or_, desc, literal_column
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timedelta
 import hashlib
+import html
+import json
+import logging
+import re
+import time
 
-from app.models.bando import Bando, BandoStatus, BandoSource
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.models.bando import Bando, BandoStatus, BandoSource, SEARCH_CONFIG
 from app.schemas.bando import BandoCreate, BandoUpdate, BandoSearch
 
+# Campi che entrano nel testo valutato dallo scoring (vedi bando_analysis_text)
+SCORED_FIELDS = {"title", "ente", "importo", "scadenza_raw", "descrizione"}
+
+# Statistiche (/bandi/stats, /analytics/kpi, /stats/iss)
+STATS_CACHE_KEY = "iss:stats:bandi"
+STATS_CACHE_TTL = 300
+
+# Oltre questa soglia il totale della ricerca è stimato dal planner
+COUNT_EXACT_LIMIT = 1000
+
+SEARCH_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+# Marcatori non stampabili: lo snippet viene escapato prima di inserire <mark>
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+logger = logging.getLogger(__name__)
+
 
 class BandoCRUD:
 
+    def __init__(self):
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._stats_memory: Optional[tuple[float, Dict[str, Any]]] = None
+
     @staticmethod
     def generate_hash(title: str, ente: str, link: str) -> str:
         """Genera hash univoco per identificare un bando"""
@@ -33,6 +67,7 @@ class BandoCRUD:
         db.add(db_bando)
         await db.commit()
         await db.refresh(db_bando)
+        await self.invalidate_stats()
         return db_bando
 
     async def get_bando(self, db: AsyncSession, bando_id: int) -> Optional[Bando]:
@@ -55,28 +90,32 @@ class BandoCRUD:
         search: Optional[BandoSearch] = None
     ) -> tuple[List[Bando], int]:
         """Recupera lista bandi con filtri e paginazione"""
+        bandi, total, _ = await self.search_bandi(db, skip=skip, limit=limit, search=search)
+        return bandi, total
 
-        query = select(Bando)
-        count_query = select(func.count(Bando.id))
+    async def search_bandi(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        search: Optional[BandoSearch] = None
+    ) -> tuple[List[Bando], int, bool]:
+        """
+        Lista bandi con ricerca full-text (indice GIN su search_vector),
+        ranking per rilevanza e snippet evidenziati in `bando.highlight`.
+
+        Returns:
+            (bandi, totale, totale_stimato): oltre COUNT_EXACT_LIMIT risultati
+            il totale è la stima del planner invece di un COUNT completo.
+        """
+        conditions = []
+        ts_query = None
 
         # Applica filtri
         if search:
-            conditions = []
-
-            if search.query:
-                # Cerca ogni parola separatamente (AND logic)
-                words = search.query.strip().split()
-                for word in words:
-                    if len(word) >= 2:  # Ignora parole troppo corte
-                        word_term = f"%{word}%"
-                        conditions.append(
-                            or_(
-                                Bando.title.ilike(word_term),
-                                Bando.ente.ilike(word_term),
-                                Bando.descrizione.ilike(word_term),
-                                Bando.keyword_match.ilike(word_term)
-                            )
-                        )
+            ts_query = self._build_ts_query(search.query)
+            if ts_query is not None:
+                conditions.append(Bando.search_vector.op("@@")(ts_query))
 
             if search.fonte:
                 conditions.append(Bando.fonte == search.fonte)
@@ -94,24 +133,99 @@ class BandoCRUD:
                 keyword_term = f"%{search.keyword}%"
                 conditions.append(Bando.keyword_match.ilike(keyword_term))
 
-            if conditions:
-                query = query.where(and_(*conditions))
-                count_query = count_query.where(and_(*conditions))
-
-        # Ordina per data più recente
-        query = query.order_by(desc(Bando.data_trovato))
+        if ts_query is not None:
+            headline = func.ts_headline(
+                SEARCH_REGCONFIG,
+                func.coalesce(Bando.descrizione, Bando.title),
+                ts_query,
+                HEADLINE_OPTIONS
+            )
+            query = select(Bando, headline)
+        else:
+            query = select(Bando)
+
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        # Ordina per rilevanza se c'è una ricerca testuale, altrimenti per data più recente
+        if ts_query is not None and (search.sort_by or "relevance") == "relevance":
+            query = query.order_by(
+                desc(func.ts_rank_cd(Bando.search_vector, ts_query)),
+                desc(Bando.data_trovato)
+            )
+        else:
+            query = query.order_by(desc(Bando.data_trovato))
 
         # Paginazione
         query = query.offset(skip).limit(limit)
 
         # Esegui query
         result = await db.execute(query)
-        bandi = result.scalars().all()
+        if ts_query is not None:
+            bandi = []
+            for bando, snippet in result.all():
+                bando.highlight = self._format_highlight(snippet)
+                bandi.append(bando)
+        else:
+            bandi = list(result.scalars().all())
 
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
+        total, estimated = await self._count(db, conditions)
+        return bandi, total, estimated
 
-        return list(bandi), total
+    @staticmethod
+    def _build_ts_query(text_query: Optional[str]):
+        """
+        tsquery in AND delle parole (prefisso, così "alfabet" trova
+        "alfabetizzazione"); None se non ci sono parole utilizzabili.
+        """
+        if not text_query:
+            return None
+        # Solo caratteri di parola: gli operatori tsquery (&, |, !, :) non arrivano a Postgres
+        words = [word for word in re.findall(r"\w+", text_query) if len(word) >= 2]
+        if not words:
+            return None
+        terms = " & ".join(f"{word}:*" for word in words)
+        return func.to_tsquery(SEARCH_REGCONFIG, func.iss_unaccent(terms))
+
+    @staticmethod
+    def _format_highlight(snippet: Optional[str]) -> Optional[str]:
+        """Escape HTML dello snippet; solo i termini trovati diventano <mark>."""
+        if not snippet:
+            return None
+        escaped = html.escape(snippet)
+        return escaped.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+    async def _count(self, db: AsyncSession, conditions: list) -> tuple[int, bool]:
+        """
+        COUNT limitato a COUNT_EXACT_LIMIT righe; oltre, stima del planner
+        (EXPLAIN) così il costo non cresce con la tabella.
+        """
+        bounded = select(Bando.id)
+        if conditions:
+            bounded = bounded.where(and_(*conditions))
+        bounded = bounded.limit(COUNT_EXACT_LIMIT + 1).subquery()
+
+        result = await db.execute(select(func.count()).select_from(bounded))
+        total = result.scalar() or 0
+        if total <= COUNT_EXACT_LIMIT:
+            return total, False
+
+        full_count = select(Bando.id)
+        if conditions:
+            full_count = full_count.where(and_(*conditions))
+        try:
+            # I valori sono resi letterali dal dialetto (quoting standard);
+            # le parole della ricerca sono già ridotte a caratteri \w
+            sql = full_count.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+            conn = await db.connection()
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Stima conteggio bandi non disponibile: {e}")
+            estimate = total
+        return max(estimate, total), True
 
     async def update_bando(
         self,
@@ -128,8 +242,13 @@ class BandoCRUD:
         for field, value in update_data.items():
             setattr(db_bando, field, value)
 
+        # Contenuto cambiato: lo score va ricalcolato dalla pipeline di scoring
+        if SCORED_FIELDS & update_data.keys() and "ai_score" not in update_data:
+            db_bando.ai_score_version = None
+
         await db.commit()
         await db.refresh(db_bando)
+        await self.invalidate_stats()
         return db_bando
 
     async def delete_bando(self, db: AsyncSession, bando_id: int) -> bool:
@@ -140,6 +259,7 @@ class BandoCRUD:
 
         await db.delete(db_bando)
         await db.commit()
+        await self.invalidate_stats()
         return True
 
     async def mark_as_notified(
@@ -164,90 +284,137 @@ class BandoCRUD:
         return db_bando
 
     async def get_stats(self, db: AsyncSession) -> Dict[str, Any]:
-        """Ottieni statistiche sui bandi"""
-
-        # Conteggi totali
-        total_query = select(func.count(Bando.id))
-        total_result = await db.execute(total_query)
-        totali = total_result.scalar() or 0
-
-        # Bandi attivi
-        active_query = select(func.count(Bando.id)).where(Bando.status == BandoStatus.ATTIVO)
-        active_result = await db.execute(active_query)
-        attivi = active_result.scalar() or 0
-
-        # Bandi scaduti
-        expired_query = select(func.count(Bando.id)).where(Bando.status == BandoStatus.SCADUTO)
-        expired_result = await db.execute(expired_query)
-        scaduti = expired_result.scalar() or 0
-
-        # Bandi in scadenza (prossimi 30 giorni)
-        future_30_days = datetime.now() + timedelta(days=30)
-        expiring_query = select(func.count(Bando.id)).where(
-            and_(
+        """
+        Ottieni statistiche sui bandi.
+
+        Servite dal cache (Redis, fallback in memoria) per STATS_CACHE_TTL
+        secondi; `invalidate_stats()` le scarta quando i bandi cambiano.
+        """
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                cached = await client.get(STATS_CACHE_KEY)
+                if cached:
+                    return json.loads(cached)
+            except Exception as e:
+                logger.warning(f"Bandi stats cache read failed: {e}")
+        elif self._stats_memory and self._stats_memory[0] > time.monotonic():
+            return self._stats_memory[1]
+
+        stats = await self._compute_stats(db)
+
+        if client is not None:
+            try:
+                await client.set(STATS_CACHE_KEY, json.dumps(stats), ex=STATS_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f"Bandi stats cache write failed: {e}")
+        else:
+            self._stats_memory = (time.monotonic() + STATS_CACHE_TTL, stats)
+        return stats
+
+    async def invalidate_stats(self):
+        """Scarta le statistiche in cache (nuovi bandi, modifiche, archiviazione)."""
+        self._stats_memory = None
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                await client.delete(STATS_CACHE_KEY)
+            except Exception as e:
+                logger.warning(f"Bandi stats cache invalidation failed: {e}")
+
+    async def _get_redis(self):
+        if self._redis is None and time.monotonic() >= self._redis_retry_at:
+            try:
+                client = redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+                await client.ping()
+                self._redis = client
+            except Exception as e:
+                logger.warning(f"Redis not available for bandi stats, using memory: {e}")
+                self._redis_retry_at = time.monotonic() + STATS_CACHE_TTL
+        return self._redis
+
+    async def _compute_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """Statistiche in due query aggregate: contatori con FILTER e GROUPING SETS."""
+        now = datetime.now()
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        future_30_days = now + timedelta(days=30)
+
+        # 1. Contatori
+        counters = (await db.execute(select(
+            func.count(Bando.id).label("totali"),
+            func.count(Bando.id).filter(Bando.status == BandoStatus.ATTIVO).label("attivi"),
+            func.count(Bando.id).filter(Bando.status == BandoStatus.SCADUTO).label("scaduti"),
+            # Bandi in scadenza (prossimi 30 giorni)
+            func.count(Bando.id).filter(and_(
                 Bando.status == BandoStatus.ATTIVO,
                 Bando.scadenza <= future_30_days,
-                Bando.scadenza >= datetime.now()
-            )
+                Bando.scadenza >= now
+            )).label("in_scadenza"),
+            func.count(Bando.id).filter(Bando.data_trovato >= week_ago).label("nuovi_settimana"),
+            func.count(Bando.id).filter(Bando.data_trovato >= month_ago).label("nuovi_mese"),
+        ))).one()
+
+        # 2. Distribuzioni per fonte, categoria e mese in un solo passaggio
+        # ('month' letterale: con un parametro SELECT e GROUP BY non coinciderebbero)
+        mese = func.date_trunc(literal_column("'month'"), Bando.data_trovato)
+        groups = await db.execute(
+            select(
+                Bando.fonte,
+                Bando.categoria,
+                mese.label("mese"),
+                func.grouping(Bando.fonte).label("per_fonte"),
+                func.grouping(Bando.categoria).label("per_categoria"),
+                func.count(Bando.id).label("count"),
+            ).group_by(func.grouping_sets(Bando.fonte, Bando.categoria, mese))
         )
-        expiring_result = await db.execute(expiring_query)
-        in_scadenza = expiring_result.scalar() or 0
-
-        # Bandi per fonte
-        source_query = select(Bando.fonte, func.count(Bando.id)).group_by(Bando.fonte)
-        source_result = await db.execute(source_query)
-        fonti = {fonte.value if hasattr(fonte, 'value') else str(fonte): count
-                for fonte, count in source_result.fetchall()}
-
-        # Bandi per categoria
-        category_query = select(Bando.categoria, func.count(Bando.id)).where(
-            Bando.categoria.isnot(None)
-        ).group_by(Bando.categoria)
-        category_result = await db.execute(category_query)
-        categorie = {categoria: count for categoria, count in category_result.fetchall()}
-
-        # Ultimi 7 giorni
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_query = select(func.count(Bando.id)).where(Bando.data_trovato >= week_ago)
-        recent_result = await db.execute(recent_query)
-        nuovi_settimana = recent_result.scalar() or 0
+
+        fonti: Dict[str, int] = {}
+        categorie: Dict[str, int] = {}
+        per_mese: Dict[str, int] = {}
+        for row in groups:
+            if row.per_fonte == 0:
+                fonte = row.fonte.value if hasattr(row.fonte, 'value') else str(row.fonte)
+                fonti[fonte] = row.count
+            elif row.per_categoria == 0:
+                if row.categoria is not None:
+                    categorie[row.categoria] = row.count
+            elif row.mese is not None:
+                per_mese[row.mese.strftime("%Y-%m")] = row.count
+
+        totali = counters.totali or 0
+        attivi = counters.attivi or 0
+        scaduti = counters.scaduti or 0
+        nuovi_settimana = counters.nuovi_settimana or 0
 
         # Calcolo importi (mock data per ora)
         importo_totale = 15000000.0  # €15M mock
         importo_medio = importo_totale / max(totali, 1)
 
-        # Trend mensile (ultimi 6 mesi)
+        # Trend mensile (ultimi 6 mesi di calendario, in ordine cronologico)
         trend_mensile = []
-        for i in range(6):
-            month_start = datetime.now().replace(day=1) - timedelta(days=30*i)
-            month_end = month_start + timedelta(days=30)
-
-            month_query = select(func.count(Bando.id)).where(
-                and_(
-                    Bando.data_trovato >= month_start,
-                    Bando.data_trovato < month_end
-                )
-            )
-            month_result = await db.execute(month_query)
-            count = month_result.scalar() or 0
-
+        year, month = now.year, now.month
+        for _ in range(6):
+            mese_key = f"{year:04d}-{month:02d}"
+            count = per_mese.get(mese_key, 0)
             trend_mensile.append({
-                "mese": month_start.strftime("%Y-%m"),
+                "mese": mese_key,
                 "count": count,
                 "importo": count * (importo_medio if count > 0 else 0)
             })
-
-        trend_mensile.reverse()  # Ordine cronologico
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        trend_mensile.reverse()
 
         return {
             # Formato nuovo per il frontend
             "totali": totali,
             "attivi": attivi,
             "scaduti": scaduti,
-            "in_scadenza": in_scadenza,
+            "in_scadenza": counters.in_scadenza or 0,
             "importo_totale": importo_totale,
             "importo_medio": importo_medio,
             "nuovi_settimana": nuovi_settimana,
+            "nuovi_mese": counters.nuovi_mese or 0,
             "fonti": fonti,
             "categorie": categorie,
             "trend_mensile": trend_mensile,
@@ -289,6 +456,8 @@ class BandoCRUD:
             count += 1
 
         await db.commit()
+        if count:
+            await self.invalidate_stats()
         return count
 
 
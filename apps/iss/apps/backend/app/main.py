@@ -89,6 +89,13 @@ async def shutdown_events():
     except Exception as e:
         logger.warning(f"Bando scheduler shutdown error: {e}")
 
+    # Close pooled ChromaDB/Ollama client
+    try:
+        from .services.rag_service import rag_service
+        await rag_service.aclose()
+    except Exception as e:
+        logger.warning(f"RAG client shutdown error: {e}")
+
 # Security headers middleware
 @app.middleware("http")
 async def security_headers_middleware(request: Request, call_next):
@@ -1,10 +1,29 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, Date, Boolean, DateTime, Enum, JSON, Index, Computed, DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.database.database import Base
 
 
+# Ricerca full-text: configurazione italiana, senza accenti, campi pesati
+# (A titolo, B keyword, C ente, D descrizione). unaccent() non è IMMUTABLE
+# e non può stare in una colonna generata: lo si avvolge in iss_unaccent().
+SEARCH_CONFIG = "italian"
+
+UNACCENT_EXTENSION_SQL = "CREATE EXTENSION IF NOT EXISTS unaccent"
+UNACCENT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION iss_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+"""
+
+SEARCH_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, iss_unaccent(coalesce({column}, ''))), '{weight}')"
+    for column, weight in (("title", "A"), ("keyword_match", "B"), ("ente", "C"), ("descrizione", "D"))
+)
+
+
 class BandoStatus(enum.Enum):
     """Stati possibili di un bando"""
     ATTIVO = "attivo"
@@ -29,6 +48,11 @@ class BandoSource(enum.Enum):
 class Bando(Base):
     """Modello per i bandi trovati dal sistema di monitoraggio"""
     __tablename__ = "bandi"
+    __table_args__ = (
+        # /best-matches: status = attivo ORDER BY ai_score DESC, data_trovato DESC
+        Index("ix_bandi_status_score_trovato", "status", "ai_score", "data_trovato"),
+        Index("ix_bandi_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False, index=True)
@@ -57,8 +81,14 @@ class Bando(Base):
     # AI Analysis Persistence
     ai_score = Column(Integer, nullable=True, index=True)
     ai_reasoning = Column(Text, nullable=True)
+    ai_match_details = Column(JSON, nullable=True)  # {"strengths": [...], "weaknesses": [...]}
+    ai_score_version = Column(String(64), nullable=True)  # Modello/profilo/prompt che ha prodotto lo score
+    ai_scored_at = Column(DateTime(timezone=True), nullable=True)
     deep_analysis = Column(JSON, nullable=True) # Strategic report from Agent Analyst
 
+    # Ricerca full-text (colonna generata da Postgres, vedi SEARCH_VECTOR_SQL)
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
+
     # Relazioni con sistema utenti
     applications = relationship("BandoApplication", back_populates="bando")
     watchlists = relationship("BandoWatchlist", back_populates="bando")
@@ -66,3 +96,8 @@ class Bando(Base):
 
     def __repr__(self):
         return f"<Bando(id={self.id}, title='{self.title}', ente='{self.ente}', fonte='{self.fonte}')>"
+
+
+# La colonna generata usa iss_unaccent(): deve esistere prima di CREATE TABLE
+for _statement in (UNACCENT_EXTENSION_SQL, UNACCENT_FUNCTION_SQL):
+    event.listen(Bando.__table__, "before_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, HttpUrl
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from enum import Enum
 
 
@@ -55,6 +55,7 @@ class BandoUpdate(BaseModel):
     notificato_telegram: Optional[bool] = None
     ai_score: Optional[int] = None
     ai_reasoning: Optional[str] = None
+    deep_analysis: Optional[Dict[str, Any]] = None
 
 
 class BandoRead(BandoBase):
@@ -70,6 +71,7 @@ class BandoRead(BandoBase):
     keyword_match: Optional[str] = None
     ai_score: Optional[int] = None
     ai_reasoning: Optional[str] = None
+    highlight: Optional[str] = None  # Snippet della ricerca full-text (HTML escapato, termini in <mark>)
 
     class Config:
         from_attributes = True
@@ -82,6 +84,7 @@ class BandoList(BaseModel):
     page: int
     size: int
     pages: int
+    total_estimated: bool = False  # True se `total` è una stima (risultati molto numerosi)
 
 
 class BandoSearch(BaseModel):
@@ -822,11 +822,11 @@ Se non trovi bandi validi, rispondi: {{"bandi": []}}
 
         logger.info(f"✅ Ricerca completata. Trovati {len(unique_bandi)} bandi unici.")
         
-        # Salva nel DB e analizza
+        # Salva nel DB (lo score viene calcolato dopo, in batch)
         saved_count = 0
+        saved_ids = []
         from app.crud.bando import bando_crud
-        from app.schemas.bando import BandoCreate, BandoUpdate
-        from app.services.match_service import ISS_PROFILE
+        from app.schemas.bando import BandoCreate
         
         for b in unique_bandi:
             try:
@@ -846,17 +846,18 @@ Se non trovi bandi validi, rispondi: {{"bandi": []}}
                 # Salva (gestisce duplicati internamente)
                 bando_obj = await bando_crud.create_bando(db, bando_in)
                 if bando_obj:
-                    # Analisi immediata del match per persistenza
-                    tender_text = f"TITOLO: {bando_obj.title}\nENTE: {bando_obj.ente}\nDESCRIZIONE: {bando_obj.descrizione or ''}"
-                    analysis = await self.analyze_match(tender_text, ISS_PROFILE)
-                    
-                    await bando_crud.update_bando(db, bando_obj.id, BandoUpdate(
-                        ai_score=analysis.get('score', 0),
-                        ai_reasoning=analysis.get('reasoning', '')
-                    ))
+                    saved_ids.append(bando_obj.id)
                     saved_count += 1
             except Exception as e:
-                logger.warning(f"Errore salvataggio/analisi bando {b.get('title')}: {e}")
+                logger.warning(f"Errore salvataggio bando {b.get('title')}: {e}")
+
+        # Score dei bandi salvati: più bandi per prompt invece di una chiamata per bando
+        if saved_ids and settings.match_scoring:
+            from app.services.scoring_service import scoring_service
+            try:
+                results['scored'] = await scoring_service.score_pending(saved_ids)
+            except Exception as e:
+                logger.error(f"Errore scoring bandi salvati: {e}")
 
         results['status'] = 'completed'
         results['completed_at'] = datetime.now().isoformat()
@@ -880,8 +881,12 @@ Se non trovi bandi validi, rispondi: {{"bandi": []}}
         # Usa Ollama se disponibile (gratis e privato), altrimenti Groq (veloce) o Gemini
         try:
             # 0. Recupera contesto da RAG (Personal Knowledge)
-            from app.services.rag_service import rag_service
-            rag_results = rag_service.query(tender_text[:1000]) # Query with first 1000 chars of tender
+            from app.services.rag_service import RAGUnavailableError, rag_service
+            try:
+                rag_results = await rag_service.query(tender_text[:1000]) # Query with first 1000 chars of tender
+            except RAGUnavailableError as e:
+                logger.warning(f"Match analysis without RAG context: {e}")
+                rag_results = {}
             
             rag_context = ""
             if rag_results and rag_results['documents']:
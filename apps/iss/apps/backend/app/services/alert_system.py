@@ -7,13 +7,13 @@ import logging
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, desc
 from sqlalchemy.orm import selectinload
 
 from app.database.database import get_db
 from app.models.bando import Bando
 from app.models.aps_user import APSUser, BandoWatchlist
-from app.crud.aps_user import aps_user_crud, bando_watchlist_crud
+from app.crud.aps_user import bando_watchlist_crud
 from app.crud.bando import bando_crud
 from app.services.email_notifications import email_notification_service
 # Lazy import to avoid loading AI model at startup
@@ -21,6 +21,12 @@ from app.services.email_notifications import email_notification_service
 
 logger = logging.getLogger(__name__)
 
+# Similarità minima profilo/bando per un alert
+MATCH_THRESHOLD = 0.3
+# Bandi attivi recenti tra cui scegliere le raccomandazioni della newsletter
+NEWSLETTER_CANDIDATES = 200
+USERS_PAGE_SIZE = 1000
+
 
 class BandoAlertSystem:
     """Sistema di alert automatici per bandi e notifiche utenti"""
@@ -55,37 +61,37 @@ class BandoAlertSystem:
 
             logger.info(f"🆕 Trovati {len(new_bandi)} nuovi bandi")
 
-            # Recupera tutti gli utenti attivi con preferenze email
-            users, _ = await aps_user_crud.search_users(db, skip=0, limit=1000, is_active=True)
-
-            for user in users:
-                try:
-                    # Controlla preferenze notifiche
-                    preferences = user.notification_preferences or {}
-                    if not preferences.get('new_bandi_alerts', True):
-                        continue
-
-                    # Trova bandi rilevanti per l'utente usando AI
-                    relevant_bandi = await self._find_relevant_bandi_for_user(db, user, new_bandi)
-
-                    if relevant_bandi:
-                        # Invia notifica email
-                        success = await email_notification_service.send_new_bandi_alert(
-                            user, relevant_bandi
-                        )
-
-                        if success:
-                            results["emails_sent"] += 1
-                            logger.info(f"📧 Alert inviato a {user.organization_name}: {len(relevant_bandi)} bandi")
-                        else:
-                            results["errors"] += 1
+            # Utenti attivi che vogliono gli alert
+            users = [
+                user for user in await self._get_active_users(db)
+                if (user.notification_preferences or {}).get('new_bandi_alerts', True)
+            ]
 
-                        results["users_notified"] += 1
+            # Tutti i nuovi bandi contro tutti gli utenti in un solo passaggio
+            matches = await self._match_bandi_for_users(users, new_bandi, limit=5)
 
+            emails = []
+            recipients = []
+            for user, relevant_bandi in zip(users, matches):
+                if not relevant_bandi:
+                    continue
+                try:
+                    emails.append(email_notification_service.render_new_bandi_alert(user, relevant_bandi))
+                    recipients.append((user, len(relevant_bandi)))
                 except Exception as e:
                     logger.error(f"Errore alert per utente {user.id}: {e}")
                     results["errors"] += 1
 
+            # Invio batch
+            outcome = await email_notification_service.send_batch(emails)
+            for (user, count), success in zip(recipients, outcome):
+                if success:
+                    results["emails_sent"] += 1
+                    logger.info(f"📧 Alert inviato a {user.organization_name}: {count} bandi")
+                else:
+                    results["errors"] += 1
+                results["users_notified"] += 1
+
             logger.info(f"✅ Alert nuovi bandi completato: {results}")
             return results
 
@@ -180,32 +186,38 @@ class BandoAlertSystem:
             stats = await self._calculate_weekly_stats(db)
 
             # Recupera utenti che vogliono la newsletter
-            users, _ = await aps_user_crud.search_users(db, skip=0, limit=1000, is_active=True)
+            users = [
+                user for user in await self._get_active_users(db)
+                if (user.notification_preferences or {}).get('weekly_newsletter', True)
+            ]
 
-            for user in users:
-                try:
-                    # Controlla preferenze
-                    preferences = user.notification_preferences or {}
-                    if not preferences.get('weekly_newsletter', True):
-                        continue
+            # Raccomandazioni (una moltiplicazione di matrici) e scadenze watchlist (una query)
+            candidates = await self._get_newsletter_candidates(db)
+            recommendations = await self._match_bandi_for_users(users, candidates, limit=3)
+            deadlines = await self._get_upcoming_deadlines(db, [user.id for user in users])
 
+            emails = []
+            recipients = []
+            for user, recommended in zip(users, recommendations):
+                try:
                     # Personalizza statistiche per l'utente
-                    user_stats = await self._personalize_stats_for_user(db, user, stats)
-
-                    success = await email_notification_service.send_weekly_newsletter(
-                        user, user_stats
+                    user_stats = self._personalize_stats_for_user(
+                        stats, recommended, deadlines.get(user.id, [])
                     )
-
-                    if success:
-                        results["newsletters_sent"] += 1
-                        logger.info(f"📊 Newsletter inviata a {user.organization_name}")
-                    else:
-                        results["errors"] += 1
-
+                    emails.append(email_notification_service.render_weekly_newsletter(user, user_stats))
+                    recipients.append(user)
                 except Exception as e:
                     logger.error(f"Errore newsletter per {user.organization_name}: {e}")
                     results["errors"] += 1
 
+            outcome = await email_notification_service.send_batch(emails)
+            for user, success in zip(recipients, outcome):
+                if success:
+                    results["newsletters_sent"] += 1
+                    logger.info(f"📊 Newsletter inviata a {user.organization_name}")
+                else:
+                    results["errors"] += 1
+
             logger.info(f"✅ Newsletter settimanali completate: {results}")
             return results
 
@@ -214,53 +226,129 @@ class BandoAlertSystem:
             results["errors"] += 1
             return results
 
-    async def _find_relevant_bandi_for_user(self, db: AsyncSession, user: APSUser, bandi: List[Bando]) -> List[Bando]:
-        """Trova bandi rilevanti per un utente specifico usando AI"""
-        if not bandi:
-            return []
+    async def _get_active_users(self, db: AsyncSession) -> List[APSUser]:
+        """
+        Tutti gli utenti attivi, a pagine (non solo i primi 1000).
+
+        Paginazione per id (id > ultimo id letto): con offset un utente
+        registrato durante la lettura sposterebbe le pagine, saltando o
+        duplicando destinatari.
+        """
+        users: List[APSUser] = []
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(APSUser)
+                .where(and_(APSUser.is_active == True, APSUser.id > last_id))
+                .order_by(APSUser.id)
+                .limit(USERS_PAGE_SIZE)
+            )
+            page = list(result.scalars().all())
+            users.extend(page)
+            if len(page) < USERS_PAGE_SIZE:
+                return users
+            last_id = page[-1].id
+
+    @staticmethod
+    def _user_profile(user: APSUser) -> Dict[str, Any]:
+        """Profilo utente per il matching AI"""
+        return {
+            'organization_type': user.organization_type.value if user.organization_type else 'aps',
+            'sectors': user.sectors or [],
+            'target_groups': user.target_groups or [],
+            'keywords': user.keywords or [],
+            'geographical_scope': user.geographical_scope or 'Campania',
+            'description': user.description
+        }
+
+    async def _match_bandi_for_users(self, users: List[APSUser], bandi: List[Bando], limit: int) -> List[List[Bando]]:
+        """
+        Bandi rilevanti per ogni utente (stesso ordine di `users`).
+
+        Un solo calcolo profili x bandi sugli embedding (profili in cache);
+        se gli embedding non sono disponibili, matching per settori.
+        """
+        if not users or not bandi:
+            return [[] for _ in users]
 
         try:
-            # Costruisci profilo utente per AI
-            user_profile = {
-                'organization_type': user.organization_type.value if user.organization_type else 'aps',
-                'sectors': user.sectors or [],
-                'target_groups': user.target_groups or [],
-                'keywords': user.keywords or [],
-                'geographical_scope': user.geographical_scope or 'Campania',
-                'max_budget_interest': user.max_budget_interest,
-                'description': user.description
-            }
-
-            # Usa AI per trovare match (lazy import)
+            # Lazy import to avoid loading AI model at startup
             from app.services.semantic_search import semantic_search_service
-            recommendations = await semantic_search_service.generate_user_recommendations(
-                user_profile, db, limit=len(bandi)
+            matches = await semantic_search_service.match_profiles_to_bandi(
+                [self._user_profile(user) for user in users], bandi,
+                limit=limit, threshold=MATCH_THRESHOLD
             )
-
-            # Filtra solo i bandi nuovi che sono stati raccomandati
-            new_bando_ids = {b.id for b in bandi}
-            relevant_bandi = []
-
-            for rec in recommendations:
-                if rec['bando'].id in new_bando_ids and rec['recommendation_score'] > 0.3:
-                    relevant_bandi.append(rec['bando'])
-
-            return relevant_bandi[:5]  # Max 5 bandi per email
-
         except Exception as e:
-            logger.error(f"Errore ricerca bandi rilevanti per {user.organization_name}: {e}")
-            # Fallback: usa matching semplice per settori
-            relevant = []
-            user_sectors = [s.lower() for s in (user.sectors or [])]
+            logger.error(f"Errore matching AI bandi/utenti: {e}")
+            matches = None
 
-            for bando in bandi:
-                if user_sectors and bando.categoria:
-                    if any(sector in bando.categoria.lower() for sector in user_sectors):
-                        relevant.append(bando)
-                        if len(relevant) >= 3:
-                            break
+        if matches is None:
+            logger.warning("⚠️ Embedding non disponibili, uso il matching per settori")
+            return [self._match_by_sector(user, bandi, limit=min(limit, 3)) for user in users]
 
-            return relevant
+        return [[bando for bando, _ in user_matches] for user_matches in matches]
+
+    async def _find_relevant_bandi_for_user(self, db: AsyncSession, user: APSUser, bandi: List[Bando]) -> List[Bando]:
+        """Bandi rilevanti per un singolo utente (anteprima notifiche)"""
+        return (await self._match_bandi_for_users([user], bandi, limit=5))[0]
+
+    async def _user_newsletter_stats(self, db: AsyncSession, user: APSUser, base_stats: Dict) -> Dict[str, Any]:
+        """Statistiche newsletter di un singolo utente (anteprima notifiche)"""
+        candidates = await self._get_newsletter_candidates(db)
+        recommended = (await self._match_bandi_for_users([user], candidates, limit=3))[0]
+        deadlines = await self._get_upcoming_deadlines(db, [user.id])
+        return self._personalize_stats_for_user(base_stats, recommended, deadlines.get(user.id, []))
+
+    @staticmethod
+    def _match_by_sector(user: APSUser, bandi: List[Bando], limit: int) -> List[Bando]:
+        """Fallback: bandi la cui categoria contiene uno dei settori dell'utente"""
+        relevant = []
+        user_sectors = [s.lower() for s in (user.sectors or [])]
+
+        for bando in bandi:
+            if user_sectors and bando.categoria:
+                if any(sector in bando.categoria.lower() for sector in user_sectors):
+                    relevant.append(bando)
+                    if len(relevant) >= limit:
+                        break
+
+        return relevant
+
+    async def _get_newsletter_candidates(self, db: AsyncSession) -> List[Bando]:
+        """Bandi attivi più recenti tra cui scegliere le raccomandazioni"""
+        result = await db.execute(
+            select(Bando)
+            .where(Bando.status == 'attivo')
+            .order_by(desc(Bando.data_trovato))
+            .limit(NEWSLETTER_CANDIDATES)
+        )
+        return list(result.scalars().all())
+
+    async def _get_upcoming_deadlines(self, db: AsyncSession, user_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Scadenze nei prossimi 30 giorni dalla watchlist di tutti gli utenti, in una query"""
+        if not user_ids:
+            return {}
+
+        now = datetime.now()
+        result = await db.execute(
+            select(BandoWatchlist)
+            .options(selectinload(BandoWatchlist.bando))
+            .join(Bando)
+            .where(and_(
+                BandoWatchlist.aps_user_id.in_(user_ids),
+                Bando.status == 'attivo',
+                Bando.scadenza > now,
+                Bando.scadenza <= now + timedelta(days=30)
+            ))
+        )
+
+        deadlines: Dict[int, List[Dict[str, Any]]] = {}
+        for item in result.scalars().all():
+            deadlines.setdefault(item.aps_user_id, []).append({
+                'bando': item.bando,
+                'days_left': (item.bando.scadenza - now).days
+            })
+        return deadlines
 
     async def _calculate_weekly_stats(self, db: AsyncSession) -> Dict[str, Any]:
         """Calcola statistiche settimanali per newsletter"""
@@ -310,51 +398,25 @@ class BandoAlertSystem:
                 'scadenze_imminenti': []
             }
 
-    async def _personalize_stats_for_user(self, db: AsyncSession, user: APSUser, base_stats: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _personalize_stats_for_user(
+        base_stats: Dict,
+        recommended: List[Bando],
+        upcoming_deadlines: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         """Personalizza le statistiche per un utente specifico"""
         personalized = base_stats.copy()
 
-        try:
-            # Aggiungi raccomandazioni AI personalizzate
-            if user.id:
-                user_profile = {
-                    'organization_type': user.organization_type.value if user.organization_type else 'aps',
-                    'sectors': user.sectors or [],
-                    'target_groups': user.target_groups or [],
-                    'keywords': user.keywords or [],
-                    'geographical_scope': user.geographical_scope or 'Campania'
-                }
-
-                # Lazy import AI service
-                from app.services.semantic_search import semantic_search_service
-                recommendations = await semantic_search_service.generate_user_recommendations(
-                    user_profile, db, limit=3
-                )
-
-                personalized['raccomandazioni_ai'] = len(recommendations)
-                personalized['bandi_raccomandati'] = [rec['bando'] for rec in recommendations[:3]]
+        # Raccomandazioni AI personalizzate
+        if recommended:
+            personalized['raccomandazioni_ai'] = len(recommended)
+            personalized['bandi_raccomandati'] = recommended[:3]
 
-            # Aggiungi scadenze dalla watchlist dell'utente
-            watchlist = await bando_watchlist_crud.get_user_watchlist(db, user.id)
-            upcoming_deadlines = []
-
-            now = datetime.now()
-            for item in watchlist:
-                if item.bando.scadenza and item.bando.scadenza > now:
-                    days_left = (item.bando.scadenza - now).days
-                    if days_left <= 30:  # Solo prossimi 30 giorni
-                        upcoming_deadlines.append({
-                            'bando': item.bando,
-                            'days_left': days_left
-                        })
-
-            personalized['scadenze_imminenti'] = sorted(
-                upcoming_deadlines,
-                key=lambda x: x['days_left']
-            )[:5]
-
-        except Exception as e:
-            logger.error(f"Errore personalizzazione stats per {user.organization_name}: {e}")
+        # Scadenze dalla watchlist dell'utente
+        personalized['scadenze_imminenti'] = sorted(
+            upcoming_deadlines,
+            key=lambda x: x['days_left']
+        )[:5]
 
         return personalized
 
@@ -1,45 +1,271 @@
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
 from app.core.config import settings
-from app.services.rag_service import rag_service
+from app.services.rag_service import RAGUnavailableError, rag_service
 import httpx
+import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompts or the output structure change: invalidates every memoized analysis
+ANALYSIS_VERSION = "2"
+CHECKPOINT_TTL_SECONDS = int(os.getenv("ANALYSIS_CHECKPOINT_TTL", str(30 * 24 * 3600)))
+CHECKPOINT_PREFIX = "iss:analysis:"
+# Checkpoint in memoria (solo senza Redis): massimo numero di analisi tenute
+MEMORY_CHECKPOINT_MAX = int(os.getenv("ANALYSIS_MEMORY_CHECKPOINTS", "256"))
+
+
+class AnalysisStageError(Exception):
+    """Uno stage dell'analisi è fallito: gli stage precedenti restano in checkpoint."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(message)
+        self.stage = stage
+
+
+def bando_analysis_text(bando) -> str:
+    """Testo del bando usato da analisi e bozza (anche per l'hash di contenuto)."""
+    parts = [
+        bando.title,
+        f"Ente: {bando.ente}" if bando.ente else "",
+        f"Importo: {bando.importo}" if bando.importo else "",
+        f"Scadenza: {bando.scadenza_raw}" if bando.scadenza_raw else "",
+        bando.descrizione or "",
+    ]
+    return "\n".join(part for part in parts if part)
+
+
 class DeepAnalystService:
+    """
+    Analisi profonda in 3 stage (requisiti -> contesto RAG -> valutazione).
+
+    Ogni stage completato viene salvato (Redis, fallback in memoria) sotto
+    una chiave derivata da testo del bando, profilo associazione, modello e
+    ANALYSIS_VERSION: la stessa analisi non viene mai ricalcolata e, se uno
+    stage fallisce, la richiesta successiva riparte da quello stage. Uno
+    stage fallito non viene mai salvato.
+
+    Il fallback in memoria è un LRU con TTL (MEMORY_CHECKPOINT_MAX voci) e
+    i lock per chiave vengono rimossi quando nessuno li usa più.
+    """
+
     def __init__(self):
         self.ollama_url = f"http://{settings.ollama_host}:11434/api/generate"
         self.ollama_model = settings.ollama_model
+        self.model_version = f"{self.ollama_model}|v{ANALYSIS_VERSION}"
+
+        self._redis = None
+        # key -> (scadenza monotonic, checkpoint)
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # key -> [lock, richieste che lo usano]
+        self._locks: Dict[str, list] = {}
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def content_hash(self, bando_text: str, association_profile: str) -> str:
+        """Chiave di memoizzazione: contenuto del bando + profilo + versione del modello."""
+        digest = hashlib.sha256()
+        for part in (self.model_version, association_profile, bando_text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    async def _get_redis(self):
+        if self._redis is None:
+            try:
+                client = redis.from_url(settings.redis_url, encoding="utf-8", decode_responses=True)
+                await client.ping()
+                self._redis = client
+            except Exception as e:
+                logger.warning(f"Redis not available for analysis checkpoints, using memory: {e}")
+        return self._redis
+
+    @asynccontextmanager
+    async def _key_lock(self, key: str):
+        """Lock per analisi: doppio click / precompute in corso aspettano la prima richiesta."""
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
 
-    async def analyze_bando(self, bando_text: str, association_profile: str) -> Dict[str, Any]:
+    async def _load_checkpoint(self, key: str) -> Dict[str, Any]:
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(CHECKPOINT_PREFIX + key)
+                if raw:
+                    return json.loads(raw)
+            except Exception as e:
+                logger.warning(f"Analysis checkpoint read failed: {e}")
+
+        cached = self._memory.get(key)
+        if cached is None:
+            return {}
+        expires_at, checkpoint = cached
+        if expires_at < time.monotonic():
+            del self._memory[key]
+            return {}
+        self._memory.move_to_end(key)
+        return dict(checkpoint)
+
+    async def _save_checkpoint(self, key: str, checkpoint: Dict[str, Any]):
+        client = await self._get_redis()
+        if client is not None:
+            try:
+                await client.set(CHECKPOINT_PREFIX + key, json.dumps(checkpoint), ex=CHECKPOINT_TTL_SECONDS)
+                self._memory.pop(key, None)
+                return
+            except Exception as e:
+                logger.warning(f"Analysis checkpoint write failed: {e}")
+
+        self._memory[key] = (time.monotonic() + CHECKPOINT_TTL_SECONDS, dict(checkpoint))
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_CHECKPOINT_MAX:
+            self._memory.popitem(last=False)
+
+    def is_current(self, analysis: Optional[Dict[str, Any]], bando_text: str, association_profile: str) -> bool:
+        """True se `analysis` (es. bando.deep_analysis) è stata prodotta da questo contenuto/modello."""
+        meta = (analysis or {}).get("analysis_meta") or {}
+        return meta.get("content_hash") == self.content_hash(bando_text, association_profile)
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    async def analyze_bando(self, bando_text: str, association_profile: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Perform a multi-step deep analysis of a bando.
+
+        Ritorna il risultato memoizzato se esiste; `refresh=True` lo ricalcola.
+        In caso di errore ritorna {"error", "failed_stage"} senza perdere gli
+        stage già completati.
         """
-        logger.info("🚀 Starting Deep Analysis for Bando...")
-        
-        # Step 1: Extract Key Requirements
-        requirements = await self._extract_requirements(bando_text)
-        logger.info(f"📍 Extracted {len(requirements)} key requirements.")
+        key = self.content_hash(bando_text, association_profile)
 
-        # Step 2: Query RAG for Internal Guidelines
-        context_query = " ".join(requirements[:5])
-        rag_results = await rag_service.query(context_query, n_results=5)
-        rag_context = ""
-        if rag_results and "documents" in rag_results and rag_results["documents"]:
-            rag_context = "\n".join(rag_results["documents"][0])
-        logger.info("📚 RAG Context loaded.")
-
-        # Step 3: Comprehensive Evaluation (SWOT + Strategy)
-        final_analysis = await self._perform_reasoning(
-            bando_text=bando_text,
-            association_profile=association_profile,
-            rag_context=rag_context,
-            requirements=requirements
-        )
-        
-        return final_analysis
+        async with self._key_lock(key):
+            checkpoint = {} if refresh else await self._load_checkpoint(key)
+            if checkpoint.get("result"):
+                logger.info("♻️ Deep Analysis served from cache")
+                return checkpoint["result"]
+
+            logger.info("🚀 Starting Deep Analysis for Bando...")
+            try:
+                # Step 1: Extract Key Requirements
+                if "requirements" not in checkpoint:
+                    checkpoint["requirements"] = await self._extract_requirements(bando_text)
+                    await self._save_checkpoint(key, checkpoint)
+                requirements = checkpoint["requirements"]
+                logger.info(f"📍 Extracted {len(requirements)} key requirements.")
+
+                # Step 2: Query RAG for Internal Guidelines
+                if "rag_context" not in checkpoint:
+                    checkpoint["rag_context"] = await self._load_rag_context(requirements)
+                    await self._save_checkpoint(key, checkpoint)
+                logger.info("📚 RAG Context loaded.")
+
+                # Step 3: Comprehensive Evaluation (SWOT + Strategy)
+                final_analysis = await self._perform_reasoning(
+                    bando_text=bando_text,
+                    association_profile=association_profile,
+                    rag_context=checkpoint["rag_context"],
+                    requirements=requirements
+                )
+            except AnalysisStageError as e:
+                logger.error(f"Deep Analysis failed at stage '{e.stage}': {e}")
+                return {"error": str(e), "failed_stage": e.stage}
+
+            final_analysis["requirements"] = requirements
+            final_analysis["analysis_meta"] = {
+                "content_hash": key,
+                "model_version": self.model_version,
+            }
+            checkpoint["result"] = final_analysis
+            await self._save_checkpoint(key, checkpoint)
+            return final_analysis
+
+    async def get_requirements(self, bando_text: str, association_profile: str) -> List[str]:
+        """Requisiti estratti (stage 1), riusati da /draft; calcolati e salvati se mancano."""
+        key = self.content_hash(bando_text, association_profile)
+        checkpoint = await self._load_checkpoint(key)
+        if "requirements" in checkpoint:
+            return checkpoint["requirements"]
+
+        async with self._key_lock(key):
+            checkpoint = await self._load_checkpoint(key)
+            if "requirements" not in checkpoint:
+                try:
+                    checkpoint["requirements"] = await self._extract_requirements(bando_text)
+                except AnalysisStageError as e:
+                    logger.warning(f"Requirements unavailable for draft: {e}")
+                    return []
+                await self._save_checkpoint(key, checkpoint)
+            return checkpoint["requirements"]
+
+    async def precompute(self, bando_ids: List[int], association_profile: str):
+        """
+        Analizza in background i bandi appena trovati (dopo run_monitoring).
+        Sequenziale: Ollama è una risorsa condivisa.
+        """
+        from app.crud.bando import bando_crud
+        from app.database.database import async_session_maker
+        from app.schemas.bando import BandoUpdate
+
+        for bando_id in bando_ids:
+            try:
+                async with async_session_maker() as db:
+                    bando = await bando_crud.get_bando(db, bando_id=bando_id)
+                    if not bando:
+                        continue
+                    bando_text = bando_analysis_text(bando)
+                    if self.is_current(bando.deep_analysis, bando_text, association_profile):
+                        continue
+
+                    analysis = await self.analyze_bando(bando_text, association_profile)
+                    if "error" not in analysis:
+                        await bando_crud.update_bando(db, bando_id=bando_id, bando_update=BandoUpdate(deep_analysis=analysis))
+            except Exception as e:
+                logger.error(f"Precompute analysis failed for bando {bando_id}: {e}")
+        logger.info(f"🧠 Precomputed deep analysis for {len(bando_ids)} new bandi")
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _generate_json(self, stage: str, prompt: str, timeout: float):
+        try:
+            async with httpx.AsyncClient() as client:
+                resp = await client.post(self.ollama_url, json={
+                    "model": self.ollama_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "format": "json"
+                }, timeout=timeout)
+        except httpx.HTTPError as e:
+            raise AnalysisStageError(stage, f"Ollama unreachable: {e}") from e
+
+        if resp.status_code != 200:
+            raise AnalysisStageError(stage, f"Ollama error {resp.status_code}: {resp.text[:200]}")
+        try:
+            return json.loads(resp.json()["response"])
+        except (KeyError, ValueError) as e:
+            raise AnalysisStageError(stage, f"Invalid JSON from model: {e}") from e
 
     async def _extract_requirements(self, text: str) -> List[str]:
         """Extract technical/legal requirements from the bando text."""
@@ -50,19 +276,26 @@ BANDO:
 Rispondi SOLO con una lista JSON di stringhe:
 ["requisito 1", "requisito 2", ...]
 """
+        data = await self._generate_json("requirements", prompt, timeout=60.0)
+        # format=json può restituire {"requisiti": [...]} invece della lista nuda
+        if isinstance(data, dict):
+            data = next((v for v in data.values() if isinstance(v, list)), [])
+        if not isinstance(data, list):
+            raise AnalysisStageError("requirements", "Model did not return a list of requirements")
+        return [str(item) for item in data]
+
+    async def _load_rag_context(self, requirements: List[str]) -> str:
+        context_query = " ".join(requirements[:5])
+        if not context_query:
+            return ""
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(self.ollama_url, json={
-                    "model": self.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json"
-                }, timeout=60.0)
-                if resp.status_code == 200:
-                    return json.loads(resp.json()["response"])
-        except Exception as e:
-            logger.error(f"Error extracting requirements: {e}")
-        return []
+            rag_results = await rag_service.query(context_query, n_results=5)
+        except RAGUnavailableError as e:
+            # Non salvare un contesto vuoto: lo stage si riprova alla prossima richiesta
+            raise AnalysisStageError("rag_context", f"Knowledge base unavailable: {e}") from e
+        if rag_results and "documents" in rag_results and rag_results["documents"]:
+            return "\n".join(rag_results["documents"][0])
+        return ""
 
     async def _perform_reasoning(self, bando_text: str, association_profile: str, rag_context: str, requirements: List[str]) -> Dict[str, Any]:
         """Final multi-pronged analysis."""
@@ -98,20 +331,9 @@ Rispondi SOLO in JSON con questa struttura:
   "internal_notes": "<note basate sul contesto operativo>"
 }}
 """
-        try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(self.ollama_url, json={
-                    "model": self.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json"
-                }, timeout=120.0)
-                if resp.status_code == 200:
-                    return json.loads(resp.json()["response"])
-        except Exception as e:
-            logger.error(f"Error in deep reasoning: {e}")
-            return {"error": str(e)}
-            
-        return {"error": "Unknown error during analysis"}
+        result = await self._generate_json("reasoning", prompt, timeout=120.0)
+        if not isinstance(result, dict):
+            raise AnalysisStageError("reasoning", "Model did not return a JSON object")
+        return result
 
 analyst_service = DeepAnalystService()
@@ -28,6 +28,7 @@ class BandoMonitorService:
 
     def __init__(self):
         self.session = None
+        self._background_tasks = set()
         self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         self.headers = {
             'User-Agent': self.user_agent,
@@ -1467,6 +1468,29 @@ class BandoMonitorService:
 
         return bandi
 
+    def _schedule_analysis_precompute(self, bando_ids: List[int]):
+        """Avvia in background la deep analysis dei bandi nuovi (non blocca il monitoraggio)."""
+        if not bando_ids or not settings.analysis_precompute:
+            return
+
+        from app.services.analyst_service import analyst_service
+        from app.services.match_service import ISS_PROFILE
+
+        task = asyncio.create_task(analyst_service.precompute(bando_ids, ISS_PROFILE))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _schedule_match_scoring(self, bando_ids: List[int]):
+        """Avvia in background lo scoring dei bandi nuovi per /best-matches."""
+        if not bando_ids or not settings.match_scoring:
+            return
+
+        from app.services.scoring_service import scoring_service
+
+        task = asyncio.create_task(scoring_service.score_pending(bando_ids))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def run_monitoring(self, db: AsyncSession, config: BandoConfig) -> Dict:
         """Esegue il monitoraggio con una configurazione specifica"""
 
@@ -1479,6 +1503,7 @@ class BandoMonitorService:
 
         all_bandi = []
         new_bandi = 0
+        new_bando_objs = []
         errors = 0
         sources_processed = {}
 
@@ -1611,6 +1636,7 @@ class BandoMonitorService:
                         )
 
                         db.add(new_bando)
+                        new_bando_objs.append(new_bando)
                         new_bandi += 1
 
                 except Exception as e:
@@ -1624,6 +1650,13 @@ class BandoMonitorService:
             config.next_run = datetime.now() + timedelta(hours=config.schedule_interval_hours)
             await db.commit()
 
+            if new_bandi:
+                await bando_crud.invalidate_stats()
+
+            new_ids = [b.id for b in new_bando_objs if b.id]
+            self._schedule_match_scoring(new_ids)
+            self._schedule_analysis_precompute(new_ids)
+
             return {
                 'status': 'completed',
                 'bandi_found': len(all_bandi),
@@ -2,9 +2,9 @@
 import logging
 import httpx
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.core.config import settings
-from app.services.rag_service import rag_service
+from app.services.rag_service import RAGUnavailableError, rag_service
 
 logger = logging.getLogger(__name__)
 
@@ -13,14 +13,21 @@ class DraftService:
         self.ollama_url = f"http://{settings.ollama_host}:11434/api/generate"
         self.ollama_model = settings.ollama_model
 
-    async def generate_draft(self, bando_text: str, association_profile: str) -> str:
+    async def generate_draft(self, bando_text: str, association_profile: str, requirements: Optional[List[str]] = None) -> str:
         """
         Generate a project draft for a specific bando.
+
+        `requirements` sono quelli estratti dall'analisi profonda (stage 1),
+        così bozza e analisi lavorano sugli stessi requisiti.
         """
         logger.info("✍️ Generating Project Draft...")
         
         # Step 1: Query RAG for templates and similar projects
-        rag_results = await rag_service.query("template progetto finanziamento lettera presentazione", n_results=3)
+        try:
+            rag_results = await rag_service.query("template progetto finanziamento lettera presentazione", n_results=3)
+        except RAGUnavailableError as e:
+            logger.warning(f"Draft without RAG templates: {e}")
+            rag_results = {}
         rag_context = ""
         if rag_results and "documents" in rag_results and rag_results["documents"]:
             rag_context = "\n".join(rag_results["documents"][0])
@@ -34,11 +41,14 @@ class DraftService:
 --- TEMPLATE E LINEE GUIDA ---
 {rag_context}
 
+--- REQUISITI DEL BANDO ---
+{json.dumps(requirements or [], ensure_ascii=False, indent=2)}
+
 --- BANDO ---
 {bando_text[:4000]}
 
 --- TASK ---
-Scrivi una bozza strutturata in Markdown che includa:
+Scrivi una bozza strutturata in Markdown, coerente con i requisiti elencati, che includa:
 1. Obiettivo del Progetto
 2. Attività previste
 3. Budget stimato
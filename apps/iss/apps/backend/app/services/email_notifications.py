@@ -7,6 +7,7 @@ import logging
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 import asyncio
+from dataclasses import dataclass
 from jinja2 import Template
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -23,6 +24,184 @@ from app.crud.bando import bando_crud
 logger = logging.getLogger(__name__)
 
 
+# Template compilati una volta: gli alert e le newsletter li renderizzano per ogni utente
+NEW_BANDI_ALERT_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .header { background: #1e40af; color: white; padding: 20px; text-align: center; }
+        .content { padding: 20px; }
+        .bando { border: 1px solid #e5e7eb; margin: 15px 0; padding: 15px; border-radius: 8px; }
+        .bando-title { color: #1e40af; font-weight: bold; margin-bottom: 8px; }
+        .bando-info { color: #6b7280; font-size: 14px; margin: 5px 0; }
+        .cta-button { background: #1e40af; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 20px 0; }
+        .footer { background: #f9fafb; padding: 15px; text-align: center; color: #6b7280; font-size: 12px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🏛️ ISS - Innovazione Sociale Salernitana</h1>
+        <h2>Nuovi Bandi per {{ organization_name }}</h2>
+    </div>
+    
+    <div class="content">
+        <p>Ciao <strong>{{ organization_name }}</strong>,</p>
+        <p>Abbiamo trovato <strong>{{ bandi_count }} nuovi bandi</strong> che potrebbero interessarti:</p>
+        
+        {% for bando in bandi %}
+        <div class="bando">
+            <div class="bando-title">{{ bando.title }}</div>
+            <div class="bando-info">🏛️ <strong>Ente:</strong> {{ bando.ente }}</div>
+            {% if bando.importo %}
+            <div class="bando-info">💰 <strong>Importo:</strong> {{ bando.importo }}</div>
+            {% endif %}
+            {% if bando.scadenza %}
+            <div class="bando-info">📅 <strong>Scadenza:</strong> {{ bando.scadenza.strftime('%d/%m/%Y') }}</div>
+            {% endif %}
+            {% if bando.descrizione %}
+            <div class="bando-info">📝 {{ bando.descrizione[:200] }}{% if bando.descrizione|length > 200 %}...{% endif %}</div>
+            {% endif %}
+        </div>
+        {% endfor %}
+        
+        <a href="https://innovazionesocialesalernitana.it/bandi" class="cta-button">
+            🔍 Visualizza Tutti i Bandi
+        </a>
+        
+        <p>Il nostro sistema AI ha selezionato questi bandi basandosi sul tuo profilo organizzativo. 
+           Accedi alla piattaforma per vedere le raccomandazioni personalizzate!</p>
+    </div>
+    
+    <div class="footer">
+        <p>Questa email è stata inviata automaticamente dal sistema ISS</p>
+        <p>ISS - Innovazione Sociale Salernitana | Primo Hub Bandi AI-Powered d'Italia</p>
+        <p><a href="https://innovazionesocialesalernitana.it">innovazionesocialesalernitana.it</a></p>
+    </div>
+</body>
+</html>
+""")
+
+WEEKLY_NEWSLETTER_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .header { background: linear-gradient(135deg, #1e40af, #3b82f6); color: white; padding: 30px; text-align: center; }
+        .content { padding: 20px; }
+        .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }
+        .stat-card { background: #f8fafc; border: 1px solid #e2e8f0; padding: 15px; border-radius: 8px; text-align: center; }
+        .stat-value { font-size: 2em; font-weight: bold; color: #1e40af; }
+        .stat-label { color: #64748b; font-size: 14px; }
+        .section { margin: 30px 0; }
+        .bando-list { background: #f9fafb; padding: 15px; border-radius: 8px; }
+        .cta-button { background: #1e40af; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 20px 0; }
+        .footer { background: #1f2937; color: white; padding: 20px; text-align: center; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>📊 ISS Weekly Newsletter</h1>
+        <p>La tua dose settimanale di opportunità per {{ organization_name }}</p>
+    </div>
+    
+    <div class="content">
+        <div class="section">
+            <h2>📈 Statistiche della Settimana</h2>
+            <div class="stats-grid">
+                <div class="stat-card">
+                    <div class="stat-value">{{ stats.nuovi_bandi }}</div>
+                    <div class="stat-label">Nuovi Bandi</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-value">{{ stats.totali_attivi }}</div>
+                    <div class="stat-label">Bandi Attivi</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-value">€{{ stats.importo_totale | default('N/A') }}</div>
+                    <div class="stat-label">Importo Disponibile</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-value">{{ stats.raccomandazioni_ai | default(0) }}</div>
+                    <div class="stat-label">Raccomandazioni AI</div>
+                </div>
+            </div>
+        </div>
+        
+        <div class="section">
+            <h2>🎯 I Tuoi Bandi Raccomandati</h2>
+            {% if stats.bandi_raccomandati %}
+            <div class="bando-list">
+                {% for bando in stats.bandi_raccomandati %}
+                <div style="margin: 10px 0; padding: 10px; border-left: 4px solid #1e40af;">
+                    <strong>{{ bando.title }}</strong><br>
+                    <small>{{ bando.ente }} • {{ bando.importo if bando.importo else 'Importo non specificato' }}</small>
+                </div>
+                {% endfor %}
+            </div>
+            {% else %}
+            <p>🤖 Il nostro AI sta analizzando i nuovi bandi per generare raccomandazioni personalizzate.</p>
+            {% endif %}
+        </div>
+        
+        <div class="section">
+            <h2>📅 Scadenze Imminenti</h2>
+            {% if stats.scadenze_imminenti %}
+            <div class="bando-list">
+                {% for scadenza in stats.scadenze_imminenti %}
+                <div style="margin: 10px 0; padding: 10px; border-left: 4px solid #dc2626;">
+                    <strong>{{ scadenza.bando.title }}</strong><br>
+                    <small>⏰ {{ scadenza.days_left }} giorni rimasti</small>
+                </div>
+                {% endfor %}
+            </div>
+            {% else %}
+            <p>✅ Nessuna scadenza imminente nella tua watchlist.</p>
+            {% endif %}
+        </div>
+        
+        <div class="section">
+            <h2>💡 Suggerimento della Settimana</h2>
+            <div style="background: #fef3c7; border: 1px solid #f59e0b; padding: 15px; border-radius: 8px;">
+                <p><strong>🚀 Ottimizza il tuo profilo:</strong> Aggiungi più parole chiave specifiche al tuo profilo per ricevere raccomandazioni AI più precise!</p>
+            </div>
+        </div>
+        
+        <a href="https://innovazionesocialesalernitana.it/dashboard" class="cta-button">
+            🏠 Vai alla Dashboard
+        </a>
+    </div>
+    
+    <div class="footer">
+        <h3>🏛️ ISS - Innovazione Sociale Salernitana</h3>
+        <p>Il primo Hub Bandi AI-powered per il terzo settore</p>
+        <p><a href="https://innovazionesocialesalernitana.it" style="color: #60a5fa;">innovazionesocialesalernitana.it</a></p>
+        <p style="font-size: 12px; margin-top: 10px;">
+            Per disattivare queste email, <a href="#" style="color: #60a5fa;">clicca qui</a>
+        </p>
+    </div>
+</body>
+</html>
+""")
+
+# Invio batch: email per connessione SMTP e connessioni in parallelo
+EMAIL_BATCH_SIZE = 50
+EMAIL_CONCURRENCY = 2
+
+
+@dataclass
+class OutgoingEmail:
+    """Email già renderizzata, pronta per send_batch"""
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+
+
 class EmailNotificationService:
     """Servizio completo per notifiche email agli utenti APS"""
     
@@ -72,80 +251,25 @@ class EmailNotificationService:
             logger.error(f"❌ Errore invio email a {to_email}: {e}")
             return False
     
+    def render_new_bandi_alert(self, user: APSUser, bandi: List[Bando]) -> OutgoingEmail:
+        """Alert per nuovi bandi compatibili con il profilo utente"""
+        return OutgoingEmail(
+            to_email=user.contact_email,
+            subject=f"🎯 {len(bandi)} nuovi bandi per {user.organization_name}",
+            html_content=NEW_BANDI_ALERT_TEMPLATE.render(
+                organization_name=user.organization_name,
+                bandi_count=len(bandi),
+                bandi=bandi
+            )
+        )
+
     async def send_new_bandi_alert(self, user: APSUser, bandi: List[Bando]) -> bool:
         """Invia alert per nuovi bandi compatibili con il profilo utente"""
         if not bandi:
             return False
-        
-        subject = f"🎯 {len(bandi)} nuovi bandi per {user.organization_name}"
-        
-        # Template HTML
-        html_template = Template("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                .header { background: #1e40af; color: white; padding: 20px; text-align: center; }
-                .content { padding: 20px; }
-                .bando { border: 1px solid #e5e7eb; margin: 15px 0; padding: 15px; border-radius: 8px; }
-                .bando-title { color: #1e40af; font-weight: bold; margin-bottom: 8px; }
-                .bando-info { color: #6b7280; font-size: 14px; margin: 5px 0; }
-                .cta-button { background: #1e40af; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 20px 0; }
-                .footer { background: #f9fafb; padding: 15px; text-align: center; color: #6b7280; font-size: 12px; }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🏛️ ISS - Innovazione Sociale Salernitana</h1>
-                <h2>Nuovi Bandi per {{ organization_name }}</h2>
-            </div>
-            
-            <div class="content">
-                <p>Ciao <strong>{{ organization_name }}</strong>,</p>
-                <p>Abbiamo trovato <strong>{{ bandi_count }} nuovi bandi</strong> che potrebbero interessarti:</p>
-                
-                {% for bando in bandi %}
-                <div class="bando">
-                    <div class="bando-title">{{ bando.title }}</div>
-                    <div class="bando-info">🏛️ <strong>Ente:</strong> {{ bando.ente }}</div>
-                    {% if bando.importo %}
-                    <div class="bando-info">💰 <strong>Importo:</strong> {{ bando.importo }}</div>
-                    {% endif %}
-                    {% if bando.scadenza %}
-                    <div class="bando-info">📅 <strong>Scadenza:</strong> {{ bando.scadenza.strftime('%d/%m/%Y') }}</div>
-                    {% endif %}
-                    {% if bando.descrizione %}
-                    <div class="bando-info">📝 {{ bando.descrizione[:200] }}{% if bando.descrizione|length > 200 %}...{% endif %}</div>
-                    {% endif %}
-                </div>
-                {% endfor %}
-                
-                <a href="https://innovazionesocialesalernitana.it/bandi" class="cta-button">
-                    🔍 Visualizza Tutti i Bandi
-                </a>
-                
-                <p>Il nostro sistema AI ha selezionato questi bandi basandosi sul tuo profilo organizzativo. 
-                   Accedi alla piattaforma per vedere le raccomandazioni personalizzate!</p>
-            </div>
-            
-            <div class="footer">
-                <p>Questa email è stata inviata automaticamente dal sistema ISS</p>
-                <p>ISS - Innovazione Sociale Salernitana | Primo Hub Bandi AI-Powered d'Italia</p>
-                <p><a href="https://innovazionesocialesalernitana.it">innovazionesocialesalernitana.it</a></p>
-            </div>
-        </body>
-        </html>
-        """)
-        
-        html_content = html_template.render(
-            organization_name=user.organization_name,
-            bandi_count=len(bandi),
-            bandi=bandi
-        )
-        
-        return await self.send_email(user.contact_email, subject, html_content)
+
+        email = self.render_new_bandi_alert(user, bandi)
+        return await self.send_email(email.to_email, email.subject, email.html_content)
     
     async def send_deadline_reminder(self, user: APSUser, bando: Bando, days_left: int) -> bool:
         """Invia reminder per scadenza bando imminente"""
@@ -226,120 +350,80 @@ class EmailNotificationService:
         
         return await self.send_email(user.contact_email, subject, html_content)
     
+    def render_weekly_newsletter(self, user: APSUser, stats: Dict[str, Any]) -> OutgoingEmail:
+        """Newsletter settimanale con statistiche e nuovi bandi"""
+        return OutgoingEmail(
+            to_email=user.contact_email,
+            subject=f"📊 Newsletter ISS: {stats.get('nuovi_bandi', 0)} nuovi bandi questa settimana",
+            html_content=WEEKLY_NEWSLETTER_TEMPLATE.render(
+                organization_name=user.organization_name,
+                stats=stats
+            )
+        )
+
     async def send_weekly_newsletter(self, user: APSUser, stats: Dict[str, Any]) -> bool:
         """Invia newsletter settimanale con statistiche e nuovi bandi"""
-        subject = f"📊 Newsletter ISS: {stats.get('nuovi_bandi', 0)} nuovi bandi questa settimana"
-        
-        html_template = Template("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-                .header { background: linear-gradient(135deg, #1e40af, #3b82f6); color: white; padding: 30px; text-align: center; }
-                .content { padding: 20px; }
-                .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }
-                .stat-card { background: #f8fafc; border: 1px solid #e2e8f0; padding: 15px; border-radius: 8px; text-align: center; }
-                .stat-value { font-size: 2em; font-weight: bold; color: #1e40af; }
-                .stat-label { color: #64748b; font-size: 14px; }
-                .section { margin: 30px 0; }
-                .bando-list { background: #f9fafb; padding: 15px; border-radius: 8px; }
-                .cta-button { background: #1e40af; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; margin: 20px 0; }
-                .footer { background: #1f2937; color: white; padding: 20px; text-align: center; }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>📊 ISS Weekly Newsletter</h1>
-                <p>La tua dose settimanale di opportunità per {{ organization_name }}</p>
-            </div>
-            
-            <div class="content">
-                <div class="section">
-                    <h2>📈 Statistiche della Settimana</h2>
-                    <div class="stats-grid">
-                        <div class="stat-card">
-                            <div class="stat-value">{{ stats.nuovi_bandi }}</div>
-                            <div class="stat-label">Nuovi Bandi</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-value">{{ stats.totali_attivi }}</div>
-                            <div class="stat-label">Bandi Attivi</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-value">€{{ stats.importo_totale | default('N/A') }}</div>
-                            <div class="stat-label">Importo Disponibile</div>
-                        </div>
-                        <div class="stat-card">
-                            <div class="stat-value">{{ stats.raccomandazioni_ai | default(0) }}</div>
-                            <div class="stat-label">Raccomandazioni AI</div>
-                        </div>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2>🎯 I Tuoi Bandi Raccomandati</h2>
-                    {% if stats.bandi_raccomandati %}
-                    <div class="bando-list">
-                        {% for bando in stats.bandi_raccomandati %}
-                        <div style="margin: 10px 0; padding: 10px; border-left: 4px solid #1e40af;">
-                            <strong>{{ bando.title }}</strong><br>
-                            <small>{{ bando.ente }} • {{ bando.importo if bando.importo else 'Importo non specificato' }}</small>
-                        </div>
-                        {% endfor %}
-                    </div>
-                    {% else %}
-                    <p>🤖 Il nostro AI sta analizzando i nuovi bandi per generare raccomandazioni personalizzate.</p>
-                    {% endif %}
-                </div>
-                
-                <div class="section">
-                    <h2>📅 Scadenze Imminenti</h2>
-                    {% if stats.scadenze_imminenti %}
-                    <div class="bando-list">
-                        {% for scadenza in stats.scadenze_imminenti %}
-                        <div style="margin: 10px 0; padding: 10px; border-left: 4px solid #dc2626;">
-                            <strong>{{ scadenza.bando.title }}</strong><br>
-                            <small>⏰ {{ scadenza.days_left }} giorni rimasti</small>
-                        </div>
-                        {% endfor %}
-                    </div>
-                    {% else %}
-                    <p>✅ Nessuna scadenza imminente nella tua watchlist.</p>
-                    {% endif %}
-                </div>
-                
-                <div class="section">
-                    <h2>💡 Suggerimento della Settimana</h2>
-                    <div style="background: #fef3c7; border: 1px solid #f59e0b; padding: 15px; border-radius: 8px;">
-                        <p><strong>🚀 Ottimizza il tuo profilo:</strong> Aggiungi più parole chiave specifiche al tuo profilo per ricevere raccomandazioni AI più precise!</p>
-                    </div>
-                </div>
-                
-                <a href="https://innovazionesocialesalernitana.it/dashboard" class="cta-button">
-                    🏠 Vai alla Dashboard
-                </a>
-            </div>
-            
-            <div class="footer">
-                <h3>🏛️ ISS - Innovazione Sociale Salernitana</h3>
-                <p>Il primo Hub Bandi AI-powered per il terzo settore</p>
-                <p><a href="https://innovazionesocialesalernitana.it" style="color: #60a5fa;">innovazionesocialesalernitana.it</a></p>
-                <p style="font-size: 12px; margin-top: 10px;">
-                    Per disattivare queste email, <a href="#" style="color: #60a5fa;">clicca qui</a>
-                </p>
-            </div>
-        </body>
-        </html>
-        """)
-        
-        html_content = html_template.render(
-            organization_name=user.organization_name,
-            stats=stats
-        )
-        
-        return await self.send_email(user.contact_email, subject, html_content)
+        email = self.render_weekly_newsletter(user, stats)
+        return await self.send_email(email.to_email, email.subject, email.html_content)
+
+    async def send_batch(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """
+        Invia molte email riusando le connessioni SMTP: EMAIL_BATCH_SIZE
+        email per connessione, EMAIL_CONCURRENCY connessioni in parallelo,
+        in thread separati per non bloccare l'event loop.
+
+        Returns:
+            Esito per ogni email, nello stesso ordine
+        """
+        if not emails:
+            return []
+        if not self.enabled:
+            logger.info(f"📧 Email service disabled - would send {len(emails)} emails")
+            return [False] * len(emails)
+
+        semaphore = asyncio.Semaphore(EMAIL_CONCURRENCY)
+        chunks = [emails[i:i + EMAIL_BATCH_SIZE] for i in range(0, len(emails), EMAIL_BATCH_SIZE)]
+
+        async def send_chunk(chunk: List[OutgoingEmail]) -> List[bool]:
+            async with semaphore:
+                return await asyncio.to_thread(self._send_chunk, chunk)
+
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        outcome = [ok for chunk_result in results for ok in chunk_result]
+        logger.info(f"📧 Batch inviato: {sum(outcome)}/{len(emails)} email")
+        return outcome
+
+    def _send_chunk(self, chunk: List[OutgoingEmail]) -> List[bool]:
+        """Invia un gruppo di email su una sola connessione SMTP (sincrono, gira in un thread)"""
+        outcome = []
+        try:
+            context = ssl.create_default_context()
+            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                server.starttls(context=context)
+                server.login(self.smtp_username, self.smtp_password)
+
+                for email in chunk:
+                    try:
+                        server.sendmail(self.from_email, email.to_email, self._build_message(email).as_string())
+                        outcome.append(True)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                        logger.error(f"❌ Errore invio email a {email.to_email}: {e}")
+                        outcome.append(False)
+        except Exception as e:
+            logger.error(f"❌ Errore connessione SMTP per batch: {e}")
+        # Email non tentate per errore di connessione: fallite
+        return outcome + [False] * (len(chunk) - len(outcome))
+
+    def _build_message(self, email: OutgoingEmail) -> MIMEMultipart:
+        message = MIMEMultipart("alternative")
+        message["Subject"] = email.subject
+        message["From"] = self.from_email
+        message["To"] = email.to_email
+
+        if email.text_content:
+            message.attach(MIMEText(email.text_content, "plain"))
+        message.attach(MIMEText(email.html_content, "html"))
+        return message
     
     async def send_bulk_notifications(self, db: AsyncSession, notification_type: str, **kwargs) -> Dict[str, int]:
         """Invia notifiche bulk a tutti gli utenti attivi"""
@@ -1,149 +1,208 @@
+import asyncio
 import httpx
 import logging
+from typing import Optional
 from app.core.config import settings
-import json
 
 logger = logging.getLogger(__name__)
 
+
+class EmbeddingError(Exception):
+    """Embedding non disponibile: nessun vettore viene scritto nell'indice."""
+
+
+class RAGUnavailableError(Exception):
+    """Knowledge base non interrogabile (Chroma, collection o embedding non disponibili)."""
+
+
 class RAGService:
+    """
+    Knowledge base ISS su ChromaDB (API v2) con embedding Ollama.
+
+    - un solo httpx.AsyncClient con pool di connessioni, condiviso da
+      Chroma e Ollama (niente client sincroni nel loop)
+    - ID della collection risolto una volta (get_or_create) e tenuto in cache
+    - embedding in batch (`/api/embed`) con un modello dedicato, batch
+      inviati in parallelo fino a `embedding_concurrency`
+    - se l'embedding fallisce non si scrivono vettori a zero: add solleva
+      EmbeddingError, query solleva RAGUnavailableError (un contesto vuoto
+      non viene scambiato per "nessun documento rilevante")
+    - una collection indicizzata con un altro modello (o senza modello
+      registrato) viene rifiutata invece di restituire risultati casuali
+    """
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(RAGService, cls).__new__(cls)
             cls._instance._initialized = False
         return cls._instance
-    
+
     def __init__(self):
         if self._initialized:
             return
-            
-        self.base_url = "http://central-chromadb:8000/api/v2"
+
+        self.base_url = f"{settings.chroma_url.rstrip('/')}/api/v2"
         self.tenant = "default_tenant"
         self.database = "default_database"
         self.api_root = f"{self.base_url}/tenants/{self.tenant}/databases/{self.database}"
-        
-        self.ollama_url = "http://central-ollama:11434/api/embeddings"
-        self.collection_name = "iss_knowledge_base"
+
+        self.ollama_url = f"http://{settings.ollama_host}:{settings.ollama_port}/api/embed"
+        self.embedding_model = settings.ollama_embedding_model
+        self.batch_size = max(1, settings.embedding_batch_size)
+        self.collection_name = settings.rag_collection_name
         self.collection_id = None
-        
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._collection_lock = asyncio.Lock()
+        self._embed_semaphore = asyncio.Semaphore(max(1, settings.embedding_concurrency))
+
         self._initialized = True
-        logger.info(f"🔌 RAG Service Initialized (HTTP V2 Mode). API Root: {self.api_root}")
+        logger.info(f"🔌 RAG Service Initialized (HTTP V2 Mode). API Root: {self.api_root}, embeddings: {self.embedding_model}")
 
-    async def _get_embeddings(self, texts: list[str]) -> list[list[float]]:
-        """Get embeddings from Ollama"""
-        embeddings = []
-        async with httpx.AsyncClient() as client:
-            for text in texts:
-                try:
-                    response = await client.post(self.ollama_url, json={
-                        "model": "llama3.2:3b",
-                        "prompt": text
-                    }, timeout=60.0)
-                    if response.status_code == 200:
-                        embeddings.append(response.json()["embedding"])
-                    else:
-                        logger.error(f"Ollama embedding failed: {response.text}")
-                        embeddings.append([0.0]*1024) 
-                except Exception as e:
-                    logger.error(f"Embedding error: {e}")
-                    embeddings.append([0.0]*1024)
-        return embeddings
-        
-    def _get_embeddings_sync(self, texts: list[str]) -> list[list[float]]:
-        """Sync version for ingestion script"""
-        embeddings = []
-        with httpx.Client() as client:
-            for text in texts:
-                try:
-                    response = client.post(self.ollama_url, json={
-                        "model": "llama3.2:3b",
-                        "prompt": text
-                    }, timeout=60.0)
-                    if response.status_code == 200:
-                        embeddings.append(response.json()["embedding"])
-                    else:
-                        embeddings.append([])
-                except Exception as e:
-                    logger.error(f"Embedding error: {e}")
-                    embeddings.append([])
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Chiude il pool HTTP (shutdown dell'app / fine script)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    # ------------------------------------------------------------------
+    # Embeddings
+    # ------------------------------------------------------------------
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        async with self._embed_semaphore:
+            try:
+                response = await self.client.post(self.ollama_url, json={
+                    "model": self.embedding_model,
+                    "input": texts
+                })
+            except httpx.HTTPError as e:
+                raise EmbeddingError(f"Ollama unreachable: {e}") from e
+
+        if response.status_code != 200:
+            raise EmbeddingError(f"Ollama embedding failed ({response.status_code}): {response.text[:200]}")
+
+        embeddings = response.json().get("embeddings") or []
+        if len(embeddings) != len(texts) or not all(embeddings):
+            raise EmbeddingError(f"Ollama returned {len(embeddings)} embeddings for {len(texts)} texts")
         return embeddings
 
-    def _ensure_collection(self):
-        """Get or create collection ID using V2 paths"""
+    async def _get_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Embedding di `texts` in batch concorrenti; solleva EmbeddingError se un batch fallisce."""
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._embed_batch(batch) for batch in batches))
+        return [embedding for batch in results for embedding in batch]
+
+    # ------------------------------------------------------------------
+    # Chroma
+    # ------------------------------------------------------------------
+
+    async def _ensure_collection(self):
+        """Get or create collection ID using V2 paths (cached)"""
         if self.collection_id:
             return self.collection_id
-            
-        try:
-            with httpx.Client() as client:
-                # List collections
-                resp = client.get(f"{self.api_root}/collections")
-                
-                if resp.status_code == 200:
-                    cols = resp.json()
-                    for col in cols:
-                        if col['name'] == self.collection_name:
-                            self.collection_id = col['id']
-                            return self.collection_id
-                
-                # Create if not exists
-                resp = client.post(f"{self.api_root}/collections", json={
+
+        async with self._collection_lock:
+            if self.collection_id:
+                return self.collection_id
+
+            try:
+                resp = await self.client.post(f"{self.api_root}/collections", json={
                     "name": self.collection_name,
-                    "metadata": {"hnsw:space": "cosine"}
+                    "metadata": {"hnsw:space": "cosine", "embedding_model": self.embedding_model},
+                    "get_or_create": True
                 })
-                if resp.status_code == 200:
-                    self.collection_id = resp.json()['id']
-                    return self.collection_id
-                else:
-                    logger.error(f"Failed to create collection: {resp.text}")
-        except Exception as e:
-            logger.error(f"Chroma connection error: {e}")
-        return None
-
-    def add_documents(self, documents: list[str], metadatas: list[dict], ids: list[str]):
+            except httpx.HTTPError as e:
+                logger.error(f"Chroma connection error: {e}")
+                return None
+
+            if resp.status_code != 200:
+                logger.error(f"Failed to get/create collection: {resp.text}")
+                return None
+
+            collection = resp.json()
+            # Una collection senza embedding_model è stata creata prima che il
+            # modello venisse registrato: i vettori non sono confrontabili
+            indexed_with = (collection.get("metadata") or {}).get("embedding_model")
+            if indexed_with != self.embedding_model:
+                logger.error(
+                    f"Collection '{self.collection_name}' was indexed with '{indexed_with or 'unknown model'}', "
+                    f"configured model is '{self.embedding_model}': refusing to use it. Re-ingest with "
+                    f"scripts/ingest_docs.py into a new collection (RAG_COLLECTION) or delete it"
+                )
+                return None
+            self.collection_id = collection["id"]
+            return self.collection_id
+
+    async def add_documents(self, documents: list[str], metadatas: list[dict], ids: list[str]):
         """Add documents via V2 /add endpoint"""
-        col_id = self._ensure_collection()
-        if not col_id:
-            logger.error("Could not get collection ID")
+        if not documents:
             return
-            
-        embeddings = self._get_embeddings_sync(documents)
-        
+
+        col_id = await self._ensure_collection()
+        if not col_id:
+            raise RuntimeError("Could not get collection ID")
+
+        # EmbeddingError propagates: better to skip the chunk than index zero vectors
+        embeddings = await self._get_embeddings(documents)
+
         payload = {
             "ids": ids,
             "embeddings": embeddings,
             "metadatas": metadatas,
             "documents": documents
         }
-        
-        try:
-            with httpx.Client() as client:
-                resp = client.post(f"{self.api_root}/collections/{col_id}/add", json=payload)
-                if resp.status_code not in [200, 201]:
-                     logger.error(f"Failed to add docs: {resp.text}")
-        except Exception as e:
-            logger.error(f"Add docs error: {e}")
+
+        resp = await self.client.post(f"{self.api_root}/collections/{col_id}/add", json=payload)
+        if resp.status_code == 404:
+            self.collection_id = None
+        if resp.status_code not in [200, 201]:
+            raise RuntimeError(f"Failed to add docs: {resp.text}")
 
     async def query(self, query_text: str, n_results: int = 3):
-        """Query via V2 /query endpoint"""
-        col_id = self._ensure_collection()
+        """
+        Query via V2 /query endpoint.
+
+        Raises:
+            RAGUnavailableError: collection, embedding o query non disponibili
+        """
+        col_id = await self._ensure_collection()
         if not col_id:
-            return {}
-            
-        embeddings = await self._get_embeddings([query_text])
-        if not embeddings or not embeddings[0]:
-            return {}
-            
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "query_embeddings": embeddings,
-                "n_results": n_results
-            }
-            resp = await client.post(f"{self.api_root}/collections/{col_id}/query", json=payload)
-            if resp.status_code == 200:
-                return resp.json()
-            else:
-                logger.error(f"Query failed: {resp.text}")
-                return {}
+            raise RAGUnavailableError(f"Collection '{self.collection_name}' not available")
+
+        try:
+            embeddings = await self._get_embeddings([query_text])
+        except EmbeddingError as e:
+            logger.error(f"RAG query embedding failed: {e}")
+            raise RAGUnavailableError(f"Query embedding failed: {e}") from e
+
+        payload = {
+            "query_embeddings": embeddings,
+            "n_results": n_results
+        }
+        try:
+            resp = await self.client.post(f"{self.api_root}/collections/{col_id}/query", json=payload)
+        except httpx.HTTPError as e:
+            logger.error(f"Chroma query error: {e}")
+            raise RAGUnavailableError(f"Chroma query error: {e}") from e
+
+        if resp.status_code == 200:
+            return resp.json()
+        if resp.status_code == 404:
+            # Collection ricreata/eliminata: risolvi di nuovo l'ID alla prossima chiamata
+            self.collection_id = None
+        logger.error(f"Query failed: {resp.text}")
+        raise RAGUnavailableError(f"Chroma query failed ({resp.status_code})")
+
 
 rag_service = RAGService()
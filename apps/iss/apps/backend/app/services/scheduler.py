@@ -78,6 +78,16 @@ class BandoSchedulerService:
                 max_instances=1
             )
 
+            # 🎯 Job recupero scoring: bandi modificati o score di una versione precedente
+            self.scheduler.add_job(
+                func=self._score_pending_bandi,
+                trigger=IntervalTrigger(hours=1),
+                id='bandi_match_scoring',
+                name='Scoring bandi in attesa',
+                replace_existing=True,
+                max_instances=1
+            )
+
             # Job di pulizia giornaliera (alle 02:00)
             self.scheduler.add_job(
                 func=self._daily_cleanup,
@@ -234,6 +244,20 @@ class BandoSchedulerService:
             except Exception as e:
                 logger.error(f"Errore pulizia automatica: {e}")
 
+    async def _score_pending_bandi(self):
+        """Calcola lo score dei bandi senza score aggiornato"""
+        if not settings.match_scoring:
+            return
+
+        try:
+            from app.services.scoring_service import scoring_service
+
+            updated = await scoring_service.score_pending()
+            if updated:
+                logger.info(f"🎯 Scoring periodico: {updated} bandi aggiornati")
+        except Exception as e:
+            logger.error(f"❌ Errore scoring bandi: {e}")
+
     def add_custom_job(
         self,
         func,
@@ -0,0 +1,290 @@
+"""
+Pipeline di scoring dei bandi rispetto al profilo dell'associazione.
+
+Lo score usato da /best-matches viene calcolato in background subito dopo
+l'ingestione (monitoraggio e AI agent) e da un job periodico di recupero,
+mai durante la richiesta:
+- più bandi per prompt (SCORING_BATCH_SIZE), batch in parallelo fino a
+  SCORING_CONCURRENCY per non saturare Ollama
+- ogni bando salva `ai_score_version` (modello + profilo + prompt): se uno
+  dei tre cambia, tutti gli score diventano da ricalcolare
+- un bando modificato (titolo, descrizione, ...) perde la versione e viene
+  ricalcolato al giro successivo
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import or_, select, update
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump quando cambia il prompt di scoring: invalida tutti gli score salvati
+SCORING_PROMPT_VERSION = "1"
+BANDO_TEXT_LIMIT = 1500
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODEL = "llama-3.1-8b-instant"
+
+ScoredCallback = Callable[[Dict[int, Dict[str, Any]]], Awaitable[None]]
+
+
+class ScoringError(Exception):
+    """Nessun LLM ha prodotto una risposta valida per il batch."""
+
+
+class BandoScoringService:
+    """
+    Calcola `ai_score`, `ai_reasoning` e punti di forza/debolezza dei bandi.
+
+    Usage:
+        await scoring_service.score_pending()            # tutti i bandi da (ri)calcolare
+        await scoring_service.score_pending([12, 13])    # solo i bandi appena salvati
+    """
+
+    def __init__(self):
+        self.ollama_url = f"http://{settings.ollama_host}:{settings.ollama_port}/api/generate"
+        self.ollama_model = settings.ollama_model
+        self.groq_api_key = settings.groq_api_key
+        self.batch_size = max(1, settings.scoring_batch_size)
+        self.concurrency = max(1, settings.scoring_concurrency)
+        self._inflight: set = set()
+
+    def score_version(self, association_profile: str) -> str:
+        """Versione dello score: cambia con modello, profilo o prompt."""
+        model = self.ollama_model if settings.use_ollama else GROQ_MODEL
+        digest = hashlib.sha256(
+            f"{model}\x00{SCORING_PROMPT_VERSION}\x00{association_profile}".encode("utf-8")
+        ).hexdigest()
+        return f"v{SCORING_PROMPT_VERSION}-{digest[:16]}"
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    async def score_pending(self, bando_ids: Optional[List[int]] = None, association_profile: Optional[str] = None) -> int:
+        """
+        Calcola lo score dei bandi attivi senza score o con versione diversa
+        da quella corrente (limitati a `bando_ids` se indicati).
+
+        Returns:
+            Numero di bandi aggiornati
+        """
+        from app.database.database import async_session_maker
+        from app.models.bando import Bando, BandoStatus
+        from app.services.analyst_service import bando_analysis_text
+        from app.services.match_service import ISS_PROFILE
+
+        profile = association_profile or ISS_PROFILE
+        version = self.score_version(profile)
+
+        query = select(Bando).where(
+            Bando.status == BandoStatus.ATTIVO,
+            or_(Bando.ai_score_version.is_(None), Bando.ai_score_version != version)
+        ).order_by(Bando.data_trovato.desc())
+        if bando_ids is not None:
+            if not bando_ids:
+                return 0
+            query = query.where(Bando.id.in_(bando_ids))
+
+        async with async_session_maker() as db:
+            bandi = (await db.execute(query)).scalars().all()
+            # Bandi già in lavorazione da un'altra esecuzione (monitor + job periodico)
+            items = [(b.id, bando_analysis_text(b)) for b in bandi if b.id not in self._inflight]
+
+        if not items:
+            return 0
+
+        ids = {bando_id for bando_id, _ in items}
+        self._inflight |= ids
+        updated = 0
+
+        async def save(results: Dict[int, Dict[str, Any]]):
+            nonlocal updated
+            now = datetime.now(timezone.utc)
+            rows = [
+                {
+                    "id": bando_id,
+                    "ai_score": result["score"],
+                    "ai_reasoning": result["reasoning"],
+                    "ai_match_details": {
+                        "strengths": result["strengths"],
+                        "weaknesses": result["weaknesses"],
+                    },
+                    "ai_score_version": version,
+                    "ai_scored_at": now,
+                }
+                for bando_id, result in results.items()
+            ]
+            async with async_session_maker() as db:
+                await db.execute(update(Bando), rows)
+                await db.commit()
+            updated += len(rows)
+
+        try:
+            logger.info(f"🎯 Scoring {len(items)} bandi (batch da {self.batch_size}, {self.concurrency} worker)")
+            await self.score_texts(items, profile, on_scored=save)
+        finally:
+            self._inflight -= ids
+
+        logger.info(f"🎯 Scoring completato: {updated}/{len(items)} bandi aggiornati")
+        return updated
+
+    async def score_texts(
+        self,
+        items: List[Tuple[int, str]],
+        association_profile: str,
+        on_scored: Optional[ScoredCallback] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Score di `items` [(id, testo)] in batch da `batch_size` su un pool di
+        `concurrency` worker. `on_scored` riceve i risultati di ogni batch
+        appena pronti, così un errore a metà non perde il lavoro già fatto.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        scored: Dict[int, Dict[str, Any]] = {}
+
+        async with httpx.AsyncClient(timeout=httpx.Timeout(180.0, connect=5.0)) as client:
+
+            async def run(batch: List[Tuple[int, str]]):
+                async with semaphore:
+                    results = await self._score_batch(client, batch, association_profile)
+                if results:
+                    scored.update(results)
+                    if on_scored is not None:
+                        await on_scored(results)
+
+            batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+            await asyncio.gather(*(run(batch) for batch in batches))
+
+        return scored
+
+    async def _score_batch(self, client: httpx.AsyncClient, batch: List[Tuple[int, str]], association_profile: str) -> Dict[int, Dict[str, Any]]:
+        try:
+            data = await self._complete(client, self._build_prompt(batch, association_profile))
+        except ScoringError as e:
+            logger.error(f"Scoring batch {[bando_id for bando_id, _ in batch]} failed: {e}")
+            return {}
+
+        results = self._parse_results(data, [bando_id for bando_id, _ in batch])
+
+        # Il modello a volte salta qualche bando del batch: riprova quelli da soli
+        missing = [item for item in batch if item[0] not in results]
+        if missing and len(batch) > 1:
+            logger.warning(f"Scoring batch missed bandi {[bando_id for bando_id, _ in missing]}, retrying one by one")
+            for item in missing:
+                results.update(await self._score_batch(client, [item], association_profile))
+        return results
+
+    # ------------------------------------------------------------------
+    # Prompt / LLM
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _build_prompt(batch: List[Tuple[int, str]], association_profile: str) -> str:
+        bandi = "\n\n".join(
+            f"[BANDO ID {bando_id}]\n{text[:BANDO_TEXT_LIMIT]}" for bando_id, text in batch
+        )
+        return f"""Sei un esperto di fundraising per il terzo settore in Italia.
+
+--- PROFILO ASSOCIAZIONE ---
+{association_profile}
+
+--- BANDI ---
+{bandi}
+
+--- TASK ---
+Valuta quanto ciascun bando è adatto all'associazione.
+Assegna a ogni bando un punteggio da 0 a 100.
+0 = Completamente fuori target
+100 = Bando perfetto
+
+Rispondi SOLO in JSON, con un elemento per ogni BANDO ID:
+{{
+    "results": [
+        {{
+            "id": <BANDO ID>,
+            "score": <numero 0-100>,
+            "reasoning": "<breve spiegazione discorsiva>",
+            "strengths": ["<punto di forza 1>", "<punto di forza 2>"],
+            "weaknesses": ["<punto debole 1>", "<punto debole 2>"]
+        }}
+    ]
+}}
+"""
+
+    @staticmethod
+    def _parse_results(data: Any, expected_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Normalizza la risposta del modello; scarta ID sconosciuti e voci malformate."""
+        if isinstance(data, dict):
+            if "score" in data and len(expected_ids) == 1:
+                data = [{"id": expected_ids[0], **data}]
+            else:
+                data = next((v for v in data.values() if isinstance(v, list)), [])
+        if not isinstance(data, list):
+            return {}
+
+        expected = set(expected_ids)
+        results: Dict[int, Dict[str, Any]] = {}
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                bando_id = int(entry.get("id"))
+                score = int(float(entry.get("score")))
+            except (TypeError, ValueError):
+                continue
+            if bando_id not in expected:
+                continue
+            results[bando_id] = {
+                "score": max(0, min(100, score)),
+                "reasoning": str(entry.get("reasoning") or ""),
+                "strengths": [str(s) for s in entry.get("strengths") or []],
+                "weaknesses": [str(w) for w in entry.get("weaknesses") or []],
+            }
+        return results
+
+    async def _complete(self, client: httpx.AsyncClient, prompt: str) -> Any:
+        """JSON dal modello: Ollama, con fallback su Groq (come analyze_match)."""
+        errors = []
+
+        if settings.use_ollama:
+            try:
+                resp = await client.post(self.ollama_url, json={
+                    "model": self.ollama_model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "format": "json"
+                })
+                if resp.status_code == 200:
+                    return json.loads(resp.json().get("response", ""))
+                errors.append(f"Ollama {resp.status_code}")
+            except (httpx.HTTPError, ValueError) as e:
+                errors.append(f"Ollama: {e}")
+
+        if self.groq_api_key:
+            try:
+                resp = await client.post(GROQ_URL, json={
+                    "model": GROQ_MODEL,
+                    "messages": [
+                        {"role": "system", "content": "Rispondi sempre in JSON valido."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "response_format": {"type": "json_object"}
+                }, headers={"Authorization": f"Bearer {self.groq_api_key}"})
+                if resp.status_code == 200:
+                    return json.loads(resp.json()["choices"][0]["message"]["content"])
+                errors.append(f"Groq {resp.status_code}")
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                errors.append(f"Groq: {e}")
+
+        raise ScoringError("; ".join(errors) or "no LLM provider configured")
+
+
+scoring_service = BandoScoringService()
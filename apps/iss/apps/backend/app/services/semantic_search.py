@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import json
 import pickle
 import os
+import hashlib
 from datetime import datetime
 
 from app.core.config import settings
@@ -26,8 +27,12 @@ class SemanticSearchService:
     def __init__(self):
         # Configurazione Ollama per Embedding
         self.ollama_url = f"http://{settings.ollama_host}:{settings.ollama_port}/api/embeddings"
+        self.ollama_batch_url = f"http://{settings.ollama_host}:{settings.ollama_port}/api/embed"
         self.model_name = "all-minilm" # Leggero e veloce
+        self.batch_size = 64
         self.bando_embeddings = {}
+        # Vettori dei profili utente, per hash del testo del profilo
+        self.profile_embeddings: Dict[str, List[float]] = {}
         
         # Cache locale per embedding
         cache_dir = os.path.expanduser("~/.cache")
@@ -63,6 +68,114 @@ class SemanticSearchService:
             logger.error(f"❌ Errore chiamata Ollama Embedding: {e}")
         return None
 
+    async def _get_embeddings_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embedding di più testi per richiesta (`/api/embed`); None se Ollama non risponde."""
+        embeddings: List[List[float]] = []
+        try:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                for i in range(0, len(texts), self.batch_size):
+                    batch = texts[i:i + self.batch_size]
+                    response = await client.post(
+                        self.ollama_batch_url,
+                        json={"model": self.model_name, "input": batch}
+                    )
+                    if response.status_code != 200:
+                        logger.error(f"❌ Errore Ollama Embedding batch: {response.status_code}")
+                        return None
+                    vectors = response.json().get("embeddings") or []
+                    if len(vectors) != len(batch):
+                        logger.error(f"❌ Ollama ha restituito {len(vectors)} embedding per {len(batch)} testi")
+                        return None
+                    embeddings.extend(vectors)
+        except Exception as e:
+            logger.error(f"❌ Errore chiamata Ollama Embedding batch: {e}")
+            return None
+        return embeddings
+
+    @staticmethod
+    def profile_text(profile: Dict) -> str:
+        """Testo del profilo utente usato per l'embedding"""
+        parts = []
+        if profile.get('organization_type'): parts.append(f"organizzazione {profile['organization_type']}")
+        if profile.get('sectors'): parts.append(f"settori: {', '.join(profile['sectors'])}")
+        if profile.get('target_groups'): parts.append(f"destinatari: {', '.join(profile['target_groups'])}")
+        if profile.get('keywords'): parts.append(f"interesse: {', '.join(profile['keywords'])}")
+        if profile.get('geographical_scope'): parts.append(f"area: {profile['geographical_scope']}")
+        if profile.get('description'): parts.append(profile['description'])
+        return " ".join(parts)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    async def _profile_matrix(self, profile_texts: List[str]) -> Optional[np.ndarray]:
+        """Vettori dei profili (righe normalizzate); calcola in batch solo quelli non in cache."""
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in profile_texts]
+        missing = {key: text for key, text in zip(keys, profile_texts) if key not in self.profile_embeddings}
+        if missing:
+            vectors = await self._get_embeddings_batch(list(missing.values()))
+            if vectors is None:
+                return None
+            self.profile_embeddings.update(zip(missing.keys(), vectors))
+            await self._save_embeddings_cache()
+        return self._normalize(np.array([self.profile_embeddings[key] for key in keys], dtype=np.float32))
+
+    async def _bando_matrix(self, bandi: List[Bando]) -> Optional[np.ndarray]:
+        """Vettori dei bandi (righe normalizzate), riusando il cache degli embedding."""
+        missing = [b for b in bandi if b.id not in self.bando_embeddings]
+        if missing:
+            vectors = await self._get_embeddings_batch([self._prepare_bando_text(b) for b in missing])
+            if vectors is None:
+                return None
+            self.bando_embeddings.update((b.id, v) for b, v in zip(missing, vectors))
+            await self._save_embeddings_cache()
+        return self._normalize(np.array([self.bando_embeddings[b.id] for b in bandi], dtype=np.float32))
+
+    async def match_profiles_to_bandi(
+        self,
+        profiles: List[Dict],
+        bandi: List[Bando],
+        limit: int = 5,
+        threshold: float = 0.3
+    ) -> Optional[List[List[Tuple[Bando, float]]]]:
+        """
+        Abbina tutti i profili a tutti i bandi con una sola moltiplicazione
+        di matrici (profili x bandi, cosine similarity).
+
+        Returns:
+            Per ogni profilo (stesso ordine) i bandi sopra soglia, max `limit`,
+            ordinati per similarità; None se gli embedding non sono disponibili.
+        """
+        if not profiles or not bandi:
+            return [[] for _ in profiles]
+
+        if not self.bando_embeddings and not self.profile_embeddings:
+            await self._load_cached_embeddings()
+
+        profile_matrix = await self._profile_matrix([self.profile_text(p) for p in profiles])
+        bando_matrix = await self._bando_matrix(bandi)
+        if profile_matrix is None or bando_matrix is None:
+            return None
+        if profile_matrix.shape[1] != bando_matrix.shape[1]:
+            logger.error("❌ Embedding profili e bandi di dimensioni diverse: rigenerare il cache")
+            return None
+
+        scores = profile_matrix @ bando_matrix.T
+        k = min(limit, len(bandi))
+        # Top-k per riga senza ordinare tutta la matrice
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+        results = []
+        for row, candidates in enumerate(top):
+            ranked = sorted(candidates, key=lambda col: scores[row, col], reverse=True)
+            results.append([
+                (bandi[col], float(scores[row, col]))
+                for col in ranked if scores[row, col] >= threshold
+            ])
+        return results
+
     def _prepare_bando_text(self, bando: Bando) -> str:
         """Prepara il testo del bando per l'embedding"""
         text_parts = []
@@ -191,6 +304,7 @@ class SemanticSearchService:
                 with open(self.embeddings_cache_file, 'rb') as f:
                     cache_data = pickle.load(f)
                     self.bando_embeddings = cache_data.get('embeddings', {})
+                    self.profile_embeddings = cache_data.get('profile_embeddings', {})
                     self.last_update = cache_data.get('last_update')
         except Exception as e:
             logger.warning(f"⚠️ Errore caricamento cache embedding: {e}")
@@ -198,7 +312,11 @@ class SemanticSearchService:
     async def _save_embeddings_cache(self):
         try:
             with open(self.embeddings_cache_file, 'wb') as f:
-                pickle.dump({'embeddings': self.bando_embeddings, 'last_update': datetime.now()}, f)
+                pickle.dump({
+                    'embeddings': self.bando_embeddings,
+                    'profile_embeddings': self.profile_embeddings,
+                    'last_update': datetime.now()
+                }, f)
         except Exception as e:
             logger.warning(f"⚠️ Errore salvataggio cache embedding: {e}")
 
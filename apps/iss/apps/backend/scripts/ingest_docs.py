@@ -1,4 +1,5 @@
 
+import asyncio
 import os
 import sys
 import glob
@@ -28,11 +29,12 @@ def chunk_text(text, chunk_size=1000, overlap=200):
         start += (chunk_size - overlap)
     return chunks
 
-def ingest_docs():
+async def ingest_docs():
     logger.info(f"📂 Reading docs from: {DOCS_DIR}")
     files = glob.glob(os.path.join(DOCS_DIR, "*.md"))
     
     total_chunks = 0
+    failed_files = []
     
     for filepath in files:
         filename = os.path.basename(filepath)
@@ -46,14 +48,22 @@ def ingest_docs():
         ids = [f"{filename}_{i}" for i in range(len(chunks))]
         metadatas = [{"source": filename, "category": "operational"} for _ in range(len(chunks))]
         
-        rag_service.add_documents(
-            documents=chunks,
-            metadatas=metadatas,
-            ids=ids
-        )
+        try:
+            await rag_service.add_documents(
+                documents=chunks,
+                metadatas=metadatas,
+                ids=ids
+            )
+        except Exception as e:
+            logger.error(f"❌ Skipped {filename}: {e}")
+            failed_files.append(filename)
+            continue
         total_chunks += len(chunks)
         
+    await rag_service.aclose()
     logger.info(f"✅ Ingestion Complete! Added {total_chunks} chunks to ChromaDB.")
+    if failed_files:
+        logger.warning(f"⚠️ {len(failed_files)} files not indexed: {', '.join(failed_files)}")
 
 if __name__ == "__main__":
-    ingest_docs()
+    asyncio.run(ingest_docs())
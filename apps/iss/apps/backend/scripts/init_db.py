@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from sqlalchemy import text
 from app.database.database import engine, Base
 from app.models.admin import AdminUser
+from app.models.bando import UNACCENT_EXTENSION_SQL, UNACCENT_FUNCTION_SQL, SEARCH_VECTOR_SQL
 from app.core.security import get_password_hash
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import async_session_maker
@@ -29,6 +30,28 @@ async def init_database():
         logger.info("✅ Tabelle create con successo")
 
 
+# create_all non modifica tabelle esistenti: colonne/indici aggiunti dopo
+SCHEMA_UPGRADES = [
+    "ALTER TABLE bandi ADD COLUMN IF NOT EXISTS deep_analysis JSON",
+    "ALTER TABLE bandi ADD COLUMN IF NOT EXISTS ai_match_details JSON",
+    "ALTER TABLE bandi ADD COLUMN IF NOT EXISTS ai_score_version VARCHAR(64)",
+    "ALTER TABLE bandi ADD COLUMN IF NOT EXISTS ai_scored_at TIMESTAMP WITH TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_bandi_status_score_trovato ON bandi (status, ai_score, data_trovato)",
+    UNACCENT_EXTENSION_SQL,
+    UNACCENT_FUNCTION_SQL,
+    f"ALTER TABLE bandi ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_bandi_search_vector ON bandi USING gin (search_vector)",
+]
+
+
+async def upgrade_schema():
+    """Applica le modifiche di schema idempotenti alle tabelle esistenti"""
+    async with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
+    logger.info("✅ Schema aggiornato")
+
+
 async def create_admin_user(username: str = "admin", password: str = "admin123"):
     """Crea utente amministratore di default"""
     async with async_session_maker() as session:
@@ -69,6 +92,7 @@ async def main():
     
     # Inizializza database
     await init_database()
+    await upgrade_schema()
     
     # Crea utente admin
     await create_admin_user()
@@ -0,0 +1,106 @@
+"""
+Test per il matching batch utenti/bandi degli alert
+"""
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.aps_user import APSUser
+from app.services import alert_system
+from app.services.alert_system import BandoAlertSystem
+from app.services.semantic_search import SemanticSearchService
+
+
+def _bando(bando_id, title):
+    return SimpleNamespace(id=bando_id, title=title, descrizione=None, ente="Ente", categoria=None)
+
+
+@pytest.fixture
+def search_service(tmp_path):
+    service = SemanticSearchService()
+    service.embeddings_cache_file = str(tmp_path / "embeddings.pkl")
+    return service
+
+
+class TestMatchProfilesToBandi:
+    """Test per la moltiplicazione profili x bandi e il cache dei profili."""
+
+    @pytest.mark.asyncio
+    async def test_all_profiles_scored_in_one_pass(self, search_service):
+        """Ogni profilo riceve i bandi sopra soglia, ordinati per similarità."""
+        bandi = [_bando(1, "digitale"), _bando(2, "sport"), _bando(3, "anziani")]
+        search_service._get_embeddings_batch = AsyncMock(side_effect=[
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],                    # profili
+            [[0.9, 0.1, 0.0], [0.0, 1.0, 0.0], [0.7, 0.0, 0.7]],   # bandi
+        ])
+
+        results = await search_service.match_profiles_to_bandi(
+            [{"sectors": ["digitale"]}, {"sectors": ["sport"]}], bandi, limit=2, threshold=0.3
+        )
+
+        assert [b.id for b, _ in results[0]] == [1, 3]
+        assert [b.id for b, _ in results[1]] == [2]
+        assert search_service._get_embeddings_batch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_profile_vectors_are_cached(self, search_service):
+        """Un profilo già visto non viene ricalcolato, un bando già visto nemmeno."""
+        bandi = [_bando(1, "digitale")]
+        search_service._get_embeddings_batch = AsyncMock(side_effect=[
+            [[1.0, 0.0]],
+            [[1.0, 0.0]],
+        ])
+        profile = {"sectors": ["digitale"]}
+
+        await search_service.match_profiles_to_bandi([profile], bandi)
+        again = await search_service.match_profiles_to_bandi([profile], bandi)
+
+        assert again[0][0][0].id == 1
+        assert search_service._get_embeddings_batch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_returns_none_without_embeddings(self, search_service):
+        """Ollama non disponibile: None, il chiamante usa il fallback."""
+        search_service._get_embeddings_batch = AsyncMock(return_value=None)
+
+        results = await search_service.match_profiles_to_bandi([{"sectors": ["x"]}], [_bando(1, "x")])
+
+        assert results is None
+
+
+@pytest_asyncio.fixture
+async def users_db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(APSUser.__table__.create)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def _user(index, is_active=True):
+    return APSUser(
+        organization_name=f"APS {index}",
+        fiscal_code=f"CF{index:014d}",
+        contact_email=f"aps{index}@example.org",
+        is_active=is_active,
+        created_at=datetime(2024, 1, 1),
+    )
+
+
+class TestGetActiveUsers:
+    """Destinatari degli alert letti a pagine per id."""
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_active_user_once(self, users_db, monkeypatch):
+        """Stesso created_at per tutti: nessun utente saltato o duplicato."""
+        monkeypatch.setattr(alert_system, "USERS_PAGE_SIZE", 2)
+        users_db.add_all([_user(i, is_active=i != 3) for i in range(7)])
+        await users_db.commit()
+
+        users = await BandoAlertSystem()._get_active_users(users_db)
+
+        assert [u.organization_name for u in users] == [f"APS {i}" for i in range(7) if i != 3]
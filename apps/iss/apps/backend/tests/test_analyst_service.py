@@ -0,0 +1,106 @@
+"""
+Test per la deep analysis memoizzata e ripristinabile
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services import analyst_service
+from app.services.analyst_service import AnalysisStageError, DeepAnalystService
+from app.services.rag_service import RAGUnavailableError
+
+
+@pytest.fixture
+def analyst():
+    """Servizio con checkpoint solo in memoria (Redis non disponibile)."""
+    service = DeepAnalystService()
+    service._get_redis = AsyncMock(return_value=None)
+    return service
+
+
+class TestDeepAnalystService:
+    """Test per memoizzazione e checkpoint degli stage."""
+
+    @pytest.mark.asyncio
+    async def test_result_is_memoized_by_content(self, analyst):
+        """Stesso testo = nessuna nuova chiamata al modello."""
+        analyst._extract_requirements = AsyncMock(return_value=["requisito"])
+        analyst._perform_reasoning = AsyncMock(return_value={"feasibility_score": 80})
+
+        with patch("app.services.analyst_service.rag_service.query", AsyncMock(return_value={})):
+            first = await analyst.analyze_bando("Bando A", "Profilo")
+            second = await analyst.analyze_bando("Bando A", "Profilo")
+
+        assert first == second
+        assert first["requirements"] == ["requisito"]
+        assert analyst.is_current(first, "Bando A", "Profilo")
+        assert not analyst.is_current(first, "Bando A modificato", "Profilo")
+        analyst._extract_requirements.assert_awaited_once()
+        analyst._perform_reasoning.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_resumes_from_checkpoint(self, analyst):
+        """Se la valutazione fallisce, la richiesta successiva non riestrae i requisiti."""
+        analyst._extract_requirements = AsyncMock(return_value=["requisito"])
+        analyst._perform_reasoning = AsyncMock(side_effect=[
+            AnalysisStageError("reasoning", "timeout"),
+            {"feasibility_score": 70},
+        ])
+
+        with patch("app.services.analyst_service.rag_service.query", AsyncMock(return_value={})) as rag_query:
+            failed = await analyst.analyze_bando("Bando B", "Profilo")
+            resumed = await analyst.analyze_bando("Bando B", "Profilo")
+
+        assert failed == {"error": "timeout", "failed_stage": "reasoning"}
+        assert resumed["feasibility_score"] == 70
+        analyst._extract_requirements.assert_awaited_once()
+        assert rag_query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_draft_reuses_extracted_requirements(self, analyst):
+        """I requisiti dell'analisi vengono riusati da /draft."""
+        analyst._extract_requirements = AsyncMock(return_value=["req 1", "req 2"])
+        analyst._perform_reasoning = AsyncMock(return_value={"feasibility_score": 50})
+
+        with patch("app.services.analyst_service.rag_service.query", AsyncMock(return_value={})):
+            await analyst.analyze_bando("Bando C", "Profilo")
+
+        requirements = await analyst.get_requirements("Bando C", "Profilo")
+
+        assert requirements == ["req 1", "req 2"]
+        analyst._extract_requirements.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rag_failure_is_not_checkpointed(self, analyst):
+        """Knowledge base giù: lo stage fallisce e viene riprovato, non salvato vuoto."""
+        analyst._extract_requirements = AsyncMock(return_value=["requisito"])
+        analyst._perform_reasoning = AsyncMock(return_value={"feasibility_score": 60})
+        rag_query = AsyncMock(side_effect=[
+            RAGUnavailableError("Chroma down"),
+            {"documents": [["linee guida interne"]]},
+        ])
+
+        with patch("app.services.analyst_service.rag_service.query", rag_query):
+            failed = await analyst.analyze_bando("Bando D", "Profilo")
+            key = analyst.content_hash("Bando D", "Profilo")
+            assert "rag_context" not in await analyst._load_checkpoint(key)
+            resumed = await analyst.analyze_bando("Bando D", "Profilo")
+
+        assert failed["failed_stage"] == "rag_context"
+        assert resumed["feasibility_score"] == 60
+        assert analyst._perform_reasoning.await_args.kwargs["rag_context"] == "linee guida interne"
+        analyst._extract_requirements.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_locks_and_memory_are_bounded(self, analyst, monkeypatch):
+        """Lock rimossi a fine analisi, checkpoint in memoria limitati (LRU)."""
+        monkeypatch.setattr(analyst_service, "MEMORY_CHECKPOINT_MAX", 2)
+        analyst._extract_requirements = AsyncMock(return_value=["requisito"])
+        analyst._perform_reasoning = AsyncMock(return_value={"feasibility_score": 40})
+
+        with patch("app.services.analyst_service.rag_service.query", AsyncMock(return_value={})):
+            for title in ("Bando E", "Bando F", "Bando G"):
+                await analyst.analyze_bando(title, "Profilo")
+
+        assert analyst._locks == {}
+        assert len(analyst._memory) == 2
+        assert await analyst._load_checkpoint(analyst.content_hash("Bando E", "Profilo")) == {}
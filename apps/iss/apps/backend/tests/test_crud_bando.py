@@ -191,6 +191,53 @@ class TestBandoCRUD:
         assert total == 2
         assert all(bando.status == BandoStatus.ATTIVO for bando in bandi)
 
+    @pytest.mark.asyncio
+    async def test_full_text_search_ranking_and_highlight(self, db_session: AsyncSession):
+        """Ricerca full-text: accenti, prefissi, titolo pesato più della descrizione."""
+        db_session.add_all([
+            Bando(
+                title="Contributi per associazioni",
+                ente="Comune di Salerno",
+                link="https://example.com/fts1",
+                fonte=BandoSource.COMUNE_SALERNO,
+                status=BandoStatus.ATTIVO,
+                hash_identifier="fts1",
+                descrizione="Sostegno all'inclusione digitale nella città di Salerno"
+            ),
+            Bando(
+                title="Inclusione digitale over 65",
+                ente="Regione Campania",
+                link="https://example.com/fts2",
+                fonte=BandoSource.REGIONE_CAMPANIA,
+                status=BandoStatus.ATTIVO,
+                hash_identifier="fts2",
+                descrizione="Laboratori <b>SPID</b> per anziani"
+            ),
+        ])
+        await db_session.commit()
+
+        bandi, total, estimated = await bando_crud.search_bandi(
+            db_session, search=BandoSearch(query="inclus digital")
+        )
+
+        assert total == 2
+        assert not estimated
+        assert bandi[0].title == "Inclusione digitale over 65"
+        assert "<mark>" in bandi[1].highlight
+
+        bandi, total = await bando_crud.get_bandi(db_session, search=BandoSearch(query="citta"))
+        assert total == 1
+        assert bandi[0].title == "Contributi per associazioni"
+
+    def test_search_highlight_is_escaped(self):
+        """Lo snippet è HTML escapato: solo i termini trovati diventano <mark>."""
+        snippet = "Laboratori <b>SPID</b> per \x02anziani\x03"
+
+        assert bando_crud._format_highlight(snippet) == (
+            "Laboratori &lt;b&gt;SPID&lt;/b&gt; per <mark>anziani</mark>"
+        )
+        assert bando_crud._build_ts_query("a & !") is None
+
     @pytest.mark.asyncio
     async def test_update_bando(self, db_session: AsyncSession):
         """Test aggiornamento bando."""
@@ -327,6 +374,9 @@ class TestBandoCRUD:
             db_session.add(bando)
         await db_session.commit()
         
+        # Inserimento diretto (non via CRUD): scarta le statistiche in cache
+        await bando_crud.invalidate_stats()
+
         # Test statistiche
         stats = await bando_crud.get_stats(db_session)
         
@@ -337,6 +387,36 @@ class TestBandoCRUD:
         assert stats["bandi_per_fonte"]["regione_campania"] == 1
         assert stats["bandi_per_fonte"]["csv_salerno"] == 1
         assert isinstance(stats["media_giornaliera"], float)
+        assert len(stats["trend_mensile"]) == 6
+        assert stats["trend_mensile"][-1] == {
+            "mese": now.strftime("%Y-%m"),
+            "count": 3,
+            "importo": 3 * stats["importo_medio"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_stats_cached_until_invalidated(self, db_session: AsyncSession, sample_bando_data: dict):
+        """Le statistiche restano in cache finché un nuovo bando non le invalida."""
+        await bando_crud.invalidate_stats()
+        before = await bando_crud.get_stats(db_session)
+
+        db_session.add(Bando(
+            title="Bando non via CRUD",
+            ente="Test",
+            link="https://example.com/direct",
+            fonte=BandoSource.COMUNE_SALERNO,
+            hash_identifier="stats-direct"
+        ))
+        await db_session.commit()
+        assert (await bando_crud.get_stats(db_session))["totali"] == before["totali"]
+
+        await bando_crud.create_bando(db_session, BandoCreate(
+            title=sample_bando_data["title"],
+            ente=sample_bando_data["ente"],
+            link=sample_bando_data["link"],
+            fonte=sample_bando_data["fonte"]
+        ))
+        assert (await bando_crud.get_stats(db_session))["totali"] == before["totali"] + 2
 
     @pytest.mark.asyncio
     async def test_get_recent_bandi(self, db_session: AsyncSession):
@@ -0,0 +1,67 @@
+"""
+Test per la collection RAG legata al modello di embedding
+"""
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.services.rag_service import RAGService, RAGUnavailableError
+
+
+def chroma_returning(metadata):
+    """Client httpx che risponde al get_or_create di Chroma con `metadata`."""
+    def handler(request):
+        return httpx.Response(200, json={"id": "col-1", "name": "kb", "metadata": metadata})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def rag():
+    service = RAGService()
+    service.collection_id = None
+    yield service
+    service.collection_id = None
+    service._client = None
+
+
+class TestCollectionName:
+    """Nome della collection derivato dal modello di embedding."""
+
+    def test_default_includes_embedding_model(self):
+        settings = Settings(OLLAMA_EMBEDDING_MODEL="llama3.2:3b")
+        assert settings.rag_collection_name == "iss_knowledge_base_llama3.2-3b"
+
+    def test_explicit_collection_wins(self):
+        settings = Settings(RAG_COLLECTION="custom_kb", OLLAMA_EMBEDDING_MODEL="all-minilm")
+        assert settings.rag_collection_name == "custom_kb"
+
+
+class TestEnsureCollection:
+    """Una collection con vettori di un altro modello non viene usata."""
+
+    @pytest.mark.asyncio
+    async def test_matching_model_is_used(self, rag):
+        rag._client = chroma_returning({"embedding_model": rag.embedding_model})
+        assert await rag._ensure_collection() == "col-1"
+
+    @pytest.mark.asyncio
+    async def test_other_model_is_refused(self, rag):
+        rag._client = chroma_returning({"embedding_model": "llama3.2:3b"})
+        assert await rag._ensure_collection() is None
+        assert rag.collection_id is None
+
+    @pytest.mark.asyncio
+    async def test_missing_model_metadata_is_refused(self, rag):
+        """Collection creata prima della registrazione del modello."""
+        rag._client = chroma_returning({"hnsw:space": "cosine"})
+        assert await rag._ensure_collection() is None
+
+
+class TestQuery:
+    """Un errore della knowledge base non viene restituito come risultato vuoto."""
+
+    @pytest.mark.asyncio
+    async def test_unavailable_collection_raises(self, rag):
+        rag._client = chroma_returning({"embedding_model": "llama3.2:3b"})
+        with pytest.raises(RAGUnavailableError):
+            await rag.query("requisiti")
@@ -0,0 +1,73 @@
+"""
+Test per la pipeline di scoring dei bandi in batch
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.scoring_service import BandoScoringService, ScoringError
+
+
+@pytest.fixture
+def scorer():
+    service = BandoScoringService()
+    service.batch_size = 2
+    service.concurrency = 2
+    return service
+
+
+def _result(bando_id, score):
+    return {"id": bando_id, "score": score, "reasoning": "ok", "strengths": ["a"], "weaknesses": []}
+
+
+class TestBandoScoringService:
+    """Test per batching, parsing e versionamento degli score."""
+
+    @pytest.mark.asyncio
+    async def test_scores_several_bandi_per_prompt(self, scorer):
+        """4 bandi con batch da 2 = 2 chiamate al modello, risultati per batch."""
+        scorer._complete = AsyncMock(side_effect=[
+            {"results": [_result(1, 80), _result(2, 30)]},
+            {"results": [_result(3, 150), _result(4, 10)]},
+        ])
+        on_scored = AsyncMock()
+
+        scored = await scorer.score_texts(
+            [(1, "A"), (2, "B"), (3, "C"), (4, "D")], "Profilo", on_scored=on_scored
+        )
+
+        assert scorer._complete.await_count == 2
+        assert on_scored.await_count == 2
+        assert scored[1]["score"] == 80
+        assert scored[3]["score"] == 100  # clamp 0-100
+        assert scored[1]["strengths"] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_missing_bando_is_retried_alone(self, scorer):
+        """Un bando saltato dal modello viene riprovato da solo."""
+        scorer._complete = AsyncMock(side_effect=[
+            {"results": [_result(1, 60), _result(99, 70)]},
+            {"score": 45, "reasoning": "singolo", "strengths": [], "weaknesses": []},
+        ])
+
+        scored = await scorer.score_texts([(1, "A"), (2, "B")], "Profilo")
+
+        assert set(scored) == {1, 2}
+        assert scored[2]["score"] == 45
+        assert scorer._complete.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_skipped(self, scorer):
+        """Se il modello non risponde il batch non viene salvato (resta da calcolare)."""
+        scorer._complete = AsyncMock(side_effect=ScoringError("Ollama 500"))
+        on_scored = AsyncMock()
+
+        scored = await scorer.score_texts([(1, "A")], "Profilo", on_scored=on_scored)
+
+        assert scored == {}
+        on_scored.assert_not_awaited()
+
+    def test_version_changes_with_profile(self, scorer):
+        """Cambiare profilo invalida gli score salvati."""
+        assert scorer.score_version("Profilo") == scorer.score_version("Profilo")
+        assert scorer.score_version("Profilo") != scorer.score_version("Profilo aggiornato")
+        assert len(scorer.score_version("Profilo")) <= 64
@@ -0,0 +1,83 @@
+"""
+021_metric_rollups.py
+Time-bucketed metric rollups
+
+Creates:
+- metric_rollups (count/sum/min/max/sketch per metric, labels, bucket)
+- composite index (metric_name, timestamp) on metric_logs
+
+Revision ID: 021_metric_rollups
+Revises: 020_v3_token_economy
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '021_metric_rollups'
+down_revision = '020_v3_token_economy'
+branch_labels = None
+depends_on = None
+
+
+def _index_names(inspector, table: str) -> set:
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    # Tables and indexes may already exist: app startup runs create_all
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'metric_rollups' not in tables:
+        op.create_table(
+            'metric_rollups',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('metric_name', sa.String(100), nullable=False),
+            sa.Column('labels_key', sa.String(255), nullable=False, server_default=''),
+            sa.Column('labels', sa.JSON, nullable=True),
+            sa.Column('resolution', sa.String(8), nullable=False),
+            sa.Column('bucket_start', sa.DateTime, nullable=False),
+            sa.Column('source', sa.String(100), nullable=False, server_default='*'),
+            sa.Column('count', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('sum', sa.Float, nullable=False, server_default='0'),
+            sa.Column('min', sa.Float, nullable=True),
+            sa.Column('max', sa.Float, nullable=True),
+            sa.Column('sketch', sa.JSON, nullable=True),
+            sa.UniqueConstraint(
+                'metric_name', 'labels_key', 'resolution', 'bucket_start', 'source',
+                name='uq_metric_rollups_bucket',
+            ),
+        )
+
+    if 'ix_metric_rollups_lookup' not in _index_names(inspector, 'metric_rollups'):
+        op.create_index(
+            'ix_metric_rollups_lookup',
+            'metric_rollups',
+            ['metric_name', 'resolution', 'bucket_start'],
+        )
+
+    # metric_logs may have been created by create_all on older deployments
+    if (
+        'metric_logs' in tables
+        and 'ix_metric_logs_name_timestamp' not in _index_names(inspector, 'metric_logs')
+    ):
+        op.create_index(
+            'ix_metric_logs_name_timestamp',
+            'metric_logs',
+            ['metric_name', 'timestamp'],
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if (
+        'metric_logs' in inspector.get_table_names()
+        and 'ix_metric_logs_name_timestamp' in _index_names(inspector, 'metric_logs')
+    ):
+        op.drop_index('ix_metric_logs_name_timestamp', table_name='metric_logs')
+
+    op.drop_index('ix_metric_rollups_lookup', table_name='metric_rollups')
+    op.drop_table('metric_rollups')
@@ -0,0 +1,62 @@
+"""
+022_ga4_warehouse.py
+Local GA4 daily warehouse
+
+Creates:
+- ga4_daily_metrics (additive GA4 metrics per property, day, report, dimensions)
+
+Revision ID: 022_ga4_warehouse
+Revises: 021_metric_rollups
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '022_ga4_warehouse'
+down_revision = '021_metric_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ga4_daily_metrics may already exist: app startup runs create_all
+    inspector = sa.inspect(op.get_bind())
+
+    if 'ga4_daily_metrics' not in inspector.get_table_names():
+        op.create_table(
+            'ga4_daily_metrics',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('property_id', sa.String(100), nullable=False),
+            sa.Column('date', sa.Date, nullable=False),
+            sa.Column('report', sa.String(20), nullable=False),
+            sa.Column('dimension_key', sa.String(500), nullable=False, server_default=''),
+            sa.Column('dimensions', sa.JSON, nullable=True),
+            sa.Column('active_users', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('new_users', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('sessions', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('engaged_sessions', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('page_views', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('session_duration', sa.Float, nullable=False, server_default='0'),
+            sa.Column('conversions', sa.Integer, nullable=False, server_default='0'),
+            sa.Column('synced_at', sa.DateTime(timezone=True), nullable=False),
+            sa.UniqueConstraint(
+                'property_id', 'report', 'date', 'dimension_key',
+                name='uq_ga4_daily_metrics_row',
+            ),
+        )
+
+    indexes = {index['name'] for index in inspector.get_indexes('ga4_daily_metrics')}
+    if 'ix_ga4_daily_metrics_lookup' not in indexes:
+        op.create_index(
+            'ix_ga4_daily_metrics_lookup',
+            'ga4_daily_metrics',
+            ['property_id', 'report', 'date'],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ga4_daily_metrics_lookup', table_name='ga4_daily_metrics')
+    op.drop_table('ga4_daily_metrics')
@@ -17,6 +17,7 @@ from app.core.config import get_settings
 from app.core.api.dependencies.auth_deps import get_current_user
 from app.domain.auth.models import User
 from app.infrastructure.database.session import get_db
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -163,7 +164,7 @@ async def instagram_callback(code: str, state: str, db: Session = Depends(get_db
 
     redirect_uri = f"{settings.FRONTEND_URL}/oauth/callback/instagram"
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.client("social") as client:
         token_response = await client.post(
             "https://api.instagram.com/oauth/access_token",
             data={
@@ -270,7 +271,7 @@ async def facebook_callback(code: str, state: str, db: Session = Depends(get_db)
 
     redirect_uri = f"{settings.FRONTEND_URL}/oauth/callback/facebook"
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.client("social") as client:
         token_response = await client.get(
             "https://graph.facebook.com/v19.0/oauth/access_token",
             params={
@@ -361,7 +362,7 @@ async def linkedin_callback(code: str, state: str, db: Session = Depends(get_db)
 
     redirect_uri = settings.LINKEDIN_REDIRECT_URI or f"{settings.FRONTEND_URL}/oauth/callback/linkedin"
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.client("social") as client:
         token_response = await client.post(
             "https://www.linkedin.com/oauth/v2/accessToken",
             data={
@@ -461,7 +462,7 @@ async def twitter_callback(code: str, state: str, db: Session = Depends(get_db))
     code_verifier = _oauth_verifiers.pop(state, None)
     redirect_uri = f"{settings.FRONTEND_URL}/oauth/callback/twitter"
 
-    async with httpx.AsyncClient() as client:
+    async with http_clients.client("social") as client:
         auth_header = httpx.BasicAuth(settings.TWITTER_API_KEY, settings.TWITTER_API_SECRET)
 
         token_response = await client.post(
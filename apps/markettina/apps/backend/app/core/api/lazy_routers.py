@@ -0,0 +1,312 @@
+"""
+Lazy Router Registry - Caricamento on-demand dei domini.
+
+Importare tutti i router all'avvio significa importare anche le loro
+dipendenze pesanti (client Google, PIL, reportlab, SDK social, agenti AI):
+ogni worker paga secondi di boot e decine di MB di RSS anche per domini che
+non riceverà mai una richiesta.
+
+I domini pesanti vengono dichiarati con una dichiarazione leggera
+(modulo, attributo, prefisso di include, prefisso URL servito) e importati:
+- alla prima richiesta che ricade nel loro prefisso URL (LazyRouterMiddleware)
+- oppure dal warm-up in background dopo l'avvio (LAZY_ROUTERS_WARMUP)
+- oppure tutti insieme prima di generare lo schema OpenAPI
+
+Configurazione (env):
+- LAZY_ROUTERS: "false" per importare tutto all'avvio (comportamento classico)
+- LAZY_ROUTERS_WARMUP: "false" per non precaricare (minimo RSS per worker)
+- LAZY_ROUTERS_WARMUP_DELAY: secondi di attesa prima del warm-up (default 5)
+"""
+
+import asyncio
+import importlib
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import structlog
+from fastapi import FastAPI
+
+logger = structlog.get_logger(__name__)
+
+# Riga di output di `python -X importtime`:
+# "import time:       523 |       1234 |   app.domain.google"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+@dataclass
+class LazyRouter:
+    """Dichiarazione leggera di un router da importare on-demand."""
+
+    module: str
+    path_prefix: str
+    attr: str = "router"
+    prefix: str = ""
+    tags: list[str] | None = None
+    loaded: bool = False
+    load_ms: float | None = None
+    loaded_by: str | None = None
+    error: str | None = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    def matches(self, path: str) -> bool:
+        return path == self.path_prefix or path.startswith(self.path_prefix.rstrip("/") + "/")
+
+
+class LazyRouterRegistry:
+    """
+    Registro dei router caricati on-demand.
+
+    Example:
+        >>> registry = LazyRouterRegistry(app)
+        >>> registry.register("app.domain.google.router", "/api/v1/admin/google")
+        >>> app.add_middleware(LazyRouterMiddleware, registry=registry)
+    """
+
+    def __init__(self, app: FastAPI, enabled: bool | None = None):
+        self.app = app
+        self.enabled = (
+            enabled if enabled is not None
+            else os.getenv("LAZY_ROUTERS", "true").lower() == "true"
+        )
+        self.warmup_enabled = os.getenv("LAZY_ROUTERS_WARMUP", "true").lower() == "true"
+        self.warmup_delay = float(os.getenv("LAZY_ROUTERS_WARMUP_DELAY", "5"))
+        self.routers: list[LazyRouter] = []
+        self._warmup_task: asyncio.Task | None = None
+
+    def register(
+        self,
+        module: str,
+        path_prefix: str,
+        attr: str = "router",
+        prefix: str = "",
+        tags: list[str] | None = None,
+    ) -> None:
+        """
+        Dichiara un router.
+
+        Args:
+            module: Modulo che definisce il router
+            path_prefix: Prefisso URL coperto da tutte le route del router
+            attr: Nome dell'APIRouter nel modulo
+            prefix: Prefisso passato a include_router
+            tags: Tag OpenAPI passati a include_router
+        """
+        entry = LazyRouter(module=module, path_prefix=path_prefix, attr=attr, prefix=prefix, tags=tags)
+        self.routers.append(entry)
+
+        if not self.enabled:
+            self._load_sync(entry, "startup")
+
+    @property
+    def pending(self) -> list[LazyRouter]:
+        return [r for r in self.routers if not r.loaded and r.error is None]
+
+    def _include(self, entry: LazyRouter, module: Any) -> None:
+        router = getattr(module, entry.attr)
+        kwargs: dict[str, Any] = {"prefix": entry.prefix}
+        if entry.tags:
+            kwargs["tags"] = entry.tags
+        self.app.include_router(router, **kwargs)
+        # Lo schema OpenAPI in cache non contiene le nuove route
+        self.app.openapi_schema = None
+
+    def _load_sync(self, entry: LazyRouter, reason: str) -> None:
+        start = time.perf_counter()
+        module = importlib.import_module(entry.module)
+        self._include(entry, module)
+        self._mark_loaded(entry, start, reason)
+
+    def _mark_loaded(self, entry: LazyRouter, start: float, reason: str) -> None:
+        entry.loaded = True
+        entry.load_ms = round((time.perf_counter() - start) * 1000, 1)
+        entry.loaded_by = reason
+        logger.info(
+            "lazy_router_loaded",
+            module=entry.module,
+            load_ms=entry.load_ms,
+            reason=reason,
+        )
+
+    async def load(self, entry: LazyRouter, reason: str) -> None:
+        """Importa il modulo (in un thread) e monta le route sul loop."""
+        if entry.loaded or entry.error is not None:
+            return
+
+        async with entry._lock:
+            if entry.loaded or entry.error is not None:
+                return
+            start = time.perf_counter()
+            try:
+                module = await asyncio.to_thread(importlib.import_module, entry.module)
+                self._include(entry, module)
+            except Exception as e:
+                # Un dominio rotto non deve bloccare gli altri: le sue route
+                # restano assenti (404) come se il router non fosse montato
+                entry.error = str(e)
+                logger.error("lazy_router_load_failed", module=entry.module, error=str(e))
+                return
+            self._mark_loaded(entry, start, reason)
+
+    async def ensure_loaded(self, path: str) -> None:
+        """Carica i router in attesa che servono `path`."""
+        for entry in self.pending:
+            if entry.matches(path):
+                await self.load(entry, "request")
+
+    async def load_all(self, reason: str = "schema") -> None:
+        for entry in self.pending:
+            await self.load(entry, reason)
+
+    def start_warmup(self) -> None:
+        """Avvia il precaricamento in background dei router ancora in attesa."""
+        if not self.enabled or not self.warmup_enabled or not self.pending:
+            return
+        self._warmup_task = asyncio.create_task(self._warmup())
+
+    async def _warmup(self) -> None:
+        await asyncio.sleep(self.warmup_delay)
+        start = time.perf_counter()
+        count = len(self.pending)
+        # Un router alla volta: ogni import cede il loop alle richieste in corso
+        await self.load_all("warmup")
+        logger.info(
+            "lazy_routers_warmup_completed",
+            routers=count,
+            duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+
+    async def stop(self) -> None:
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+            self._warmup_task = None
+
+    def get_status(self) -> dict[str, Any]:
+        """Stato di caricamento dei router dichiarati."""
+        return {
+            "enabled": self.enabled,
+            "warmup_enabled": self.warmup_enabled,
+            "loaded": sum(1 for r in self.routers if r.loaded),
+            "pending": len(self.pending),
+            "routers": [
+                {
+                    "module": r.module,
+                    "path_prefix": r.path_prefix,
+                    "loaded": r.loaded,
+                    "load_ms": r.load_ms,
+                    "loaded_by": r.loaded_by,
+                    "error": r.error,
+                }
+                for r in self.routers
+            ],
+        }
+
+
+class LazyRouterMiddleware:
+    """
+    Middleware ASGI che monta i router lazy prima del routing.
+
+    Le route montate durante la richiesta sono già visibili al router di
+    Starlette, quindi anche la prima richiesta viene servita normalmente.
+    """
+
+    def __init__(self, app, registry: LazyRouterRegistry, schema_paths: tuple[str, ...] = ("/openapi.json",)):
+        self.app = app
+        self.registry = registry
+        self.schema_paths = schema_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.pending:
+            path = scope["path"]
+            if path in self.schema_paths:
+                await self.registry.load_all()
+            else:
+                await self.registry.ensure_loaded(path)
+        await self.app(scope, receive, send)
+
+
+# ============================================================================
+# Startup profile (`python -X importtime`)
+# ============================================================================
+
+_import_profile: dict[str, Any] | None = None
+_import_profile_lock = asyncio.Lock()
+
+
+def parse_importtime(output: str, top: int = 25) -> dict[str, Any]:
+    """Riassume l'output di `-X importtime` (tempi in microsecondi)."""
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": len(indent) // 2,
+        })
+
+    # Pacchetti di primo livello importati direttamente (depth 0) = tempo totale
+    total_ms = sum(e["cumulative_ms"] for e in entries if e["depth"] == 0)
+    app_modules = [e for e in entries if e["module"].startswith("app.")]
+
+    return {
+        "modules_imported": len(entries),
+        "total_import_ms": round(total_ms, 1),
+        "app_import_ms": round(sum(e["self_ms"] for e in app_modules), 1),
+        "top_cumulative": sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:top],
+        "top_self": sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top],
+    }
+
+
+async def profile_imports(
+    target: str = "app.main",
+    refresh: bool = False,
+    timeout: float = 120.0,
+) -> dict[str, Any]:
+    """
+    Esegue `python -X importtime -c "import <target>"` in un sottoprocesso.
+
+    Il risultato è in cache per la vita del processo: il profilo cambia
+    solo con un nuovo deploy. `refresh=True` lo ricalcola.
+    """
+    global _import_profile
+
+    async with _import_profile_lock:
+        if _import_profile is not None and not refresh:
+            return _import_profile
+
+        backend_root = Path(__file__).resolve().parents[3]
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-X", "importtime", "-c", f"import {target}",
+            cwd=str(backend_root),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+
+        profile = parse_importtime(stderr.decode(errors="replace"))
+        profile.update({
+            "target": target,
+            "exit_code": process.returncode,
+            "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+            "generated_at": time.time(),
+        })
+        _import_profile = profile
+        return profile
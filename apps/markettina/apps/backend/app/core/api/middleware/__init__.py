@@ -11,7 +11,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
-from app.core.api.exceptions.middleware import GlobalExceptionMiddleware
 from app.core.config import settings
 from app.core.rate_limiting import RateLimitMiddleware
 from app.infrastructure.monitoring.logging_middleware import LoggingMiddleware
@@ -29,34 +28,35 @@ def setup_middleware_stack(app: FastAPI) -> None:
     1. TrustedHostMiddleware (security)
     2. CORSMiddleware (CORS headers)
     3. GZipMiddleware (compression)
-    4. RateLimitMiddleware (rate limiting)
-    5. LoggingMiddleware (request/response logging)
-    6. GlobalExceptionMiddleware (catches all unhandled exceptions)
+    4. LoggingMiddleware (request ID, logging, metrics, unhandled exceptions)
+    5. RateLimitMiddleware (rate limiting)
+
+    LoggingMiddleware and RateLimitMiddleware are pure ASGI: no
+    BaseHTTPMiddleware in the stack, so streaming responses are not buffered.
+    LoggingMiddleware wraps rate limiting so 429s carry a request ID and are
+    counted in the metrics.
 
     Args:
         app: FastAPI application instance
     """
 
-    # 1. Global Exception Middleware (innermost - catches all unhandled exceptions)
-    app.add_middleware(GlobalExceptionMiddleware)
+    # 1. Rate Limiting Middleware (innermost, before CORS for security)
+    if settings.ENABLE_RATE_LIMITING:
+        app.add_middleware(RateLimitMiddleware)
 
-    # 2. Logging Middleware (logs everything)
+    # 2. Logging Middleware (request ID, timing, logs, metrics, 500 on unhandled exceptions)
     app.add_middleware(
         LoggingMiddleware,
         service_name="portfolio-backend"
     )
 
-    # 3. Rate Limiting Middleware (before CORS for security)
-    if settings.ENABLE_RATE_LIMITING:
-        app.add_middleware(RateLimitMiddleware)
-
-    # 4. GZip Compression (compress responses)
+    # 3. GZip Compression (compress responses)
     app.add_middleware(
         GZipMiddleware,
         minimum_size=1000  # Only compress responses larger than 1KB
     )
 
-    # 5. CORS Middleware (handle cross-origin requests)
+    # 4. CORS Middleware (handle cross-origin requests)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.BACKEND_CORS_ORIGINS,
@@ -66,7 +66,7 @@ def setup_middleware_stack(app: FastAPI) -> None:
         expose_headers=["X-Request-ID", "X-RateLimit-Limit", "X-RateLimit-Remaining"],
     )
 
-    # 6. Trusted Host Middleware (outermost - security layer)
+    # 5. Trusted Host Middleware (outermost - security layer)
     if settings.ENVIRONMENT == "production":
         # DEBUG: Log allowed hosts
         logger.debug(f"Allowed hosts configured: {settings.BACKEND_CORS_ORIGINS}")
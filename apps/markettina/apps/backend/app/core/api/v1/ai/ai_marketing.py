@@ -5,12 +5,12 @@ Content generation, image generation, social media automation
 import logging
 import os
 
-import httpx
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
 from app.core.security import get_api_key_header
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 router = APIRouter(dependencies=[Depends(get_api_key_header())])
@@ -51,7 +51,7 @@ async def generate_with_ai(prompt: str, brand_context: str | None = None) -> str
                 "max_tokens": 1000,
                 "temperature": 0.8
             }
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with http_clients.client("ai", timeout=60.0) as client:
                 response = await client.post(api_url, headers=headers, json=payload)
                 if response.status_code == 200:
                     data = response.json()
@@ -79,7 +79,7 @@ async def generate_with_ai(prompt: str, brand_context: str | None = None) -> str
                 "max_tokens": 1000,
                 "temperature": 0.8
             }
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with http_clients.client("ai", timeout=60.0) as client:
                 response = await client.post(api_url, headers=headers, json=payload)
                 if response.status_code == 200:
                     data = response.json()
@@ -107,7 +107,7 @@ async def generate_with_ai(prompt: str, brand_context: str | None = None) -> str
             "temperature": 0.8
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_clients.client("ai", timeout=60.0) as client:
             response = await client.post(api_url, headers=headers, json=payload)
 
             if response.status_code == 200:
@@ -1731,7 +1731,7 @@ async def translate_with_ai(text: str, source_lang: str, target_lang: str) -> st
         "temperature": 0.3
     }
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    async with http_clients.client("ai", timeout=60.0) as client:
         response = await client.post(api_url, headers=headers, json=payload)
 
         if response.status_code == 200:
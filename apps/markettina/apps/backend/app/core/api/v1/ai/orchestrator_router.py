@@ -13,9 +13,11 @@ Endpoints:
 
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel, Field
 
+from app.core.api.v1.jobs_router import enqueue_job
+
 from app.services.multi_agent_orchestrator import (
     orchestrator,
     AgentType,
@@ -302,10 +304,26 @@ async def get_pipeline(pipeline_id: str):
 
 
 @router.post("/pipelines/{pipeline_id}/execute")
-async def execute_pipeline(pipeline_id: str):
+async def execute_pipeline(
+    pipeline_id: str,
+    background: bool = Query(False, description="Esegui nel worker e ritorna un job_id")
+):
     """
     Esegue una pipeline esistente.
-    """
+
+    Con background=true la pipeline viene eseguita dal worker della coda:
+    ritorna 202 con job_id (stato e context finale su /api/v1/jobs/{job_id}).
+    """
+    if background:
+        pipeline = orchestrator.pipelines.get(pipeline_id)
+        if not pipeline:
+            raise HTTPException(status_code=404, detail=f"Pipeline not found: {pipeline_id}")
+        return await enqueue_job(
+            "execute_pipeline",
+            {"pipeline": pipeline.model_dump(mode="json")},
+            max_retries=0,
+        )
+
     try:
         result = await orchestrator.execute_pipeline(pipeline_id)
         return {
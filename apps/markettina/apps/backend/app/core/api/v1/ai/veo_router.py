@@ -10,11 +10,15 @@ Endpoints:
 - POST /generate-marketing - Genera video marketing con template
 """
 
+from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
 from pydantic import BaseModel, Field
 
+from app.core.api.v1.jobs_router import enqueue_job
+from app.infrastructure.queue import JobStatus, task_queue
+
 from app.services.veo_video_service import (
     veo_service,
     VideoGenerationRequest,
@@ -126,12 +130,15 @@ async def generate_video(request: GenerateVideoRequest):
 @router.post("/generate-async")
 async def generate_video_async(
     request: GenerateVideoRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Esegui nel worker della coda e ritorna un job_id")
 ):
     """
     Avvia generazione video in background.
 
-    Ritorna immediatamente con job_id per polling.
+    Ritorna immediatamente con job_id per polling su /jobs/{job_id}.
+    Con background=true il job va nel worker della coda (202): lo stato è
+    disponibile anche su /api/v1/jobs/{job_id} e /api/v1/jobs/{job_id}/stream.
     """
     if not veo_service.is_configured:
         raise HTTPException(
@@ -148,6 +155,14 @@ async def generate_video_async(
         image_input_url=request.image_url
     )
 
+    if background:
+        return await enqueue_job(
+            "generate_video",
+            gen_request.model_dump(mode="json"),
+            max_retries=1,
+            timeout=900,
+        )
+
     job_id = await veo_service.generate_video_async(gen_request)
     job = veo_service.get_job(job_id)
 
@@ -196,12 +211,49 @@ async def list_jobs(
     return JobListResponse(count=len(jobs), jobs=jobs)
 
 
+# Stato job della coda -> stato job VEO
+_QUEUE_STATUS = {
+    JobStatus.QUEUED.value: VideoJobStatus.PENDING,
+    JobStatus.RUNNING.value: VideoJobStatus.PROCESSING,
+    JobStatus.RETRYING.value: VideoJobStatus.PROCESSING,
+    JobStatus.FAILED.value: VideoJobStatus.FAILED,
+}
+
+
+async def _get_queued_job(job_id: str) -> Optional[VideoJob]:
+    """VideoJob per un job `generate_video` della coda (generate-async?background=true)."""
+    try:
+        queued = await task_queue.get_job(job_id)
+    except Exception:
+        return None
+    if not queued or queued.get("task") != "generate_video":
+        return None
+
+    result = queued.get("result") or {}
+    if queued["status"] == JobStatus.COMPLETED.value and result.get("job"):
+        return VideoJob.model_validate(result["job"])
+
+    payload = queued.get("payload") or {}
+    finished_at = queued.get("finished_at")
+    return VideoJob(
+        job_id=job_id,
+        status=_QUEUE_STATUS.get(queued["status"], VideoJobStatus.PENDING),
+        prompt=payload.get("prompt", ""),
+        error=queued.get("error") or None,
+        created_at=datetime.fromtimestamp(queued["created_at"], tz=timezone.utc),
+        completed_at=datetime.fromtimestamp(finished_at, tz=timezone.utc) if finished_at else None,
+        duration_seconds=payload.get("duration_seconds", 8),
+        aspect_ratio=payload.get("aspect_ratio", "16:9"),
+        resolution=payload.get("resolution", "720p"),
+    )
+
+
 @router.get("/jobs/{job_id}", response_model=VideoJob)
 async def get_job(job_id: str):
     """
-    Ottiene status di un job specifico.
+    Ottiene status di un job specifico (anche se accodato nel worker).
     """
-    job = veo_service.get_job(job_id)
+    job = veo_service.get_job(job_id) or await _get_queued_job(job_id)
 
     if not job:
         raise HTTPException(
@@ -0,0 +1,92 @@
+"""
+🩺 Diagnostics Router
+
+Profilo di avvio del worker e stato delle connessioni in uscita.
+
+Endpoints:
+- GET /admin/diagnostics/startup - Router lazy caricati, moduli importati e RSS
+- GET /admin/diagnostics/importtime - Riepilogo di `python -X importtime` (in cache)
+- GET /admin/diagnostics/upstreams - Richieste, errori, retry e latenza per upstream HTTP
+"""
+
+import os
+import sys
+import time
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.core.api.dependencies.auth_deps import get_current_admin_user
+from app.core.api.lazy_routers import profile_imports
+from app.domain.auth.admin_models import AdminUser
+from app.infrastructure.http import http_clients
+
+router = APIRouter(prefix="/admin/diagnostics", tags=["diagnostics"])
+
+_PROCESS_STARTED_AT = time.time()
+
+
+def _rss_mb() -> float | None:
+    """RSS corrente del processo (Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+@router.get("/startup")
+async def get_startup_diagnostics(
+    request: Request,
+    admin: AdminUser = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    """Stato dei router lazy e footprint del worker corrente."""
+    registry = getattr(request.app.state, "lazy_routers", None)
+    app_modules = [name for name in sys.modules if name.startswith("app.")]
+
+    return {
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.time() - _PROCESS_STARTED_AT, 1),
+        "rss_mb": _rss_mb(),
+        "modules_loaded": len(sys.modules),
+        "app_modules_loaded": len(app_modules),
+        "lazy_routers": registry.get_status() if registry else None,
+    }
+
+
+@router.get("/importtime")
+async def get_importtime_profile(
+    refresh: bool = False,
+    top: int = 25,
+    admin: AdminUser = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    """
+    Profilo di import dell'applicazione (`python -X importtime -c "import app.main"`).
+
+    Eseguito in un sottoprocesso alla prima chiamata e tenuto in cache;
+    `refresh=true` lo ricalcola.
+    """
+    try:
+        profile = await profile_imports(refresh=refresh)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Import profile unavailable: {e!s}"
+        )
+
+    return {
+        **profile,
+        "top_cumulative": profile["top_cumulative"][:top],
+        "top_self": profile["top_self"][:top],
+    }
+
+
+@router.get("/upstreams")
+async def get_upstream_diagnostics(
+    admin: AdminUser = Depends(get_current_admin_user),
+) -> dict[str, Any]:
+    """Contatori dei pool HTTP in uscita del worker corrente."""
+    return {"pid": os.getpid(), "upstreams": http_clients.get_stats()}
@@ -0,0 +1,92 @@
+"""
+🧵 Jobs Router
+
+Stato dei job eseguiti dal worker della coda (app.infrastructure.queue).
+
+Endpoints:
+- GET /jobs/stats - Profondità coda e consumer attivi
+- GET /jobs/{job_id} - Stato e risultato di un job
+- GET /jobs/{job_id}/stream - Stato in streaming (SSE) fino al completamento
+"""
+
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.api.dependencies.auth_deps import get_current_admin_user
+from app.domain.auth.admin_models import AdminUser
+from app.infrastructure.queue import task_queue
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+async def enqueue_job(task_name: str, payload: dict[str, Any], **options: Any) -> JSONResponse:
+    """
+    Accoda un job e ritorna 202 con i link di polling/streaming.
+
+    Usato dagli endpoint che supportano `?background=true`.
+    """
+    try:
+        job_id = await task_queue.enqueue(task_name, payload, **options)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Job queue unavailable: {e!s}"
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/v1/jobs/{job_id}",
+            "stream_url": f"/api/v1/jobs/{job_id}/stream",
+        },
+    )
+
+
+def _public_job(job: dict[str, Any]) -> dict[str, Any]:
+    """Stato del job senza il payload (può contenere dati interni)."""
+    return {key: value for key, value in job.items() if key != "payload"}
+
+
+@router.get("/stats")
+async def get_queue_stats(admin: AdminUser = Depends(get_current_admin_user)):
+    """
+    Statistiche della coda job.
+    """
+    return await task_queue.get_stats()
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, admin: AdminUser = Depends(get_current_admin_user)):
+    """
+    Stato di un job: queued, running, retrying, completed, failed.
+
+    Il risultato è disponibile nel campo `result` a job completato.
+    """
+    job = await task_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _public_job(job)
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(job_id: str, admin: AdminUser = Depends(get_current_admin_user)):
+    """
+    Stream SSE degli aggiornamenti di stato, chiuso a job terminato.
+    """
+    if not await task_queue.get_job(job_id):
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    async def events():
+        async for job in task_queue.stream_job(job_id):
+            yield f"event: {job['status']}\ndata: {json.dumps(_public_job(job), default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -23,12 +23,15 @@ Ora tutto è consolidato qui per evitare:
 
 from .oauth_service import GoogleOAuthService, google_oauth_service
 from .scopes import GOOGLE_SCOPE_SETS, GoogleScopes
+from .token_cache import GoogleTokenCache, google_token_cache
 from .token_manager import GoogleTokenManager
 
 __all__ = [
     "GOOGLE_SCOPE_SETS",
     "GoogleOAuthService",
     "GoogleScopes",
+    "GoogleTokenCache",
     "GoogleTokenManager",
     "google_oauth_service",
+    "google_token_cache",
 ]
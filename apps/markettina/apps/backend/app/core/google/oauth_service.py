@@ -31,10 +31,10 @@ import secrets
 from datetime import UTC, datetime, timedelta
 from urllib.parse import urlencode
 
-import httpx
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 from .scopes import GOOGLE_SCOPE_SETS, get_scopes_for_use_case
 
@@ -166,7 +166,7 @@ class GoogleOAuthService:
             None se exchange fallito
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     GOOGLE_TOKEN_URL,
                     data={
@@ -206,7 +206,7 @@ class GoogleOAuthService:
             None se richiesta fallita
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     GOOGLE_USERINFO_URL,
                     headers={"Authorization": f"Bearer {access_token}"},
@@ -239,7 +239,7 @@ class GoogleOAuthService:
             None se refresh fallito
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     GOOGLE_TOKEN_URL,
                     data={
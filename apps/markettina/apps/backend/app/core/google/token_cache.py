@@ -0,0 +1,349 @@
+"""
+Google Token Cache - Access token condivisi tra worker con refresh singleflight.
+
+Ogni servizio Google (GA4, Search Console, Business Profile, Calendar,
+Gmail, Docs) chiedeva il token al database a ogni richiesta e, se scaduto,
+lo rinnovava per conto suo: con N worker e richieste concorrenti partivano
+N refresh insieme verso oauth2.googleapis.com.
+
+Il cache:
+- L1 in-process + Redis (`google:token:<subject>`) con TTL = scadenza del token;
+  L1 viene riconfrontato con Redis ogni GOOGLE_TOKEN_LOCAL_TTL secondi, così
+  un `invalidate` su un worker (token o property cambiati) arriva agli altri
+- refresh anticipato: negli ultimi GOOGLE_TOKEN_REFRESH_AHEAD secondi il
+  token corrente viene ancora servito e il rinnovo parte in background
+- singleflight: un solo refresh per subject nel processo (task condiviso)
+  e tra i worker (lock Redis SET NX PX); chi non ha il lock attende il
+  token scritto dal vincitore invece di rinnovarlo di nuovo
+- senza Redis degrada al solo cache in-process
+
+Subject: "admin:<id>", "user:<id>", "sa:<client_email>:<scope>".
+Il refresh token non viene mai scritto nel cache: resta nel database.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+from app.infrastructure.http import http_clients
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+KEY_PREFIX = "google:token:"
+REFRESH_AHEAD_SECONDS = float(os.getenv("GOOGLE_TOKEN_REFRESH_AHEAD", "300"))
+# Token senza scadenza nota (es. salvati dal login admin): riletti dal DB dopo questo TTL
+UNKNOWN_EXPIRY_TTL = float(os.getenv("GOOGLE_TOKEN_UNKNOWN_EXPIRY_TTL", "300"))
+# Dopo questo intervallo L1 si riallinea a Redis (invalidazioni degli altri worker)
+LOCAL_TTL_SECONDS = float(os.getenv("GOOGLE_TOKEN_LOCAL_TTL", "30"))
+LOCK_TTL_MS = 15000
+WAIT_TIMEOUT_SECONDS = 10.0
+POLL_INTERVAL_SECONDS = 0.1
+REDIS_RETRY_SECONDS = 30.0
+
+# Campi mai scritti nel cache
+_PRIVATE_FIELDS = ("refresh_token",)
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+TokenLoader = Callable[[], Awaitable[dict[str, Any] | None]]
+
+
+def _timestamp(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value.timestamp()
+    return float(value)
+
+
+class GoogleTokenCache:
+    """
+    Cache cross-worker dei token Google.
+
+    Il loader passato a `get` rinnova il token se serve e lo ritorna come
+    dict con almeno `access_token` ed `expires_at` (datetime o None). Può
+    girare in background dopo la fine della richiesta: non deve usare la
+    sessione DB della richiesta.
+
+    Example:
+        >>> token = await google_token_cache.get("admin:1", load_admin_token)
+        >>> token["access_token"]
+    """
+
+    def __init__(self, redis_url: str | None = None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self._local: dict[str, dict[str, Any]] = {}
+        # subject -> monotonic oltre il quale L1 va riconfrontato con Redis
+        self._local_until: dict[str, float] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._redis: aioredis.Redis | None = None
+        self._redis_retry_at = 0.0
+        self._release = None
+        self.stats = {"local_hits": 0, "redis_hits": 0, "refreshes": 0, "waits": 0, "background_refreshes": 0}
+
+    # ------------------------------------------------------------------
+    # Redis (best effort)
+    # ------------------------------------------------------------------
+
+    async def _get_redis(self) -> aioredis.Redis | None:
+        if self._redis is not None:
+            return self._redis
+        if not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            self._release = self._redis.register_script(_RELEASE_SCRIPT)
+        except Exception as e:
+            self._redis_unavailable(e)
+        return self._redis
+
+    def _redis_unavailable(self, error: Exception) -> None:
+        logger.warning(f"Google token cache: Redis unavailable, using local cache only: {error}")
+        self._redis = None
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def _read(self, subject: str) -> dict[str, Any] | None:
+        redis = await self._get_redis()
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(KEY_PREFIX + subject)
+        except Exception as e:
+            self._redis_unavailable(e)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def _write(self, subject: str, entry: dict[str, Any]) -> None:
+        redis = await self._get_redis()
+        if redis is None:
+            return
+        ttl = max(1, int(entry["cached_until"] - time.time()))
+        try:
+            await redis.set(KEY_PREFIX + subject, json.dumps(entry), ex=ttl)
+        except Exception as e:
+            self._redis_unavailable(e)
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _entry(data: dict[str, Any]) -> dict[str, Any]:
+        entry = {k: v for k, v in data.items() if k not in _PRIVATE_FIELDS}
+        expires_at = _timestamp(data.get("expires_at"))
+        entry["expires_at"] = expires_at
+        entry["cached_until"] = expires_at if expires_at is not None else time.time() + UNKNOWN_EXPIRY_TTL
+        return entry
+
+    @staticmethod
+    def _public(entry: dict[str, Any]) -> dict[str, Any]:
+        data = {k: v for k, v in entry.items() if k != "cached_until"}
+        if entry.get("expires_at") is not None:
+            data["expires_at"] = datetime.fromtimestamp(entry["expires_at"], tz=UTC)
+        return data
+
+    def _remember(self, subject: str, entry: dict[str, Any]) -> None:
+        self._local[subject] = entry
+        self._local_until[subject] = time.monotonic() + LOCAL_TTL_SECONDS
+
+    def _forget(self, subject: str) -> None:
+        self._local.pop(subject, None)
+        self._local_until.pop(subject, None)
+
+    @staticmethod
+    def _fresh(entry: dict[str, Any]) -> bool:
+        """Valido e fuori dalla finestra di refresh anticipato."""
+        if entry.get("expires_at") is None:
+            return entry["cached_until"] > time.time()
+        return entry["cached_until"] - REFRESH_AHEAD_SECONDS > time.time()
+
+    @staticmethod
+    def _usable(entry: dict[str, Any]) -> bool:
+        """Ancora valido, anche se da rinnovare."""
+        return entry["cached_until"] - 5 > time.time()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, subject: str, loader: TokenLoader) -> dict[str, Any] | None:
+        """
+        Token per `subject`: L1, poi Redis, poi refresh singleflight.
+
+        Returns:
+            Dict del loader (senza refresh_token) o None se non disponibile
+        """
+        entry = self._local.get(subject)
+        if entry is not None and self._fresh(entry) and time.monotonic() < self._local_until[subject]:
+            self.stats["local_hits"] += 1
+            return self._public(entry)
+
+        remote = await self._read(subject)
+        if remote is not None:
+            self._remember(subject, remote)
+            entry = remote
+            if self._fresh(remote):
+                self.stats["redis_hits"] += 1
+                return self._public(remote)
+        elif self._redis is not None:
+            # Redis raggiungibile ma senza token: invalidato da un altro worker o scaduto
+            self._forget(subject)
+            entry = None
+        elif entry is not None and self._fresh(entry):
+            # Senza Redis L1 è l'unico cache
+            self.stats["local_hits"] += 1
+            return self._public(entry)
+
+        if entry is not None and self._usable(entry) and entry.get("expires_at") is not None:
+            # Refresh anticipato: il token corrente vale ancora qualche minuto
+            self._start_refresh(subject, loader, background=True)
+            return self._public(entry)
+
+        entry = await asyncio.shield(self._start_refresh(subject, loader))
+        return self._public(entry) if entry is not None else None
+
+    async def invalidate(self, subject: str) -> None:
+        """
+        Dimentica il token (nuovo token salvato, disconnessione, cambio impostazioni).
+
+        Gli altri worker lo rileggono al più dopo GOOGLE_TOKEN_LOCAL_TTL secondi.
+        """
+        self._forget(subject)
+        redis = await self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(KEY_PREFIX + subject)
+        except Exception as e:
+            self._redis_unavailable(e)
+
+    def _start_refresh(self, subject: str, loader: TokenLoader, background: bool = False) -> asyncio.Task:
+        task = self._inflight.get(subject)
+        if task is None:
+            task = asyncio.create_task(self._refresh(subject, loader))
+            self._inflight[subject] = task
+            task.add_done_callback(lambda _: self._inflight.pop(subject, None))
+            if background:
+                self.stats["background_refreshes"] += 1
+                task.add_done_callback(self._log_background_error)
+        return task
+
+    @staticmethod
+    def _log_background_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background Google token refresh failed: {task.exception()}")
+
+    async def _refresh(self, subject: str, loader: TokenLoader) -> dict[str, Any] | None:
+        redis = await self._get_redis()
+        lock_key = f"{KEY_PREFIX}{subject}:lock"
+        lock_token = uuid.uuid4().hex
+        locked = False
+
+        if redis is not None:
+            try:
+                locked = bool(await redis.set(lock_key, lock_token, nx=True, px=LOCK_TTL_MS))
+            except Exception as e:
+                self._redis_unavailable(e)
+
+            if not locked and self._redis is not None:
+                # Un altro worker sta rinnovando: aspetta il suo risultato
+                self.stats["waits"] += 1
+                deadline = time.monotonic() + WAIT_TIMEOUT_SECONDS
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                    remote = await self._read(subject)
+                    if remote is not None and self._fresh(remote):
+                        self._remember(subject, remote)
+                        return remote
+                logger.warning(f"Timed out waiting for Google token refresh of {subject}, refreshing locally")
+
+        try:
+            self.stats["refreshes"] += 1
+            data = await loader()
+            if data is None or not data.get("access_token"):
+                self._forget(subject)
+                return None
+
+            entry = self._entry(data)
+            self._remember(subject, entry)
+            await self._write(subject, entry)
+            return entry
+        finally:
+            if locked and self._redis is not None:
+                try:
+                    await self._release(keys=[lock_key], args=[lock_token])
+                except Exception as e:
+                    self._redis_unavailable(e)
+
+    async def service_account_token(self, credentials_json: str, scope: str) -> str:
+        """
+        Access token di un service account (JWT RS256 -> token endpoint).
+
+        Condiviso tra worker e tra client con stesse credenziali e scope
+        (GA4Client, SearchConsoleClient).
+        """
+        if not credentials_json:
+            raise ValueError("Google credentials not configured")
+
+        creds = json.loads(credentials_json)
+
+        async def load() -> dict[str, Any]:
+            import jwt
+
+            now = int(time.time())
+            payload = {
+                "iss": creds["client_email"],
+                "scope": scope,
+                "aud": GOOGLE_TOKEN_URL,
+                "iat": now,
+                "exp": now + 3600,
+            }
+            signed_jwt = jwt.encode(payload, creds["private_key"], algorithm="RS256")
+
+            async with http_clients.client("google") as client:
+                response = await client.post(
+                    GOOGLE_TOKEN_URL,
+                    data={
+                        "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                        "assertion": signed_jwt,
+                    },
+                )
+
+            if response.status_code != 200:
+                raise ValueError(f"Token exchange failed: {response.text}")
+
+            token_data = response.json()
+            return {
+                "access_token": token_data["access_token"],
+                "expires_at": time.time() + token_data.get("expires_in", 3600),
+            }
+
+        token = await self.get(f"sa:{creds['client_email']}:{scope}", load)
+        if token is None:
+            raise ValueError("Token exchange failed")
+        return token["access_token"]
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self.stats, "cached_subjects": len(self._local), "inflight": len(self._inflight)}
+
+
+# Singleton instance
+google_token_cache = GoogleTokenCache()
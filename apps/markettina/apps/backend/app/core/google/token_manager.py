@@ -10,16 +10,21 @@ Prima c'erano 2 storage separati:
 - AdminGoogleSettings → Admin
 
 Questo manager unifica l'accesso, mantenendo compatibilità con entrambi.
+Gli access token passano da `google_token_cache` (Redis, condiviso tra
+worker): il DB viene letto e il token rinnovato una sola volta per
+subject, non a ogni richiesta.
 """
 
 import logging
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.google.token_cache import google_token_cache
+from app.infrastructure.database.session import SessionLocal
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -54,20 +59,56 @@ class GoogleTokenManager:
         """
         Ottieni un token valido (refresh se necessario).
 
+        Servito dal cache condiviso; il refresh avviene una sola volta per
+        subject anche con più worker e richieste concorrenti.
+
         Args:
             user_id: ID utente (Customer)
             admin_id: ID admin
 
         Returns:
-            Dict con access_token, refresh_token, expires_at, scopes
+            Dict con access_token, expires_at, scopes (+ ga4_property_id,
+            gmb_account_id, gmb_location_id per Admin). Il refresh_token
+            resta nel database e non viene ritornato.
             None se non trovato o refresh fallito
         """
         if admin_id:
-            return await self._get_admin_token(admin_id)
+            return await google_token_cache.get(
+                self.cache_subject(admin_id=admin_id),
+                lambda: self._load_token(admin_id=admin_id),
+            )
         if user_id:
-            return await self._get_customer_token(user_id)
+            return await google_token_cache.get(
+                self.cache_subject(user_id=user_id),
+                lambda: self._load_token(user_id=user_id),
+            )
         raise ValueError("Either user_id or admin_id must be provided")
 
+    @staticmethod
+    def cache_subject(user_id: int | None = None, admin_id: int | None = None) -> str:
+        """Chiave del token nel cache condiviso."""
+        return f"admin:{admin_id}" if admin_id else f"user:{user_id}"
+
+    @classmethod
+    async def invalidate(cls, user_id: int | None = None, admin_id: int | None = None) -> None:
+        """Rimuovi il token dal cache (token salvato, disconnessione, cambio property)."""
+        await google_token_cache.invalidate(cls.cache_subject(user_id=user_id, admin_id=admin_id))
+
+    @staticmethod
+    async def _load_token(user_id: int | None = None, admin_id: int | None = None) -> dict[str, Any] | None:
+        """
+        Loader del cache: legge (e rinnova) il token con una sessione propria,
+        perché il refresh anticipato può girare dopo la fine della richiesta.
+        """
+        db = SessionLocal()
+        try:
+            manager = GoogleTokenManager(db)
+            if admin_id:
+                return await manager._get_admin_token(admin_id)
+            return await manager._get_customer_token(user_id)
+        finally:
+            db.close()
+
     async def _get_admin_token(self, admin_id: int) -> dict[str, Any] | None:
         """Ottieni token Admin da AdminGoogleSettings."""
         from app.domain.google.models import AdminGoogleSettings
@@ -95,6 +136,7 @@ class GoogleTokenManager:
                         "refresh_token": google_settings.refresh_token,
                         "expires_at": refreshed["expires_at"],
                         "scopes": google_settings.scopes,
+                        **self._admin_extras(google_settings),
                     }
 
             logger.warning(f"Token expired and refresh failed for admin {admin_id}")
@@ -105,6 +147,16 @@ class GoogleTokenManager:
             "refresh_token": google_settings.refresh_token,
             "expires_at": google_settings.token_expires_at,
             "scopes": google_settings.scopes,
+            **self._admin_extras(google_settings),
+        }
+
+    @staticmethod
+    def _admin_extras(google_settings: Any) -> dict[str, Any]:
+        """Impostazioni admin servite insieme al token (evitano una query per richiesta)."""
+        return {
+            "ga4_property_id": google_settings.ga4_property_id,
+            "gmb_account_id": google_settings.gmb_account_id,
+            "gmb_location_id": google_settings.gmb_location_id,
         }
 
     async def _get_customer_token(self, user_id: int) -> dict[str, Any] | None:
@@ -172,7 +224,7 @@ class GoogleTokenManager:
             None se refresh fallito
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     GOOGLE_TOKEN_URL,
                     data={
@@ -213,7 +265,7 @@ class GoogleTokenManager:
             True se revocato con successo
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     GOOGLE_REVOKE_URL,
                     params={"token": token},
@@ -241,7 +293,7 @@ class GoogleTokenManager:
             Dict con user info se valido, None altrimenti
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     GOOGLE_USERINFO_URL,
                     headers={"Authorization": f"Bearer {access_token}"},
@@ -292,6 +344,7 @@ class GoogleTokenManager:
             google_settings.updated_at = datetime.now(UTC)
 
             self.db.commit()
+            await self.invalidate(admin_id=admin_id)
             logger.info(f"Saved Google token for admin {admin_id}")
             return True
 
@@ -327,6 +380,7 @@ class GoogleTokenManager:
                 scope=scopes,
                 token_type="Bearer"
             )
+            await self.invalidate(user_id=user_id)
             logger.info(f"Saved Google token for user {user_id}")
             return True
 
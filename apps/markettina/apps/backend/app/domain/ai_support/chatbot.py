@@ -8,9 +8,9 @@ import os
 import time
 from typing import Any
 
-import httpx
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -213,7 +213,7 @@ NON INVENTARE informazioni. Se non sei sicuro di qualcosa, dillo chiaramente e s
                 },
             }
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_clients.client("ai", timeout=10.0) as client:
                 response = await client.post(api_url, json=payload)
 
                 if response.status_code == 200:
@@ -321,7 +321,7 @@ NON INVENTARE informazioni. Se non sei sicuro di qualcosa, dillo chiaramente e s
                 "top_p": 0.9
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with http_clients.client("ai", timeout=60.0) as client:
                 response = await client.post(api_url, headers=headers, json=payload)
 
                 if response.status_code == 200:
@@ -360,7 +360,7 @@ NON INVENTARE informazioni. Se non sei sicuro di qualcosa, dillo chiaramente e s
                 "options": {"temperature": 0.7, "num_predict": 500},
             }
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_clients.client("ai", timeout=30.0) as client:
                 response = await client.post(
                     f"{ollama_url}/api/generate",
                     json=payload
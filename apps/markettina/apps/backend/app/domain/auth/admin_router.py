@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.core.api.dependencies.auth_deps import get_current_admin_user
 from app.infrastructure.database.session import get_db
+from app.infrastructure.http import http_clients
 
 from .admin_models import AdminUser
 from .admin_schemas import (
@@ -120,11 +121,11 @@ async def google_login_callback(
     """
     import logging
 
-    import httpx
     from fastapi.responses import RedirectResponse
 
     from app.core.config import settings
     from app.core.google.oauth_service import google_oauth_service
+    from app.core.google.token_manager import GoogleTokenManager
 
     logger = logging.getLogger(__name__)
 
@@ -153,7 +154,7 @@ async def google_login_callback(
             raise ValueError("Token exchange failed")
 
         # Get user info from Google
-        async with httpx.AsyncClient() as client:
+        async with http_clients.client("google") as client:
             userinfo_response = await client.get(
                 "https://www.googleapis.com/oauth2/v2/userinfo",
                 headers={"Authorization": f"Bearer {token_response.access_token}"}
@@ -183,6 +184,7 @@ async def google_login_callback(
             access_token=token_response.access_token,
             refresh_token=token_response.refresh_token
         )
+        await GoogleTokenManager.invalidate(admin_id=admin.id)
 
         # Generate JWT token
         auth_response = AdminAuthService.create_admin_session(db, admin)
@@ -19,6 +19,7 @@ from sqlalchemy.orm import Session
 from app.core.api.dependencies.auth_deps import get_current_admin_user
 from app.domain.auth.admin_models import AdminUser
 from app.infrastructure.database.session import get_db
+from app.infrastructure.http import http_clients
 from app.integrations.social_media import social_media
 
 router = APIRouter(prefix="/api/v1/copilot", tags=["copilot"])
@@ -117,8 +118,6 @@ async def generate_marketing_content(
     Proxies to centralized AI service for LLM-powered content generation.
     Falls back to templates if microservice unavailable.
     """
-    import httpx
-
     ai_service_url = os.getenv("AI_SERVICE_URL", "http://ai_microservice:8001")
 
     # Map content type to AI service endpoint
@@ -133,7 +132,7 @@ async def generate_marketing_content(
         ai_api_key = os.getenv("AI_SERVICE_API_KEY", "")
         headers = {"Authorization": f"Bearer {ai_api_key}"} if ai_api_key else {}
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_clients.client("ai", timeout=60.0) as client:
             # Build request payload - use custom prompt if provided
             payload = {
                 "type": content_type_map.get(request.type, "social"),
@@ -234,12 +233,10 @@ async def chat_with_ai(
     """
     Chat with AI assistant via AI Microservice proxy.
     """
-    import httpx
-
     ai_service_url = os.getenv("AI_SERVICE_URL", "http://ai_microservice:8001")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.post(
                 f"{ai_service_url}/api/v1/support/chat",
                 json={
@@ -278,8 +275,6 @@ async def search_leads(
     2. Google Places API (digitalized businesses)
     3. Intelligent generation (fallback)
     """
-    import httpx
-
     from app.infrastructure.scraping.pagine_gialle_scraper import pagine_gialle_scraper
 
     logger.info(f"Lead search: {request.industry} in {request.location} ({request.radius_km}km) - need: {request.need}")
@@ -386,7 +381,7 @@ async def search_leads(
     # Try Google Places API first
     if google_api_key:
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_clients.client("leads", timeout=30.0) as client:
                 # Google Places API (New) - Search Nearby
                 url = "https://places.googleapis.com/v1/places:searchNearby"
                 headers = {
@@ -892,13 +887,12 @@ async def generate_image(
 
     # Fallback: Try AI Microservice
     try:
-        import httpx
         ai_service_url = os.getenv("AI_SERVICE_URL", "http://ai_microservice:8001")
         ai_api_key = os.getenv("AI_SERVICE_API_KEY", "")
 
         headers = {"Authorization": f"Bearer {ai_api_key}"} if ai_api_key else {}
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_clients.client("ai", timeout=120.0) as client:
             response = await client.post(
                 f"{ai_service_url}/api/v1/marketing/image/generate",
                 json={
@@ -3,14 +3,14 @@ Google Analytics Data API Service (GA4)
 Real implementation using Google Analytics Data API v1
 """
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.domain.auth.oauth_tokens import OAuthProvider, OAuthTokenService
+from app.core.google.token_manager import GoogleTokenManager
+from app.infrastructure.http import http_clients
 
 from .schemas import (
     GADashboardResponse,
@@ -33,6 +33,55 @@ GA4_DATA_API_BASE = "https://analyticsdata.googleapis.com/v1beta"
 # Default GA4 Property ID from environment
 DEFAULT_GA4_PROPERTY_ID = settings.GA4_PROPERTY_ID if hasattr(settings, "GA4_PROPERTY_ID") else "properties/467399370"
 
+# batchRunReports accepts at most 5 RunReportRequest per call
+GA4_BATCH_MAX_REQUESTS = 5
+
+OVERVIEW_METRICS = [
+    "activeUsers",
+    "newUsers",
+    "sessions",
+    "screenPageViews",
+    "bounceRate",
+    "averageSessionDuration",
+    "conversions"
+]
+
+# Reports stored in the local warehouse (one batch, all split by `date`).
+# averageSessionDuration is stored multiplied by sessions, so bounce rate
+# and average duration can be rebuilt for any window from additive sums.
+DAILY_REPORTS: dict[str, dict[str, list[str]]] = {
+    "total": {
+        "dimensions": [],
+        "metrics": ["activeUsers", "newUsers", "sessions", "engagedSessions",
+                    "screenPageViews", "averageSessionDuration", "conversions"],
+    },
+    "source": {
+        "dimensions": ["sessionSource", "sessionMedium"],
+        "metrics": ["activeUsers", "sessions"],
+    },
+    "page": {
+        "dimensions": ["pagePath"],
+        "metrics": ["screenPageViews", "activeUsers", "sessions", "averageSessionDuration"],
+    },
+    "device": {
+        "dimensions": ["deviceCategory"],
+        "metrics": ["activeUsers", "sessions"],
+    },
+    "geo": {
+        "dimensions": ["country", "city"],
+        "metrics": ["activeUsers", "sessions"],
+    },
+}
+DAILY_REPORT_ROW_LIMIT = 100000
+
+
+class GA4ReportError(Exception):
+    """GA4 Data API call failed (HTTP error or transport error)."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class GoogleAnalyticsService:
     """Service for Google Analytics Data API (GA4)."""
@@ -53,9 +102,9 @@ class GoogleAnalyticsService:
         }
 
     @classmethod
-    def from_admin_token(cls, db: Session, admin_id: int, property_id: str | None = None) -> Optional["GoogleAnalyticsService"]:
+    async def from_admin_token(cls, db: Session, admin_id: int, property_id: str | None = None) -> Optional["GoogleAnalyticsService"]:
         """
-        Create service instance from admin's stored OAuth token.
+        Create service instance from admin's OAuth token (shared Google token cache).
 
         Args:
             db: Database session
@@ -65,39 +114,27 @@ class GoogleAnalyticsService:
         Returns:
             GoogleAnalyticsService instance or None if no valid token
         """
-        token = OAuthTokenService.get_valid_token(db, admin_id, OAuthProvider.GOOGLE)
-        if not token:
+        token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin_id)
+        if not token_data:
             logger.warning(f"No valid Google OAuth token for admin {admin_id}")
             return None
+        token = token_data["access_token"]
         return cls(access_token=token, property_id=property_id)
 
-    async def run_report(
+    def _build_report_request(
         self,
         metrics: list[str],
         dimensions: list[str] | None = None,
         date_ranges: list[dict[str, str]] | None = None,
         limit: int = 100,
         order_by: str | None = None,
-        descending: bool = True
-    ) -> GAReportResponse:
-        """
-        Run a GA4 report.
-
-        Args:
-            metrics: List of metric names (e.g., ["activeUsers", "sessions"])
-            dimensions: Optional list of dimension names
-            date_ranges: Date ranges (default: last 30 days)
-            limit: Max rows to return
-            order_by: Metric or dimension to order by
-            descending: Sort descending if True
-
-        Returns:
-            GAReportResponse with report data
-        """
+        descending: bool = True,
+        totals: bool = False,
+    ) -> dict[str, Any]:
+        """Build a RunReportRequest body (also used inside batchRunReports)."""
         if not date_ranges:
             date_ranges = [{"startDate": "30daysAgo", "endDate": "today"}]
 
-        # Build request body
         body = {
             "dateRanges": date_ranges,
             "metrics": [{"name": m} for m in metrics],
@@ -113,10 +150,39 @@ class GoogleAnalyticsService:
                 "desc": descending
             }]
 
+        if totals:
+            body["metricAggregations"] = ["TOTAL"]
+
+        return body
+
+    async def run_report(
+        self,
+        metrics: list[str],
+        dimensions: list[str] | None = None,
+        date_ranges: list[dict[str, str]] | None = None,
+        limit: int = 100,
+        order_by: str | None = None,
+        descending: bool = True
+    ) -> GAReportResponse:
+        """
+        Run a GA4 report.
+
+        Args:
+            metrics: List of metric names (e.g., ["activeUsers", "sessions"])
+            dimensions: Optional list of dimension names
+            date_ranges: Date ranges (default: last 30 days)
+            limit: Max rows to return
+            order_by: Metric or dimension to order by
+            descending: Sort descending if True
+
+        Returns:
+            GAReportResponse with report data
+        """
+        body = self._build_report_request(metrics, dimensions, date_ranges, limit, order_by, descending)
         url = f"{GA4_DATA_API_BASE}/{self.property_id}:runReport"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -135,6 +201,72 @@ class GoogleAnalyticsService:
             logger.error(f"Error running GA4 report: {e}", exc_info=True)
             return GAReportResponse(rows=[], row_count=0)
 
+    async def batch_run_reports(self, requests: list[dict[str, Any]]) -> list[GAReportResponse]:
+        """
+        Run up to 5 reports in a single `batchRunReports` call.
+
+        Unlike `run_report`, errors are raised (GA4ReportError): callers that
+        persist results must not mistake a failed call for a day without traffic.
+
+        Args:
+            requests: RunReportRequest bodies (see `_build_report_request`)
+
+        Returns:
+            One GAReportResponse per request, in the same order
+        """
+        if len(requests) > GA4_BATCH_MAX_REQUESTS:
+            raise ValueError(f"batchRunReports accepts at most {GA4_BATCH_MAX_REQUESTS} requests")
+
+        url = f"{GA4_DATA_API_BASE}/{self.property_id}:batchRunReports"
+
+        try:
+            async with http_clients.client("google") as client:
+                response = await client.post(
+                    url,
+                    headers=self.headers,
+                    json={"requests": requests},
+                    timeout=60.0
+                )
+        except Exception as e:
+            raise GA4ReportError(f"GA4 batchRunReports failed: {e}") from e
+
+        if response.status_code != 200:
+            raise GA4ReportError(
+                f"GA4 batchRunReports error: {response.status_code} - {response.text}",
+                status_code=response.status_code,
+            )
+
+        reports = response.json().get("reports", [])
+        return [
+            self._parse_report_response(
+                reports[i] if i < len(reports) else {},
+                [m["name"] for m in request["metrics"]],
+                [d["name"] for d in request.get("dimensions", [])],
+            )
+            for i, request in enumerate(requests)
+        ]
+
+    async def fetch_daily_reports(self, start_date: date, end_date: date) -> dict[str, GAReportResponse]:
+        """
+        Fetch the warehouse reports (DAILY_REPORTS) for a date range in one batch.
+
+        Every report is split by the `date` dimension, so rows can be stored
+        per day and re-aggregated for any window.
+        """
+        date_ranges = [{"startDate": start_date.isoformat(), "endDate": end_date.isoformat()}]
+        names = list(DAILY_REPORTS)
+        requests = [
+            self._build_report_request(
+                metrics=DAILY_REPORTS[name]["metrics"],
+                dimensions=["date", *DAILY_REPORTS[name]["dimensions"]],
+                date_ranges=date_ranges,
+                limit=DAILY_REPORT_ROW_LIMIT,
+            )
+            for name in names
+        ]
+        reports = await self.batch_run_reports(requests)
+        return dict(zip(names, reports, strict=True))
+
     def _parse_report_response(
         self,
         data: dict[str, Any],
@@ -142,67 +274,124 @@ class GoogleAnalyticsService:
         dimensions: list[str]
     ) -> GAReportResponse:
         """Parse GA4 API response into structured format."""
-        rows = []
-
-        for row in data.get("rows", []):
-            dimension_values = []
-            metric_values = []
-
-            # Parse dimensions
-            for i, dim_value in enumerate(row.get("dimensionValues", [])):
-                dim_name = dimensions[i] if i < len(dimensions) else f"dimension{i}"
-                dimension_values.append(GADimensionValue(
-                    name=dim_name,
-                    value=dim_value.get("value", "")
-                ))
-
-            # Parse metrics
-            for i, met_value in enumerate(row.get("metricValues", [])):
-                met_name = metrics[i] if i < len(metrics) else f"metric{i}"
-                metric_values.append(GAMetricValue(
-                    name=met_name,
-                    value=met_value.get("value", "0")
-                ))
-
-            rows.append(GAReportRow(
-                dimension_values=dimension_values,
-                metric_values=metric_values
-            ))
+        rows = [self._parse_row(row, metrics, dimensions) for row in data.get("rows", [])]
+        totals = [self._parse_row(row, metrics, dimensions) for row in data.get("totals", [])]
 
         return GAReportResponse(
             rows=rows,
             row_count=data.get("rowCount", len(rows)),
+            totals=totals,
             metadata=data.get("metadata", {})
         )
 
-    async def get_overview_metrics(self, days: int = 30) -> GAOverviewMetrics:
-        """
-        Get overview metrics for dashboard.
+    @staticmethod
+    def _parse_row(row: dict[str, Any], metrics: list[str], dimensions: list[str]) -> GAReportRow:
+        dimension_values = []
+        metric_values = []
+
+        # Parse dimensions
+        for i, dim_value in enumerate(row.get("dimensionValues", [])):
+            dim_name = dimensions[i] if i < len(dimensions) else f"dimension{i}"
+            dimension_values.append(GADimensionValue(
+                name=dim_name,
+                value=dim_value.get("value", "")
+            ))
 
-        Args:
-            days: Number of days to look back
+        # Parse metrics
+        for i, met_value in enumerate(row.get("metricValues", [])):
+            met_name = metrics[i] if i < len(metrics) else f"metric{i}"
+            metric_values.append(GAMetricValue(
+                name=met_name,
+                value=met_value.get("value", "0")
+            ))
 
-        Returns:
-            GAOverviewMetrics with key metrics
-        """
-        date_ranges = [{"startDate": f"{days}daysAgo", "endDate": "today"}]
-
-        metrics = [
-            "activeUsers",
-            "newUsers",
-            "sessions",
-            "screenPageViews",
-            "bounceRate",
-            "averageSessionDuration",
-            "conversions"
-        ]
+        return GAReportRow(
+            dimension_values=dimension_values,
+            metric_values=metric_values
+        )
+
+    # ------------------------------------------------------------------
+    # Dashboard reports: request builders + parsers, shared by the single
+    # report methods and the batched get_full_dashboard
+    # ------------------------------------------------------------------
+
+    def _overview_request(self, days: int) -> dict[str, Any]:
+        # Daily rows + TOTAL aggregation: one request serves both the
+        # overview (deduplicated totals) and the daily traffic chart
+        return self._build_report_request(
+            metrics=OVERVIEW_METRICS,
+            dimensions=["date"],
+            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
+            limit=days + 1,
+            order_by="date",
+            descending=False,
+            totals=True,
+        )
 
-        report = await self.run_report(metrics=metrics, date_ranges=date_ranges)
+    def _traffic_sources_request(self, days: int, limit: int = 10) -> dict[str, Any]:
+        return self._build_report_request(
+            metrics=["activeUsers", "sessions"],
+            dimensions=["sessionSource", "sessionMedium"],
+            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
+            limit=limit,
+            order_by="sessions",
+            descending=True
+        )
 
-        # Extract values from first row
+    def _top_pages_request(self, days: int, limit: int = 10) -> dict[str, Any]:
+        return self._build_report_request(
+            metrics=["screenPageViews", "activeUsers", "averageSessionDuration"],
+            dimensions=["pagePath"],
+            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
+            limit=limit,
+            order_by="screenPageViews",
+            descending=True
+        )
+
+    def _device_request(self, days: int) -> dict[str, Any]:
+        return self._build_report_request(
+            metrics=["activeUsers", "sessions"],
+            dimensions=["deviceCategory"],
+            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
+            limit=10
+        )
+
+    def _geo_request(self, days: int, limit: int = 10) -> dict[str, Any]:
+        return self._build_report_request(
+            metrics=["activeUsers", "sessions"],
+            dimensions=["country", "city"],
+            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
+            limit=limit,
+            order_by="sessions",
+            descending=True
+        )
+
+    async def _run(self, request: dict[str, Any]) -> GAReportResponse:
+        return await self.run_report(
+            metrics=[m["name"] for m in request["metrics"]],
+            dimensions=[d["name"] for d in request.get("dimensions", [])] or None,
+            date_ranges=request["dateRanges"],
+            limit=int(request["limit"]),
+            order_by=self._order_by(request),
+            descending=request.get("orderBys", [{}])[0].get("desc", True),
+        )
+
+    @staticmethod
+    def _order_by(request: dict[str, Any]) -> str | None:
+        if not request.get("orderBys"):
+            return None
+        order = request["orderBys"][0]
+        if "metric" in order:
+            return order["metric"]["metricName"]
+        return order["dimension"]["dimensionName"]
+
+    @staticmethod
+    def _parse_overview(report: GAReportResponse, days: int) -> GAOverviewMetrics:
+        # Totals row when requested, otherwise the first (only) row
+        source = report.totals or report.rows
         values = {}
-        if report.rows:
-            for mv in report.rows[0].metric_values:
+        if source:
+            for mv in source[0].metric_values:
                 values[mv.name] = mv.value
 
         return GAOverviewMetrics(
@@ -216,17 +405,31 @@ class GoogleAnalyticsService:
             period=f"{days}d"
         )
 
-    async def get_traffic_sources(self, days: int = 30, limit: int = 10) -> list[GATrafficSource]:
-        """Get traffic sources breakdown."""
-        report = await self.run_report(
-            metrics=["activeUsers", "sessions"],
-            dimensions=["sessionSource", "sessionMedium"],
-            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
-            limit=limit,
-            order_by="sessions",
-            descending=True
-        )
+    @staticmethod
+    def _parse_daily_traffic(report: GAReportResponse) -> list[dict[str, Any]]:
+        daily_data = []
+        for row in report.rows:
+            date_str = row.dimension_values[0].value if row.dimension_values else ""
+            values = {mv.name: mv.value for mv in row.metric_values}
+
+            # Parse date (format: YYYYMMDD)
+            try:
+                date_obj = datetime.strptime(date_str, "%Y%m%d")
+                formatted_date = date_obj.strftime("%Y-%m-%d")
+            except ValueError:
+                formatted_date = date_str
+
+            daily_data.append({
+                "date": formatted_date,
+                "users": int(float(values.get("activeUsers", 0))),
+                "sessions": int(float(values.get("sessions", 0))),
+                "pageViews": int(float(values.get("screenPageViews", 0)))
+            })
+
+        return daily_data
 
+    @staticmethod
+    def _parse_traffic_sources(report: GAReportResponse) -> list[GATrafficSource]:
         sources = []
         total_sessions = sum(
             int(float(row.metric_values[1].value))
@@ -249,17 +452,8 @@ class GoogleAnalyticsService:
 
         return sources
 
-    async def get_top_pages(self, days: int = 30, limit: int = 10) -> list[GATopPage]:
-        """Get top pages by views."""
-        report = await self.run_report(
-            metrics=["screenPageViews", "activeUsers", "averageSessionDuration"],
-            dimensions=["pagePath"],
-            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
-            limit=limit,
-            order_by="screenPageViews",
-            descending=True
-        )
-
+    @staticmethod
+    def _parse_top_pages(report: GAReportResponse) -> list[GATopPage]:
         pages = []
         for row in report.rows:
             path = row.dimension_values[0].value if row.dimension_values else "/"
@@ -276,15 +470,8 @@ class GoogleAnalyticsService:
 
         return pages
 
-    async def get_device_breakdown(self, days: int = 30) -> list[GADeviceBreakdown]:
-        """Get device category breakdown."""
-        report = await self.run_report(
-            metrics=["activeUsers", "sessions"],
-            dimensions=["deviceCategory"],
-            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
-            limit=10
-        )
-
+    @staticmethod
+    def _parse_devices(report: GAReportResponse) -> list[GADeviceBreakdown]:
         devices = []
         total_sessions = sum(
             int(float(row.metric_values[1].value))
@@ -305,17 +492,8 @@ class GoogleAnalyticsService:
 
         return devices
 
-    async def get_geographic_data(self, days: int = 30, limit: int = 10) -> list[GAGeographicData]:
-        """Get geographic breakdown."""
-        report = await self.run_report(
-            metrics=["activeUsers", "sessions"],
-            dimensions=["country", "city"],
-            date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
-            limit=limit,
-            order_by="sessions",
-            descending=True
-        )
-
+    @staticmethod
+    def _parse_geo(report: GAReportResponse) -> list[GAGeographicData]:
         geo_data = []
         for row in report.rows:
             country = row.dimension_values[0].value if row.dimension_values else "Unknown"
@@ -332,40 +510,48 @@ class GoogleAnalyticsService:
 
         return geo_data
 
-    async def get_daily_traffic(self, days: int = 30) -> list[dict[str, Any]]:
-        """Get daily traffic over time."""
+    async def get_overview_metrics(self, days: int = 30) -> GAOverviewMetrics:
+        """
+        Get overview metrics for dashboard.
+
+        Args:
+            days: Number of days to look back
+
+        Returns:
+            GAOverviewMetrics with key metrics
+        """
         report = await self.run_report(
-            metrics=["activeUsers", "sessions", "screenPageViews"],
-            dimensions=["date"],
+            metrics=OVERVIEW_METRICS,
             date_ranges=[{"startDate": f"{days}daysAgo", "endDate": "today"}],
-            limit=days + 1,
-            order_by="date",
-            descending=False
         )
+        return self._parse_overview(report, days)
 
-        daily_data = []
-        for row in report.rows:
-            date_str = row.dimension_values[0].value if row.dimension_values else ""
+    async def get_traffic_sources(self, days: int = 30, limit: int = 10) -> list[GATrafficSource]:
+        """Get traffic sources breakdown."""
+        return self._parse_traffic_sources(await self._run(self._traffic_sources_request(days, limit)))
 
-            # Parse date (format: YYYYMMDD)
-            try:
-                date_obj = datetime.strptime(date_str, "%Y%m%d")
-                formatted_date = date_obj.strftime("%Y-%m-%d")
-            except ValueError:
-                formatted_date = date_str
+    async def get_top_pages(self, days: int = 30, limit: int = 10) -> list[GATopPage]:
+        """Get top pages by views."""
+        return self._parse_top_pages(await self._run(self._top_pages_request(days, limit)))
 
-            daily_data.append({
-                "date": formatted_date,
-                "users": int(float(row.metric_values[0].value)),
-                "sessions": int(float(row.metric_values[1].value)),
-                "pageViews": int(float(row.metric_values[2].value))
-            })
+    async def get_device_breakdown(self, days: int = 30) -> list[GADeviceBreakdown]:
+        """Get device category breakdown."""
+        return self._parse_devices(await self._run(self._device_request(days)))
 
-        return daily_data
+    async def get_geographic_data(self, days: int = 30, limit: int = 10) -> list[GAGeographicData]:
+        """Get geographic breakdown."""
+        return self._parse_geo(await self._run(self._geo_request(days, limit)))
+
+    async def get_daily_traffic(self, days: int = 30) -> list[dict[str, Any]]:
+        """Get daily traffic over time."""
+        return self._parse_daily_traffic(await self._run(self._overview_request(days)))
 
     async def get_full_dashboard(self, days: int = 30) -> GADashboardResponse:
         """
-        Get complete dashboard data in a single call.
+        Get complete dashboard data with a single `batchRunReports` call.
+
+        The overview comes from the TOTAL aggregation of the daily report,
+        so five requests cover all six dashboard sections.
 
         Args:
             days: Number of days to look back
@@ -373,46 +559,25 @@ class GoogleAnalyticsService:
         Returns:
             GADashboardResponse with all dashboard data
         """
-        # Run all queries concurrently
-        import asyncio
-
-        overview, sources, pages, devices, geo, daily = await asyncio.gather(
-            self.get_overview_metrics(days),
-            self.get_traffic_sources(days),
-            self.get_top_pages(days),
-            self.get_device_breakdown(days),
-            self.get_geographic_data(days),
-            self.get_daily_traffic(days),
-            return_exceptions=True
-        )
-
-        # Handle any exceptions
-        if isinstance(overview, Exception):
-            logger.error(f"Error getting overview: {overview}")
-            overview = GAOverviewMetrics(period=f"{days}d")
-        if isinstance(sources, Exception):
-            logger.error(f"Error getting sources: {sources}")
-            sources = []
-        if isinstance(pages, Exception):
-            logger.error(f"Error getting pages: {pages}")
-            pages = []
-        if isinstance(devices, Exception):
-            logger.error(f"Error getting devices: {devices}")
-            devices = []
-        if isinstance(geo, Exception):
-            logger.error(f"Error getting geo: {geo}")
-            geo = []
-        if isinstance(daily, Exception):
-            logger.error(f"Error getting daily: {daily}")
-            daily = []
+        try:
+            daily, sources, pages, devices, geo = await self.batch_run_reports([
+                self._overview_request(days),
+                self._traffic_sources_request(days),
+                self._top_pages_request(days),
+                self._device_request(days),
+                self._geo_request(days),
+            ])
+        except GA4ReportError as e:
+            logger.error(f"Error getting GA4 dashboard: {e}")
+            return GADashboardResponse(overview=GAOverviewMetrics(period=f"{days}d"))
 
         return GADashboardResponse(
-            overview=overview,
-            traffic_sources=sources,
-            top_pages=pages,
-            device_breakdown=devices,
-            geographic_data=geo,
-            daily_traffic=daily,
+            overview=self._parse_overview(daily, days),
+            traffic_sources=self._parse_traffic_sources(sources),
+            top_pages=self._parse_top_pages(pages),
+            device_breakdown=self._parse_devices(devices),
+            geographic_data=self._parse_geo(geo),
+            daily_traffic=self._parse_daily_traffic(daily),
             last_updated=datetime.utcnow()
         )
 
@@ -421,7 +586,7 @@ class GoogleAnalyticsService:
         url = "https://analyticsadmin.googleapis.com/v1beta/accounts"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(url, headers=self.headers, timeout=30.0)
 
                 if response.status_code != 200:
@@ -444,7 +609,7 @@ class GoogleAnalyticsService:
             params["filter"] = f"parent:accounts/{account_id}"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -0,0 +1,437 @@
+"""
+GA4 Warehouse - Storico giornaliero locale per le dashboard Analytics.
+
+Le dashboard e gli endpoint /analytics/* leggono da `ga4_daily_metrics`
+invece di interrogare GA4 a ogni pagina:
+- i giorni chiusi vengono scaricati una sola volta (batchRunReports, a
+  blocchi di GA4_WAREHOUSE_CHUNK_DAYS giorni)
+- gli ultimi GA4_WAREHOUSE_OPEN_DAYS giorni (GA4 rielabora i dati fino a
+  ~48h) vengono riscaricati in background al massimo ogni
+  GA4_WAREHOUSE_REFRESH_SECONDS secondi
+- la richiesta aspetta GA4 solo per i giorni mai scaricati
+
+Le finestre si ricostruiscono sommando le righe giornaliere: sessioni,
+visualizzazioni, conversioni e nuovi utenti sono esatti; gli utenti attivi
+sono la somma degli utenti attivi giornalieri (GA4 non espone utenti unici
+additivi per giorno).
+"""
+import asyncio
+import logging
+import os
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.session import SessionLocal
+
+from .analytics_service import DAILY_REPORTS, GA4ReportError, GoogleAnalyticsService
+from .models import GA4DailyMetric
+from .schemas import (
+    GADashboardResponse,
+    GADeviceBreakdown,
+    GAGeographicData,
+    GAOverviewMetrics,
+    GAReportResponse,
+    GATopPage,
+    GATrafficSource,
+)
+
+logger = logging.getLogger(__name__)
+
+OPEN_DAYS = int(os.getenv("GA4_WAREHOUSE_OPEN_DAYS", "2"))
+REFRESH_SECONDS = int(os.getenv("GA4_WAREHOUSE_REFRESH_SECONDS", "900"))
+CHUNK_DAYS = int(os.getenv("GA4_WAREHOUSE_CHUNK_DAYS", "31"))
+
+# Metrica GA4 -> colonna (additive)
+_METRIC_COLUMNS = {
+    "activeUsers": "active_users",
+    "newUsers": "new_users",
+    "sessions": "sessions",
+    "engagedSessions": "engaged_sessions",
+    "screenPageViews": "page_views",
+    "conversions": "conversions",
+}
+_SUM_COLUMNS = (*_METRIC_COLUMNS.values(), "session_duration")
+_KEY_SEPARATOR = "|"
+_KEY_MAX_LENGTH = 500
+
+
+def _contiguous_chunks(dates: Iterable[date], size: int) -> list[tuple[date, date]]:
+    """Raggruppa date ordinate in intervalli contigui lunghi al più `size` giorni."""
+    chunks: list[tuple[date, date]] = []
+    for d in sorted(set(dates)):
+        if chunks:
+            start, end = chunks[-1]
+            if d == end + timedelta(days=1) and (d - start).days < size:
+                chunks[-1] = (start, d)
+                continue
+        chunks.append((d, d))
+    return chunks
+
+
+class GA4Warehouse:
+    """
+    Sync incrementale e lettura dello storico GA4 giornaliero.
+
+    Example:
+        >>> service = await get_analytics_service(db, admin)
+        >>> dashboard = await ga4_warehouse.get_dashboard(db, service, days=30)
+    """
+
+    def __init__(self):
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(UTC).date()
+
+    def _window(self, days: int) -> tuple[date, date]:
+        # Stessa finestra di GA4 "{days}daysAgo" -> "today"
+        today = self._today()
+        return today - timedelta(days=days), today
+
+    def _lock(self, property_id: str) -> asyncio.Lock:
+        if property_id not in self._locks:
+            self._locks[property_id] = asyncio.Lock()
+        return self._locks[property_id]
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _plan(self, db: Session, property_id: str, start: date, end: date) -> tuple[list[date], list[date]]:
+        """
+        Giorni da scaricare: (mancanti, da aggiornare).
+
+        Un giorno chiuso è definitivo se l'ultimo sync è successivo alla sua
+        chiusura (giorno + OPEN_DAYS); i giorni aperti scadono dopo REFRESH_SECONDS.
+        """
+        synced = dict(
+            db.query(GA4DailyMetric.date, GA4DailyMetric.synced_at)
+            .filter(
+                GA4DailyMetric.property_id == property_id,
+                GA4DailyMetric.report == "total",
+                GA4DailyMetric.date >= start,
+                GA4DailyMetric.date <= end,
+            )
+            .all()
+        )
+
+        now = datetime.now(UTC)
+        first_open_day = self._today() - timedelta(days=OPEN_DAYS - 1)
+        missing: list[date] = []
+        stale: list[date] = []
+
+        day = start
+        while day <= end:
+            synced_at = synced.get(day)
+            if synced_at is None:
+                missing.append(day)
+            else:
+                if synced_at.tzinfo is None:
+                    synced_at = synced_at.replace(tzinfo=UTC)
+                if day >= first_open_day:
+                    if (now - synced_at).total_seconds() > REFRESH_SECONDS:
+                        stale.append(day)
+                elif synced_at.date() < day + timedelta(days=OPEN_DAYS):
+                    stale.append(day)
+            day += timedelta(days=1)
+
+        return missing, stale
+
+    async def ensure_synced(self, db: Session, service: GoogleAnalyticsService, days: int) -> None:
+        """
+        Garantisce che la finestra sia nel warehouse.
+
+        Scarica subito i giorni mai visti; i giorni da aggiornare vengono
+        riscaricati in background e la richiesta usa i dati già presenti.
+        """
+        start, end = self._window(days)
+        missing, stale = self._plan(db, service.property_id, start, end)
+
+        if missing:
+            async with self._lock(service.property_id):
+                # Un'altra richiesta può averli scaricati mentre aspettavamo
+                missing, stale = self._plan(db, service.property_id, start, end)
+                if missing:
+                    try:
+                        await self.sync_dates(db, service, missing + stale)
+                        stale = []
+                    except GA4ReportError as e:
+                        logger.error(f"GA4 warehouse sync failed for {service.property_id}: {e}")
+                    except IntegrityError:
+                        # Un altro worker ha scritto gli stessi giorni in parallelo
+                        # (_store ha già fatto rollback): si usano le sue righe
+                        logger.info(f"GA4 warehouse {service.property_id} synced concurrently by another worker")
+                        missing, stale = self._plan(db, service.property_id, start, end)
+
+        if stale:
+            self._schedule_refresh(service, stale)
+
+    async def sync_dates(self, db: Session, service: GoogleAnalyticsService, dates: Iterable[date]) -> int:
+        """Scarica e sostituisce i giorni indicati (un batch per intervallo). Ritorna le righe scritte."""
+        written = 0
+        for start, end in _contiguous_chunks(dates, CHUNK_DAYS):
+            reports = await service.fetch_daily_reports(start, end)
+            written += self._store(db, service.property_id, start, end, reports)
+
+        return written
+
+    def _store(
+        self,
+        db: Session,
+        property_id: str,
+        start: date,
+        end: date,
+        reports: dict[str, GAReportResponse],
+    ) -> int:
+        synced_at = datetime.now(UTC)
+        rows: dict[tuple[str, date, str], dict[str, Any]] = {}
+
+        def row_for(report: str, day: date, key: str, dimensions: dict[str, str] | None) -> dict[str, Any]:
+            row_key = (report, day, key)
+            if row_key not in rows:
+                rows[row_key] = {
+                    "property_id": property_id,
+                    "date": day,
+                    "report": report,
+                    "dimension_key": key,
+                    "dimensions": dimensions,
+                    "synced_at": synced_at,
+                    **{column: 0 for column in _SUM_COLUMNS},
+                }
+            return rows[row_key]
+
+        # Una riga "total" per ogni giorno, anche senza traffico: il giorno
+        # risulta scaricato e non viene richiesto di nuovo
+        day = start
+        while day <= end:
+            row_for("total", day, "", None)
+            day += timedelta(days=1)
+
+        for report_name, report in reports.items():
+            for report_row in report.rows:
+                values = [dv.value for dv in report_row.dimension_values]
+                try:
+                    day = datetime.strptime(values[0], "%Y%m%d").date()
+                except (IndexError, ValueError):
+                    continue
+
+                dimension_names = DAILY_REPORTS[report_name]["dimensions"]
+                dimensions = dict(zip(dimension_names, values[1:], strict=False)) or None
+                key = _KEY_SEPARATOR.join(values[1:])[:_KEY_MAX_LENGTH]
+                row = row_for(report_name, day, key, dimensions)
+
+                metrics = {mv.name: float(mv.value or 0) for mv in report_row.metric_values}
+                for metric, column in _METRIC_COLUMNS.items():
+                    if metric in metrics:
+                        row[column] += int(metrics[metric])
+                if "averageSessionDuration" in metrics:
+                    row["session_duration"] += metrics["averageSessionDuration"] * metrics.get("sessions", 0)
+
+        try:
+            db.query(GA4DailyMetric).filter(
+                GA4DailyMetric.property_id == property_id,
+                GA4DailyMetric.date >= start,
+                GA4DailyMetric.date <= end,
+            ).delete(synchronize_session=False)
+            db.bulk_insert_mappings(GA4DailyMetric, list(rows.values()))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        logger.info(f"GA4 warehouse synced {property_id} {start}..{end}: {len(rows)} rows")
+        return len(rows)
+
+    def _schedule_refresh(self, service: GoogleAnalyticsService, dates: list[date]) -> None:
+        if service.property_id in self._refreshing:
+            return
+        self._refreshing.add(service.property_id)
+        task = asyncio.create_task(self._refresh(service, dates))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, service: GoogleAnalyticsService, dates: list[date]) -> None:
+        db = SessionLocal()
+        try:
+            async with self._lock(service.property_id):
+                await self.sync_dates(db, service, dates)
+        except Exception as e:
+            logger.warning(f"GA4 warehouse background refresh failed for {service.property_id}: {e}")
+        finally:
+            db.close()
+            self._refreshing.discard(service.property_id)
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def _query(self, db: Session, property_id: str, report: str, days: int):
+        start, end = self._window(days)
+        return db.query(GA4DailyMetric).filter(
+            GA4DailyMetric.property_id == property_id,
+            GA4DailyMetric.report == report,
+            GA4DailyMetric.date >= start,
+            GA4DailyMetric.date <= end,
+        )
+
+    def _grouped(self, db: Session, property_id: str, report: str, days: int, order_by: str, limit: int) -> list[Any]:
+        sums = [func.coalesce(func.sum(getattr(GA4DailyMetric, column)), 0).label(column) for column in _SUM_COLUMNS]
+        return (
+            self._query(db, property_id, report, days)
+            .with_entities(GA4DailyMetric.dimension_key, *sums)
+            .group_by(GA4DailyMetric.dimension_key)
+            .order_by(func.sum(getattr(GA4DailyMetric, order_by)).desc())
+            .limit(limit)
+            .all()
+        )
+
+    def overview(self, db: Session, property_id: str, days: int) -> GAOverviewMetrics:
+        totals = self._query(db, property_id, "total", days).with_entities(
+            *[func.coalesce(func.sum(getattr(GA4DailyMetric, column)), 0).label(column) for column in _SUM_COLUMNS]
+        ).one()
+        sessions = totals.sessions or 0
+
+        return GAOverviewMetrics(
+            active_users=int(totals.active_users),
+            new_users=int(totals.new_users),
+            sessions=int(sessions),
+            page_views=int(totals.page_views),
+            bounce_rate=round((1 - totals.engaged_sessions / sessions) * 100, 2) if sessions else 0.0,
+            avg_session_duration=round(totals.session_duration / sessions, 2) if sessions else 0.0,
+            conversions=int(totals.conversions),
+            period=f"{days}d",
+        )
+
+    def daily_traffic(self, db: Session, property_id: str, days: int) -> list[dict[str, Any]]:
+        rows = self._query(db, property_id, "total", days).order_by(GA4DailyMetric.date).all()
+        return [
+            {
+                "date": row.date.isoformat(),
+                "users": row.active_users,
+                "sessions": row.sessions,
+                "pageViews": row.page_views,
+            }
+            for row in rows
+        ]
+
+    def traffic_sources(self, db: Session, property_id: str, days: int, limit: int = 10) -> list[GATrafficSource]:
+        rows = self._grouped(db, property_id, "source", days, "sessions", limit)
+        total_sessions = sum(int(row.sessions) for row in rows) or 1
+
+        sources = []
+        for row in rows:
+            source, _, medium = row.dimension_key.rpartition(_KEY_SEPARATOR)
+            sources.append(GATrafficSource(
+                source=source or "direct",
+                medium=medium or "(none)",
+                users=int(row.active_users),
+                sessions=int(row.sessions),
+                percentage=round((int(row.sessions) / total_sessions) * 100, 2),
+            ))
+        return sources
+
+    def top_pages(self, db: Session, property_id: str, days: int, limit: int = 10) -> list[GATopPage]:
+        rows = self._grouped(db, property_id, "page", days, "page_views", limit)
+        return [
+            GATopPage(
+                path=row.dimension_key or "/",
+                page_views=int(row.page_views),
+                unique_views=int(row.active_users),
+                avg_time_on_page=round(row.session_duration / row.sessions, 2) if row.sessions else 0.0,
+            )
+            for row in rows
+        ]
+
+    def device_breakdown(self, db: Session, property_id: str, days: int) -> list[GADeviceBreakdown]:
+        rows = self._grouped(db, property_id, "device", days, "sessions", 10)
+        total_sessions = sum(int(row.sessions) for row in rows) or 1
+        return [
+            GADeviceBreakdown(
+                device=row.dimension_key or "unknown",
+                users=int(row.active_users),
+                sessions=int(row.sessions),
+                percentage=round((int(row.sessions) / total_sessions) * 100, 2),
+            )
+            for row in rows
+        ]
+
+    def geographic_data(self, db: Session, property_id: str, days: int, limit: int = 10) -> list[GAGeographicData]:
+        rows = self._grouped(db, property_id, "geo", days, "sessions", limit)
+        geo_data = []
+        for row in rows:
+            country, _, city = row.dimension_key.partition(_KEY_SEPARATOR)
+            geo_data.append(GAGeographicData(
+                country=country or "Unknown",
+                city=city if city and city != "(not set)" else None,
+                users=int(row.active_users),
+                sessions=int(row.sessions),
+            ))
+        return geo_data
+
+    def last_synced(self, db: Session, property_id: str) -> datetime | None:
+        return db.query(func.max(GA4DailyMetric.synced_at)).filter(
+            GA4DailyMetric.property_id == property_id,
+            GA4DailyMetric.report == "total",
+        ).scalar()
+
+    # ------------------------------------------------------------------
+    # Endpoint helpers (sync + lettura)
+    # ------------------------------------------------------------------
+
+    async def get_dashboard(self, db: Session, service: GoogleAnalyticsService, days: int = 30) -> GADashboardResponse:
+        await self.ensure_synced(db, service, days)
+        property_id = service.property_id
+
+        return GADashboardResponse(
+            overview=self.overview(db, property_id, days),
+            traffic_sources=self.traffic_sources(db, property_id, days),
+            top_pages=self.top_pages(db, property_id, days),
+            device_breakdown=self.device_breakdown(db, property_id, days),
+            geographic_data=self.geographic_data(db, property_id, days),
+            daily_traffic=self.daily_traffic(db, property_id, days),
+            last_updated=self.last_synced(db, property_id) or datetime.now(UTC),
+        )
+
+    async def get_overview(self, db: Session, service: GoogleAnalyticsService, days: int = 30) -> GAOverviewMetrics:
+        await self.ensure_synced(db, service, days)
+        return self.overview(db, service.property_id, days)
+
+    async def get_daily_traffic(self, db: Session, service: GoogleAnalyticsService, days: int = 30) -> list[dict[str, Any]]:
+        await self.ensure_synced(db, service, days)
+        return self.daily_traffic(db, service.property_id, days)
+
+    async def get_traffic_sources(
+        self, db: Session, service: GoogleAnalyticsService, days: int = 30, limit: int = 10
+    ) -> list[GATrafficSource]:
+        await self.ensure_synced(db, service, days)
+        return self.traffic_sources(db, service.property_id, days, limit)
+
+    async def get_top_pages(
+        self, db: Session, service: GoogleAnalyticsService, days: int = 30, limit: int = 10
+    ) -> list[GATopPage]:
+        await self.ensure_synced(db, service, days)
+        return self.top_pages(db, service.property_id, days, limit)
+
+    async def get_device_breakdown(
+        self, db: Session, service: GoogleAnalyticsService, days: int = 30
+    ) -> list[GADeviceBreakdown]:
+        await self.ensure_synced(db, service, days)
+        return self.device_breakdown(db, service.property_id, days)
+
+    async def get_geographic_data(
+        self, db: Session, service: GoogleAnalyticsService, days: int = 30, limit: int = 10
+    ) -> list[GAGeographicData]:
+        await self.ensure_synced(db, service, days)
+        return self.geographic_data(db, service.property_id, days, limit)
+
+
+# Singleton instance
+ga4_warehouse = GA4Warehouse()
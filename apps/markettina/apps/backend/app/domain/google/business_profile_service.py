@@ -6,10 +6,10 @@ import logging
 from datetime import date, datetime, timedelta
 from typing import Any, Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
-from app.domain.auth.oauth_tokens import OAuthProvider, OAuthTokenService
+from app.core.google.token_manager import GoogleTokenManager
+from app.infrastructure.http import http_clients
 
 from .schemas import (
     GMBDashboardResponse,
@@ -58,7 +58,7 @@ class GoogleBusinessProfileService:
         }
 
     @classmethod
-    def from_admin_token(
+    async def from_admin_token(
         cls,
         db: Session,
         admin_id: int,
@@ -66,7 +66,7 @@ class GoogleBusinessProfileService:
         location_id: str | None = None
     ) -> Optional["GoogleBusinessProfileService"]:
         """
-        Create service instance from admin's stored OAuth token.
+        Create service instance from admin's OAuth token (shared Google token cache).
 
         Args:
             db: Database session
@@ -77,10 +77,11 @@ class GoogleBusinessProfileService:
         Returns:
             GoogleBusinessProfileService instance or None if no valid token
         """
-        token = OAuthTokenService.get_valid_token(db, admin_id, OAuthProvider.GOOGLE)
-        if not token:
+        token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin_id)
+        if not token_data:
             logger.warning(f"No valid Google OAuth token for admin {admin_id}")
             return None
+        token = token_data["access_token"]
         return cls(access_token=token, account_id=account_id, location_id=location_id)
 
     async def list_accounts(self) -> list[dict[str, Any]]:
@@ -88,7 +89,7 @@ class GoogleBusinessProfileService:
         url = f"{GMB_ACCOUNT_API}/accounts"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(url, headers=self.headers, timeout=30.0)
 
                 if response.status_code != 200:
@@ -117,7 +118,7 @@ class GoogleBusinessProfileService:
         params = {"readMask": "name,title,storefrontAddress,phoneNumbers,websiteUri,metadata"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -151,7 +152,7 @@ class GoogleBusinessProfileService:
         params = {"readMask": "name,title,storefrontAddress,phoneNumbers,websiteUri,metadata"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -231,7 +232,7 @@ class GoogleBusinessProfileService:
             params["pageToken"] = page_token
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -334,7 +335,7 @@ class GoogleBusinessProfileService:
         body = {"comment": reply_text}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.put(
                     url,
                     headers=self.headers,
@@ -427,7 +428,7 @@ class GoogleBusinessProfileService:
             }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -470,7 +471,7 @@ class GoogleBusinessProfileService:
             params["pageToken"] = page_token
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -584,7 +585,7 @@ class GoogleBusinessProfileService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -7,10 +7,10 @@ import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any, Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
+from app.core.google.token_manager import GoogleTokenManager
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -18,72 +18,6 @@ logger = logging.getLogger(__name__)
 CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
 
 
-def get_admin_google_token(db: Session, admin_id: int) -> str | None:
-    """
-    Get valid Google OAuth token for admin from admin_google_settings.
-
-    Returns None if no token found or token expired and refresh failed.
-    """
-    from datetime import datetime
-
-    import httpx
-
-    from app.domain.google.models import AdminGoogleSettings
-
-    settings_obj = db.query(AdminGoogleSettings).filter(
-        AdminGoogleSettings.admin_id == admin_id
-    ).first()
-
-    if not settings_obj or not settings_obj.access_token:
-        logger.warning(f"No Google settings found for admin {admin_id}")
-        return None
-
-    # Check if token is expired
-    if settings_obj.token_expires_at:
-        now = datetime.now(UTC)
-        if settings_obj.token_expires_at.replace(tzinfo=UTC) > now:
-            # Token still valid
-            return settings_obj.access_token
-
-    # Token expired, try to refresh
-    if not settings_obj.refresh_token:
-        logger.warning(f"No refresh token for admin {admin_id}")
-        return None
-
-    try:
-        logger.info(f"Refreshing Google token for admin {admin_id}")
-
-        response = httpx.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "refresh_token": settings_obj.refresh_token,
-                "grant_type": "refresh_token"
-            },
-            timeout=10.0
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Update tokens
-            settings_obj.access_token = data["access_token"]
-            settings_obj.token_expires_at = datetime.now(UTC).replace(
-                microsecond=0
-            ) + timedelta(seconds=data.get("expires_in", 3600))
-
-            db.commit()
-            logger.info(f"Google token refreshed for admin {admin_id}")
-            return settings_obj.access_token
-        logger.error(f"Token refresh failed for admin {admin_id}: {response.status_code}")
-        return None
-
-    except Exception as e:
-        logger.error(f"Error refreshing token for admin {admin_id}: {e}", exc_info=True)
-        return None
-
-
 class GoogleCalendarService:
     """Service for Google Calendar API with Meet integration."""
 
@@ -103,17 +37,18 @@ class GoogleCalendarService:
         }
 
     @classmethod
-    def from_admin_token(
+    async def from_admin_token(
         cls,
         db: Session,
         admin_id: int,
         calendar_id: str = "primary"
     ) -> Optional["GoogleCalendarService"]:
-        """Create service instance from admin's stored OAuth token in admin_google_settings."""
-        token = get_admin_google_token(db, admin_id)
-        if not token:
+        """Create service instance from admin's OAuth token (shared Google token cache)."""
+        token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin_id)
+        if not token_data:
             logger.warning(f"No valid Google OAuth token for admin {admin_id}")
             return None
+        token = token_data["access_token"]
         return cls(access_token=token, calendar_id=calendar_id)
 
     async def create_event_with_meet(
@@ -180,7 +115,7 @@ class GoogleCalendarService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -264,7 +199,7 @@ class GoogleCalendarService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.patch(
                     url,
                     headers=self.headers,
@@ -295,7 +230,7 @@ class GoogleCalendarService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.delete(
                     url,
                     headers=self.headers,
@@ -318,7 +253,7 @@ class GoogleCalendarService:
         url = f"{CALENDAR_API_BASE}/calendars/{self.calendar_id}/events/{event_id}"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -358,7 +293,7 @@ class GoogleCalendarService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -400,7 +335,7 @@ class GoogleCalendarService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -429,7 +364,7 @@ class GoogleCalendarService:
         url = f"{CALENDAR_API_BASE}/users/me/calendarList"
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -470,7 +405,7 @@ async def create_booking_with_meet(
     Returns:
         Dict with event_id, meet_link, html_link, etc.
     """
-    service = GoogleCalendarService.from_admin_token(db, admin_id)
+    service = await GoogleCalendarService.from_admin_token(db, admin_id)
     if not service:
         logger.error(f"Could not create calendar service for admin {admin_id}")
         return None
@@ -514,7 +449,7 @@ async def update_booking_event(
     new_title: str | None = None
 ) -> dict[str, Any] | None:
     """Update an existing booking calendar event."""
-    service = GoogleCalendarService.from_admin_token(db, admin_id)
+    service = await GoogleCalendarService.from_admin_token(db, admin_id)
     if not service:
         return None
 
@@ -537,7 +472,7 @@ async def cancel_booking_event(
     event_id: str
 ) -> bool:
     """Cancel/delete a booking calendar event."""
-    service = GoogleCalendarService.from_admin_token(db, admin_id)
+    service = await GoogleCalendarService.from_admin_token(db, admin_id)
     if not service:
         return False
 
@@ -558,7 +493,7 @@ async def get_available_slots(
     Returns:
         List of available slots with start and end times
     """
-    service = GoogleCalendarService.from_admin_token(db, admin_id)
+    service = await GoogleCalendarService.from_admin_token(db, admin_id)
     if not service:
         return []
 
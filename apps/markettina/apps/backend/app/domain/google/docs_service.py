@@ -7,11 +7,11 @@ import logging
 from datetime import datetime
 from typing import Any, Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.domain.auth.oauth_tokens import OAuthProvider, OAuthTokenService
+from app.core.google.token_manager import GoogleTokenManager
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +37,13 @@ class GoogleDocsService:
         }
 
     @classmethod
-    def from_admin_token(cls, db: Session, admin_id: int) -> Optional["GoogleDocsService"]:
-        """Create service instance from admin's stored OAuth token."""
-        token = OAuthTokenService.get_valid_token(db, admin_id, OAuthProvider.GOOGLE)
-        if not token:
+    async def from_admin_token(cls, db: Session, admin_id: int) -> Optional["GoogleDocsService"]:
+        """Create service instance from admin's OAuth token (shared Google token cache)."""
+        token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin_id)
+        if not token_data:
             logger.warning(f"No valid Google OAuth token for admin {admin_id}")
             return None
+        token = token_data["access_token"]
         return cls(access_token=token)
 
     async def copy_template(
@@ -69,7 +70,7 @@ class GoogleDocsService:
             body["parents"] = [folder_id]
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -119,7 +120,7 @@ class GoogleDocsService:
         body = {"requests": requests}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -151,7 +152,7 @@ class GoogleDocsService:
         params = {"mimeType": "application/pdf"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers={"Authorization": f"Bearer {self.access_token}"},
@@ -213,7 +214,7 @@ class GoogleDocsService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=headers,
@@ -256,7 +257,7 @@ class GoogleDocsService:
             }
 
             try:
-                async with httpx.AsyncClient() as client:
+                async with http_clients.client("google") as client:
                     response = await client.post(
                         url,
                         headers=self.headers,
@@ -275,7 +276,7 @@ class GoogleDocsService:
         params = {"fields": "webViewLink,webContentLink"}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -309,7 +310,7 @@ class GoogleDocsService:
             body["parents"] = [parent_id]
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -349,7 +350,7 @@ class GoogleDocsService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -406,7 +407,7 @@ async def generate_quote_pdf(
     Returns:
         Dict with pdf_id, pdf_link, doc_id, doc_link
     """
-    service = GoogleDocsService.from_admin_token(db, admin_id)
+    service = await GoogleDocsService.from_admin_token(db, admin_id)
     if not service:
         logger.error("Could not create Docs service")
         return None
@@ -508,7 +509,7 @@ async def get_or_create_quotes_folder(
     admin_id: int
 ) -> str | None:
     """Get or create a folder for storing quotes."""
-    service = GoogleDocsService.from_admin_token(db, admin_id)
+    service = await GoogleDocsService.from_admin_token(db, admin_id)
     if not service:
         return None
 
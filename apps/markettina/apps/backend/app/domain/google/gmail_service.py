@@ -9,10 +9,10 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Any, Optional
 
-import httpx
 from sqlalchemy.orm import Session
 
-from app.domain.auth.oauth_tokens import OAuthProvider, OAuthTokenService
+from app.core.google.token_manager import GoogleTokenManager
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +37,13 @@ class GmailService:
         }
 
     @classmethod
-    def from_admin_token(cls, db: Session, admin_id: int) -> Optional["GmailService"]:
-        """Create service instance from admin's stored OAuth token."""
-        token = OAuthTokenService.get_valid_token(db, admin_id, OAuthProvider.GOOGLE)
-        if not token:
+    async def from_admin_token(cls, db: Session, admin_id: int) -> Optional["GmailService"]:
+        """Create service instance from admin's OAuth token (shared Google token cache)."""
+        token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin_id)
+        if not token_data:
             logger.warning(f"No valid Google OAuth token for admin {admin_id}")
             return None
+        token = token_data["access_token"]
         return cls(access_token=token)
 
     def _create_message(
@@ -122,7 +123,7 @@ class GmailService:
         body = {"raw": raw}
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.post(
                     url,
                     headers=self.headers,
@@ -435,7 +436,7 @@ async def send_booking_confirmation(
     calendar_link: str | None = None
 ) -> bool:
     """Send booking confirmation email."""
-    service = GmailService.from_admin_token(db, admin_id)
+    service = await GmailService.from_admin_token(db, admin_id)
     if not service:
         logger.error("Could not create Gmail service")
         return False
@@ -470,7 +471,7 @@ async def send_booking_reminder(
     hours_before: int = 24
 ) -> bool:
     """Send booking reminder email."""
-    service = GmailService.from_admin_token(db, admin_id)
+    service = await GmailService.from_admin_token(db, admin_id)
     if not service:
         return False
 
@@ -503,7 +504,7 @@ async def send_quote_email(
     quote_pdf_link: str
 ) -> bool:
     """Send quote/preventivo email with PDF link."""
-    service = GmailService.from_admin_token(db, admin_id)
+    service = await GmailService.from_admin_token(db, admin_id)
     if not service:
         return False
 
@@ -3,7 +3,7 @@ Google Integration Models - Database models for Google settings
 """
 from datetime import UTC, datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import JSON, Column, Date, DateTime, Float, Index, Integer, String, Text, UniqueConstraint
 
 from app.infrastructure.database.session import Base
 
@@ -35,3 +35,36 @@ class AdminGoogleSettings(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+
+
+class GA4DailyMetric(Base):
+    """
+    Warehouse locale GA4 a granularità giornaliera.
+
+    Una riga per (property, giorno, report, valore delle dimensioni), con
+    solo metriche additive: i rapporti (bounce rate, durata media) si
+    ricostruiscono sommando engaged_sessions e session_duration.
+    """
+    __tablename__ = "ga4_daily_metrics"
+    __table_args__ = (
+        UniqueConstraint("property_id", "report", "date", "dimension_key", name="uq_ga4_daily_metrics_row"),
+        Index("ix_ga4_daily_metrics_lookup", "property_id", "report", "date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    property_id = Column(String(100), nullable=False)
+    date = Column(Date, nullable=False)
+    # total | source | page | device | geo
+    report = Column(String(20), nullable=False)
+    dimension_key = Column(String(500), nullable=False, default="")
+    dimensions = Column(JSON, nullable=True)
+
+    active_users = Column(Integer, nullable=False, default=0)
+    new_users = Column(Integer, nullable=False, default=0)
+    sessions = Column(Integer, nullable=False, default=0)
+    engaged_sessions = Column(Integer, nullable=False, default=0)
+    page_views = Column(Integer, nullable=False, default=0)
+    session_duration = Column(Float, nullable=False, default=0.0)  # secondi totali
+    conversions = Column(Integer, nullable=False, default=0)
+
+    synced_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
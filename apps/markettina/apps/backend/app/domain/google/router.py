@@ -15,6 +15,7 @@ from app.domain.auth.admin_models import AdminUser
 from app.infrastructure.database.session import get_db
 
 from .analytics_service import GoogleAnalyticsService
+from .analytics_warehouse import ga4_warehouse
 from .business_profile_service import GoogleBusinessProfileService
 from .models import AdminGoogleSettings
 from .schemas import (
@@ -54,7 +55,7 @@ class GMBLocationsResponse(BaseModel):
 # OAUTH ENDPOINTS - Using unified Google OAuth service
 # ============================================================================
 
-from app.core.google import google_oauth_service
+from app.core.google import GoogleTokenManager, google_oauth_service
 
 
 @router.get("/connect")
@@ -154,6 +155,7 @@ async def google_oauth_callback(
         google_settings.updated_at = datetime.now(UTC)
 
         db.commit()
+        await GoogleTokenManager.invalidate(admin_id=admin_id)
 
         logger.info(f"Google OAuth connected for admin {admin_id} - scopes: {scope}")
 
@@ -176,8 +178,6 @@ async def get_google_connection_status(
     admin: AdminUser = Depends(get_current_admin_user)
 ):
     """Get current Google integration connection status."""
-    from app.core.google import GoogleTokenManager
-
     google_settings = db.query(AdminGoogleSettings).filter(
         AdminGoogleSettings.admin_id == admin.id
     ).first()
@@ -222,6 +222,8 @@ async def disconnect_google(
         google_settings.scopes = None
         db.commit()
 
+    await GoogleTokenManager.invalidate(admin_id=admin.id)
+
     logger.info(f"Google disconnected successfully for admin {admin.id}")
 
     return {"message": "Google disconnected successfully"}
@@ -235,30 +237,16 @@ async def get_analytics_service(
     db: Session,
     admin: AdminUser
 ) -> GoogleAnalyticsService:
-    """Get configured GA4 service for admin."""
-    from app.core.google import GoogleTokenManager
-
-    google_settings = db.query(AdminGoogleSettings).filter(
-        AdminGoogleSettings.admin_id == admin.id
-    ).first()
-
-    if not google_settings or not google_settings.access_token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Google Analytics not connected. Please connect your Google account."
-        )
-
-    # Use GoogleTokenManager to get valid token (auto-refreshes if expired)
-    token_manager = GoogleTokenManager(db)
-    valid_token_data = await token_manager.get_valid_token(admin_id=admin.id)
+    """Get configured GA4 service for admin (token and property from the shared token cache)."""
+    valid_token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin.id)
 
     if not valid_token_data:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Google token expired and refresh failed. Please reconnect your Google account."
+            detail="Google Analytics not connected or token expired. Please connect your Google account."
         )
 
-    property_id = google_settings.ga4_property_id or "properties/467399370"  # Default property
+    property_id = valid_token_data.get("ga4_property_id") or "properties/467399370"  # Default property
 
     return GoogleAnalyticsService(
         access_token=valid_token_data["access_token"],
@@ -272,9 +260,9 @@ async def get_analytics_dashboard(
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin_user)
 ):
-    """Get complete GA4 dashboard data."""
+    """Get complete GA4 dashboard data (served from the local GA4 warehouse)."""
     service = await get_analytics_service(db, admin)
-    return await service.get_full_dashboard(days=days)
+    return await ga4_warehouse.get_dashboard(db, service, days=days)
 
 
 @router.get("/analytics/overview", response_model=GAOverviewMetrics)
@@ -285,7 +273,7 @@ async def get_analytics_overview(
 ):
     """Get overview metrics for GA4."""
     service = await get_analytics_service(db, admin)
-    return await service.get_overview_metrics(days=days)
+    return await ga4_warehouse.get_overview(db, service, days=days)
 
 
 @router.get("/analytics/traffic")
@@ -296,7 +284,7 @@ async def get_analytics_traffic(
 ):
     """Get daily traffic data."""
     service = await get_analytics_service(db, admin)
-    return await service.get_daily_traffic(days=days)
+    return await ga4_warehouse.get_daily_traffic(db, service, days=days)
 
 
 @router.get("/analytics/sources")
@@ -308,7 +296,7 @@ async def get_analytics_sources(
 ):
     """Get traffic sources."""
     service = await get_analytics_service(db, admin)
-    return await service.get_traffic_sources(days=days, limit=limit)
+    return await ga4_warehouse.get_traffic_sources(db, service, days=days, limit=limit)
 
 
 @router.get("/analytics/pages")
@@ -320,7 +308,7 @@ async def get_analytics_top_pages(
 ):
     """Get top pages."""
     service = await get_analytics_service(db, admin)
-    return await service.get_top_pages(days=days, limit=limit)
+    return await ga4_warehouse.get_top_pages(db, service, days=days, limit=limit)
 
 
 @router.get("/analytics/devices")
@@ -331,7 +319,7 @@ async def get_analytics_devices(
 ):
     """Get device breakdown."""
     service = await get_analytics_service(db, admin)
-    return await service.get_device_breakdown(days=days)
+    return await ga4_warehouse.get_device_breakdown(db, service, days=days)
 
 
 @router.get("/analytics/geo")
@@ -343,7 +331,7 @@ async def get_analytics_geo(
 ):
     """Get geographic data."""
     service = await get_analytics_service(db, admin)
-    return await service.get_geographic_data(days=days, limit=limit)
+    return await ga4_warehouse.get_geographic_data(db, service, days=days, limit=limit)
 
 
 @router.get("/analytics/properties", response_model=GAPropertiesResponse)
@@ -394,6 +382,7 @@ async def select_analytics_property(
 
     google_settings.updated_at = datetime.now(UTC)
     db.commit()
+    await GoogleTokenManager.invalidate(admin_id=admin.id)
 
     return {"message": "Property selected successfully"}
 
@@ -406,27 +395,19 @@ async def get_business_service(
     db: Session,
     admin: AdminUser
 ) -> GoogleBusinessProfileService:
-    """Get configured GMB service for admin."""
-    google_settings = db.query(AdminGoogleSettings).filter(
-        AdminGoogleSettings.admin_id == admin.id
-    ).first()
-
-    if not google_settings or not google_settings.access_token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Google Business Profile not connected. Please connect your Google account."
-        )
+    """Get configured GMB service for admin (token and location from the shared token cache)."""
+    valid_token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin.id)
 
-    if google_settings.token_expires_at and google_settings.token_expires_at < datetime.now(UTC):
+    if not valid_token_data:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Google token expired. Please reconnect your Google account."
+            detail="Google Business Profile not connected or token expired. Please connect your Google account."
         )
 
     return GoogleBusinessProfileService(
-        access_token=google_settings.access_token,
-        account_id=google_settings.gmb_account_id,
-        location_id=google_settings.gmb_location_id
+        access_token=valid_token_data["access_token"],
+        account_id=valid_token_data.get("gmb_account_id"),
+        location_id=valid_token_data.get("gmb_location_id")
     )
 
 
@@ -568,6 +549,7 @@ async def select_business_location(
 
     google_settings.updated_at = datetime.now(UTC)
     db.commit()
+    await GoogleTokenManager.invalidate(admin_id=admin.id)
 
     return {"message": "Location selected successfully"}
 
@@ -666,7 +648,7 @@ async def list_calendar_events(
     admin: AdminUser = Depends(get_current_admin_user)
 ):
     """List upcoming calendar events."""
-    service = GoogleCalendarService.from_admin_token(db, admin.id)
+    service = await GoogleCalendarService.from_admin_token(db, admin.id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -721,7 +703,7 @@ async def list_calendars(
     admin: AdminUser = Depends(get_current_admin_user)
 ):
     """List all calendars accessible to the user."""
-    service = GoogleCalendarService.from_admin_token(db, admin.id)
+    service = await GoogleCalendarService.from_admin_token(db, admin.id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -795,7 +777,7 @@ async def send_email(
     admin: AdminUser = Depends(get_current_admin_user)
 ):
     """Send a custom email via Gmail."""
-    service = GmailService.from_admin_token(db, admin.id)
+    service = await GmailService.from_admin_token(db, admin.id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -978,7 +960,7 @@ async def list_doc_templates(
     admin: AdminUser = Depends(get_current_admin_user)
 ):
     """List available document templates."""
-    service = GoogleDocsService.from_admin_token(db, admin.id)
+    service = await GoogleDocsService.from_admin_token(db, admin.id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -999,7 +981,7 @@ async def list_generated_quotes(
     admin: AdminUser = Depends(get_current_admin_user)
 ):
     """List generated quotes."""
-    service = GoogleDocsService.from_admin_token(db, admin.id)
+    service = await GoogleDocsService.from_admin_token(db, admin.id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1031,7 +1013,7 @@ async def get_search_console_service(
     admin: AdminUser
 ) -> GoogleSearchConsoleService:
     """Get configured Search Console service for admin."""
-    service = GoogleSearchConsoleService.from_admin_token(db, admin.id)
+    service = await GoogleSearchConsoleService.from_admin_token(db, admin.id)
     if not service:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1112,7 +1094,7 @@ async def get_search_console_dashboard(
         }
 
     try:
-        service = GoogleSearchConsoleService.from_admin_token(db, admin.id)
+        service = await GoogleSearchConsoleService.from_admin_token(db, admin.id)
         if not service:
             raise ValueError("Service initialization failed")
         dashboard = service.get_full_seo_dashboard(days)
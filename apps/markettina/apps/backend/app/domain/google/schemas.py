@@ -77,6 +77,7 @@ class GAReportResponse(BaseModel):
     """Response from GA4 report."""
     rows: list[GAReportRow] = Field(default_factory=list)
     row_count: int = 0
+    totals: list[GAReportRow] = Field(default_factory=list)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
@@ -11,7 +11,7 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from sqlalchemy.orm import Session
 
-from .models import AdminGoogleSettings
+from app.core.google.token_manager import GoogleTokenManager
 
 logger = logging.getLogger(__name__)
 
@@ -27,30 +27,25 @@ class GoogleSearchConsoleService:
         self.service = build("searchconsole", "v1", credentials=credentials)
 
     @classmethod
-    def from_admin_token(cls, db: Session, admin_id: int) -> Optional["GoogleSearchConsoleService"]:
-        """Create service from admin's stored Google token."""
-        from app.core.config import settings
-
-        google_settings = db.query(AdminGoogleSettings).filter(
-            AdminGoogleSettings.admin_id == admin_id
-        ).first()
-
-        if not google_settings or not google_settings.access_token:
+    async def from_admin_token(cls, db: Session, admin_id: int) -> Optional["GoogleSearchConsoleService"]:
+        """
+        Create service from admin's Google token (shared Google token cache).
+
+        The cached access token is refreshed ahead of expiry by the cache,
+        so the credentials carry no refresh token of their own.
+        """
+        token_data = await GoogleTokenManager(db).get_valid_token(admin_id=admin_id)
+        if not token_data:
             return None
 
         # Check if webmasters scope is present
-        scopes = google_settings.scopes or ""
+        scopes = token_data.get("scopes") or ""
         if "webmasters" not in scopes.lower():
             return None
 
-        # Create credentials using app's OAuth client credentials
         credentials = Credentials(
-            token=google_settings.access_token,
-            refresh_token=google_settings.refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            scopes=google_settings.scopes.split() if google_settings.scopes else []
+            token=token_data["access_token"],
+            scopes=scopes.split()
         )
 
         return cls(credentials)
@@ -6,7 +6,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-import httpx
+
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +54,7 @@ class GoogleTrendsService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
@@ -131,7 +132,7 @@ class GoogleTrendsService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("google") as client:
                 response = await client.get(
                     url,
                     headers=self.headers,
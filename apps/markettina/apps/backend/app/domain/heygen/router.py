@@ -13,6 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.core.api.dependencies.auth_deps import get_current_admin_user
+from app.infrastructure.http import http_clients
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/admin/heygen", tags=["HeyGen Integration"])
@@ -77,7 +78,7 @@ async def list_avatars(current_user = Depends(get_current_admin_user)):
     """
     try:
         headers = get_heygen_headers()
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.get(
                 f"{HEYGEN_API_URL}/v2/avatars",
                 headers=headers
@@ -126,7 +127,7 @@ async def list_voices(
     """
     try:
         headers = get_heygen_headers()
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.get(
                 f"{HEYGEN_API_URL}/v2/voices",
                 headers=headers
@@ -217,7 +218,7 @@ async def generate_video(
                    platform=request.platform,
                    avatar=request.avatar_id)
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_clients.client("ai", timeout=60.0) as client:
             response = await client.post(
                 f"{HEYGEN_API_URL}/v2/video/generate",
                 headers=headers,
@@ -267,7 +268,7 @@ async def get_video_status(
     try:
         headers = get_heygen_headers()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.get(
                 f"{HEYGEN_API_URL}/v1/video_status.get",
                 headers=headers,
@@ -313,7 +314,7 @@ async def list_videos(current_user = Depends(get_current_admin_user)):
     try:
         headers = get_heygen_headers()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.get(
                 f"{HEYGEN_API_URL}/v1/video.list",
                 headers=headers
@@ -345,7 +346,7 @@ async def delete_video(
     try:
         headers = get_heygen_headers()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.delete(
                 f"{HEYGEN_API_URL}/v1/video.delete",
                 headers=headers,
@@ -379,7 +380,7 @@ async def get_quota(current_user = Depends(get_current_admin_user)):
     try:
         headers = get_heygen_headers()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("ai", timeout=30.0) as client:
             response = await client.get(
                 f"{HEYGEN_API_URL}/v2/user/remaining_quota",
                 headers=headers
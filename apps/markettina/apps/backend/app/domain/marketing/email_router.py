@@ -5,13 +5,14 @@ Endpoints for email campaign management and sending
 
 from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.api.dependencies.auth_deps import get_current_admin_user
 from app.core.api.dependencies.database import get_db
+from app.core.api.v1.jobs_router import enqueue_job
 
 from .email_service import EmailMessage, EmailRecipient, email_service
 
@@ -327,17 +328,26 @@ async def send_campaign(
     campaign_id: int,
     request: SendCampaignRequest | None = None,
     background_tasks: BackgroundTasks = None,
+    background: bool = Query(False, description="Send from the queue worker and return a job_id"),
     db: Session = Depends(get_db),
     _current_user=Depends(get_current_admin_user)
 ):
     """
     Send email campaign to all targeted leads.
-    Runs in background for large campaigns.
+    With background=true the campaign is sent by the queue worker and the
+    endpoint returns 202 with a job_id (status on /api/v1/jobs/{job_id}).
     """
     batch_size = request.batch_size if request else 50
     delay_seconds = request.delay_seconds if request else 1.0
 
-    # For now, send synchronously (could be moved to background)
+    if background:
+        # Single attempt: a retry could send the same email twice
+        return await enqueue_job(
+            "send_campaign",
+            {"campaign_id": campaign_id, "batch_size": batch_size, "delay_seconds": delay_seconds},
+            max_retries=0,
+        )
+
     result = await email_service.send_campaign(
         db=db,
         campaign_id=campaign_id,
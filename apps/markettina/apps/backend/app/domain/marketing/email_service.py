@@ -12,11 +12,11 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-import httpx
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 
 class EmailProvider(str, Enum):
@@ -145,7 +145,7 @@ class EmailMarketingService:
                 if message.tags:
                     payload["categories"] = message.tags[:10]  # SendGrid max 10 categories
 
-                async with httpx.AsyncClient() as client:
+                async with http_clients.client("email") as client:
                     response = await client.post(
                         "https://api.sendgrid.com/v3/mail/send",
                         headers={
@@ -213,7 +213,7 @@ class EmailMarketingService:
                 for key, value in message.custom_headers.items():
                     form_data[f"h:{key}"] = value
 
-                async with httpx.AsyncClient() as client:
+                async with http_clients.client("email") as client:
                     response = await client.post(
                         f"https://api.mailgun.net/v3/{self.mailgun_domain}/messages",
                         auth=("api", self.mailgun_api_key),
@@ -10,12 +10,13 @@ Endpoints:
 
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.core.api.dependencies.auth_deps import get_current_admin_user
 from app.core.api.dependencies.database import get_db
+from app.core.api.v1.jobs_router import enqueue_job
 from app.domain.auth.admin_models import AdminUser
 
 from .lead_enrichment_service import LeadEnrichmentService
@@ -202,6 +203,7 @@ async def enrich_lead(
 @router.post("/bulk-enrich", response_model=BulkEnrichResponse)
 async def bulk_enrich_leads(
     request: BulkEnrichRequest,
+    background: bool = Query(False, description="Esegui nel worker e ritorna un job_id"),
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin_user)
 ):
@@ -210,7 +212,11 @@ async def bulk_enrich_leads(
 
     Max 100 lead per richiesta.
     Esegue fino a 5 arricchimenti in parallelo.
+    Con background=true ritorna 202 con job_id (stato su /api/v1/jobs/{job_id}).
     """
+    if background:
+        return await enqueue_job("bulk_enrich_leads", {"lead_ids": request.lead_ids})
+
     service = LeadEnrichmentService(db)
 
     try:
@@ -21,6 +21,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -39,10 +40,10 @@ class LeadEnrichmentService:
     async def get_http_client(self) -> httpx.AsyncClient:
         """Lazy init HTTP client."""
         if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+            self._http_client = http_clients.client(
+                "leads",
                 timeout=httpx.Timeout(10.0, connect=5.0),
                 follow_redirects=True,
-                limits=httpx.Limits(max_connections=20, max_keepalive_connections=5)
             )
         return self._http_client
 
@@ -29,6 +29,7 @@ from app.domain.marketing.schemas import (
     ScheduledPostUpdate,
 )
 from app.infrastructure.database import get_db
+from app.infrastructure.http import http_clients
 from app.infrastructure.scheduler import post_scheduler
 
 logger = structlog.get_logger(__name__)
@@ -476,7 +477,6 @@ def get_calendar_stats(
 
 import os
 
-import httpx
 from pydantic import BaseModel, Field
 
 
@@ -567,7 +567,7 @@ async def ai_generate_campaign(
         "reminder"
     ]
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
+    async with http_clients.client("ai", timeout=120.0) as client:
         for i, post_date in enumerate(posting_dates):
             theme = themes[i % len(themes)]
             days_remaining = (data.end_date - post_date).days
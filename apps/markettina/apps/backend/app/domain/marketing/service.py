@@ -7,11 +7,12 @@ import json
 import logging
 import os
 
-import httpx
 from fastapi import HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.infrastructure.http import http_clients
+
 from .models import BrandSettings
 from .schemas import (
     EmailCampaignCreate,
@@ -256,7 +257,7 @@ Target: {brand.target_audience or ''}
         ai_url = os.getenv("AI_SERVICE_URL", "http://ai-service:8001")
 
         try:
-             async with httpx.AsyncClient() as client:
+             async with http_clients.client("ai") as client:
                 response = await client.post(
                     f"{ai_url}/api/v1/marketing/content/generate",
                     json={
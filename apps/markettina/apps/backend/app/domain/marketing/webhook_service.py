@@ -18,9 +18,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-import httpx
 from pydantic import BaseModel, Field
 
+from app.infrastructure.http import http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -214,7 +215,7 @@ class WebhookService:
         start_time = datetime.utcnow()
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_clients.client("default", timeout=30.0) as client:
                 response = await client.post(
                     webhook.url,
                     json=payload,
@@ -317,7 +318,7 @@ class WebhookService:
         start_time = datetime.utcnow()
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_clients.client("default", timeout=30.0) as client:
                 response = await client.post(webhook.url, json=test_payload, headers=headers)
 
                 delivery.response_status = response.status_code
@@ -8,9 +8,9 @@ import os
 import time
 from abc import ABC, abstractmethod
 
-import httpx
 
 from app.domain.rag.models import EmbeddingStats
+from app.infrastructure.http import http_clients
 
 
 class BaseEmbeddings(ABC):
@@ -130,7 +130,7 @@ class OpenAIEmbeddings(BaseEmbeddings):
             )
 
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = http_clients.client("ai", timeout=30.0)
 
     async def embed_text(self, text: str) -> list[float]:
         """
@@ -200,7 +200,7 @@ class AnthropicEmbeddings(BaseEmbeddings):
                 "Anthropic API key required. Set ANTHROPIC_API_KEY env var."
             )
 
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = http_clients.client("ai", timeout=30.0)
 
     async def embed_text(self, text: str) -> list[float]:
         """
@@ -270,7 +270,7 @@ class GoogleEmbeddings(BaseEmbeddings):
             )
 
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = http_clients.client("ai", timeout=30.0)
 
     async def embed_text(self, text: str) -> list[float]:
         """
@@ -9,12 +9,12 @@ New workflow:
 """
 from datetime import datetime
 
-import httpx
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
 from app.domain.social.publisher_service import SocialPublisherService
+from app.infrastructure.http import http_clients
 
 router = APIRouter(prefix="/social", tags=["Multi-Platform Social"])
 
@@ -128,7 +128,7 @@ async def create_multi_platform_post(
             })
 
         # Call AI microservice batch endpoint
-        async with httpx.AsyncClient(timeout=180.0) as client:
+        async with http_clients.client("ai", timeout=180.0) as client:
             ai_response = await client.post(
                 f"{settings.AI_SERVICE_URL}/api/v1/marketing/image/batch-generate",
                 json={
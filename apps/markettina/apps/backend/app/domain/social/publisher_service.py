@@ -18,6 +18,7 @@ import structlog
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -84,7 +85,8 @@ class MetaPublisher:
     async def get_client(self) -> httpx.AsyncClient:
         """Get HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "social",
                 timeout=httpx.Timeout(30.0),
                 follow_redirects=True
             )
@@ -458,7 +460,8 @@ class LinkedInPublisher:
 
     async def get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "social",
                 timeout=httpx.Timeout(30.0),
                 headers={
                     "Authorization": f"Bearer {self.access_token}",
@@ -589,7 +592,8 @@ class TwitterPublisher:
         if self._client is None or self._client.is_closed:
             # Twitter requires OAuth 1.0a for posting
             # Using Bearer token for read operations
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "social",
                 timeout=httpx.Timeout(30.0),
                 headers={
                     "Authorization": f"Bearer {self.bearer_token}",
@@ -27,6 +27,7 @@ import structlog
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -68,7 +69,7 @@ class MetaTokenService:
     async def get_client(self) -> httpx.AsyncClient:
         """Get HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=30.0)
+            self._client = http_clients.client("social", timeout=30.0)
         return self._client
 
     async def close(self):
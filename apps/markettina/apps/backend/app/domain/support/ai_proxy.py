@@ -8,6 +8,8 @@ from typing import Any
 
 import httpx
 
+from app.infrastructure.http import http_clients
+
 logger = logging.getLogger(__name__)
 
 # AI Microservice configuration
@@ -46,7 +48,7 @@ class AICustomerSupport:
             Dict with response, confidence, provider, processing_time, sentiment
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_clients.client("ai", timeout=self.timeout) as client:
                 response = await client.post(
                     f"{self.service_url}/api/v1/support/chat",
                     json={
@@ -119,7 +121,7 @@ class AICustomerSupport:
     async def health_check(self) -> dict[str, Any]:
         """Check AI Microservice availability."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with http_clients.client("ai", timeout=5.0) as client:
                 response = await client.get(f"{self.service_url}/health")
                 if response.status_code == 200:
                     return {
@@ -16,6 +16,7 @@ import structlog
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 from .models import WhatsAppMessage, WhatsAppMessageStatus, WhatsAppMessageType
 from .schemas import (
@@ -75,7 +76,8 @@ class WhatsAppService:
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "social",
                 timeout=30.0,
                 headers={
                     "Authorization": f"Bearer {self.access_token}",
@@ -22,6 +22,8 @@ from typing import Any
 import httpx
 import structlog
 
+from app.infrastructure.http import http_clients
+
 logger = structlog.get_logger(__name__)
 
 
@@ -76,7 +78,7 @@ class ToolAIScraper:
             }
             if self.github_token:
                 headers["Authorization"] = f"token {self.github_token}"
-            self.client = httpx.AsyncClient(timeout=30.0, headers=headers)
+            self.client = http_clients.client("default", timeout=30.0, headers=headers)
 
     async def close(self):
         """Chiudi il client HTTP."""
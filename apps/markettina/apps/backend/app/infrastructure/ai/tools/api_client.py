@@ -13,6 +13,8 @@ from urllib.parse import urljoin
 import httpx
 from pydantic import BaseModel, Field
 
+from app.infrastructure.http import http_clients
+
 
 class HTTPMethod(str, Enum):
     """HTTP methods."""
@@ -147,7 +149,8 @@ class ExternalAPIClient:
 
     async def __aenter__(self) -> "ExternalAPIClient":
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(
+        self._client = http_clients.client(
+            "default",
             base_url=self.base_url,
             headers=self.headers,
             timeout=self.timeout
@@ -189,7 +192,8 @@ class ExternalAPIClient:
 
         # Ensure client is initialized
         if self._client is None:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "default",
                 base_url=self.base_url,
                 headers=self.headers,
                 timeout=self.timeout
@@ -11,6 +11,7 @@ import hashlib
 import json
 import os
 import pickle
+import threading
 import time
 from collections.abc import Callable
 from functools import wraps
@@ -74,15 +75,40 @@ class CacheConfig:
     PREFIX_PORTFOLIO_PROFILE = "portfolio_profile:"
 
 class RedisCache:
-    """Redis cache manager with fallback handling."""
+    """Redis cache manager with fallback handling.
+
+    The connection is established lazily (first cache access) or in the
+    background by the StartupManager, never at import time.
+    """
 
     def __init__(self):
         self.redis_client = None
         self.is_available = False
-        self._connect()
+        self._connect_attempted = False
+        self._connect_lock = threading.Lock()
+
+    def ensure_connected(self) -> bool:
+        """
+        Connect on first use; return whether the cache is usable.
+
+        Never waits for a connect already in progress (e.g. the background one
+        started by the StartupManager): callers on the event loop would block
+        for the whole retry loop, so the cache counts as unavailable until it
+        finishes.
+        """
+        if not self._connect_attempted:
+            if not self._connect_lock.acquire(blocking=False):
+                return False
+            try:
+                if not self._connect_attempted:
+                    self.connect()
+            finally:
+                self._connect_lock.release()
+        return self.is_available
 
-    def _connect(self):
+    def connect(self):
         """Establish Redis connection with retry + exponential backoff before warning."""
+        self._connect_attempted = True
         retries = int(os.getenv("CACHE_REDIS_MAX_RETRIES", "2"))  # Reduced for faster startup
         initial_backoff = float(os.getenv("CACHE_REDIS_INITIAL_BACKOFF", "0.1"))
         backoff = initial_backoff
@@ -146,7 +172,7 @@ class RedisCache:
 
     def get(self, key: str) -> Any | None:
         """Get value from cache with deserialization."""
-        if not self.is_available:
+        if not self.ensure_connected():
             return None
 
         start_time = time.perf_counter()
@@ -184,7 +210,7 @@ class RedisCache:
 
     def set(self, key: str, value: Any, ttl: int | None = None) -> bool:
         """Set value in cache with serialization."""
-        if not self.is_available:
+        if not self.ensure_connected():
             return False
 
         monitor = get_cache_monitor()
@@ -215,7 +241,7 @@ class RedisCache:
 
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
-        if not self.is_available:
+        if not self.ensure_connected():
             return False
 
         try:
@@ -232,7 +258,7 @@ class RedisCache:
 
     def delete_pattern(self, pattern: str) -> int:
         """Delete all keys matching pattern."""
-        if not self.is_available:
+        if not self.ensure_connected():
             return 0
 
         try:
@@ -287,7 +313,7 @@ class RedisCache:
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        if not self.is_available:
+        if not self.ensure_connected():
             return {"status": "unavailable", "is_available": False}
 
         try:
@@ -18,6 +18,8 @@ from typing import Any
 import httpx
 
 from app.core.config import settings
+from app.core.google.token_cache import google_token_cache
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -48,8 +50,6 @@ class SearchConsoleClient:
     ):
         self._site_url = site_url or getattr(settings, "GOOGLE_SEARCH_CONSOLE_SITE", "")
         self._credentials_json = credentials_json or getattr(settings, "GOOGLE_CREDENTIALS_JSON", "")
-        self._access_token: str | None = None
-        self._token_expires: datetime | None = None
         self._client: httpx.AsyncClient | None = None
 
     def is_configured(self) -> bool:
@@ -59,7 +59,8 @@ class SearchConsoleClient:
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "google",
                 base_url=self.BASE_URL,
                 timeout=30.0,
             )
@@ -72,55 +73,12 @@ class SearchConsoleClient:
             self._client = None
 
     async def _get_access_token(self) -> str:
-        """Get OAuth 2.0 access token using service account credentials."""
-        import json
-        import time
-        import jwt
-
-        if self._access_token and self._token_expires:
-            if datetime.utcnow() < self._token_expires:
-                return self._access_token
-
-        if not self._credentials_json:
-            raise ValueError("Google credentials not configured")
-
-        creds = json.loads(self._credentials_json)
-
-        # Create JWT for service account
-        now = int(time.time())
-        payload = {
-            "iss": creds["client_email"],
-            "scope": "https://www.googleapis.com/auth/webmasters.readonly",
-            "aud": "https://oauth2.googleapis.com/token",
-            "iat": now,
-            "exp": now + 3600,
-        }
-
-        signed_jwt = jwt.encode(
-            payload,
-            creds["private_key"],
-            algorithm="RS256",
+        """Get OAuth 2.0 access token using service account credentials (shared token cache)."""
+        return await google_token_cache.service_account_token(
+            self._credentials_json,
+            "https://www.googleapis.com/auth/webmasters.readonly",
         )
 
-        # Exchange JWT for access token
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data={
-                    "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                    "assertion": signed_jwt,
-                },
-            )
-
-            if response.status_code != 200:
-                raise ValueError(f"Token exchange failed: {response.text}")
-
-            token_data = response.json()
-            self._access_token = token_data["access_token"]
-            self._token_expires = datetime.utcnow() + timedelta(seconds=token_data.get("expires_in", 3600) - 60)
-
-            return self._access_token
-
     async def _request(
         self,
         method: str,
@@ -0,0 +1,16 @@
+"""
+HTTP Infrastructure
+Pool di connessioni in uscita condivisi per upstream, con retry e metriche.
+"""
+
+from .client_registry import (
+    HTTPClientRegistry,
+    UpstreamConfig,
+    http_clients,
+)
+
+__all__ = [
+    "HTTPClientRegistry",
+    "UpstreamConfig",
+    "http_clients",
+]
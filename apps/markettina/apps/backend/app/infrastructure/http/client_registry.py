@@ -0,0 +1,312 @@
+"""
+HTTP Client Registry - Connessioni in uscita condivise per upstream.
+
+Creare un `httpx.AsyncClient` per ogni chiamata significa pagare DNS, TCP e
+TLS ogni volta e buttare la connessione subito dopo. Il registro mantiene
+un transport con pool di connessioni per ogni upstream (google, social,
+leads, email, media, ai, default) con:
+- limiti di connessioni per host e keep-alive
+- HTTP/2 dove supportato (se il pacchetto `h2` è installato)
+- retry con backoff esponenziale + jitter (un solo livello, nel transport
+  instrumentato) per GET/HEAD/OPTIONS (errori di trasporto, 429, 502, 503,
+  504) e per gli errori di connect di tutti i metodi
+- metriche per upstream (richieste, errori, retry, latenza) in MetricsRegistry
+  e nei rollup persistiti (`upstream_latency_ms`, labels upstream/host; gli
+  host fuori da `UpstreamConfig.hosts` finiscono in "other")
+
+`http_clients.client(upstream, **kwargs)` ritorna un AsyncClient leggero
+(base_url, headers, timeout propri) sopra il transport condiviso: chiuderlo
+(anche con `async with`) non chiude il pool. Il pool viene chiuso da
+`http_clients.aclose()` allo shutdown dell'app.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+import structlog
+
+from app.infrastructure.monitoring.metrics import metrics_registry
+
+logger = structlog.get_logger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Errori prima dell'invio della richiesta: sicuri da ritentare anche per POST
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+# Opzioni del transport condiviso: si configurano sull'UpstreamConfig
+TRANSPORT_OPTIONS = ("limits", "http2", "verify", "cert", "proxy", "transport")
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class UpstreamConfig:
+    """Configurazione del pool di un upstream."""
+
+    name: str
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    max_connections: int = 50
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    verify: bool | str = True
+    retries: int = 2
+    backoff_base: float = 0.3
+    backoff_max: float = 5.0
+    headers: dict[str, str] = field(default_factory=dict)
+    # Domini con label host propria nei rollup (sottodomini inclusi)
+    hosts: tuple[str, ...] = ()
+
+    def host_label(self, host: str) -> str:
+        """Label host per i rollup: cardinalità limitata ai domini noti."""
+        for domain in self.hosts:
+            if host == domain or host.endswith(f".{domain}"):
+                return host
+        return "other"
+
+
+DEFAULT_UPSTREAMS = (
+    # Google APIs (GA4, Search Console, Business Profile, Calendar, Gmail, OAuth)
+    UpstreamConfig("google", timeout=30.0, http2=True, hosts=("googleapis.com", "google.com")),
+    # Meta / LinkedIn / Twitter / Instagram / WhatsApp
+    UpstreamConfig(
+        "social",
+        timeout=30.0,
+        http2=True,
+        hosts=("facebook.com", "instagram.com", "threads.net", "linkedin.com", "twitter.com", "x.com"),
+    ),
+    # Apollo, Hunter, Google Places
+    UpstreamConfig(
+        "leads", timeout=15.0, max_connections=20, hosts=("apollo.io", "hunter.io", "googleapis.com")
+    ),
+    # SendGrid / Mailgun
+    UpstreamConfig("email", timeout=30.0, max_connections=20, hosts=("sendgrid.com", "mailgun.net")),
+    # Download immagini/video: host arbitrari, risposte grandi
+    UpstreamConfig("media", timeout=60.0, max_connections=30, retries=1),
+    # LLM, embedding, avatar video: risposte lente, nessun retry su status
+    UpstreamConfig(
+        "ai",
+        timeout=120.0,
+        max_connections=30,
+        retries=0,
+        hosts=("googleapis.com", "groq.com", "openrouter.ai", "huggingface.co", "heygen.com"),
+    ),
+    UpstreamConfig("default", timeout=30.0),
+)
+
+
+class _UpstreamStats:
+    """Contatori per upstream esposti in MetricsRegistry."""
+
+    def __init__(self, name: str):
+        self.requests = metrics_registry.register_counter(
+            f"http_client_{name}_requests_total", f"Outbound HTTP requests to {name}"
+        )
+        self.errors = metrics_registry.register_counter(
+            f"http_client_{name}_errors_total", f"Outbound HTTP errors (transport or 5xx) for {name}"
+        )
+        self.retries = metrics_registry.register_counter(
+            f"http_client_{name}_retries_total", f"Outbound HTTP retries for {name}"
+        )
+        self.duration = metrics_registry.register_histogram(
+            f"http_client_{name}_duration_seconds", f"Outbound HTTP latency to {name} (until headers)"
+        )
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport condiviso: pool + retry con backoff + metriche."""
+
+    def __init__(self, config: UpstreamConfig):
+        self.config = config
+        self.stats = _UpstreamStats(config.name)
+        # Nessun retry nel transport httpx: li gestisce solo handle_async_request
+        self._transport = httpx.AsyncHTTPTransport(
+            http2=config.http2 and HTTP2_AVAILABLE,
+            verify=config.verify,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+
+    def _backoff(self, attempt: int, response: httpx.Response | None = None) -> float:
+        if response is not None and "retry-after" in response.headers:
+            retry_after = _parse_retry_after(response.headers["retry-after"])
+            if retry_after is not None:
+                return min(retry_after, self.config.backoff_max)
+        delay = self.config.backoff_base * (2 ** attempt)
+        return min(delay, self.config.backoff_max) * (0.5 + random.random() / 2)
+
+    def _record(self, request: httpx.Request, started: float, status: int | None, error: str | None = None):
+        from app.infrastructure.monitoring.rollups import metric_rollups
+
+        duration = time.perf_counter() - started
+        failed = error is not None or (status is not None and status >= 500)
+
+        self.stats.requests.inc()
+        self.stats.duration.observe(duration)
+        if failed:
+            self.stats.errors.inc()
+
+        labels = {"upstream": self.config.name, "host": self.config.host_label(request.url.host)}
+        metric_rollups.record("upstream_latency_ms", duration * 1000, labels)
+        if failed:
+            metric_rollups.record("upstream_errors", 1, {**labels, "error": error or str(status)})
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                self._record(request, started, None, type(e).__name__)
+                retryable = idempotent or isinstance(e, CONNECT_ERRORS)
+                if retryable and attempt < self.config.retries:
+                    self.stats.retries.inc()
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+                    continue
+                raise
+
+            self._record(request, started, response.status_code)
+
+            if (
+                idempotent
+                and response.status_code in RETRY_STATUSES
+                and attempt < self.config.retries
+            ):
+                await response.aclose()
+                self.stats.retries.inc()
+                await asyncio.sleep(self._backoff(attempt, response))
+                attempt += 1
+                continue
+
+            return response
+
+    async def aclose(self) -> None:
+        # Condiviso tra tutti i client dell'upstream: lo chiude solo il registro
+        pass
+
+    async def close_pool(self) -> None:
+        await self._transport.aclose()
+
+
+def _parse_retry_after(value: str) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HTTPClientRegistry:
+    """
+    Registro dei pool HTTP in uscita per upstream.
+
+    Example:
+        >>> async with http_clients.client("google", timeout=30.0) as client:
+        ...     response = await client.get(url, headers=headers)
+        >>> self._client = http_clients.client("leads", base_url=BASE_URL, headers=auth)
+    """
+
+    def __init__(self, upstreams: tuple[UpstreamConfig, ...] = DEFAULT_UPSTREAMS):
+        self._configs = {config.name: config for config in upstreams}
+        self._transports: dict[str, _InstrumentedTransport] = {}
+
+    def register(self, config: UpstreamConfig) -> None:
+        """Aggiunge (o sostituisce, se non ancora usato) un upstream."""
+        if config.name in self._transports:
+            logger.warning("http_upstream_already_started", upstream=config.name)
+            return
+        self._configs[config.name] = config
+
+    def _transport(self, upstream: str) -> _InstrumentedTransport:
+        transport = self._transports.get(upstream)
+        if transport is None:
+            config = self._configs.get(upstream) or self._configs["default"]
+            transport = _InstrumentedTransport(config)
+            self._transports[upstream] = transport
+        return transport
+
+    def client(self, upstream: str = "default", **kwargs: Any) -> httpx.AsyncClient:
+        """
+        AsyncClient leggero sul pool condiviso dell'upstream.
+
+        Accetta gli stessi argomenti di `httpx.AsyncClient` a livello client
+        (base_url, headers, timeout, follow_redirects, ...); i parametri di
+        transport (limits, http2, verify, ...) sono quelli dell'upstream:
+        passarli qui solleva ValueError invece di ignorarli in silenzio.
+        Per un verify diverso registrare un upstream dedicato.
+        """
+        invalid = [option for option in TRANSPORT_OPTIONS if option in kwargs]
+        if invalid:
+            raise ValueError(
+                f"Transport options {invalid} are set per upstream: "
+                f"register an UpstreamConfig instead of passing them to client()"
+            )
+
+        config = self._configs.get(upstream) or self._configs["default"]
+
+        kwargs.setdefault(
+            "timeout", httpx.Timeout(config.timeout, connect=config.connect_timeout)
+        )
+        if config.headers:
+            kwargs["headers"] = {**config.headers, **(kwargs.get("headers") or {})}
+
+        return httpx.AsyncClient(transport=self._transport(upstream), **kwargs)
+
+    def start(self) -> None:
+        """Crea i pool di tutti gli upstream configurati (lifespan)."""
+        for name in self._configs:
+            self._transport(name)
+        logger.info(
+            "http_client_registry_started",
+            upstreams=list(self._configs),
+            http2=HTTP2_AVAILABLE,
+        )
+
+    async def aclose(self) -> None:
+        """Chiude tutti i pool (shutdown)."""
+        transports, self._transports = self._transports, {}
+        for name, transport in transports.items():
+            try:
+                await transport.close_pool()
+            except Exception as e:
+                logger.warning("http_client_close_error", upstream=name, error=str(e))
+
+    def get_stats(self) -> dict[str, Any]:
+        """Richieste, errori, retry e latenza per upstream."""
+        stats = {}
+        for name, transport in self._transports.items():
+            duration = transport.stats.duration.get_stats()
+            count = duration["count"]
+            stats[name] = {
+                "requests": transport.stats.requests.get(),
+                "errors": transport.stats.errors.get(),
+                "retries": transport.stats.retries.get(),
+                "avg_latency_ms": round(duration["sum"] / count * 1000, 1) if count else 0.0,
+                "http2": transport.config.http2 and HTTP2_AVAILABLE,
+            }
+        return stats
+
+
+# Singleton instance
+http_clients = HTTPClientRegistry()
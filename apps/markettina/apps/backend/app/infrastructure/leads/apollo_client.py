@@ -19,6 +19,7 @@ from typing import Any
 import httpx
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +62,8 @@ class ApolloClient:
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "leads",
                 base_url=self.BASE_URL,
                 timeout=30.0,
                 headers={
@@ -15,10 +15,11 @@ Dimensioni ottimali per ogni piattaforma:
 
 from io import BytesIO
 
-import httpx
 import structlog
 from PIL import Image
 
+from app.infrastructure.http import http_clients
+
 logger = structlog.get_logger(__name__)
 
 
@@ -73,7 +74,7 @@ class ImageResizeService:
         """
         try:
             # Scarica immagine
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with http_clients.client("media", timeout=30.0) as client:
                 response = await client.get(image_url)
                 response.raise_for_status()
                 image_data = response.content
@@ -194,7 +195,7 @@ class ImageResizeService:
             platforms = ["facebook", "instagram", "instagram_story", "linkedin", "twitter"]
 
         # Scarica immagine una volta sola
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_clients.client("media", timeout=30.0) as client:
             response = await client.get(image_url)
             response.raise_for_status()
             image_data = response.content
@@ -5,6 +5,8 @@ Sistema completo di monitoraggio e alerting per CV-Lab SaaS production.
 import asyncio
 import json
 import logging
+import os
+import time
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum
@@ -15,8 +17,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 
+from app.infrastructure.monitoring.metrics import metrics_registry
+
 logger = logging.getLogger(__name__)
 
+# Durata di ogni gruppo di check del ciclo di monitoring
+_check_duration_histograms = {
+    name: metrics_registry.register_histogram(
+        f"alert_check_{name}_duration_seconds", f"Duration of the {name} alert checks"
+    )
+    for name in ("payments", "security", "metrics")
+}
+
 class AlertSeverity(str, Enum):
     """Livelli di severità alert."""
 
@@ -262,7 +274,7 @@ class AlertManager:
                     resolved=alert.resolved,
                     acknowledged=alert.acknowledged,
                     escalated=alert.escalated,
-                    metadata=alert.metadata,
+                    alert_metadata=alert.metadata,
                     timestamp=alert.timestamp,
                 )
 
@@ -304,29 +316,41 @@ class PaymentAlertMonitor:
     def __init__(self, alert_manager: AlertManager):
         self.alert_manager = alert_manager
 
-    async def check_payment_failures(self, db: AsyncSession) -> Alert | None:
+    async def collect(self, db: AsyncSession) -> dict[str, float]:
+        """Tutti gli aggregati dei check di pagamento in una sola query."""
+        from sqlalchemy import func, select
+
+        from app.domain.billing.models import Payment
+
+        now = datetime.now(UTC)
+        one_hour_ago = now - timedelta(hours=1)
+        twenty_four_hours_ago = now - timedelta(hours=24)
+        failed = Payment.status == "failed"
+
+        result = await db.execute(
+            select(
+                func.count(Payment.id).filter(Payment.created_at >= one_hour_ago),
+                func.count(Payment.id).filter(Payment.created_at >= one_hour_ago, failed),
+                func.coalesce(func.sum(Payment.amount).filter(failed), 0),
+            ).where(Payment.created_at >= twenty_four_hours_ago)
+        )
+        total_last_hour, failed_last_hour, failed_amount_24h = result.one()
+
+        return {
+            "total_last_hour": total_last_hour or 0,
+            "failed_last_hour": failed_last_hour or 0,
+            "failed_amount_24h": float(failed_amount_24h or 0),
+        }
+
+    async def check_payment_failures(
+        self, db: AsyncSession, stats: dict[str, float] | None = None
+    ) -> Alert | None:
         """Check for payment failure rate spikes."""
         try:
-            from sqlalchemy import func, select
-
-            from app.domain.billing.models import Payment
-
             # Query payment failures in last hour
-            one_hour_ago = datetime.now(UTC) - timedelta(hours=1)
-
-            # Query actual payment data
-            total_result = await db.execute(
-                select(func.count(Payment.id)).where(Payment.created_at >= one_hour_ago)
-            )
-            total_payments = total_result.scalar() or 0
-
-            failed_result = await db.execute(
-                select(func.count(Payment.id)).where(
-                    Payment.created_at >= one_hour_ago,
-                    Payment.status == "failed"
-                )
-            )
-            failed_payments = failed_result.scalar() or 0
+            stats = stats if stats is not None else await self.collect(db)
+            total_payments = stats["total_last_hour"]
+            failed_payments = stats["failed_last_hour"]
 
             if total_payments > 10:  # Only alert if meaningful volume
                 failure_rate = failed_payments / total_payments
@@ -355,31 +379,20 @@ class PaymentAlertMonitor:
 
         return None
 
-    async def check_revenue_loss(self, db: AsyncSession) -> Alert | None:
+    async def check_revenue_loss(
+        self, db: AsyncSession, stats: dict[str, float] | None = None
+    ) -> Alert | None:
         """Check for significant revenue loss due to payment failures."""
         try:
-            from sqlalchemy import func, select
-
-            from app.domain.billing.models import Payment
-
-            # Query failed payments in last 24 hours
-            twenty_four_hours_ago = datetime.now(UTC) - timedelta(hours=24)
-
-            # Calculate actual revenue loss
-            result = await db.execute(
-                select(func.sum(Payment.amount)).where(
-                    Payment.created_at >= twenty_four_hours_ago,
-                    Payment.status == "failed"
-                )
-            )
-
-            revenue_loss = float(result.scalar() or 0)
+            # Failed payments amount in last 24 hours
+            stats = stats if stats is not None else await self.collect(db)
+            revenue_loss = stats["failed_amount_24h"]
 
             if revenue_loss > self.alert_manager.alert_thresholds["payment_amount_loss"]:
                 return Alert(
                     id=f"revenue-loss-{int(datetime.now(UTC).timestamp())}",
                     title="Significant Revenue Loss Detected",
-                    description=f"Revenue loss from payment failures: €{revenue_loss:.2f} in the last hour. Threshold: €{self.alert_manager.alert_thresholds['payment_amount_loss']:.2f}",
+                    description=f"Revenue loss from payment failures: €{revenue_loss:.2f} in the last 24 hours. Threshold: €{self.alert_manager.alert_thresholds['payment_amount_loss']:.2f}",
                     severity=AlertSeverity.CRITICAL,
                     category=AlertCategory.PAYMENT,
                     timestamp=datetime.now(UTC),
@@ -396,31 +409,54 @@ class PaymentAlertMonitor:
 
         return None
 
+    async def run_checks(self, db: AsyncSession) -> list[Alert | None]:
+        """Esegue tutti i check di pagamento su un'unica query aggregata."""
+        stats = await self.collect(db)
+        return [
+            await self.check_payment_failures(db, stats),
+            await self.check_revenue_loss(db, stats),
+        ]
+
 class SecurityAlertMonitor:
     """Monitor security-related events and trigger alerts."""
 
     def __init__(self, alert_manager: AlertManager):
         self.alert_manager = alert_manager
 
-    async def check_suspicious_login_attempts(self, db: AsyncSession) -> Alert | None:
-        """Check for suspicious login attempt patterns."""
-        try:
-            from sqlalchemy import func, select
+    async def collect(self, db: AsyncSession) -> dict[str, int]:
+        """Tutti gli aggregati dei check di sicurezza in una sola query sull'audit log."""
+        from sqlalchemy import func, select
 
-            from app.domain.gdpr.models import AuditActionEnum, DataAuditLog
+        from app.domain.gdpr.models import AuditActionEnum, DataAuditLog
 
-            # Query actual failed login attempts from audit logs
-            one_minute_ago = datetime.now(UTC) - timedelta(minutes=1)
+        one_minute_ago = datetime.now(UTC) - timedelta(minutes=1)
 
-            result = await db.execute(
-                select(func.count(DataAuditLog.id)).where(
-                    DataAuditLog.timestamp >= one_minute_ago,
+        result = await db.execute(
+            select(
+                # Failed logins
+                func.count(DataAuditLog.id).filter(
                     DataAuditLog.action == AuditActionEnum.LOGIN,
-                    DataAuditLog.response_status.in_([401, 403])  # Failed logins
-                )
-            )
+                    DataAuditLog.response_status.in_([401, 403]),
+                ),
+                # Rate limited
+                func.count(DataAuditLog.id).filter(DataAuditLog.response_status == 429),
+            ).where(DataAuditLog.timestamp >= one_minute_ago)
+        )
+        failed_logins, rate_limited = result.one()
+
+        return {
+            "failed_logins_last_minute": failed_logins or 0,
+            "rate_limited_last_minute": rate_limited or 0,
+        }
 
-            failed_attempts_last_minute = result.scalar() or 0
+    async def check_suspicious_login_attempts(
+        self, db: AsyncSession, stats: dict[str, int] | None = None
+    ) -> Alert | None:
+        """Check for suspicious login attempt patterns."""
+        try:
+            # Failed login attempts from audit logs (last minute)
+            stats = stats if stats is not None else await self.collect(db)
+            failed_attempts_last_minute = stats["failed_logins_last_minute"]
 
             if (
                 failed_attempts_last_minute
@@ -446,24 +482,14 @@ class SecurityAlertMonitor:
 
         return None
 
-    async def check_rate_limit_violations(self, db: AsyncSession) -> Alert | None:
+    async def check_rate_limit_violations(
+        self, db: AsyncSession, stats: dict[str, int] | None = None
+    ) -> Alert | None:
         """Check for rate limiting violations indicating attacks."""
         try:
-            from sqlalchemy import func, select
-
-            from app.domain.gdpr.models import DataAuditLog
-
-            # Query rate limit violations from audit logs (HTTP 429 responses)
-            one_minute_ago = datetime.now(UTC) - timedelta(minutes=1)
-
-            result = await db.execute(
-                select(func.count(DataAuditLog.id)).where(
-                    DataAuditLog.timestamp >= one_minute_ago,
-                    DataAuditLog.response_status == 429  # Rate limited
-                )
-            )
-
-            violations_per_minute = result.scalar() or 0
+            # Rate limit violations from audit logs (HTTP 429 responses, last minute)
+            stats = stats if stats is not None else await self.collect(db)
+            violations_per_minute = stats["rate_limited_last_minute"]
 
             if (
                 violations_per_minute
@@ -489,35 +515,53 @@ class SecurityAlertMonitor:
 
         return None
 
+    async def run_checks(self, db: AsyncSession) -> list[Alert | None]:
+        """Esegue tutti i check di sicurezza su un'unica query aggregata."""
+        stats = await self.collect(db)
+        return [
+            await self.check_suspicious_login_attempts(db, stats),
+            await self.check_rate_limit_violations(db, stats),
+        ]
+
+# Finestre lette dai check di performance/uptime: (metrica, durata, labels)
+_METRIC_WINDOWS = {
+    "api_response_time": ("api_response_time", timedelta(minutes=5), None),
+    "requests": ("http_requests", timedelta(minutes=10), None),
+    "errors": ("http_requests", timedelta(minutes=10), {"status_class": "5xx"}),
+    "health_check": ("health_check", timedelta(hours=24), None),
+}
+
+
+async def collect_metric_windows(db: AsyncSession, names: list[str] | None = None) -> dict[str, Any]:
+    """Rollup delle finestre richieste (default: tutte) in una sola query."""
+    from app.infrastructure.monitoring.rollups import query_windows
+
+    names = names or list(_METRIC_WINDOWS)
+    buckets = await query_windows(db, [_METRIC_WINDOWS[name] for name in names])
+    return dict(zip(names, buckets))
+
+
 class PerformanceAlertMonitor:
     """Monitor performance metrics and trigger alerts."""
 
     def __init__(self, alert_manager: AlertManager):
         self.alert_manager = alert_manager
 
-    async def check_api_response_times(self, db: AsyncSession) -> Alert | None:
+    async def check_api_response_times(
+        self, db: AsyncSession, windows: dict[str, Any] | None = None
+    ) -> Alert | None:
         """Check for API response time degradation."""
         try:
-            from sqlalchemy import func, select
-
-            from app.infrastructure.monitoring.models import MetricLog
+            # API response times from the per-minute rollups (last 5 minutes)
+            windows = windows or await collect_metric_windows(db, ["api_response_time"])
+            rollup = windows["api_response_time"]
 
-            # Query actual API response times from metrics (last 5 minutes)
-            five_minutes_ago = datetime.now(UTC) - timedelta(minutes=5)
-
-            result = await db.execute(
-                select(func.avg(MetricLog.value)).where(
-                    MetricLog.metric_name == "api_response_time",
-                    MetricLog.timestamp >= five_minutes_ago
-                )
-            )
-
-            avg_response_time = result.scalar() or 0
-
-            # If no metrics yet, skip alert (returns 0)
-            if avg_response_time == 0:
+            # If no metrics yet, skip alert
+            if not rollup.count:
                 return None
 
+            avg_response_time = round(rollup.avg, 1)
+
             if avg_response_time > self.alert_manager.alert_thresholds["api_response_time"]:
                 return Alert(
                     id=f"api-performance-{int(datetime.now(UTC).timestamp())}",
@@ -529,6 +573,9 @@ class PerformanceAlertMonitor:
                     source="performance-monitor",
                     metadata={
                         "avg_response_time": avg_response_time,
+                        "p95_response_time": rollup.quantile(0.95),
+                        "max_response_time": rollup.max,
+                        "request_count": rollup.count,
                         "threshold": self.alert_manager.alert_thresholds["api_response_time"],
                         "time_window": "5_minutes",
                     },
@@ -539,33 +586,17 @@ class PerformanceAlertMonitor:
 
         return None
 
-    async def check_error_rates(self, db: AsyncSession) -> Alert | None:
+    async def check_error_rates(
+        self, db: AsyncSession, windows: dict[str, Any] | None = None
+    ) -> Alert | None:
         """Check for elevated error rates."""
         try:
-            from sqlalchemy import func, select
-
-            from app.domain.gdpr.models import DataAuditLog
-
-            # Query actual error rates from audit logs (last 10 minutes)
-            ten_minutes_ago = datetime.now(UTC) - timedelta(minutes=10)
-
-            # Total requests
-            total_result = await db.execute(
-                select(func.count(DataAuditLog.id)).where(
-                    DataAuditLog.timestamp >= ten_minutes_ago
-                )
-            )
-            total_requests = total_result.scalar() or 0
+            # Request counts from the per-minute rollups (last 10 minutes)
+            windows = windows or await collect_metric_windows(db, ["requests", "errors"])
+            total_requests = windows["requests"].count
 
             # Error responses (5xx status codes)
-            error_result = await db.execute(
-                select(func.count(DataAuditLog.id)).where(
-                    DataAuditLog.timestamp >= ten_minutes_ago,
-                    DataAuditLog.response_status >= 500,
-                    DataAuditLog.response_status < 600
-                )
-            )
-            error_requests = error_result.scalar() or 0
+            error_requests = windows["errors"].count
 
             # Calculate error rate
             if total_requests == 0:
@@ -600,34 +631,17 @@ class UptimeAlertMonitor:
     def __init__(self, alert_manager: AlertManager):
         self.alert_manager = alert_manager
 
-    async def check_service_availability(self, db: AsyncSession) -> Alert | None:
+    async def check_service_availability(
+        self, db: AsyncSession, windows: dict[str, Any] | None = None
+    ) -> Alert | None:
         """Check service availability and SLA compliance."""
         try:
-            from sqlalchemy import func, select
-
-            from app.infrastructure.monitoring.models import MetricLog
-
-            # Calculate actual uptime from health check metrics (last 24 hours)
-            twenty_four_hours_ago = datetime.now(UTC) - timedelta(hours=24)
-
-            # Count successful health checks
-            success_result = await db.execute(
-                select(func.count(MetricLog.id)).where(
-                    MetricLog.metric_name == "health_check",
-                    MetricLog.timestamp >= twenty_four_hours_ago,
-                    MetricLog.value == 1.0  # 1 = healthy, 0 = unhealthy
-                )
-            )
-            successful_checks = success_result.scalar() or 0
-
-            # Count total health checks
-            total_result = await db.execute(
-                select(func.count(MetricLog.id)).where(
-                    MetricLog.metric_name == "health_check",
-                    MetricLog.timestamp >= twenty_four_hours_ago
-                )
-            )
-            total_checks = total_result.scalar() or 0
+            # Calculate actual uptime from health check rollups (last 24 hours):
+            # 1 = healthy, 0 = unhealthy, so sum = successful checks
+            windows = windows or await collect_metric_windows(db, ["health_check"])
+            rollup = windows["health_check"]
+            successful_checks = rollup.sum
+            total_checks = rollup.count
 
             # Calculate uptime percentage
             if total_checks == 0:
@@ -657,7 +671,17 @@ class UptimeAlertMonitor:
         return None
 
 class AlertingService:
-    """Main alerting service orchestrator."""
+    """
+    Main alerting service orchestrator.
+
+    I check sono raggruppati per tabella e ogni gruppo esegue una sola query
+    multi-aggregato (pagamenti, audit log, rollup delle metriche). I gruppi
+    girano in parallelo, ognuno con la propria sessione del pool (una
+    AsyncSession non supporta query concorrenti), con al massimo
+    ALERT_CHECK_CONCURRENCY gruppi in contemporanea.
+    """
+
+    CHECK_GROUPS = ("payments", "security", "metrics")
 
     def __init__(self):
         self.alert_manager = AlertManager()
@@ -666,45 +690,91 @@ class AlertingService:
         self.performance_monitor = PerformanceAlertMonitor(self.alert_manager)
         self.uptime_monitor = UptimeAlertMonitor(self.alert_manager)
 
-    async def run_monitoring_cycle(self, db: AsyncSession):
-        """Execute complete monitoring cycle for all alert types."""
-        alerts_to_trigger = []
+        self.max_concurrency = int(os.getenv("ALERT_CHECK_CONCURRENCY", "3"))
+        self.last_cycle: dict[str, Any] = {}
+
+    async def _run_metric_checks(self, db: AsyncSession) -> list[Alert | None]:
+        windows = await collect_metric_windows(db)
+        return [
+            await self.performance_monitor.check_api_response_times(db, windows),
+            await self.performance_monitor.check_error_rates(db, windows),
+            await self.uptime_monitor.check_service_availability(db, windows),
+        ]
+
+    async def _run_group(self, name: str, semaphore: asyncio.Semaphore) -> dict[str, Any]:
+        """Esegue un gruppo di check con una sessione dedicata e ne misura la durata."""
+        from app.infrastructure.database import AsyncSessionLocal
+        from app.infrastructure.monitoring.rollups import metric_rollups
+
+        runners = {
+            "payments": self.payment_monitor.run_checks,
+            "security": self.security_monitor.run_checks,
+            "metrics": self._run_metric_checks,
+        }
+
+        async with semaphore:
+            start = time.perf_counter()
+            alerts: list[Alert] = []
+            error = None
+            try:
+                async with AsyncSessionLocal() as db:
+                    results = await runners[name](db)
+                alerts = [a for a in results if isinstance(a, Alert)]
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Error in {name} alert checks: {e}")
+
+            duration = time.perf_counter() - start
+
+        _check_duration_histograms[name].observe(duration)
+        metric_rollups.record("alert_check_duration_ms", duration * 1000, {"check": name})
+
+        return {
+            "check": name,
+            "alerts": alerts,
+            "duration_ms": round(duration * 1000, 1),
+            "error": error,
+        }
 
-        try:
-            # Payment monitoring
-            payment_alerts = await asyncio.gather(
-                self.payment_monitor.check_payment_failures(db),
-                self.payment_monitor.check_revenue_loss(db),
-                return_exceptions=True,
-            )
-            alerts_to_trigger.extend([a for a in payment_alerts if isinstance(a, Alert)])
+    async def run_monitoring_cycle(self, db: AsyncSession | None = None):
+        """
+        Execute complete monitoring cycle for all alert types.
 
-            # Security monitoring
-            security_alerts = await asyncio.gather(
-                self.security_monitor.check_suspicious_login_attempts(db),
-                self.security_monitor.check_rate_limit_violations(db),
-                return_exceptions=True,
-            )
-            alerts_to_trigger.extend([a for a in security_alerts if isinstance(a, Alert)])
+        `db` è accettato per compatibilità ma non usato: ogni gruppo di check
+        apre la propria sessione per poter girare in parallelo.
+        """
+        cycle_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-            # Performance monitoring
-            performance_alerts = await asyncio.gather(
-                self.performance_monitor.check_api_response_times(db),
-                self.performance_monitor.check_error_rates(db),
-                return_exceptions=True,
+        try:
+            results = await asyncio.gather(
+                *(self._run_group(name, semaphore) for name in self.CHECK_GROUPS)
             )
-            alerts_to_trigger.extend([a for a in performance_alerts if isinstance(a, Alert)])
 
-            # Uptime monitoring
-            uptime_alert = await self.uptime_monitor.check_service_availability(db)
-            if uptime_alert:
-                alerts_to_trigger.append(uptime_alert)
+            alerts_to_trigger = [alert for result in results for alert in result["alerts"]]
 
             # Trigger all identified alerts
             for alert in alerts_to_trigger:
                 await self.alert_manager.trigger_alert(alert)
 
-            logger.info(f"Monitoring cycle complete: {len(alerts_to_trigger)} alerts triggered")
+            self.last_cycle = {
+                "completed_at": datetime.now(UTC).isoformat(),
+                "duration_ms": round((time.perf_counter() - cycle_start) * 1000, 1),
+                "alerts_triggered": len(alerts_to_trigger),
+                "checks": {
+                    result["check"]: {
+                        "duration_ms": result["duration_ms"],
+                        "alerts": len(result["alerts"]),
+                        "error": result["error"],
+                    }
+                    for result in results
+                },
+            }
+
+            logger.info(
+                f"Monitoring cycle complete: {len(alerts_to_trigger)} alerts triggered "
+                f"in {self.last_cycle['duration_ms']}ms"
+            )
 
         except Exception as e:
             logger.error(f"Error in monitoring cycle: {e}")
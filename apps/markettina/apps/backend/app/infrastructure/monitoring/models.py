@@ -2,7 +2,19 @@
 
 from enum import Enum as PyEnum
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, Float, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.sql import func
 
 from app.infrastructure.database import Base
@@ -49,8 +61,8 @@ class AlertLog(Base):
     acknowledged = Column(Boolean, default=False, nullable=False)
     escalated = Column(Boolean, default=False, nullable=False)
 
-    # Metadata
-    metadata = Column(JSON, nullable=True)
+    # Metadata ("metadata" è riservato dalla Declarative API)
+    alert_metadata = Column("metadata", JSON, nullable=True)
 
     # Timestamps
     timestamp = Column(DateTime, nullable=False, default=func.now(), index=True)
@@ -66,9 +78,12 @@ class AlertLog(Base):
 
 
 class MetricLog(Base):
-    """Time-series metric logging."""
+    """Time-series metric logging (campioni grezzi, vedi MetricRollup per gli aggregati)."""
 
     __tablename__ = "metric_logs"
+    __table_args__ = (
+        Index("ix_metric_logs_name_timestamp", "metric_name", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -87,3 +102,42 @@ class MetricLog(Base):
 
     def __repr__(self):
         return f"<MetricLog(metric={self.metric_name}, value={self.value})>"
+
+
+class MetricRollup(Base):
+    """
+    Aggregato di una metrica per bucket temporale.
+
+    Una riga per (metrica, labels, risoluzione, bucket, sorgente):
+    - resolution "1m": scritta da ogni worker (source = hostname:pid) al flush
+    - resolution "1h" / "1d": downsampling di tutte le sorgenti (source = "*")
+    Lo sketch è un istogramma logaritmico (vedi rollups.MetricSketch) per i quantili.
+    """
+
+    __tablename__ = "metric_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "metric_name", "labels_key", "resolution", "bucket_start", "source",
+            name="uq_metric_rollups_bucket",
+        ),
+        Index("ix_metric_rollups_lookup", "metric_name", "resolution", "bucket_start"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    metric_name = Column(String(100), nullable=False)
+    labels_key = Column(String(255), nullable=False, default="")
+    labels = Column(JSON, nullable=True)
+
+    resolution = Column(String(8), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    source = Column(String(100), nullable=False, default="*")
+
+    count = Column(Integer, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+    min = Column(Float, nullable=True)
+    max = Column(Float, nullable=True)
+    sketch = Column(JSON, nullable=True)
+
+    def __repr__(self):
+        return f"<MetricRollup(metric={self.metric_name}, {self.resolution}@{self.bucket_start}, count={self.count})>"
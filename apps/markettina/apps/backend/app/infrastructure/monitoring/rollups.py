@@ -0,0 +1,568 @@
+"""
+Metric Rollups - Aggregazione delle metriche per bucket temporali.
+
+Invece di una riga di MetricLog per campione, ogni worker aggrega in memoria
+per (metrica, labels, minuto) e ogni ROLLUP_FLUSH_INTERVAL secondi scrive
+i minuti chiusi in `metric_rollups` (count/sum/min/max + sketch per i quantili).
+Il worker leader (scheduler_leader) esegue periodicamente:
+- downsampling 1m -> 1h -> 1d (tutte le sorgenti unite, source = "*")
+- retention per risoluzione e per i campioni grezzi di MetricLog
+
+Le query degli alert leggono pochi bucket per finestra (tempo costante
+rispetto al traffico) con `query_window`.
+
+Configurazione (env):
+- ROLLUP_FLUSH_INTERVAL: secondi tra due flush (default 10)
+- ROLLUP_MAINTENANCE_INTERVAL: secondi tra due downsampling/retention (default 300)
+- ROLLUP_RETENTION_1M_DAYS / _1H_DAYS / _1D_DAYS: retention (default 2 / 30 / 365)
+- METRIC_LOG_RETENTION_DAYS: retention dei campioni grezzi (default 7)
+"""
+
+import asyncio
+import math
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+RESOLUTIONS = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+
+# Unione SQL di due MetricSketch.to_dict() (riga esistente + excluded):
+# somma di zero_count e dei conteggi bucket per bucket, come MetricSketch.merge
+_MERGE_SKETCH_SQL = """json_build_object(
+    'z', COALESCE((metric_rollups.sketch->>'z')::int, 0)
+         + COALESCE((excluded.sketch->>'z')::int, 0),
+    'b', COALESCE((
+        SELECT json_object_agg(entries.key, entries.total)
+        FROM (
+            SELECT key, SUM(value::int) AS total
+            FROM (
+                SELECT * FROM json_each_text(COALESCE(metric_rollups.sketch->'b', '{}'::json))
+                UNION ALL
+                SELECT * FROM json_each_text(COALESCE(excluded.sketch->'b', '{}'::json))
+            ) AS buckets
+            GROUP BY key
+        ) AS entries
+    ), '{}'::json)
+)"""
+
+
+def _utcnow() -> datetime:
+    # Le colonne DateTime dei modelli di monitoring sono naive in UTC
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _truncate(ts: datetime, resolution: str) -> datetime:
+    if resolution == "1m":
+        return ts.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def labels_key(labels: dict[str, Any] | None) -> str:
+    """Chiave canonica delle labels ("k1=v1,k2=v2", ordinate)."""
+    if not labels:
+        return ""
+    return ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+
+
+class MetricSketch:
+    """
+    Istogramma logaritmico con errore relativo limitato (stile DDSketch).
+
+    Ogni valore positivo cade nel bucket ceil(log_gamma(v)); due sketch si
+    uniscono sommando i bucket, quindi il downsampling conserva i quantili.
+    """
+
+    RELATIVE_ACCURACY = 0.02
+    GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _LOG_GAMMA = math.log(GAMMA)
+
+    __slots__ = ("buckets", "zero_count")
+
+    def __init__(self, buckets: dict[int, int] | None = None, zero_count: int = 0):
+        self.buckets: dict[int, int] = buckets or {}
+        self.zero_count = zero_count
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._LOG_GAMMA)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "MetricSketch") -> None:
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        total = self.zero_count + sum(self.buckets.values())
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Punto medio (relativo) del bucket
+                return 2 * self.GAMMA ** index / (self.GAMMA + 1)
+        return 2 * self.GAMMA ** max(self.buckets) / (self.GAMMA + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"z": self.zero_count, "b": {str(k): v for k, v in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "MetricSketch":
+        if not data:
+            return cls()
+        return cls({int(k): v for k, v in data.get("b", {}).items()}, data.get("z", 0))
+
+
+@dataclass
+class RollupBucket:
+    """Aggregato di un bucket (in memoria o letto da metric_rollups)."""
+
+    count: int = 0
+    sum: float = 0.0
+    min: float | None = None
+    max: float | None = None
+    sketch: MetricSketch = field(default_factory=MetricSketch)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: "RollupBucket") -> None:
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def avg(self) -> float | None:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        return self.sketch.quantile(q)
+
+
+class MetricRollupAggregator:
+    """
+    Aggregatore in-process delle metriche.
+
+    Example:
+        >>> metric_rollups.record("api_response_time", 42.0)
+        >>> metric_rollups.record("http_requests", 1, {"status_class": "5xx"})
+        >>> bucket = await query_window(db, "api_response_time", timedelta(minutes=5))
+    """
+
+    def __init__(self):
+        self.source = f"{socket.gethostname()}:{os.getpid()}"
+        self.flush_interval = float(os.getenv("ROLLUP_FLUSH_INTERVAL", "10"))
+        self.maintenance_interval = float(os.getenv("ROLLUP_MAINTENANCE_INTERVAL", "300"))
+        self.retention_days = {
+            "1m": int(os.getenv("ROLLUP_RETENTION_1M_DAYS", "2")),
+            "1h": int(os.getenv("ROLLUP_RETENTION_1H_DAYS", "30")),
+            "1d": int(os.getenv("ROLLUP_RETENTION_1D_DAYS", "365")),
+        }
+        self.raw_retention_days = int(os.getenv("METRIC_LOG_RETENTION_DAYS", "7"))
+
+        # (metric_name, labels_key, minute) -> (labels, RollupBucket)
+        self._buckets: dict[tuple[str, str, datetime], tuple[dict | None, RollupBucket]] = {}
+        # Lock di thread: record() è chiamato anche da codice sincrono nei threadpool
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._last_maintenance = 0.0
+
+        self.rows_flushed = 0
+        self.flush_errors = 0
+
+    def record(self, metric_name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        """Registra un campione nel bucket del minuto corrente."""
+        key = (metric_name, labels_key(labels), _truncate(_utcnow(), "1m"))
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is None:
+                entry = (labels, RollupBucket())
+                self._buckets[key] = entry
+            entry[1].add(float(value))
+
+    def _take(self, include_open: bool) -> dict[tuple[str, str, datetime], tuple[dict | None, RollupBucket]]:
+        """Estrae i bucket da scrivere (solo i minuti chiusi, salvo shutdown)."""
+        current_minute = _truncate(_utcnow(), "1m")
+        with self._lock:
+            if include_open:
+                taken, self._buckets = self._buckets, {}
+                return taken
+            taken = {k: v for k, v in self._buckets.items() if k[2] < current_minute}
+            for key in taken:
+                del self._buckets[key]
+            return taken
+
+    async def flush(self, include_open: bool = False) -> int:
+        """Scrive i minuti chiusi in metric_rollups. Ritorna le righe scritte."""
+        taken = self._take(include_open)
+        if not taken:
+            return 0
+
+        from sqlalchemy import JSON, func, literal_column
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.infrastructure.database import AsyncSessionLocal
+        from app.infrastructure.monitoring.models import MetricRollup
+
+        rows = [
+            {
+                "metric_name": name,
+                "labels_key": key,
+                "labels": labels,
+                "resolution": "1m",
+                "bucket_start": minute,
+                "source": self.source,
+                "count": bucket.count,
+                "sum": bucket.sum,
+                "min": bucket.min,
+                "max": bucket.max,
+                "sketch": bucket.sketch.to_dict(),
+            }
+            for (name, key, minute), (labels, bucket) in taken.items()
+        ]
+
+        stmt = insert(MetricRollup).values(rows)
+        # Ogni worker scrive un minuto una sola volta (solo minuti chiusi):
+        # il conflitto capita con un flush di shutdown seguito da campioni
+        # tardivi o con due processi con lo stesso source. In entrambi i casi
+        # il bucket esistente si unisce a quello nuovo, senza sovrascriverlo
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_metric_rollups_bucket",
+            set_={
+                "count": MetricRollup.count + stmt.excluded.count,
+                "sum": MetricRollup.sum + stmt.excluded.sum,
+                "min": func.least(MetricRollup.min, stmt.excluded.min),
+                "max": func.greatest(MetricRollup.max, stmt.excluded.max),
+                "sketch": literal_column(_MERGE_SKETCH_SQL, type_=JSON),
+            },
+        )
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            self.flush_errors += 1
+            logger.warning("metric_rollup_flush_failed", rows=len(rows), error=str(e))
+            self._restore(taken)
+            return 0
+
+        self.rows_flushed += len(rows)
+        return len(rows)
+
+    def _restore(self, taken) -> None:
+        """Rimette in memoria i bucket non scritti (riprovati al prossimo flush)."""
+        with self._lock:
+            for key, (labels, bucket) in taken.items():
+                entry = self._buckets.get(key)
+                if entry is None:
+                    self._buckets[key] = (labels, bucket)
+                else:
+                    entry[1].merge(bucket)
+
+    # ------------------------------------------------------------------ #
+    # Downsampling e retention (solo leader)
+    # ------------------------------------------------------------------ #
+
+    async def downsample(self, source_resolution: str, target_resolution: str, periods: int = 2) -> int:
+        """
+        Ricalcola gli ultimi `periods` bucket chiusi di `target_resolution`
+        unendo i bucket di `source_resolution` di tutte le sorgenti.
+
+        Idempotente: ogni esecuzione sovrascrive i bucket ricalcolati.
+        """
+        from sqlalchemy import select
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.infrastructure.database import AsyncSessionLocal
+        from app.infrastructure.monitoring.models import MetricRollup
+
+        step = RESOLUTIONS[target_resolution]
+        end = _truncate(_utcnow(), target_resolution)
+        start = end - step * periods
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(MetricRollup).where(
+                    MetricRollup.resolution == source_resolution,
+                    MetricRollup.bucket_start >= start,
+                    MetricRollup.bucket_start < end,
+                )
+            )
+
+            merged: dict[tuple[str, str, datetime], tuple[dict | None, RollupBucket]] = {}
+            for row in result.scalars():
+                key = (row.metric_name, row.labels_key, _truncate(row.bucket_start, target_resolution))
+                entry = merged.setdefault(key, (row.labels, RollupBucket()))
+                entry[1].merge(_row_bucket(row))
+
+            if not merged:
+                return 0
+
+            rows = [
+                {
+                    "metric_name": name,
+                    "labels_key": key,
+                    "labels": labels,
+                    "resolution": target_resolution,
+                    "bucket_start": bucket_start,
+                    "source": "*",
+                    "count": bucket.count,
+                    "sum": bucket.sum,
+                    "min": bucket.min,
+                    "max": bucket.max,
+                    "sketch": bucket.sketch.to_dict(),
+                }
+                for (name, key, bucket_start), (labels, bucket) in merged.items()
+            ]
+            stmt = insert(MetricRollup).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_metric_rollups_bucket",
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("labels", "count", "sum", "min", "max", "sketch")
+                },
+            )
+            await db.execute(stmt)
+            await db.commit()
+
+        return len(rows)
+
+    async def apply_retention(self) -> dict[str, int]:
+        """Elimina i bucket e i campioni grezzi oltre la retention."""
+        from sqlalchemy import delete
+
+        from app.infrastructure.database import AsyncSessionLocal
+        from app.infrastructure.monitoring.models import MetricLog, MetricRollup
+
+        now = _utcnow()
+        deleted: dict[str, int] = {}
+
+        async with AsyncSessionLocal() as db:
+            for resolution, days in self.retention_days.items():
+                result = await db.execute(
+                    delete(MetricRollup).where(
+                        MetricRollup.resolution == resolution,
+                        MetricRollup.bucket_start < now - timedelta(days=days),
+                    )
+                )
+                deleted[resolution] = result.rowcount or 0
+
+            result = await db.execute(
+                delete(MetricLog).where(
+                    MetricLog.timestamp < now - timedelta(days=self.raw_retention_days)
+                )
+            )
+            deleted["raw"] = result.rowcount or 0
+            await db.commit()
+
+        return deleted
+
+    async def run_maintenance(self) -> None:
+        """Downsampling 1m->1h->1d e retention."""
+        hourly = await self.downsample("1m", "1h")
+        daily = await self.downsample("1h", "1d")
+        deleted = await self.apply_retention()
+        logger.info("metric_rollup_maintenance", hourly=hourly, daily=daily, deleted=deleted)
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> None:
+        """Avvia il loop di flush (e manutenzione sul leader) in background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Ferma il loop e scrive anche il minuto in corso."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(include_open=True)
+
+    async def _run(self) -> None:
+        from app.infrastructure.scheduler.leader import scheduler_leader
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+
+                if (
+                    scheduler_leader.is_leader
+                    and time.monotonic() - self._last_maintenance >= self.maintenance_interval
+                ):
+                    self._last_maintenance = time.monotonic()
+                    await self.run_maintenance()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("metric_rollup_loop_error", error=str(e))
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            pending = len(self._buckets)
+        return {
+            "source": self.source,
+            "pending_buckets": pending,
+            "rows_flushed": self.rows_flushed,
+            "flush_errors": self.flush_errors,
+        }
+
+
+def _row_bucket(row) -> RollupBucket:
+    return RollupBucket(
+        count=row.count,
+        sum=row.sum,
+        min=row.min,
+        max=row.max,
+        sketch=MetricSketch.from_dict(row.sketch),
+    )
+
+
+def _window_filter(
+    metric_name: str,
+    window: timedelta,
+    labels: dict[str, Any] | None,
+    now: datetime,
+):
+    """
+    Condizione SQL e predicato Python equivalente per una finestra.
+
+    Ore intere nel passato dai bucket 1h, ultima ora (e bordo iniziale) dai 1m.
+    """
+    from sqlalchemy import and_, or_
+
+    from app.infrastructure.monitoring.models import MetricRollup
+
+    since = now - window
+    hour_start = _truncate(now, "1h")
+    key = labels_key(labels) if labels is not None else None
+
+    conditions = [MetricRollup.metric_name == metric_name]
+    if key is not None:
+        conditions.append(MetricRollup.labels_key == key)
+
+    if window > timedelta(hours=2):
+        first_full_hour = _truncate(since, "1h") + RESOLUTIONS["1h"]
+        conditions.append(or_(
+            and_(
+                MetricRollup.resolution == "1h",
+                MetricRollup.bucket_start >= first_full_hour,
+                MetricRollup.bucket_start < hour_start,
+            ),
+            and_(
+                MetricRollup.resolution == "1m",
+                or_(
+                    and_(MetricRollup.bucket_start >= since, MetricRollup.bucket_start < first_full_hour),
+                    MetricRollup.bucket_start >= hour_start,
+                ),
+            ),
+        ))
+
+        def in_time(row) -> bool:
+            if row.resolution == "1h":
+                return first_full_hour <= row.bucket_start < hour_start
+            return row.resolution == "1m" and (
+                since <= row.bucket_start < first_full_hour or row.bucket_start >= hour_start
+            )
+    else:
+        conditions.extend([
+            MetricRollup.resolution == "1m",
+            MetricRollup.bucket_start >= since,
+        ])
+
+        def in_time(row) -> bool:
+            return row.resolution == "1m" and row.bucket_start >= since
+
+    def predicate(row) -> bool:
+        return (
+            row.metric_name == metric_name
+            and (key is None or row.labels_key == key)
+            and in_time(row)
+        )
+
+    return and_(*conditions), predicate
+
+
+async def query_windows(
+    db,
+    windows: list[tuple[str, timedelta, dict[str, Any] | None]],
+) -> list[RollupBucket]:
+    """
+    Più finestre (metrica, durata, labels) con una sola query.
+
+    Ritorna un RollupBucket per finestra, nello stesso ordine. Una riga può
+    contribuire a più finestre (es. tutte le richieste e solo le 5xx).
+    """
+    from sqlalchemy import or_, select
+
+    from app.infrastructure.monitoring.models import MetricRollup
+
+    now = _utcnow()
+    filters = [_window_filter(name, window, labels, now) for name, window, labels in windows]
+
+    result = await db.execute(select(MetricRollup).where(or_(*(f[0] for f in filters))))
+
+    totals = [RollupBucket() for _ in windows]
+    for row in result.scalars():
+        bucket = None
+        for total, (_, predicate) in zip(totals, filters):
+            if predicate(row):
+                bucket = bucket or _row_bucket(row)
+                total.merge(bucket)
+    return totals
+
+
+async def query_window(
+    db,
+    metric_name: str,
+    window: timedelta,
+    labels: dict[str, Any] | None = None,
+) -> RollupBucket:
+    """
+    Aggregato di una metrica sulla finestra [now - window, now).
+
+    Usa i bucket orari per le ore complete già downsamplate e quelli al minuto
+    per il resto: il numero di righe lette dipende dalla finestra, non dal traffico.
+    `labels=None` unisce tutte le combinazioni di labels.
+    """
+    return (await query_windows(db, [(metric_name, window, labels)]))[0]
+
+
+# Singleton instance
+metric_rollups = MetricRollupAggregator()
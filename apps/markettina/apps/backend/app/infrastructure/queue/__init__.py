@@ -0,0 +1,24 @@
+"""
+Queue Infrastructure
+Coda job durevole su Redis Streams con worker separato.
+
+Avvio worker: python -m app.infrastructure.queue.worker
+"""
+
+from .task_queue import (
+    TERMINAL_STATUSES,
+    JobStatus,
+    TaskQueue,
+    get_registered_tasks,
+    task,
+    task_queue,
+)
+
+__all__ = [
+    "TERMINAL_STATUSES",
+    "JobStatus",
+    "TaskQueue",
+    "get_registered_tasks",
+    "task",
+    "task_queue",
+]
@@ -0,0 +1,441 @@
+"""
+Task Queue - Coda job durevole su Redis Streams.
+
+I lavori lunghi (arricchimento lead, invio campagne, pipeline multi-agente,
+generazione video) vengono accodati dalle API ed eseguiti da un processo
+worker separato (`python -m app.infrastructure.queue.worker`), così non
+muoiono a un restart delle API e non competono con il traffico HTTP.
+
+- Stream `queue:jobs` con consumer group `workers`: ogni job va a un solo worker
+- Ack esplicito a fine esecuzione: i messaggi non confermati restano pendenti
+- Visibility timeout: il worker rinnova i messaggi in lavorazione (heartbeat
+  XCLAIM); quelli fermi da più di `visibility_timeout` (worker morto) vengono
+  riassegnati con XAUTOCLAIM
+- Retry con backoff esponenziale fino a `max_retries` (sorted set `queue:delayed`)
+- Stato e risultato in `queue:job:{id}` (hash con TTL); ogni cambio di stato
+  è pubblicato su `queue:events:{id}` per lo streaming verso i client
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from enum import Enum
+from typing import Any
+
+import structlog
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+TaskHandler = Callable[[dict[str, Any]], Awaitable[Any]]
+
+_TASKS: dict[str, TaskHandler] = {}
+
+
+def task(name: str) -> Callable[[TaskHandler], TaskHandler]:
+    """Registra una coroutine come task eseguibile dal worker."""
+    def decorator(func: TaskHandler) -> TaskHandler:
+        if name in _TASKS:
+            raise ValueError(f"Task '{name}' already registered")
+        _TASKS[name] = func
+        return func
+    return decorator
+
+
+def get_registered_tasks() -> list[str]:
+    """Nomi dei task registrati in questo processo."""
+    return sorted(_TASKS)
+
+
+class JobStatus(str, Enum):
+    """Stato di un job in coda."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
+
+
+class TaskQueue:
+    """
+    Coda di job su Redis Streams (lato API: enqueue/stato, lato worker: consumo).
+
+    Example:
+        >>> job_id = await task_queue.enqueue("bulk_enrich_leads", {"lead_ids": [1, 2]})
+        >>> job = await task_queue.get_job(job_id)
+        >>> async for state in task_queue.stream_job(job_id):
+        ...     print(state["status"])
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        stream: str = "queue:jobs",
+        group: str = "workers",
+        visibility_timeout: float | None = None,
+        result_ttl: int | None = None,
+    ):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.stream = stream
+        self.group = group
+        self.delayed_key = "queue:delayed"
+        self.visibility_timeout = visibility_timeout or float(
+            os.getenv("QUEUE_VISIBILITY_TIMEOUT", "120")
+        )
+        self.result_ttl = result_ttl or int(os.getenv("QUEUE_RESULT_TTL", str(7 * 24 * 3600)))
+        self.retry_backoff = float(os.getenv("QUEUE_RETRY_BACKOFF", "10"))
+        self.max_backoff = float(os.getenv("QUEUE_MAX_BACKOFF", "600"))
+        self._redis: aioredis.Redis | None = None
+
+    def _job_key(self, job_id: str) -> str:
+        return f"queue:job:{job_id}"
+
+    def _events_channel(self, job_id: str) -> str:
+        return f"queue:events:{job_id}"
+
+    async def _get_redis(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+
+    async def close(self):
+        """Chiude la connessione Redis."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    # =========================================================================
+    # PRODUCER / STATUS API
+    # =========================================================================
+
+    async def enqueue(
+        self,
+        task_name: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        max_retries: int = 3,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Accoda un job e ritorna il suo ID.
+
+        Args:
+            task_name: Nome del task registrato nel worker
+            payload: Argomenti JSON-serializzabili del task
+            max_retries: Tentativi aggiuntivi in caso di errore
+            timeout: Tempo massimo di esecuzione di un tentativo (secondi)
+        """
+        redis = await self._get_redis()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        job = {
+            "id": job_id,
+            "task": task_name,
+            "payload": json.dumps(payload or {}, default=str),
+            "status": JobStatus.QUEUED.value,
+            "attempts": 0,
+            "max_retries": max_retries,
+            "timeout": timeout or 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping=job)
+            pipe.expire(self._job_key(job_id), self.result_ttl)
+            pipe.xadd(self.stream, {"job_id": job_id})
+            await pipe.execute()
+
+        logger.info("job_enqueued", job_id=job_id, task=task_name)
+        return job_id
+
+    async def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """Stato corrente di un job (None se inesistente o scaduto)."""
+        redis = await self._get_redis()
+        raw = await redis.hgetall(self._job_key(job_id))
+        if not raw:
+            return None
+
+        job: dict[str, Any] = dict(raw)
+        for field in ("payload", "result"):
+            if job.get(field):
+                job[field] = json.loads(job[field])
+        for field in ("attempts", "max_retries"):
+            job[field] = int(job.get(field, 0))
+        for field in ("timeout", "created_at", "updated_at", "started_at", "finished_at", "retry_at"):
+            if job.get(field):
+                job[field] = float(job[field])
+        return job
+
+    async def stream_job(
+        self,
+        job_id: str,
+        poll_interval: float = 15.0,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Emette lo stato del job a ogni cambiamento, fino a uno stato finale.
+
+        Usa il pub/sub del job; `poll_interval` è un fallback per eventi persi.
+        """
+        redis = await self._get_redis()
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(self._events_channel(job_id))
+
+        try:
+            last_update = None
+            while True:
+                job = await self.get_job(job_id)
+                if job is None:
+                    return
+                if job["updated_at"] != last_update:
+                    last_update = job["updated_at"]
+                    yield job
+                if job["status"] in TERMINAL_STATUSES:
+                    return
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=poll_interval)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def _update_job(self, job_id: str, **fields: Any):
+        """Aggiorna i campi del job e notifica i client in ascolto."""
+        redis = await self._get_redis()
+        fields["updated_at"] = time.time()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping=fields)
+            pipe.expire(self._job_key(job_id), self.result_ttl)
+            pipe.publish(self._events_channel(job_id), fields.get("status", ""))
+            await pipe.execute()
+
+    async def get_stats(self) -> dict[str, Any]:
+        """Profondità della coda, job pendenti e consumer attivi."""
+        redis = await self._get_redis()
+        stats: dict[str, Any] = {
+            "stream_length": await redis.xlen(self.stream),
+            "delayed": await redis.zcard(self.delayed_key),
+        }
+        try:
+            groups = await redis.xinfo_groups(self.stream)
+            for group in groups:
+                if group["name"] == self.group:
+                    stats.update(
+                        consumers=group["consumers"],
+                        pending=group["pending"],
+                        lag=group.get("lag"),
+                    )
+        except aioredis.ResponseError:
+            # Stream non ancora creato
+            pass
+        return stats
+
+    # =========================================================================
+    # WORKER
+    # =========================================================================
+
+    async def ensure_group(self):
+        """Crea stream e consumer group se mancanti."""
+        redis = await self._get_redis()
+        try:
+            await redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except aioredis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def run_worker(
+        self,
+        consumer: str,
+        concurrency: int = 4,
+        stop_event: asyncio.Event | None = None,
+    ):
+        """
+        Consuma job finché `stop_event` non viene impostato.
+
+        Allo stop i job in corso vengono cancellati senza ack: restano pendenti
+        e un altro worker li riprende dopo il visibility timeout.
+        """
+        redis = await self._get_redis()
+        await self.ensure_group()
+        stop_event = stop_event or asyncio.Event()
+        running: set[asyncio.Task] = set()
+        last_maintenance = 0.0
+
+        logger.info(
+            "queue_worker_started",
+            consumer=consumer,
+            concurrency=concurrency,
+            tasks=get_registered_tasks(),
+        )
+
+        try:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                if now - last_maintenance >= min(5.0, self.visibility_timeout / 4):
+                    last_maintenance = now
+                    await self._promote_delayed()
+                    for message_id, fields in await self._reclaim_stale(consumer):
+                        running.add(asyncio.create_task(self._process(consumer, message_id, fields)))
+
+                free = concurrency - len(running)
+                if free <= 0:
+                    done, _ = await asyncio.wait(running, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+                    running -= done
+                    continue
+
+                response = await redis.xreadgroup(
+                    self.group, consumer, {self.stream: ">"}, count=free, block=1000
+                )
+                for _, messages in response or []:
+                    for message_id, fields in messages:
+                        running.add(asyncio.create_task(self._process(consumer, message_id, fields)))
+
+                running = {t for t in running if not t.done()}
+        finally:
+            for pending in running:
+                pending.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            logger.info("queue_worker_stopped", consumer=consumer)
+
+    async def _promote_delayed(self):
+        """Riporta sullo stream i retry il cui backoff è scaduto."""
+        redis = await self._get_redis()
+        due = await redis.zrangebyscore(self.delayed_key, 0, time.time())
+        for job_id in due:
+            # ZREM come lock: un solo worker promuove ogni job
+            if await redis.zrem(self.delayed_key, job_id):
+                await redis.xadd(self.stream, {"job_id": job_id})
+
+    async def _reclaim_stale(self, consumer: str) -> list[tuple[str, dict]]:
+        """Prende in carico i messaggi di worker che hanno superato il visibility timeout."""
+        redis = await self._get_redis()
+        try:
+            result = await redis.xautoclaim(
+                self.stream,
+                self.group,
+                consumer,
+                min_idle_time=int(self.visibility_timeout * 1000),
+                start_id="0-0",
+                count=10,
+            )
+        except aioredis.ResponseError as e:
+            logger.warning("queue_reclaim_error", error=str(e))
+            return []
+
+        messages = [(message_id, fields) for message_id, fields in result[1] if fields]
+        if messages:
+            logger.warning("queue_messages_reclaimed", count=len(messages), consumer=consumer)
+        return messages
+
+    async def _heartbeat(self, consumer: str, message_id: str):
+        """Rinnova la visibilità del messaggio finché il job è in esecuzione."""
+        redis = await self._get_redis()
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                await redis.xclaim(
+                    self.stream, self.group, consumer,
+                    min_idle_time=0, message_ids=[message_id], justid=True,
+                )
+            except Exception as e:
+                logger.warning("queue_heartbeat_error", message_id=message_id, error=str(e))
+
+    async def _ack(self, message_id: str):
+        redis = await self._get_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, message_id)
+            pipe.xdel(self.stream, message_id)
+            await pipe.execute()
+
+    async def _process(self, consumer: str, message_id: str, fields: dict[str, str]):
+        """Esegue un job: stato, timeout, retry/backoff e ack."""
+        redis = await self._get_redis()
+        job_id = fields.get("job_id", "")
+        job = await self.get_job(job_id)
+
+        if job is None or job["status"] in TERMINAL_STATUSES:
+            # Job scaduto o consegna duplicata
+            await self._ack(message_id)
+            return
+
+        handler = _TASKS.get(job["task"])
+        if handler is None:
+            await self._update_job(
+                job_id,
+                status=JobStatus.FAILED.value,
+                error=f"Unknown task: {job['task']}",
+                finished_at=time.time(),
+            )
+            await self._ack(message_id)
+            return
+
+        attempts = await redis.hincrby(self._job_key(job_id), "attempts", 1)
+        if attempts > job["max_retries"] + 1:
+            # Rimesso in coda troppe volte (worker morti durante l'esecuzione)
+            await self._update_job(
+                job_id,
+                status=JobStatus.FAILED.value,
+                error=job.get("error") or "Max attempts exceeded",
+                finished_at=time.time(),
+            )
+            await self._ack(message_id)
+            return
+
+        await self._update_job(
+            job_id,
+            status=JobStatus.RUNNING.value,
+            started_at=time.time(),
+            worker=consumer,
+        )
+        logger.info("job_started", job_id=job_id, task=job["task"], attempt=attempts)
+
+        heartbeat = asyncio.create_task(self._heartbeat(consumer, message_id))
+        try:
+            coro = handler(job["payload"])
+            result = await (asyncio.wait_for(coro, timeout=job["timeout"]) if job["timeout"] else coro)
+
+        except asyncio.CancelledError:
+            # Shutdown del worker: niente ack, il messaggio verrà riassegnato
+            raise
+
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if attempts <= job["max_retries"]:
+                delay = min(self.retry_backoff * 2 ** (attempts - 1), self.max_backoff)
+                retry_at = time.time() + delay
+                await self._update_job(
+                    job_id, status=JobStatus.RETRYING.value, error=error, retry_at=retry_at
+                )
+                await redis.zadd(self.delayed_key, {job_id: retry_at})
+                logger.warning("job_retry_scheduled", job_id=job_id, attempt=attempts, delay=delay, error=error)
+            else:
+                await self._update_job(
+                    job_id, status=JobStatus.FAILED.value, error=error, finished_at=time.time()
+                )
+                logger.error("job_failed", job_id=job_id, task=job["task"], error=error)
+            await self._ack(message_id)
+
+        else:
+            await self._update_job(
+                job_id,
+                status=JobStatus.COMPLETED.value,
+                result=json.dumps(result, default=str),
+                error="",
+                finished_at=time.time(),
+            )
+            await self._ack(message_id)
+            logger.info("job_completed", job_id=job_id, task=job["task"])
+
+        finally:
+            heartbeat.cancel()
+
+
+# Singleton instance
+task_queue = TaskQueue()
@@ -0,0 +1,67 @@
+"""
+Task eseguiti dal worker della coda.
+
+Ogni task riceve il payload JSON del job e ritorna un risultato
+JSON-serializzabile; le sessioni DB sono aperte dal task stesso
+perché il worker gira fuori dal ciclo request/response.
+"""
+
+from typing import Any
+
+from app.domain.marketing.email_service import email_service
+from app.domain.marketing.lead_enrichment_service import LeadEnrichmentService
+from app.infrastructure.database import SessionLocal
+from app.infrastructure.queue.task_queue import task
+from app.services.multi_agent_orchestrator import Pipeline, orchestrator
+from app.services.veo_video_service import VideoGenerationRequest, veo_service
+
+
+@task("bulk_enrich_leads")
+async def bulk_enrich_leads(payload: dict[str, Any]) -> dict:
+    """Arricchimento multiplo lead (Google Places, sito web, scoring)."""
+    db = SessionLocal()
+    service = LeadEnrichmentService(db)
+    try:
+        return await service.bulk_enrich_leads(payload["lead_ids"])
+    finally:
+        await service.close()
+        db.close()
+
+
+@task("send_campaign")
+async def send_campaign(payload: dict[str, Any]) -> dict:
+    """Invio di una campagna email a tutti i lead target."""
+    db = SessionLocal()
+    try:
+        return await email_service.send_campaign(
+            db=db,
+            campaign_id=payload["campaign_id"],
+            batch_size=payload.get("batch_size", 50),
+            delay_between_batches=payload.get("delay_seconds", 1.0)
+        )
+    finally:
+        db.close()
+
+
+@task("execute_pipeline")
+async def execute_pipeline(payload: dict[str, Any]) -> dict:
+    """Esecuzione di una pipeline multi-agente creata dalle API."""
+    pipeline = Pipeline.model_validate(payload["pipeline"])
+    orchestrator.pipelines[pipeline.pipeline_id] = pipeline
+
+    result = await orchestrator.execute_pipeline(pipeline.pipeline_id)
+    return {
+        "pipeline_id": result.pipeline_id,
+        "status": result.status.value,
+        "context": result.context
+    }
+
+
+@task("generate_video")
+async def generate_video(payload: dict[str, Any]) -> dict:
+    """Generazione video VEO fino al download del file."""
+    request = VideoGenerationRequest.model_validate(payload)
+    result = await veo_service.generate_video(request, wait_for_completion=True)
+    if not result.success:
+        raise RuntimeError(result.job.error or "Video generation failed")
+    return result.model_dump(mode="json")
@@ -0,0 +1,48 @@
+"""
+Queue Worker - Entry point del processo worker.
+
+Esegue i job accodati dalle API fuori dai worker HTTP:
+
+    python -m app.infrastructure.queue.worker
+
+Configurazione (env):
+- QUEUE_WORKER_CONCURRENCY: job eseguiti in parallelo (default 4)
+- QUEUE_WORKER_NAME: nome consumer (default hostname-pid)
+"""
+
+import asyncio
+import os
+import signal
+import socket
+
+import structlog
+
+from app.core.config import settings
+from app.infrastructure.database.models_registry import configure_all_models
+from app.infrastructure.monitoring import setup_logging
+from app.infrastructure.queue import tasks  # noqa: F401 - registra i task
+from app.infrastructure.queue.task_queue import task_queue
+
+logger = structlog.get_logger(__name__)
+
+
+async def main():
+    setup_logging(level=settings.LOG_LEVEL, service_name="markettina-worker")
+    configure_all_models()
+
+    consumer = os.getenv("QUEUE_WORKER_NAME") or f"{socket.gethostname()}-{os.getpid()}"
+    concurrency = int(os.getenv("QUEUE_WORKER_CONCURRENCY", "4"))
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await task_queue.run_worker(consumer, concurrency=concurrency, stop_event=stop_event)
+    finally:
+        await task_queue.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
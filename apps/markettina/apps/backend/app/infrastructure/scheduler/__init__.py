@@ -6,6 +6,10 @@ Includes:
 - Trial Reminder: Promemoria scadenza trial
 - ToolAI Scheduler: Generazione quotidiana post ToolAI
 - Marketing Content Scheduler: Generazione batch daily content (1 post + 3 stories + 1 video)
+
+Con più worker uvicorn solo il leader eletto (lock Redis, vedi leader.py)
+avvia gli scheduler: i job store persistenti non sono mai usati da due
+processi insieme.
 """
 
 # from app.infrastructure.scheduler.toolai_scheduler import (
@@ -14,6 +18,10 @@ Includes:
 #     stop_toolai_scheduler,
 #     ToolAIScheduler
 # )
+from app.infrastructure.scheduler.leader import (
+    SchedulerLeaderElection,
+    scheduler_leader,
+)
 from app.infrastructure.scheduler.marketing_content_scheduler import (
     MarketingContentScheduler,
     marketing_content_scheduler,
@@ -37,16 +45,31 @@ async def stop_trial_reminder_scheduler():
     """Placeholder per trial reminders."""
 
 
-async def start_all_schedulers():
-    """Avvia tutti gli scheduler."""
+async def _start_leader_schedulers():
+    """Processo eletto leader: avvia gli scheduler ed esegue i job."""
     await start_post_scheduler()
-    await start_trial_reminder_scheduler()
     # await start_toolai_scheduler()  # ToolAI daily generation
     await start_marketing_scheduler()  # Marketing batch daily content
 
 
+async def _stop_leader_schedulers():
+    """Leadership persa: ferma gli scheduler, i job restano sul job store."""
+    await stop_post_scheduler()
+    await stop_marketing_scheduler()
+
+
+async def start_all_schedulers():
+    """Avvia la leader election: gli scheduler partono solo sul leader."""
+    await start_trial_reminder_scheduler()
+    await scheduler_leader.start(
+        on_elected=_start_leader_schedulers,
+        on_demoted=_stop_leader_schedulers,
+    )
+
+
 async def stop_all_schedulers():
     """Ferma tutti gli scheduler."""
+    await scheduler_leader.stop()  # Rilascia subito il lock e ferma gli scheduler del leader
     await stop_post_scheduler()
     await stop_trial_reminder_scheduler()
     # await stop_toolai_scheduler()  # ToolAI scheduler
@@ -69,4 +92,6 @@ __all__ = [
     "trigger_marketing_generation",
     "start_all_schedulers",
     "stop_all_schedulers",
+    "scheduler_leader",
+    "SchedulerLeaderElection",
 ]
@@ -0,0 +1,220 @@
+"""
+Scheduler Leader Election - Un solo processo esegue i job periodici.
+
+Con `uvicorn --workers N` ogni worker avvia gli scheduler: senza coordinamento
+ogni job (pubblicazione post, generazione contenuti) girerebbe N volte.
+I worker competono per un lock Redis (SET NX PX con token del processo):
+- il leader rinnova il lock ogni ttl/3 e avvia gli scheduler
+- gli altri worker non avviano scheduler e ritentano ogni pochi secondi
+- se il leader muore il lock scade dopo `ttl` secondi e un altro worker subentra
+- allo shutdown il leader rilascia subito il lock (failover immediato)
+
+Configurazione (env):
+- SCHEDULER_LEADER_ELECTION: "false" per processi singoli senza Redis
+- SCHEDULER_LEADER_TTL: durata del lock in secondi (default 10)
+- SCHEDULER_LEADER_RETRY: intervallo tentativi dei follower (default 2)
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import structlog
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Rinnova / rilascia il lock solo se appartiene ancora a questo processo
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SchedulerLeaderElection:
+    """
+    Leader election basata su lock Redis con scadenza.
+
+    Il processo eletto esegue `on_elected`, quello che perde la leadership
+    (lock scaduto o Redis irraggiungibile troppo a lungo) esegue `on_demoted`.
+    Il leader cede la leadership prima della scadenza del lock se non riesce
+    a rinnovarlo, così due processi non sono mai leader insieme.
+    """
+
+    def __init__(
+        self,
+        name: str = "schedulers",
+        redis_url: str | None = None,
+        ttl: float | None = None,
+        retry_interval: float | None = None,
+        enabled: bool | None = None,
+    ):
+        self.key = f"scheduler:leader:{name}"
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.ttl = ttl or float(os.getenv("SCHEDULER_LEADER_TTL", "10"))
+        self.retry_interval = retry_interval or float(os.getenv("SCHEDULER_LEADER_RETRY", "2"))
+        self.renew_interval = self.ttl / 3
+        # Durata massima di una chiamata Redis (rinnovo compreso)
+        self.socket_timeout = self.renew_interval
+        self.enabled = (
+            enabled if enabled is not None
+            else os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() == "true"
+        )
+        self.identity = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self.is_leader = False
+        self.elected_at: float | None = None
+        self.transitions = 0
+
+        self._redis: aioredis.Redis | None = None
+        self._task: asyncio.Task | None = None
+        self._last_renewal = 0.0
+        self._on_elected: Callable[[], Awaitable[None]] | None = None
+        self._on_demoted: Callable[[], Awaitable[None]] | None = None
+
+    async def start(
+        self,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+    ):
+        """Avvia la competizione per la leadership in background."""
+        if self._task is not None or self.is_leader:
+            logger.warning("scheduler_leader_election_already_running")
+            return
+
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+
+        if not self.enabled:
+            logger.info("scheduler_leader_election_disabled", identity=self.identity)
+            await self._become_leader()
+            return
+
+        self._redis = aioredis.from_url(
+            self.redis_url,
+            decode_responses=True,
+            socket_timeout=self.socket_timeout,
+            socket_connect_timeout=self.socket_timeout,
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info("scheduler_leader_election_started", identity=self.identity, ttl=self.ttl)
+
+    async def stop(self):
+        """Ferma la election e rilascia il lock se leader."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self.is_leader:
+            if self._redis is not None:
+                try:
+                    await self._redis.eval(_RELEASE_SCRIPT, 1, self.key, self.identity)
+                except Exception as e:
+                    logger.warning("scheduler_leader_release_error", error=str(e))
+            await self._step_down()
+
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _run(self):
+        """Loop di acquisizione (follower) / rinnovo (leader)."""
+        ttl_ms = int(self.ttl * 1000)
+
+        while True:
+            try:
+                if self.is_leader:
+                    renewed = await self._redis.eval(
+                        _RENEW_SCRIPT, 1, self.key, self.identity, ttl_ms
+                    )
+                    if renewed:
+                        self._last_renewal = time.monotonic()
+                    else:
+                        logger.warning("scheduler_leadership_lost", identity=self.identity)
+                        await self._step_down()
+                else:
+                    acquired = await self._redis.set(
+                        self.key, self.identity, nx=True, px=ttl_ms
+                    )
+                    if acquired:
+                        self._last_renewal = time.monotonic()
+                        await self._become_leader()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("scheduler_leader_redis_error", error=str(e))
+
+            if self.is_leader:
+                # Senza rinnovo il lock scade: cedere prima che un altro worker lo prenda
+                remaining = self._renew_deadline() - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("scheduler_leader_renew_deadline_missed", identity=self.identity)
+                    await self._step_down()
+                else:
+                    await asyncio.sleep(min(self.renew_interval, remaining))
+                    continue
+
+            await asyncio.sleep(self.retry_interval)
+
+    def _renew_deadline(self) -> float:
+        """
+        Ultimo istante per tentare un rinnovo: un tentativo avviato dopo può
+        durare socket_timeout e finire a meno di renew_interval dalla
+        scadenza del lock.
+        """
+        return self._last_renewal + self.ttl - (self.renew_interval + self.socket_timeout)
+
+    async def _become_leader(self):
+        self.is_leader = True
+        self.elected_at = time.time()
+        self.transitions += 1
+        logger.info("scheduler_leader_elected", identity=self.identity)
+        try:
+            await self._on_elected()
+        except Exception as e:
+            logger.error("scheduler_leader_elected_callback_error", error=str(e))
+
+    async def _step_down(self):
+        self.is_leader = False
+        self.elected_at = None
+        self.transitions += 1
+        logger.info("scheduler_leader_demoted", identity=self.identity)
+        try:
+            await self._on_demoted()
+        except Exception as e:
+            logger.error("scheduler_leader_demoted_callback_error", error=str(e))
+
+    def get_status(self) -> dict[str, Any]:
+        """Stato della leadership di questo processo."""
+        return {
+            "enabled": self.enabled,
+            "identity": self.identity,
+            "is_leader": self.is_leader,
+            "elected_at": self.elected_at,
+            "transitions": self.transitions,
+            "ttl_seconds": self.ttl,
+        }
+
+
+# Singleton instance
+scheduler_leader = SchedulerLeaderElection()
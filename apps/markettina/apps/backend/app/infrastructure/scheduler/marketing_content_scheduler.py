@@ -15,12 +15,12 @@ from typing import Optional
 
 import aiohttp
 import structlog
-from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.domain.marketing.models import PostStatus, ScheduledPost
 from app.infrastructure.database import SessionLocal
+from app.infrastructure.scheduler.jobstores import create_jobstore
 
 logger = structlog.get_logger(__name__)
 
@@ -44,7 +44,7 @@ class MarketingContentScheduler:
 
     def __init__(self):
         self.scheduler = AsyncIOScheduler(
-            jobstores={"default": MemoryJobStore()},
+            jobstores={"default": create_jobstore("apscheduler_marketing_jobs")},
             job_defaults={
                 "coalesce": True,
                 "max_instances": 1,
@@ -120,7 +120,7 @@ class MarketingContentScheduler:
 
             # Job giornaliero alle 07:00 AM CET
             self.scheduler.add_job(
-                self._generate_daily_content,
+                run_daily_generation,
                 trigger=CronTrigger(
                     hour=self.schedule_hour,
                     minute=self.schedule_minute,
@@ -135,7 +135,7 @@ class MarketingContentScheduler:
                 from datetime import datetime, timedelta
                 test_time = datetime.now() + timedelta(minutes=2)
                 self.scheduler.add_job(
-                    self._generate_daily_content,
+                    run_daily_generation,
                     trigger="date",
                     run_date=test_time,
                     id="marketing_test_generation",
@@ -391,3 +391,8 @@ async def stop_marketing_scheduler():
 async def trigger_marketing_generation(custom_topic: str | None = None):
     """Trigger manuale per testing o generazione on-demand."""
     return await marketing_content_scheduler.trigger_now(custom_topic=custom_topic)
+
+
+# Job callable a livello di modulo (serializzabile dal job store persistente)
+async def run_daily_generation():
+    return await marketing_content_scheduler._generate_daily_content()
@@ -19,6 +19,8 @@ from urllib.parse import quote_plus
 import httpx
 from bs4 import BeautifulSoup
 
+from app.infrastructure.http import http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -138,7 +140,8 @@ class PagineGialleScraper:
         all_results = []
 
         try:
-            async with httpx.AsyncClient(
+            async with http_clients.client(
+                "default",
                 headers=self.session_headers,
                 timeout=30.0,
                 follow_redirects=True
@@ -82,8 +82,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.limiter = RateLimiter(requests_per_minute)
 
     async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for health check
-        if request.url.path == "/health":
+        # Skip rate limiting for health/readiness checks
+        if request.url.path in ("/health", "/ready"):
             return await call_next(request)
 
         # Get client IP
@@ -20,6 +20,8 @@ from typing import Any
 
 import httpx
 
+from app.infrastructure.http import http_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -223,7 +225,8 @@ class BaseSocialClient(ABC):
     async def get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            self._client = http_clients.client(
+                "social",
                 base_url=self._get_base_url(),
                 timeout=self._timeout,
                 headers={"User-Agent": "MARKETTINA/2.1.0"},
@@ -18,6 +18,7 @@ from typing import Any
 from urllib.parse import urlencode
 
 from app.core.config import settings
+from app.infrastructure.http import http_clients
 from app.infrastructure.social.base_client import (
     BaseSocialClient,
     PostMetrics,
@@ -127,9 +128,7 @@ class LinkedInClient(BaseSocialClient):
         Returns:
             Token data including access_token and expires_in
         """
-        import httpx
-
-        async with httpx.AsyncClient() as client:
+        async with http_clients.client("social") as client:
             response = await client.post(
                 "https://www.linkedin.com/oauth/v2/accessToken",
                 data={
@@ -271,8 +270,6 @@ class LinkedInClient(BaseSocialClient):
         Returns:
             List of media assets for sharing
         """
-        import httpx
-
         media_assets = []
 
         for image_url in image_urls[:20]:  # Max 20 images
@@ -305,7 +302,7 @@ class LinkedInClient(BaseSocialClient):
                 continue
 
             # Step 2: Download image from URL
-            async with httpx.AsyncClient() as client:
+            async with http_clients.client("social") as client:
                 img_response = await client.get(image_url)
                 if img_response.status_code != 200:
                     continue
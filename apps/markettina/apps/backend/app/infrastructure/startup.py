@@ -1,15 +1,27 @@
 """Application Startup Events Module
 Handles database initialization and startup procedures.
+
+Startup probes (PostgreSQL, Redis, Ollama) run concurrently on the event loop
+without blocking it. Optional subsystems (Redis cache connection, schedulers)
+start in background tasks, so the worker accepts traffic as soon as the
+database is reachable. The probe results back the /ready endpoint.
 """
 
+import asyncio
 import logging
 import os
 import time
+from collections.abc import Awaitable
+from datetime import UTC, datetime
+from typing import Any
 
-import psycopg2
+import httpx
+from redis import asyncio as aioredis
 from sqlalchemy import create_engine, text
 
+from app.core.config import settings
 from app.infrastructure import database
+from app.infrastructure.cache.manager import cache
 from app.infrastructure.database.session import POOL_CONFIG, Base
 from app.infrastructure.monitoring.db_monitor import create_db_monitor
 from app.infrastructure.monitoring.logging_middleware import DatabaseLoggingMiddleware
@@ -23,63 +35,121 @@ class StartupManager:
     def __init__(self):
         self.db_monitor = None
         self.db_logging = None
+        self.probe_timeout = float(os.getenv("STARTUP_PROBE_TIMEOUT", "3"))
+        self.readiness_max_age = float(os.getenv("READINESS_MAX_AGE", "10"))
+        self.probes: dict[str, dict[str, Any]] = {}
+        self.background: dict[str, dict[str, Any]] = {}
+        self._background_tasks: dict[str, asyncio.Task] = {}
+        self._last_probe = 0.0
+
+    def _record_probe(
+        self,
+        name: str,
+        ok: bool,
+        started: float,
+        required: bool = False,
+        error: str | None = None,
+        **details: Any,
+    ) -> bool:
+        """Store the outcome of a startup/readiness probe."""
+        self.probes[name] = {
+            "ok": ok,
+            "required": required,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": error,
+            "checked_at": datetime.now(UTC).isoformat(),
+            **details,
+        }
+        return ok
+
+    async def probe_database(self) -> bool:
+        """Single non-blocking database connectivity check (async engine)."""
+        started = time.perf_counter()
+        try:
+            async with database.async_engine.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.execute(text("SELECT current_user, current_database()")),
+                    timeout=self.probe_timeout,
+                )
+                user, db = result.fetchone()
+            return self._record_probe("database", True, started, required=True, user=user, database=db)
+        except Exception as e:
+            return self._record_probe("database", False, started, required=True, error=str(e))
+
+    async def probe_redis(self) -> bool:
+        """Redis PING (optional dependency: cache, rate limiting, scheduler leader)."""
+        started = time.perf_counter()
+        client = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=self.probe_timeout,
+            socket_timeout=self.probe_timeout,
+        )
+        try:
+            await client.ping()
+            return self._record_probe("redis", True, started)
+        except Exception as e:
+            return self._record_probe("redis", False, started, error=str(e))
+        finally:
+            await client.aclose()
+
+    async def probe_ollama(self) -> bool:
+        """Ollama availability (optional dependency: local LLM generation)."""
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(timeout=self.probe_timeout) as client:
+                response = await client.get(f"{settings.OLLAMA_BASE_URL}/api/tags")
+                response.raise_for_status()
+                models = len(response.json().get("models", []))
+            return self._record_probe("ollama", True, started, models=models)
+        except Exception as e:
+            return self._record_probe("ollama", False, started, error=str(e))
+
+    async def run_probes(self) -> bool:
+        """Run all dependency probes concurrently.
+
+        Returns:
+            True if every required dependency is reachable
+        """
+        await asyncio.gather(self.probe_database(), self.probe_redis(), self.probe_ollama())
+        self._last_probe = time.monotonic()
+        return self.is_ready()
 
     async def ensure_database_connection(self) -> bool:
         """Ensure database connection with retry logic.
 
+        Retries are awaited (asyncio.sleep), so other startup work and the
+        event loop keep running while the database comes up.
+
         Returns:
             True if connection successful, False otherwise
         """
-        db_url = os.getenv("DATABASE_URL")
         max_retries = int(os.getenv("DB_MAX_RETRIES", "10"))
-        retry_delay = int(os.getenv("DB_RETRY_DELAY", "2"))
+        retry_delay = float(os.getenv("DB_RETRY_DELAY", "2"))
 
         for attempt in range(max_retries):
-            try:
-                logger.info(f"Attempt {attempt + 1}/{max_retries}: Testing database connection...")
-
-                # Test database connection with psycopg2
-                conn = psycopg2.connect(db_url)
-                with conn.cursor() as cur:
-                    cur.execute("SELECT current_user, current_database(), version();")
-                    user, db, version = cur.fetchone()
-                    logger.info(f"✅ psycopg2: Connected as: {user}, DB: {db}")
-                conn.close()
-
-                # Test SQLAlchemy engine connection
-                try:
-                    # Force engine disposal to clear connection pool
-                    database.engine.dispose()
-
-                    with database.engine.connect() as sqlalchemy_conn:
-                        result = sqlalchemy_conn.execute(
-                            text("SELECT current_user, current_database()")
-                        )
-                        sa_user, sa_db = result.fetchone()
-                        logger.info(f"✅ SQLAlchemy: Connected as: {sa_user}, DB: {sa_db}")
-                    return True
-
-                except Exception as sa_error:
-                    logger.error(f"❌ SQLAlchemy engine failed: {sa_error}")
-
-                    if "password authentication failed" in str(sa_error):
-                        # Try to recreate engine with current DATABASE_URL
-                        if self._recreate_engine(db_url):
-                            return True
-                    return False
-
-            except psycopg2.Error as e:
-                logger.warning(f"Database connection attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    logger.error("❌ Failed to connect to database after all retries")
-                    return False
-
-            except Exception as e:
-                logger.error(f"Unexpected error in database connection: {e}")
-                return False
+            logger.info(f"Attempt {attempt + 1}/{max_retries}: Testing database connection...")
+
+            if await self.probe_database():
+                probe = self.probes["database"]
+                logger.info(f"✅ Database: Connected as: {probe['user']}, DB: {probe['database']}")
+                return True
 
+            error = self.probes["database"]["error"] or ""
+            if "password authentication failed" in error:
+                # Try to recreate engine with current DATABASE_URL
+                logger.error(f"❌ Database authentication failed: {error}")
+                db_url = os.getenv("DATABASE_URL") or settings.DATABASE_URL
+                started = time.perf_counter()
+                recreated = await asyncio.to_thread(self._recreate_engine, db_url)
+                if recreated:
+                    self._record_probe("database", True, started, required=True, recreated=True)
+                return recreated
+
+            logger.warning(f"Database connection attempt {attempt + 1} failed: {error}")
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay)
+
+        logger.error("❌ Failed to connect to database after all retries")
         return False
 
     def _recreate_engine(self, db_url: str) -> bool:
@@ -122,18 +192,30 @@ class StartupManager:
     async def initialize_database(self) -> bool:
         """Initialize database tables and monitoring.
 
+        The database (with retries), Redis and Ollama are probed concurrently.
+        The Redis cache connection and the schedulers are started in the
+        background and do not delay startup.
+
         Returns:
             True if successful, False otherwise
         """
         try:
             logger.info("🚀 Starting database initialization...")
 
-            # First ensure database connection
-            db_ready = await self.ensure_database_connection()
+            # First ensure database connection (optional probes run alongside)
+            db_ready, _, _ = await asyncio.gather(
+                self.ensure_database_connection(),
+                self.probe_redis(),
+                self.probe_ollama(),
+            )
+            self._last_probe = time.monotonic()
+
+            # Redis cache: connect in a worker thread (sync client with retries)
+            self.start_background("cache", asyncio.to_thread(cache.ensure_connected))
 
             if db_ready:
                 # Create database tables
-                Base.metadata.create_all(bind=database.engine)
+                await asyncio.to_thread(Base.metadata.create_all, bind=database.engine)
 
                 # Setup database logging
                 self.db_logging = DatabaseLoggingMiddleware()
@@ -144,12 +226,8 @@ class StartupManager:
 
                 logger.info("✅ Database initialized successfully")
 
-                # Avvia schedulers (post scheduler, etc.)
-                try:
-                    await start_all_schedulers()
-                    logger.info("✅ All schedulers started successfully")
-                except Exception as sched_error:
-                    logger.warning(f"⚠️ Scheduler startup failed: {sched_error}")
+                # Avvia schedulers (post scheduler, etc.) dopo l'avvio
+                self.start_background("schedulers", start_all_schedulers())
 
                 return True
             logger.warning("⚠️ Database connection failed, running in degraded mode")
@@ -160,10 +238,56 @@ class StartupManager:
             # Don't crash the app, continue without DB (degraded mode)
             return False
 
+    def start_background(self, name: str, work: Awaitable[Any]) -> None:
+        """Run an optional startup step without blocking startup."""
+        self.background[name] = {"status": "running", "error": None, "duration_ms": None}
+        self._background_tasks[name] = asyncio.create_task(self._run_background(name, work))
+
+    async def _run_background(self, name: str, work: Awaitable[Any]) -> None:
+        started = time.perf_counter()
+        try:
+            await work
+            self.background[name]["status"] = "done"
+            logger.info(f"✅ Background startup step '{name}' completed")
+        except asyncio.CancelledError:
+            self.background[name]["status"] = "cancelled"
+            raise
+        except Exception as e:
+            self.background[name].update(status="failed", error=str(e))
+            logger.warning(f"⚠️ Background startup step '{name}' failed: {e}")
+        finally:
+            self.background[name]["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def is_ready(self) -> bool:
+        """True when every required probe has succeeded."""
+        required = [p for p in self.probes.values() if p["required"]]
+        return bool(required) and all(p["ok"] for p in required)
+
+    async def check_readiness(self) -> dict[str, Any]:
+        """Readiness report, re-probing dependencies if results are stale.
+
+        Returns:
+            Readiness status with per-dependency probes and background steps
+        """
+        if time.monotonic() - self._last_probe > self.readiness_max_age:
+            await self.run_probes()
+
+        return {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "probes": self.probes,
+            "background": self.background,
+        }
+
     async def shutdown_procedures(self) -> None:
         """Perform cleanup procedures on application shutdown."""
         logger.info("🛑 Application shutting down...")
 
+        # Cancel startup steps still running in background
+        for task in self._background_tasks.values():
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*self._background_tasks.values(), return_exceptions=True)
+
         # Stop all schedulers
         try:
             await stop_all_schedulers()
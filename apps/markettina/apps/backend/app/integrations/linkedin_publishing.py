@@ -24,6 +24,8 @@ import httpx
 import structlog
 from pydantic import BaseModel, Field
 
+from app.infrastructure.http import http_clients
+
 logger = structlog.get_logger(__name__)
 
 
@@ -140,7 +142,7 @@ class LinkedInService:
     async def get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if not self._client:
-            self._client = httpx.AsyncClient(timeout=30.0)
+            self._client = http_clients.client("social", timeout=30.0)
         return self._client
 
     async def close(self):
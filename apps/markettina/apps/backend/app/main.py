@@ -3,13 +3,13 @@ AI-Powered Marketing Automation Platform
 Architettura modulare con Domain-Driven Design.
 """
 
-import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
 
 import sentry_sdk
 from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
@@ -21,40 +21,27 @@ from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 # app.include_router(ai_support_router, prefix="/api/v1/ai/support", tags=["AI Support"])
 # CRITICAL: Import models registry to configure all SQLAlchemy relationships
 from app.core.api.dependencies.auth_deps import get_current_user
+from app.core.api.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry
 from app.core.api.middleware import setup_middleware_stack
 from app.core.api.v1 import api_router
+from app.core.api.v1.diagnostics_router import router as diagnostics_router
 from app.core.config import settings
 from app.domain.analytics.router import router as analytics_router
 from app.domain.auth.admin_router import router as admin_auth_router
 from app.domain.auth.models import User, UserRole
 from app.domain.auth.settings_router import router as admin_settings_router
 from app.domain.auth.user_admin_router import router as user_admin_router
-from app.domain.copilot.routers import router as copilot_router
 
 # from app.domain.analytics.dashboard_router import router as analytics_dashboard_router
 # app.include_router(analytics_dashboard_router, prefix="")
 from app.domain.customers.routers import router as customers_router
-from app.domain.finance.router import router as finance_router
-from app.domain.google.router import router as google_router
-from app.domain.heygen.router import router as heygen_router
-from app.domain.marketing.brand_dna_router import router as brand_dna_router
-from app.domain.marketing.email_router import router as email_marketing_router
-from app.domain.marketing.lead_enrichment_router import router as lead_enrichment_router
-from app.domain.marketing.router import router as marketing_router
-from app.domain.marketing.routers import router as marketing_calendar_router
-from app.domain.media.upload_router import router as upload_router
 from app.domain.notifications.router import router as notifications_router
 from app.domain.notifications.websocket_router import router as notifications_ws_router
 from app.domain.seo.sitemap_router import router as sitemap_router
-from app.domain.social.multi_platform_router import router as multi_platform_social_router
-from app.domain.social.router import router as social_router
-from app.domain.support.routers import router as support_router
 from app.infrastructure.database.models_registry import configure_all_models
+from app.infrastructure.http import http_clients
 from app.infrastructure.monitoring import setup_logging
-from app.infrastructure.scheduler import (
-    start_all_schedulers,
-    stop_all_schedulers,
-)
+from app.infrastructure.monitoring.rollups import metric_rollups
 from app.infrastructure.startup import startup_manager
 
 # ============================================================================
@@ -87,6 +74,10 @@ async def lifespan(app: FastAPI):
     """
     # Startup procedures
     logger.info("Starting MARKETTINA Backend...")
+
+    # Pool HTTP in uscita condivisi per upstream (Google, social, AI, ...)
+    http_clients.start()
+
     await startup_manager.initialize_database()
     logger.info("Database initialized")
 
@@ -94,21 +85,24 @@ async def lifespan(app: FastAPI):
     configure_all_models()
     logger.info("SQLAlchemy models configured")
 
-    # Start ALL schedulers (ToolAI, Marketing Content, Post Publishing, etc.)
-    try:
-        asyncio.create_task(start_all_schedulers())
-        logger.info("All schedulers started (ToolAI, Marketing Content, Post Publishing)")
-    except Exception as e:
-        logger.error(f"Failed to start schedulers: {e}")
-        # Don't crash the application, continue without scheduler
+    # Schedulers (ToolAI, Marketing Content, Post Publishing) are started by
+    # startup_manager.initialize_database(): only the elected leader worker runs jobs
+
+    # Heavy domain routers are imported on first request or by this warm-up
+    lazy_routers.start_warmup()
+
+    # Flush periodico dei rollup delle metriche (downsampling sul leader)
+    metric_rollups.start()
 
     yield  # Application runs here
 
     # Shutdown procedures
     logger.info("Shutting down MARKETTINA Backend...")
-    await stop_all_schedulers()
-    logger.info("All schedulers stopped")
+    await lazy_routers.stop()
+    await metric_rollups.stop()
     await startup_manager.shutdown_procedures()
+    # Ultimo: gli scheduler fermati sopra possono avere chiamate in corso
+    await http_clients.aclose()
 
 app = FastAPI(
     title="MARKETTINA API",
@@ -183,6 +177,12 @@ Get your token from `/api/v1/auth/login` or `/api/v1/auth/register`
 # NOTE: CORS is configured inside setup_middleware_stack with BACKEND_CORS_ORIGINS
 setup_middleware_stack(app)
 
+# Lazy domain routers: declared here, imported on first matching request
+# (or by the background warm-up) to cut worker boot time and RSS
+lazy_routers = LazyRouterRegistry(app)
+app.state.lazy_routers = lazy_routers
+app.add_middleware(LazyRouterMiddleware, registry=lazy_routers)
+
 # Admin-only dependency
 async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """Require admin role for protected endpoints"""
@@ -205,11 +205,11 @@ app.include_router(admin_settings_router, prefix="/api/v1/admin")
 # Register User Management Admin router
 app.include_router(user_admin_router)
 
-# Register Support AI router
-app.include_router(support_router)
+# Register Support AI router (lazy)
+lazy_routers.register("app.domain.support.routers", "/support")
 
-# Register Copilot router (AI Assistant)
-app.include_router(copilot_router)
+# Register Copilot router (AI Assistant, lazy)
+lazy_routers.register("app.domain.copilot.routers", "/api/v1/copilot")
 
 # Register Notifications WebSocket router
 app.include_router(notifications_ws_router)
@@ -223,67 +223,71 @@ app.include_router(analytics_router)
 # Register Analytics Dashboard router (KPI aggregati) - prefix già incluso nel router
 # app.include_router(analytics_dashboard_router, prefix="")
 
-# Register Finance router (Gestione Finanziaria) - BUSINESS CRITICAL!
-app.include_router(finance_router)
+# Register Finance router (Gestione Finanziaria, lazy) - BUSINESS CRITICAL!
+lazy_routers.register("app.domain.finance.router", "/api/v1/admin/finance")
 
 # Register Customers router (CRM)
 app.include_router(customers_router)
 
+# Marketing domain (lazy): the routers share the /api/v1/marketing prefix and
+# overlap on some paths (/leads), so they are declared with the same path
+# prefix and always loaded together in this order
+
 # Register Marketing Calendar router (Calendario Editoriale)
-app.include_router(marketing_calendar_router, prefix="/api/v1")
+lazy_routers.register("app.domain.marketing.routers", "/api/v1/marketing", prefix="/api/v1")
 
 # Register Marketing router (Leads & Email Campaigns)
-app.include_router(marketing_router, prefix="/api/v1/marketing")
+lazy_routers.register("app.domain.marketing.router", "/api/v1/marketing", prefix="/api/v1/marketing")
 
 # Register Marketing Scheduler router (Batch Content Generation Control)
-from app.domain.marketing.scheduler_router import router as marketing_scheduler_router
-
-app.include_router(marketing_scheduler_router, prefix="/api/v1/marketing")
+lazy_routers.register("app.domain.marketing.scheduler_router", "/api/v1/marketing", prefix="/api/v1/marketing")
 
 # Register Lead Enrichment router (Google Places, AI Scoring)
-app.include_router(lead_enrichment_router, prefix="/api/v1/marketing")
+lazy_routers.register("app.domain.marketing.lead_enrichment_router", "/api/v1/marketing", prefix="/api/v1/marketing")
 
 # Register Email Marketing router (SendGrid/Mailgun/SMTP)
-app.include_router(email_marketing_router, prefix="/api/v1/marketing")
+lazy_routers.register("app.domain.marketing.email_router", "/api/v1/marketing", prefix="/api/v1/marketing")
 
 # Register Brand DNA router (Brand Identity Settings)
-app.include_router(brand_dna_router, prefix="/api/v1/marketing")
+lazy_routers.register("app.domain.marketing.brand_dna_router", "/api/v1/marketing", prefix="/api/v1/marketing")
 
-# Register Social Publishing router (Meta, LinkedIn, Twitter)
-app.include_router(social_router, prefix="/api/v1")
-app.include_router(multi_platform_social_router, prefix="/api/v1")
+# Register Social Publishing router (Meta, LinkedIn, Twitter, lazy)
+lazy_routers.register("app.domain.social.router", "/api/v1/social", prefix="/api/v1")
+lazy_routers.register("app.domain.social.multi_platform_router", "/api/v1/social", prefix="/api/v1")
 
 # Register LinkedIn Publishing router (API diretta)
-from app.domain.social.linkedin_router import router as linkedin_router
-app.include_router(linkedin_router, prefix="/api/v1/social")
+lazy_routers.register("app.domain.social.linkedin_router", "/api/v1/social", prefix="/api/v1/social")
 
-# Register Upload router (Image uploads) - upload_router has prefix="/upload"
-app.include_router(upload_router, prefix="/api/v1")
+# Register Upload router (Image uploads, lazy) - upload_router has prefix="/upload"
+lazy_routers.register("app.domain.media.upload_router", "/api/v1/upload", prefix="/api/v1")
 
-# Register Google Integrations router (GA4 + GMB)
-app.include_router(google_router)
+# Register Google Integrations router (GA4 + GMB, lazy)
+lazy_routers.register("app.domain.google.router", "/api/v1/admin/google")
 
 # Register SEO router (Sitemap & Robots.txt) - NO prefix for root paths
 app.include_router(sitemap_router)
 
-# Register HeyGen router (AI Avatar Video Generation)
-app.include_router(heygen_router, prefix="/api/v1")
+# Register HeyGen router (AI Avatar Video Generation, lazy)
+lazy_routers.register("app.domain.heygen.router", "/api/v1/admin/heygen", prefix="/api/v1")
+
+# Register Instagram Insights router (Performance Analytics, lazy)
+lazy_routers.register("app.core.api.v1.insights.instagram_router", "/api/v1/insights", prefix="/api/v1/insights")
 
-# Register Instagram Insights router (Performance Analytics)
-from app.core.api.v1.insights.instagram_router import router as instagram_insights_router
-app.include_router(instagram_insights_router, prefix="/api/v1/insights")
+# Register AI Feedback Loop router (Learning from Performance, lazy)
+lazy_routers.register("app.core.api.v1.ai.feedback_loop_router", "/api/v1/ai", prefix="/api/v1/ai")
 
-# Register AI Feedback Loop router (Learning from Performance)
-from app.core.api.v1.ai.feedback_loop_router import router as feedback_loop_router
-app.include_router(feedback_loop_router, prefix="/api/v1/ai")
+# Register VEO Video router (AI Video Generation, lazy)
+lazy_routers.register("app.core.api.v1.ai.veo_router", "/api/v1/ai", prefix="/api/v1/ai")
 
-# Register VEO Video router (AI Video Generation)
-from app.core.api.v1.ai.veo_router import router as veo_router
-app.include_router(veo_router, prefix="/api/v1/ai")
+# Register Multi-Agent Orchestrator router (AI Agent Coordination, lazy)
+lazy_routers.register("app.core.api.v1.ai.orchestrator_router", "/api/v1/ai", prefix="/api/v1/ai")
 
-# Register Multi-Agent Orchestrator router (AI Agent Coordination)
-from app.core.api.v1.ai.orchestrator_router import router as orchestrator_router
-app.include_router(orchestrator_router, prefix="/api/v1/ai")
+# Register Jobs router (Durable task queue status)
+from app.core.api.v1.jobs_router import router as jobs_router
+app.include_router(jobs_router, prefix="/api/v1")
+
+# Register Diagnostics router (startup profile, lazy router status)
+app.include_router(diagnostics_router, prefix="/api/v1")
 
 # WhatsApp RIMOSSO - Usiamo l'app mobile
 # Per riattivare: decommentare le righe sotto
@@ -493,3 +497,32 @@ async def health():
         "timestamp": datetime.now(UTC).isoformat(),
         "service": "markettina-api",
     }
+
+# Readiness check
+@app.get(
+    "/ready",
+    tags=["health"],
+    summary="Readiness Check",
+    description="Check if the dependencies required to serve traffic are reachable",
+    response_description="Readiness status with dependency probes",
+)
+async def ready():
+    """
+    # Readiness Endpoint
+
+    Reports the startup probes (PostgreSQL, Redis, Ollama) and the optional
+    subsystems initialized in background (cache, schedulers).
+
+    ## Response
+    - `200` when every required dependency (database) is reachable
+    - `503` otherwise; optional dependencies never fail readiness
+
+    Probes are refreshed at most every `READINESS_MAX_AGE` seconds.
+    """
+    report = await startup_manager.check_readiness()
+    # Campione per lo SLA di uptime (UptimeAlertMonitor)
+    metric_rollups.record("health_check", 1.0 if report["status"] == "ready" else 0.0)
+    return JSONResponse(
+        status_code=200 if report["status"] == "ready" else 503,
+        content=report,
+    )
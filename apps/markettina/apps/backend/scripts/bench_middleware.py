@@ -0,0 +1,117 @@
+"""
+Benchmark Middleware Stack - Overhead per richiesta prima/dopo.
+
+Confronta, chiamando direttamente l'app ASGI (senza server né rete):
+- legacy: due BaseHTTPMiddleware (logging + eccezioni globali), come lo stack precedente
+- asgi: LoggingMiddleware pure ASGI (request ID, log campionati, metriche)
+
+Per ogni stack misura una risposta JSON e una risposta in streaming (100 chunk).
+
+Uso:
+    python -m scripts.bench_middleware [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.infrastructure.monitoring.logging_middleware import LoggingMiddleware
+
+
+async def json_endpoint(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def stream_endpoint(request):
+    async def chunks():
+        for _ in range(100):
+            yield b"x" * 512
+
+    return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+
+class _PassThroughMiddleware(BaseHTTPMiddleware):
+    """Costo strutturale di BaseHTTPMiddleware (task + memory stream)."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = "bench"
+        return response
+
+
+def build_app(stack: str) -> Starlette:
+    routes = [Route("/json", json_endpoint), Route("/stream", stream_endpoint)]
+    if stack == "legacy":
+        middleware = [Middleware(_PassThroughMiddleware), Middleware(_PassThroughMiddleware)]
+    elif stack == "asgi":
+        middleware = [Middleware(LoggingMiddleware, sample_rate=0.0)]
+    else:
+        middleware = []
+    return Starlette(routes=routes, middleware=middleware)
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, path: str, requests: int) -> float:
+    """Tempo medio per richiesta in microsecondi."""
+    for _ in range(min(200, requests)):
+        await call(app, path)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    for stack in ("none", "legacy", "asgi"):
+        app = build_app(stack)
+        results[stack] = {path: await measure(app, path, requests) for path in ("/json", "/stream")}
+
+    print(f"{'stack':<8} {'json us/req':>12} {'stream us/req':>14} {'json overhead':>14} {'stream overhead':>16}")
+    for stack, timings in results.items():
+        print(
+            f"{stack:<8} {timings['/json']:>12.1f} {timings['/stream']:>14.1f} "
+            f"{timings['/json'] - results['none']['/json']:>14.1f} "
+            f"{timings['/stream'] - results['none']['/stream']:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,118 @@
+"""
+Tests for the alert checks and the concurrent monitoring cycle.
+"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure import database
+from app.infrastructure.monitoring import rollups
+
+# alerting.py is shadowed by the alerting/ package: load the module by path
+_spec = importlib.util.spec_from_file_location(
+    "monitoring_alerting",
+    Path(rollups.__file__).with_name("alerting.py"),
+)
+alerting = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(alerting)
+
+AlertManager = alerting.AlertManager
+AlertingService = alerting.AlertingService
+AlertSeverity = alerting.AlertSeverity
+PaymentAlertMonitor = alerting.PaymentAlertMonitor
+PerformanceAlertMonitor = alerting.PerformanceAlertMonitor
+
+
+def window(count=0, sum=0.0):
+    return SimpleNamespace(count=count, sum=sum)
+
+
+class TestChecksWithPrecomputedStats:
+
+    @pytest.mark.asyncio
+    async def test_payment_failure_rate_above_threshold(self):
+        monitor = PaymentAlertMonitor(AlertManager())
+        stats = {"total_last_hour": 40, "failed_last_hour": 4, "failed_amount_24h": 0.0}
+
+        alert = await monitor.check_payment_failures(None, stats)
+
+        assert alert.severity == AlertSeverity.CRITICAL
+        assert alert.metadata["failure_rate"] == 0.1
+
+    @pytest.mark.asyncio
+    async def test_low_payment_volume_does_not_alert(self):
+        monitor = PaymentAlertMonitor(AlertManager())
+        stats = {"total_last_hour": 5, "failed_last_hour": 5, "failed_amount_24h": 0.0}
+
+        assert await monitor.check_payment_failures(None, stats) is None
+
+    @pytest.mark.asyncio
+    async def test_error_rate_from_rollup_windows(self):
+        monitor = PerformanceAlertMonitor(AlertManager())
+        windows = {"requests": window(count=1000), "errors": window(count=30)}
+
+        alert = await monitor.check_error_rates(None, windows)
+
+        assert alert.metadata["error_rate"] == 0.03
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestMonitoringCycle:
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setattr(database, "AsyncSessionLocal", FakeSession)
+        monkeypatch.setattr(rollups.metric_rollups, "record", lambda *args, **kwargs: None)
+        service = AlertingService()
+        service.alert_manager.trigger_alert = AsyncMock(return_value=True)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_groups_run_concurrently_on_their_own_sessions(self, service):
+        sessions, running, peak = [], 0, 0
+
+        async def checks(db):
+            nonlocal running, peak
+            sessions.append(db)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [None]
+
+        service.payment_monitor.run_checks = checks
+        service.security_monitor.run_checks = checks
+        service._run_metric_checks = checks
+
+        await service.run_monitoring_cycle()
+
+        assert peak == 3
+        assert len({id(db) for db in sessions}) == 3
+        assert set(service.last_cycle["checks"]) == {"payments", "security", "metrics"}
+
+    @pytest.mark.asyncio
+    async def test_failing_group_does_not_stop_the_others(self, service):
+        alert = await PaymentAlertMonitor(service.alert_manager).check_payment_failures(
+            None, {"total_last_hour": 40, "failed_last_hour": 20, "failed_amount_24h": 0.0}
+        )
+        service.payment_monitor.run_checks = AsyncMock(return_value=[alert, None])
+        service.security_monitor.run_checks = AsyncMock(side_effect=RuntimeError("audit log down"))
+        service._run_metric_checks = AsyncMock(return_value=[None, None, None])
+
+        await service.run_monitoring_cycle()
+
+        service.alert_manager.trigger_alert.assert_awaited_once_with(alert)
+        assert service.last_cycle["checks"]["security"]["error"] == "audit log down"
+        assert service.last_cycle["alerts_triggered"] == 1
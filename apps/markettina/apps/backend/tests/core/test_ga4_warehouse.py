@@ -0,0 +1,149 @@
+"""
+Tests for the local GA4 daily warehouse: incremental sync and window aggregation.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.google.analytics_service import GA4ReportError
+from app.domain.google.analytics_warehouse import GA4Warehouse, _contiguous_chunks
+from app.domain.google.models import GA4DailyMetric
+from app.domain.google.schemas import GADimensionValue, GAMetricValue, GAReportResponse, GAReportRow
+
+
+def report_row(day, dimensions=(), **metrics):
+    return GAReportRow(
+        dimension_values=[GADimensionValue(name="d", value=v) for v in (day.strftime("%Y%m%d"), *dimensions)],
+        metric_values=[GAMetricValue(name=name, value=str(value)) for name, value in metrics.items()],
+    )
+
+
+class FakeGA4Service:
+    """Daily reports with the same traffic every day; records the fetched ranges."""
+
+    property_id = "properties/1"
+
+    def __init__(self, fail=False):
+        self.fetched = []
+        self.fail = fail
+
+    async def fetch_daily_reports(self, start, end):
+        if self.fail:
+            raise GA4ReportError("quota exceeded", status_code=429)
+        self.fetched.append((start, end))
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return {
+            "total": GAReportResponse(rows=[
+                report_row(day, activeUsers=5, sessions=10, engagedSessions=6,
+                           screenPageViews=20, averageSessionDuration=30, conversions=1)
+                for day in days
+            ]),
+            "source": GAReportResponse(rows=[
+                report_row(day, ("google", "organic"), activeUsers=4, sessions=8) for day in days
+            ] + [
+                report_row(day, ("newsletter", "email"), activeUsers=1, sessions=2) for day in days
+            ]),
+        }
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    GA4DailyMetric.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def warehouse():
+    return GA4Warehouse()
+
+
+class TestContiguousChunks:
+
+    def test_splits_on_gaps_and_chunk_size(self):
+        d = date(2026, 1, 1)
+        days = [d, d + timedelta(days=1), d + timedelta(days=2), d + timedelta(days=5)]
+
+        assert _contiguous_chunks(days, size=2) == [
+            (d, d + timedelta(days=1)),
+            (d + timedelta(days=2), d + timedelta(days=2)),
+            (d + timedelta(days=5), d + timedelta(days=5)),
+        ]
+
+
+class TestGA4Warehouse:
+
+    @pytest.mark.asyncio
+    async def test_window_is_fetched_in_one_batch_and_aggregated(self, db, warehouse):
+        service = FakeGA4Service()
+
+        overview = await warehouse.get_overview(db, service, days=6)
+
+        assert len(service.fetched) == 1
+        assert overview.sessions == 70
+        assert overview.active_users == 35
+        assert overview.bounce_rate == 40.0
+        assert overview.avg_session_duration == 30.0
+
+    @pytest.mark.asyncio
+    async def test_synced_window_is_served_locally(self, db, warehouse):
+        service = FakeGA4Service()
+        await warehouse.get_overview(db, service, days=6)
+
+        await warehouse.get_overview(db, service, days=6)
+
+        assert len(service.fetched) == 1
+
+    @pytest.mark.asyncio
+    async def test_only_missing_days_are_fetched(self, db, warehouse):
+        service = FakeGA4Service()
+        await warehouse.get_overview(db, service, days=6)
+
+        await warehouse.get_overview(db, service, days=10)
+        start, end = service.fetched[-1]
+
+        assert (end - start).days == 3
+        assert end == warehouse._today() - timedelta(days=7)
+
+    @pytest.mark.asyncio
+    async def test_sources_are_summed_across_days(self, db, warehouse):
+        sources = await warehouse.get_traffic_sources(db, FakeGA4Service(), days=1)
+
+        assert [(s.source, s.medium, s.sessions) for s in sources] == [
+            ("google", "organic", 16),
+            ("newsletter", "email", 4),
+        ]
+        assert sources[0].percentage == 80.0
+
+    @pytest.mark.asyncio
+    async def test_ga4_error_serves_what_is_stored(self, db, warehouse):
+        overview = await warehouse.get_overview(db, FakeGA4Service(fail=True), days=6)
+
+        assert overview.sessions == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sync_by_another_worker_is_not_an_error(self, db, warehouse, monkeypatch):
+        """The other worker's insert wins the unique constraint: its rows are served."""
+        service = FakeGA4Service()
+        other_worker = GA4Warehouse()
+        insert = db.bulk_insert_mappings
+
+        def insert_after_other_worker(mapper, mappings):
+            monkeypatch.setattr(db, "bulk_insert_mappings", insert)
+            insert(mapper, mappings)
+            db.commit()
+            raise IntegrityError("INSERT", {}, Exception("uq_ga4_daily_metrics_row"))
+
+        monkeypatch.setattr(db, "bulk_insert_mappings", insert_after_other_worker)
+
+        overview = await warehouse.get_overview(db, service, days=6)
+
+        assert overview.sessions == 70
+        await other_worker.get_overview(db, service, days=6)
+        assert len(service.fetched) == 1
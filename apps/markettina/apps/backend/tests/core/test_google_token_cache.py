@@ -0,0 +1,113 @@
+"""
+Tests for the shared Google token cache: singleflight and cross-worker invalidation.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.google import token_cache
+from app.core.google.token_cache import GoogleTokenCache
+
+
+class FakeRedis:
+    """In-memory subset of redis.asyncio used by the token cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    def register_script(self, script):
+        async def release(keys, args):
+            if self.data.get(keys[0]) == args[0]:
+                del self.data[keys[0]]
+        return release
+
+
+def worker(redis):
+    cache = GoogleTokenCache(redis_url="redis://fake")
+    cache._redis = redis
+    cache._release = redis.register_script("")
+    return cache
+
+
+def loader(token, property_id="123"):
+    return AsyncMock(return_value={
+        "access_token": token,
+        "expires_at": time.time() + 3600,
+        "ga4_property_id": property_id,
+    })
+
+
+class TestGoogleTokenCache:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_refresh_once(self):
+        cache = worker(FakeRedis())
+        load = loader("tok")
+
+        tokens = await asyncio.gather(*(cache.get("user:1", load) for _ in range(5)))
+
+        assert {t["access_token"] for t in tokens} == {"tok"}
+        load.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_second_worker_reads_shared_token(self):
+        redis = FakeRedis()
+        await worker(redis).get("user:1", loader("tok"))
+        other_load = loader("other")
+
+        token = await worker(redis).get("user:1", other_load)
+
+        assert token["access_token"] == "tok"
+        other_load.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reaches_other_workers_after_local_ttl(self, monkeypatch):
+        """Property selection changed on worker A: worker B stops serving its L1 copy."""
+        redis = FakeRedis()
+        a, b = worker(redis), worker(redis)
+        await b.get("user:1", loader("tok", property_id="123"))
+
+        await a.invalidate("user:1")
+        monkeypatch.setattr(token_cache, "LOCAL_TTL_SECONDS", 0.0)
+        b._local_until["user:1"] = 0.0
+
+        token = await b.get("user:1", loader("tok", property_id="456"))
+
+        assert token["ga4_property_id"] == "456"
+
+    @pytest.mark.asyncio
+    async def test_without_redis_local_cache_is_kept(self):
+        cache = GoogleTokenCache(redis_url="")
+        await cache.get("user:1", loader("tok"))
+        cache._local_until["user:1"] = 0.0
+        load = loader("new")
+
+        token = await cache.get("user:1", load)
+
+        assert token["access_token"] == "tok"
+        load.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_is_not_cached(self):
+        redis = FakeRedis()
+        cache = worker(redis)
+        load = AsyncMock(return_value={"access_token": "tok", "refresh_token": "secret", "expires_at": None})
+
+        await cache.get("admin:1", load)
+
+        assert "secret" not in next(iter(redis.data.values()))
@@ -0,0 +1,86 @@
+"""
+Tests for the shared HTTP client registry: retries, host labels, transport options.
+"""
+
+import httpx
+import pytest
+
+from app.infrastructure.http.client_registry import HTTPClientRegistry, UpstreamConfig
+from app.infrastructure.monitoring.rollups import metric_rollups
+
+
+def registry_with(handler, **config):
+    """Registry whose upstream "test" sends requests to `handler`."""
+    registry = HTTPClientRegistry(upstreams=(
+        UpstreamConfig("default"),
+        UpstreamConfig("test", backoff_base=0.0, **config),
+    ))
+    registry._transport("test")._transport = httpx.MockTransport(handler)
+    return registry
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    labels = []
+    monkeypatch.setattr(
+        metric_rollups, "record", lambda name, value, tags: labels.append((name, tags["host"]))
+    )
+    return labels
+
+
+class TestRetries:
+
+    @pytest.mark.asyncio
+    async def test_connect_error_retried_once_per_configured_retry(self, recorded):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.method)
+            if len(attempts) < 3:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(201)
+
+        async with registry_with(handler, retries=2).client("test") as client:
+            response = await client.post("https://api.example.com/items", json={})
+
+        assert response.status_code == 201
+        assert attempts == ["POST"] * 3
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried_after_being_sent(self, recorded):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request.method)
+            if request.method == "POST":
+                raise httpx.ReadTimeout("slow", request=request)
+            return httpx.Response(503)
+
+        async with registry_with(handler, retries=2).client("test") as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.post("https://api.example.com/items")
+            response = await client.get("https://api.example.com/items")
+
+        assert response.status_code == 503
+        assert attempts == ["POST", "GET", "GET", "GET"]
+
+
+class TestHostLabels:
+
+    @pytest.mark.asyncio
+    async def test_unknown_hosts_share_one_label(self, recorded):
+        registry = registry_with(lambda request: httpx.Response(200), hosts=("googleapis.com",))
+
+        async with registry.client("test") as client:
+            await client.get("https://analyticsdata.googleapis.com/v1")
+            await client.get("https://cdn-123.example.net/image.png")
+
+        assert ("upstream_latency_ms", "analyticsdata.googleapis.com") in recorded
+        assert ("upstream_latency_ms", "other") in recorded
+
+
+class TestClientOptions:
+
+    def test_transport_options_are_rejected(self):
+        with pytest.raises(ValueError, match="verify"):
+            HTTPClientRegistry().client("default", verify=False)
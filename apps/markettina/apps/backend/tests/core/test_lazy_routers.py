@@ -0,0 +1,107 @@
+"""
+Tests for lazily mounted domain routers and the import-time profile parser.
+"""
+
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.api.lazy_routers import LazyRouterMiddleware, LazyRouterRegistry, parse_importtime
+
+ROUTER_MODULE = '''
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/{name}/ping")
+async def ping():
+    return {"pong": True}
+'''
+
+
+@pytest.fixture
+def domains(tmp_path, monkeypatch):
+    """Importable router modules `lazy_a`, `lazy_b` and a broken `lazy_broken`."""
+    for name in ("lazy_a", "lazy_b"):
+        (tmp_path / f"{name}.py").write_text(ROUTER_MODULE.replace("{name}", name))
+    (tmp_path / "lazy_broken.py").write_text("raise ImportError('missing sdk')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ("lazy_a", "lazy_b", "lazy_broken"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def lazy_app(enabled=True):
+    app = FastAPI()
+    registry = LazyRouterRegistry(app, enabled=enabled)
+    registry.register("lazy_a", "/lazy_a")
+    registry.register("lazy_b", "/lazy_b")
+    app.add_middleware(LazyRouterMiddleware, registry=registry)
+    return app, registry
+
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestLazyRouters:
+
+    @pytest.mark.asyncio
+    async def test_first_request_mounts_only_its_domain(self, domains):
+        app, registry = lazy_app()
+
+        async with client(app) as http:
+            response = await http.get("/lazy_a/ping")
+
+        assert response.json() == {"pong": True}
+        assert [r.module for r in registry.pending] == ["lazy_b"]
+        assert registry.routers[0].loaded_by == "request"
+
+    @pytest.mark.asyncio
+    async def test_openapi_schema_includes_every_domain(self, domains):
+        app, registry = lazy_app()
+
+        async with client(app) as http:
+            schema = (await http.get("/openapi.json")).json()
+
+        assert {"/lazy_a/ping", "/lazy_b/ping"} <= set(schema["paths"])
+        assert registry.pending == []
+
+    @pytest.mark.asyncio
+    async def test_broken_domain_is_isolated(self, domains):
+        app, registry = lazy_app()
+        registry.register("lazy_broken", "/lazy_broken")
+
+        async with client(app) as http:
+            broken = await http.get("/lazy_broken/ping")
+            healthy = await http.get("/lazy_b/ping")
+
+        assert broken.status_code == 404
+        assert healthy.status_code == 200
+        assert registry.routers[2].error == "missing sdk"
+
+    def test_disabled_registry_loads_at_startup(self, domains):
+        _, registry = lazy_app(enabled=False)
+
+        assert registry.pending == []
+        assert {r.loaded_by for r in registry.routers} == {"startup"}
+
+
+class TestParseImporttime:
+
+    def test_summarizes_top_level_and_app_modules(self):
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       200 |        200 |   app.core",
+            "import time:       300 |       1500 | app.main",
+            "import time:      1000 |       1000 | fastapi",
+        ])
+
+        profile = parse_importtime(output)
+
+        assert profile["modules_imported"] == 3
+        assert profile["total_import_ms"] == 2.5
+        assert profile["app_import_ms"] == 0.5
+        assert profile["top_cumulative"][0]["module"] == "app.main"
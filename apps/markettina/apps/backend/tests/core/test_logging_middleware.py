@@ -0,0 +1,111 @@
+"""
+Tests for the pure-ASGI logging middleware: request ID, streaming, errors.
+"""
+
+import json
+
+import pytest
+
+from app.infrastructure.monitoring import logging_middleware
+from app.infrastructure.monitoring.logging_middleware import LoggingMiddleware
+
+
+def http_scope(path="/api/items", headers=()):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": list(headers),
+        "client": ("10.0.0.1", 1234),
+    }
+
+
+async def call(app, scope, sent=None):
+    """Run `app` under the middleware and return the messages it sent."""
+    sent = [] if sent is None else sent
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await LoggingMiddleware(app, sample_rate=0.0)(scope, receive, send)
+    return sent
+
+
+def response_app(status=200, chunks=(b"ok",), sent=None):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+            if sent is not None:
+                # Pure ASGI: each chunk reaches the server before the next is produced
+                assert sent[-1]["body"] == chunk
+    return app
+
+
+@pytest.fixture
+def rollups(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(
+        logging_middleware.metric_rollups, "record",
+        lambda name, value, tags=None: recorded.append((name, tags)),
+    )
+    return recorded
+
+
+class TestLoggingMiddleware:
+
+    @pytest.mark.asyncio
+    async def test_request_id_is_generated(self, rollups):
+        sent = await call(response_app(), http_scope())
+
+        headers = dict(sent[0]["headers"])
+        assert len(headers[b"x-request-id"]) == 32
+
+    @pytest.mark.asyncio
+    async def test_incoming_request_id_is_propagated(self, rollups):
+        scope = http_scope(headers=[(b"x-request-id", b"trace-123")])
+
+        sent = await call(response_app(), scope)
+
+        assert dict(sent[0]["headers"])[b"x-request-id"] == b"trace-123"
+
+    @pytest.mark.asyncio
+    async def test_streaming_chunks_pass_through_unbuffered(self, rollups):
+        sent = []
+        app = response_app(chunks=(b"data: 1\n\n", b"data: 2\n\n"), sent=sent)
+
+        await call(app, http_scope(), sent)
+
+        assert [m["body"] for m in sent[1:]] == [b"data: 1\n\n", b"data: 2\n\n"]
+
+    @pytest.mark.asyncio
+    async def test_unhandled_exception_becomes_json_500(self, rollups):
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        sent = await call(app, http_scope())
+        body = json.loads(sent[1]["body"])
+
+        assert sent[0]["status"] == 500
+        assert body["request_id"] == dict(sent[0]["headers"])[b"x-request-id"].decode()
+        assert ("http_requests", {"status_class": "5xx"}) in rollups
+
+    @pytest.mark.asyncio
+    async def test_exception_after_response_start_is_reraised(self, rollups):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            raise RuntimeError("stream broke")
+
+        with pytest.raises(RuntimeError, match="stream broke"):
+            await call(app, http_scope())
+
+    @pytest.mark.asyncio
+    async def test_health_checks_are_not_instrumented(self, rollups):
+        sent = await call(response_app(), http_scope(path="/health"))
+
+        assert b"x-request-id" not in dict(sent[0]["headers"])
+        assert rollups == []
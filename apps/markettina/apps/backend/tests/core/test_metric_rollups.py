@@ -0,0 +1,84 @@
+"""
+Tests for metric rollups: sketch merge and the flush upsert.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.monitoring.models import AlertLog
+from app.infrastructure.monitoring.rollups import MetricRollupAggregator, MetricSketch, RollupBucket
+
+
+class FakeSession:
+    """AsyncSessionLocal stand-in that keeps the executed statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+    async def commit(self):
+        pass
+
+
+class TestRollupBucket:
+
+    def test_merge_keeps_extremes_and_quantiles(self):
+        first, second = RollupBucket(), RollupBucket()
+        for value in (10, 20, 30):
+            first.add(value)
+        for value in (5, 400):
+            second.add(value)
+
+        first.merge(second)
+
+        assert first.count == 5
+        assert (first.min, first.max) == (5, 400)
+        assert first.quantile(0.5) == pytest.approx(20, rel=MetricSketch.RELATIVE_ACCURACY)
+
+    def test_sketch_round_trip(self):
+        sketch = MetricSketch()
+        for value in (0, 1.5, 1.5, 80):
+            sketch.add(value)
+
+        restored = MetricSketch.from_dict(sketch.to_dict())
+
+        assert restored.zero_count == 1
+        assert restored.buckets == sketch.buckets
+
+
+class TestFlush:
+
+    @pytest.mark.asyncio
+    async def test_upsert_merges_existing_bucket(self):
+        """A conflicting row is merged (least/greatest + sketch), not overwritten."""
+        aggregator = MetricRollupAggregator()
+        aggregator.record("api_response_time", 42.0)
+        session = FakeSession()
+
+        with patch("app.infrastructure.database.AsyncSessionLocal", return_value=session):
+            assert await aggregator.flush(include_open=True) == 1
+
+        sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        update = sql.split("ON CONFLICT", 1)[1]
+        assert "least(metric_rollups.min, excluded.min)" in update
+        assert "greatest(metric_rollups.max, excluded.max)" in update
+        assert "json_each_text(COALESCE(metric_rollups.sketch->'b'" in update
+        assert "sketch = excluded.sketch" not in update
+
+
+def test_alert_log_metadata_column():
+    """AlertLog stores alert metadata in the "metadata" column."""
+    log = AlertLog(alert_id="a1", title="t", description="d", source="s", alert_metadata={"k": 1})
+
+    assert log.alert_metadata == {"k": 1}
+    assert AlertLog.__table__.c.metadata.name == "metadata"
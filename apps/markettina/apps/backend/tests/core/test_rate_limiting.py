@@ -0,0 +1,111 @@
+"""
+Tests for the GCRA rate limiter and hot-key token pre-allocation.
+"""
+
+import math
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limiting import RateLimiter
+
+
+class FakeGCRAScript:
+    """Python port of _GCRA_SCRIPT over an in-memory TAT store and a fixed clock."""
+
+    def __init__(self):
+        self.tat = {}
+        self.now = 1_000_000
+        self.calls = []
+        self.fail = False
+
+    async def __call__(self, keys, args):
+        if self.fail:
+            raise ConnectionError("redis down")
+        limit, window, requested = args
+        self.calls.append(requested)
+        emission = window / limit
+
+        tat = max(self.tat.get(keys[0], self.now), self.now)
+        available = math.floor((self.now + window - tat) / emission)
+        if available < 1:
+            return [0, 0, math.ceil(tat + emission - window - self.now), math.ceil(tat - self.now)]
+
+        granted = min(requested, available)
+        self.tat[keys[0]] = tat + granted * emission
+        return [granted, available - granted, 0, math.ceil(self.tat[keys[0]] - self.now)]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.script = FakeGCRAScript()
+
+    def register_script(self, script):
+        return self.script
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+def limiter(redis, batch=10, hot_rps=20):
+    with patch.object(settings, "ENABLE_RATE_LIMITING", True), \
+            patch.object(settings, "RATE_LIMIT_PREALLOC_BATCH", batch), \
+            patch.object(settings, "RATE_LIMIT_PREALLOC_HOT_RPS", hot_rps):
+        return RateLimiter(redis)
+
+
+class TestGCRA:
+
+    @pytest.mark.asyncio
+    async def test_burst_up_to_limit_then_denied(self, redis):
+        rl = limiter(redis)
+
+        results = [await rl.check_rate_limit("ip:1", 5, 60) for _ in range(6)]
+
+        assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+        assert results[4][1]["remaining"] == 0
+        assert results[5][1]["retry_after"] == 12
+
+    @pytest.mark.asyncio
+    async def test_tokens_return_at_emission_rate(self, redis):
+        rl = limiter(redis)
+        for _ in range(5):
+            await rl.check_rate_limit("ip:1", 5, 60)
+
+        redis.script.now += 12_000
+        allowed, _ = await rl.check_rate_limit("ip:1", 5, 60)
+
+        assert allowed
+
+    @pytest.mark.asyncio
+    async def test_redis_error_fails_open(self, redis):
+        redis.script.fail = True
+        assert await limiter(redis).check_rate_limit("ip:1", 5, 60) == (True, {})
+
+
+class TestPreallocation:
+
+    def test_knobs_come_from_settings(self, redis):
+        rl = limiter(redis, batch=7, hot_rps=3)
+        assert (rl.prealloc_batch, rl.prealloc_hot_rps) == (7, 3)
+
+    @pytest.mark.asyncio
+    async def test_hot_key_served_from_local_lease(self, redis):
+        rl = limiter(redis, batch=10, hot_rps=1)
+
+        results = [await rl.check_rate_limit("ip:1", 300, 60) for _ in range(10)]
+
+        assert all(allowed for allowed, _ in results)
+        assert redis.script.calls == [10]
+
+    @pytest.mark.asyncio
+    async def test_tight_limits_are_not_preallocated(self, redis):
+        rl = limiter(redis, batch=10, hot_rps=1)
+
+        for _ in range(3):
+            await rl.check_rate_limit("ip:1", 5, 60)
+
+        assert redis.script.calls == [1, 1, 1]
@@ -0,0 +1,146 @@
+"""
+Tests for scheduler leader election: only the leader runs the schedulers.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure.scheduler.leader import SchedulerLeaderElection
+from app.infrastructure.scheduler.post_scheduler import PostScheduler
+
+
+class FakeRedis:
+    """In-memory subset of redis.asyncio used by the leader election."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, identity, *args):
+        if self.data.get(key) != identity:
+            return 0
+        if "del" in script:
+            del self.data[key]
+        return 1
+
+    async def aclose(self):
+        pass
+
+
+def election(redis):
+    leader = SchedulerLeaderElection(ttl=3, retry_interval=0.01, enabled=True)
+    leader._redis = redis
+    leader._on_elected = AsyncMock()
+    leader._on_demoted = AsyncMock()
+    return leader
+
+
+async def run(leader):
+    """Let the acquire/renew loop of `leader` make progress."""
+    if leader._task is None:
+        leader._task = asyncio.create_task(leader._run())
+    await asyncio.sleep(0.05)
+
+
+class TestSchedulerLeaderElection:
+
+    @pytest.mark.asyncio
+    async def test_disabled_election_starts_schedulers(self):
+        on_elected = AsyncMock()
+        leader = SchedulerLeaderElection(enabled=False)
+
+        await leader.start(on_elected=on_elected, on_demoted=AsyncMock())
+
+        assert leader.is_leader
+        on_elected.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_only_one_worker_starts_schedulers(self):
+        redis = FakeRedis()
+        a, b = election(redis), election(redis)
+
+        await run(a)
+        await run(b)
+
+        assert a.is_leader and not b.is_leader
+        a._on_elected.assert_awaited_once()
+        b._on_elected.assert_not_awaited()
+        await a.stop()
+        await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_follower_takes_over_after_release(self):
+        redis = FakeRedis()
+        a, b = election(redis), election(redis)
+        await run(a)
+        await run(b)
+
+        await a.stop()
+        await run(b)
+
+        a._on_demoted.assert_awaited_once()
+        assert b.is_leader
+        await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_lost_lock_stops_schedulers(self):
+        redis = FakeRedis()
+        leader = election(redis)
+        leader.renew_interval = 0.01
+        await run(leader)
+        # Lock expired and taken by another worker
+        redis.data[leader.key] = "other-worker"
+
+        await run(leader)
+
+        assert not leader.is_leader
+        leader._on_demoted.assert_awaited_once()
+        await leader.stop()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_steps_down_before_lock_expires(self):
+        redis = FakeRedis()
+        leader = SchedulerLeaderElection(ttl=0.6, retry_interval=0.01, enabled=True)
+        leader._redis = redis
+        leader._on_elected = AsyncMock()
+        demoted_at = []
+        leader._on_demoted = AsyncMock(side_effect=lambda: demoted_at.append(time.monotonic()))
+        await run(leader)
+        assert leader.is_leader
+
+        redis.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+        await asyncio.sleep(0.6)
+
+        assert not leader.is_leader
+        # Lock would expire at _last_renewal + ttl: step down leaves a renew_interval margin
+        assert demoted_at[0] <= leader._last_renewal + leader.ttl - leader.renew_interval
+        await leader.stop()
+
+
+class TestPostSchedulerOnFollower:
+
+    @pytest.fixture
+    def follower(self, monkeypatch):
+        monkeypatch.setenv("SCHEDULER_JOBSTORE", "memory")
+        return PostScheduler()
+
+    @pytest.mark.asyncio
+    async def test_schedule_is_deferred_to_leader(self, follower):
+        """The post row is the source of truth: the follower touches no jobstore."""
+        scheduled = await follower.schedule_post(1, datetime.utcnow() + timedelta(hours=1))
+
+        assert scheduled
+        assert follower.scheduler.get_jobs() == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_is_left_to_leader(self, follower):
+        assert await follower.cancel_post(1) is False
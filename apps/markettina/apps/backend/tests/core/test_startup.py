@@ -0,0 +1,149 @@
+"""
+Tests for StartupManager: concurrent probes, readiness and background steps.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.infrastructure.cache.manager import RedisCache
+from app.infrastructure.startup import StartupManager
+
+
+def fake_probe(manager, name, ok=True, required=False, delay=0.05, calls=None):
+    """Probe that takes `delay` seconds and records `ok` like the real ones."""
+    async def probe():
+        if calls is not None:
+            calls.append(name)
+        started = time.perf_counter()
+        await asyncio.sleep(delay)
+        return manager._record_probe(name, ok, started, required=required, error=None if ok else "down")
+    return probe
+
+
+@pytest.fixture
+def manager():
+    return StartupManager()
+
+
+def with_probes(manager, database=True, redis=True, ollama=True, calls=None):
+    manager.probe_database = fake_probe(manager, "database", database, required=True, calls=calls)
+    manager.probe_redis = fake_probe(manager, "redis", redis, calls=calls)
+    manager.probe_ollama = fake_probe(manager, "ollama", ollama, calls=calls)
+    return manager
+
+
+class TestProbes:
+
+    @pytest.mark.asyncio
+    async def test_probes_run_concurrently(self, manager):
+        with_probes(manager)
+
+        started = time.perf_counter()
+        await manager.run_probes()
+
+        assert time.perf_counter() - started < 0.12
+        assert set(manager.probes) == {"database", "redis", "ollama"}
+
+    @pytest.mark.asyncio
+    async def test_optional_dependencies_do_not_fail_readiness(self, manager):
+        with_probes(manager, redis=False, ollama=False)
+
+        report = await manager.check_readiness()
+
+        assert report["status"] == "ready"
+        assert report["probes"]["redis"]["error"] == "down"
+
+    @pytest.mark.asyncio
+    async def test_database_down_is_not_ready(self, manager):
+        with_probes(manager, database=False)
+        assert (await manager.check_readiness())["status"] == "not_ready"
+
+    @pytest.mark.asyncio
+    async def test_recent_probes_are_reused(self, manager):
+        calls = []
+        with_probes(manager, calls=calls)
+
+        await manager.check_readiness()
+        await manager.check_readiness()
+
+        assert sorted(calls) == ["database", "ollama", "redis"]
+
+
+class TestDatabaseRetries:
+
+    @pytest.mark.asyncio
+    async def test_retries_until_database_is_up(self, manager, monkeypatch):
+        monkeypatch.setenv("DB_RETRY_DELAY", "0")
+        results = iter([False, False, True])
+
+        async def probe():
+            ok = next(results)
+            return manager._record_probe(
+                "database", ok, time.perf_counter(), required=True,
+                error=None if ok else "connection refused", user="app", database="db",
+            )
+        manager.probe_database = probe
+
+        assert await manager.ensure_database_connection()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, manager, monkeypatch):
+        monkeypatch.setenv("DB_RETRY_DELAY", "0")
+        monkeypatch.setenv("DB_MAX_RETRIES", "2")
+        manager.probe_database = fake_probe(manager, "database", ok=False, required=True, delay=0)
+
+        assert not await manager.ensure_database_connection()
+
+
+class TestBackgroundSteps:
+
+    @pytest.mark.asyncio
+    async def test_failed_step_is_reported_not_raised(self, manager):
+        async def connect():
+            raise ConnectionError("redis unavailable")
+
+        manager.start_background("cache", connect())
+        await asyncio.gather(*manager._background_tasks.values())
+
+        assert manager.background["cache"]["status"] == "failed"
+        assert manager.background["cache"]["error"] == "redis unavailable"
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_running_steps(self, manager):
+        manager.start_background("schedulers", asyncio.sleep(60))
+        await asyncio.sleep(0)
+
+        with patch("app.infrastructure.startup.stop_all_schedulers", AsyncMock()):
+            await manager.shutdown_procedures()
+
+        assert manager.background["schedulers"]["status"] == "cancelled"
+
+
+class TestLazyCacheConnect:
+
+    @pytest.mark.asyncio
+    async def test_cache_access_does_not_wait_for_background_connect(self):
+        cache = RedisCache()
+        connecting, release = threading.Event(), threading.Event()
+
+        def slow_connect():
+            connecting.set()
+            release.wait()
+            cache._connect_attempted = True
+            cache.is_available = True
+
+        cache.connect = slow_connect
+        background = asyncio.create_task(asyncio.to_thread(cache.ensure_connected))
+        await asyncio.to_thread(connecting.wait)
+
+        started = time.perf_counter()
+        assert cache.ensure_connected() is False
+        assert time.perf_counter() - started < 0.1
+
+        release.set()
+        assert await background is True
+        assert cache.ensure_connected() is True
@@ -0,0 +1,131 @@
+"""
+Tests for the Redis Streams task queue: execution, retries and redelivery.
+"""
+
+import asyncio
+import importlib
+
+import fakeredis
+import pytest
+
+from app.infrastructure.queue.task_queue import JobStatus, TaskQueue
+
+# The package re-exports the `task_queue` instance under the module's name
+queue_module = importlib.import_module("app.infrastructure.queue.task_queue")
+
+
+@pytest.fixture
+def queue():
+    queue = TaskQueue(redis_url="redis://fake", visibility_timeout=60)
+    queue._redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    queue.retry_backoff = 0.0
+    return queue
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    """Task registry isolated from the tasks registered by the app."""
+    registry = {}
+    monkeypatch.setattr(queue_module, "_TASKS", registry)
+    return registry
+
+
+async def deliver(queue, consumer="worker-1"):
+    """Read the next message for `consumer` and process it."""
+    await queue.ensure_group()
+    response = await queue._redis.xreadgroup(queue.group, consumer, {queue.stream: ">"}, count=1)
+    (_, [(message_id, fields)]), = response
+    await queue._process(consumer, message_id, fields)
+
+
+class TestTaskQueue:
+
+    @pytest.mark.asyncio
+    async def test_completed_job_stores_result_and_is_acked(self, queue, tasks):
+        async def double(payload):
+            return {"value": payload["value"] * 2}
+        tasks["double"] = double
+
+        job_id = await queue.enqueue("double", {"value": 21})
+        await deliver(queue)
+        job = await queue.get_job(job_id)
+
+        assert job["status"] == JobStatus.COMPLETED.value
+        assert job["result"] == {"value": 42}
+        assert job["attempts"] == 1
+        assert await queue._redis.xlen(queue.stream) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_is_retried_after_backoff(self, queue, tasks):
+        calls = []
+
+        async def flaky(payload):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise RuntimeError("upstream down")
+            return "ok"
+        tasks["flaky"] = flaky
+
+        job_id = await queue.enqueue("flaky", max_retries=1)
+        await deliver(queue)
+        retrying = await queue.get_job(job_id)
+        await queue._promote_delayed()
+        await deliver(queue)
+
+        assert retrying["status"] == JobStatus.RETRYING.value
+        assert retrying["error"] == "upstream down"
+        assert (await queue.get_job(job_id))["status"] == JobStatus.COMPLETED.value
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_job_fails_when_retries_are_exhausted(self, queue, tasks):
+        async def broken(payload):
+            raise ValueError("bad payload")
+        tasks["broken"] = broken
+
+        job_id = await queue.enqueue("broken", max_retries=0)
+        await deliver(queue)
+        job = await queue.get_job(job_id)
+
+        assert job["status"] == JobStatus.FAILED.value
+        assert job["error"] == "bad payload"
+        assert await queue._redis.zcard(queue.delayed_key) == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_task_fails_without_retry(self, queue, tasks):
+        job_id = await queue.enqueue("missing")
+        await deliver(queue)
+
+        job = await queue.get_job(job_id)
+
+        assert job["status"] == JobStatus.FAILED.value
+        assert job["attempts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_message_of_dead_worker_is_reclaimed(self, queue, tasks):
+        job_id = await queue.enqueue("anything")
+        await queue.ensure_group()
+        await queue._redis.xreadgroup(queue.group, "dead-worker", {queue.stream: ">"}, count=1)
+        queue.visibility_timeout = 0.001
+        await asyncio.sleep(0.01)
+
+        reclaimed = await queue._reclaim_stale("worker-2")
+
+        assert [fields["job_id"] for _, fields in reclaimed] == [job_id]
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_jobs_until_stopped(self, queue, tasks):
+        done = asyncio.Event()
+
+        async def notify(payload):
+            done.set()
+        tasks["notify"] = notify
+        job_id = await queue.enqueue("notify")
+        stop = asyncio.Event()
+
+        worker = asyncio.create_task(queue.run_worker("worker-1", stop_event=stop))
+        await asyncio.wait_for(done.wait(), timeout=5)
+        stop.set()
+        await asyncio.wait_for(worker, timeout=5)
+
+        assert (await queue.get_job(job_id))["status"] == JobStatus.COMPLETED.value
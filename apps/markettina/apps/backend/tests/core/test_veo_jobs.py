@@ -0,0 +1,98 @@
+"""
+Tests for VEO async generation: in-process default, opt-in queue, job lookup.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.api.v1.ai import veo_router
+from app.services.veo_video_service import VideoJob, VideoJobStatus
+
+
+def video_request():
+    return veo_router.GenerateVideoRequest(prompt="Drone shot of a seaside town at sunset")
+
+
+@pytest.fixture
+def veo_service():
+    service = MagicMock()
+    service.is_configured = True
+    service.generate_video_async = AsyncMock(return_value="local-job")
+    service.get_job.return_value = None
+    with patch.object(veo_router, "veo_service", service):
+        yield service
+
+
+class TestGenerateAsync:
+
+    @pytest.mark.asyncio
+    async def test_default_runs_in_process(self, veo_service):
+        """Without ?background the existing in-process path is used."""
+        with patch.object(veo_router, "enqueue_job", AsyncMock()) as enqueue:
+            response = await veo_router.generate_video_async(video_request(), MagicMock(), background=False)
+
+        assert response["job_id"] == "local-job"
+        veo_service.generate_video_async.assert_awaited_once()
+        enqueue.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_background_enqueues_job(self, veo_service):
+        """?background=true goes through the worker queue."""
+        with patch.object(veo_router, "enqueue_job", AsyncMock(return_value="queued")) as enqueue:
+            response = await veo_router.generate_video_async(video_request(), MagicMock(), background=True)
+
+        assert response == "queued"
+        assert enqueue.await_args.args[0] == "generate_video"
+        veo_service.generate_video_async.assert_not_awaited()
+
+
+class TestGetJob:
+
+    @pytest.mark.asyncio
+    async def test_resolves_running_queue_job(self, veo_service):
+        """A queue job_id is found on /video/jobs/{job_id}."""
+        queued = {
+            "id": "q1",
+            "task": "generate_video",
+            "status": "running",
+            "payload": {"prompt": "Drone shot", "aspect_ratio": "9:16"},
+            "created_at": 1_700_000_000.0,
+        }
+        with patch.object(veo_router.task_queue, "get_job", AsyncMock(return_value=queued)):
+            job = await veo_router.get_job("q1")
+
+        assert job.job_id == "q1"
+        assert job.status == VideoJobStatus.PROCESSING
+        assert job.aspect_ratio == "9:16"
+
+    @pytest.mark.asyncio
+    async def test_completed_queue_job_returns_video(self, veo_service):
+        """A completed queue job returns the VideoJob produced by the worker."""
+        produced = VideoJob(
+            job_id="veo-1",
+            status=VideoJobStatus.COMPLETED,
+            prompt="Drone shot",
+            video_url="/media/videos/veo-1.mp4",
+        )
+        queued = {
+            "id": "q2",
+            "task": "generate_video",
+            "status": "completed",
+            "payload": {"prompt": "Drone shot"},
+            "result": {"success": True, "job": produced.model_dump(mode="json")},
+            "created_at": 1_700_000_000.0,
+        }
+        with patch.object(veo_router.task_queue, "get_job", AsyncMock(return_value=queued)):
+            job = await veo_router.get_job("q2")
+
+        assert job.status == VideoJobStatus.COMPLETED
+        assert job.video_url == "/media/videos/veo-1.mp4"
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_is_404(self, veo_service):
+        with patch.object(veo_router.task_queue, "get_job", AsyncMock(return_value=None)):
+            with pytest.raises(veo_router.HTTPException) as exc:
+                await veo_router.get_job("missing")
+
+        assert exc.value.status_code == 404
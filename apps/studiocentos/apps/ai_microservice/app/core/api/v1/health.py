@@ -20,6 +20,9 @@ async def health_check():
 
     groq_keys_count = len(settings.groq_api_keys)
 
+    from app.core.llm.dispatcher import get_llm_dispatcher
+    from app.domain.marketing.custom_model_service import custom_model_service
+
     return {
         "status": "healthy",
         "version": "1.0.0",
@@ -34,6 +37,8 @@ async def health_check():
             "ollama": "available",
             "chromadb": "configured",
         },
+        "custom_model_queue": custom_model_service.get_queue_stats(),
+        "llm_dispatcher": get_llm_dispatcher().get_stats(),
         "priority": "groq (FREE & FAST!)",
         "fallback_order": ["groq", "huggingface", "gemini", "openrouter", "ollama"]
     }
@@ -1,9 +1,12 @@
 """Marketing Agents API Endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status, Form, File, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from enum import Enum
+import asyncio
 import httpx
+import json
 import os
 from app.core.security import verify_api_key
 from app.core.logging import get_logger
@@ -25,84 +28,131 @@ class ContentResponse(BaseModel):
     provider: str = "huggingface"
 
 # LEGACY CODE REMOVED - Using ContentCreatorAgent instead
-# generate_with_ai() removed to eliminate duplication
+# generate_with_ai() now delegates to the shared agent's generation chain
 
-@router.post("/content/generate", response_model=ContentResponse)
-async def generate_content(request: ContentRequest):
-    """
-    Standard Content Generation (Refactored to use ContentCreatorAgent)
-    """
-    try:
-        logger.info("generate_content_agent", type=request.type, topic=request.topic[:50])
+_content_agent = None
 
-        # Import imports locally
-        from app.domain.marketing.content_creator import (
-            ContentCreatorAgent, AgentConfig, BlogPostConfig,
-            SocialPostConfig, SocialPlatform, ContentTone, ContentType
-        )
 
-        # Initialize Agent
+async def _get_content_agent():
+    """Shared ContentCreatorAgent for helper generation (lazily started)."""
+    global _content_agent
+    if _content_agent is None:
+        from app.domain.marketing.content_creator import ContentCreatorAgent, AgentConfig
+
         agent = ContentCreatorAgent(
             config=AgentConfig(
-                id="marketing_agent_standard",
+                id="marketing_agent_helper",
                 agent_type="marketing_content_creator",
-                name="StudioCentOS Standard Creator",
+                name="StudioCentOS Helper Creator",
                 model="llama-3.3-70b-versatile",
                 temperature=0.7
             )
         )
         await agent.on_start()
+        _content_agent = agent
+    return _content_agent
 
-        content = ""
-        metadata = {}
 
-        if request.type == "blog":
-            config = BlogPostConfig(
-                topic=request.topic,
-                tone=ContentTone.PROFESSIONAL, # Map from request.tone string if needed
-                keywords=[],
-                brand_context=request.brand_context
-            )
-            result = await agent.generate_blog_post(config)
-            content = result.content
-            metadata = result.metadata
-
-        elif request.type == "social":
-            # Map platform from request or default
-            platform = SocialPlatform.LINKEDIN # Default safe
-            if request.platform:
-                try:
-                    platform = SocialPlatform(request.platform.lower())
-                except ValueError:
-                    pass
-
-            config = SocialPostConfig(
-                platform=platform,
-                message=request.topic,
-                tone=ContentTone.PROFESSIONAL,
-                brand_context=request.brand_context,
-                post_type="educational" # Default
-            )
-            result = await agent.generate_social_post(config)
-            content = result.content
-            metadata = result.metadata
+async def generate_with_ai(prompt: str, brand_context: Optional[str] = None) -> str:
+    """Generate raw text with the ContentCreatorAgent provider chain (Custom → Ollama → GROQ)."""
+    agent = await _get_content_agent()
+    return await agent._generate_content(prompt, brand_context)
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Event frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an SSE frame generator in a non-buffered StreamingResponse."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable nginx proxy buffering
+        },
+    )
+
+
+async def _create_standard_agent():
+    """Create and start the ContentCreatorAgent used by /content/generate."""
+    from app.domain.marketing.content_creator import ContentCreatorAgent, AgentConfig
+
+    agent = ContentCreatorAgent(
+        config=AgentConfig(
+            id="marketing_agent_standard",
+            agent_type="marketing_content_creator",
+            name="StudioCentOS Standard Creator",
+            model="llama-3.3-70b-versatile",
+            temperature=0.7
+        )
+    )
+    await agent.on_start()
+    return agent
+
+
+def _build_standard_config(request: ContentRequest):
+    """Map a ContentRequest to ("blog", BlogPostConfig) or ("social", SocialPostConfig)."""
+    from app.domain.marketing.content_creator import (
+        BlogPostConfig, SocialPostConfig, SocialPlatform, ContentTone
+    )
+
+    if request.type == "blog":
+        return "blog", BlogPostConfig(
+            topic=request.topic,
+            tone=ContentTone.PROFESSIONAL, # Map from request.tone string if needed
+            keywords=[],
+            brand_context=request.brand_context
+        )
+
+    if request.type == "social":
+        # Map platform from request or default
+        platform = SocialPlatform.LINKEDIN # Default safe
+        if request.platform:
+            try:
+                platform = SocialPlatform(request.platform.lower())
+            except ValueError:
+                pass
+
+        return "social", SocialPostConfig(
+            platform=platform,
+            message=request.topic,
+            tone=ContentTone.PROFESSIONAL,
+            brand_context=request.brand_context,
+            post_type="educational" # Default
+        )
+
+    # Fallback direct generation via internal helper or just error
+    # Let's map ad/video too if possible, or just use social as generic
+    return "social", SocialPostConfig(
+        platform=SocialPlatform.LINKEDIN,
+        message=f"[{request.type.upper()}] {request.topic}",
+        tone=ContentTone.PROFESSIONAL,
+        brand_context=request.brand_context
+    )
 
+
+@router.post("/content/generate", response_model=ContentResponse)
+async def generate_content(request: ContentRequest):
+    """
+    Standard Content Generation (Refactored to use ContentCreatorAgent)
+    """
+    try:
+        logger.info("generate_content_agent", type=request.type, topic=request.topic[:50])
+
+        agent = await _create_standard_agent()
+        kind, config = _build_standard_config(request)
+
+        if kind == "blog":
+            result = await agent.generate_blog_post(config)
         else:
-            # Fallback direct generation via internal helper or just error
-            # Let's map ad/video too if possible, or just use social as generic
-            config = SocialPostConfig(
-                platform=SocialPlatform.LINKEDIN,
-                message=f"[{request.type.upper()}] {request.topic}",
-                tone=ContentTone.PROFESSIONAL,
-                brand_context=request.brand_context
-            )
             result = await agent.generate_social_post(config)
-            content = result.content
-            metadata = result.metadata
 
         return ContentResponse(
-            content=content,
-            metadata=metadata,
+            content=result.content,
+            metadata=result.metadata,
             provider="groq-llama-3.3"
         )
 
@@ -115,6 +165,42 @@ async def generate_content(request: ContentRequest):
             provider="system"
         )
 
+
+@router.post("/content/generate/stream")
+async def generate_content_stream(request: ContentRequest):
+    """
+    Streaming variant of /content/generate (Server-Sent Events).
+
+    Events:
+    - ``token``: ``{"text": "..."}`` for each chunk as the LLM produces it
+    - ``done``: the same payload as ContentResponse, after post-processing
+    - ``error``: ``{"detail": "..."}`` if generation fails mid-stream
+    """
+    logger.info("generate_content_stream", type=request.type, topic=request.topic[:50])
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            agent = await _create_standard_agent()
+            kind, config = _build_standard_config(request)
+            stream = (
+                agent.stream_blog_post(config) if kind == "blog"
+                else agent.stream_social_post(config)
+            )
+            async for event, payload in stream:
+                if event == "token":
+                    yield _sse_event("token", {"text": payload})
+                else:
+                    yield _sse_event("done", ContentResponse(
+                        content=payload.content,
+                        metadata=payload.metadata,
+                        provider="groq-llama-3.3"
+                    ).model_dump())
+        except Exception as e:
+            logger.error("generate_content_stream_error", error=str(e), exc_info=True)
+            yield _sse_event("error", {"detail": str(e)})
+
+    return _sse_response(events())
+
 @router.get("/")
 async def marketing_root():
     return {
@@ -122,7 +208,7 @@ async def marketing_root():
         "status": "available",
         "agents": 5,
         "provider": "huggingface",
-        "features": ["blog", "social", "ad", "video", "leads", "generate-pro"]
+        "features": ["blog", "social", "ad", "video", "leads", "generate-pro", "streaming"]
     }
 
 
@@ -245,77 +331,62 @@ SECTOR_IMAGE_CONTEXT = {
     "consulting": "business meeting, strategy session, boardroom, professional discussion, charts",
 }
 
-@router.post("/content/generate-pro", response_model=ProContentResponse)
-async def generate_content_pro(request: ProContentRequest):
-    """
-    PROFESSIONAL Content Generation with ContentCreatorAgent (Llama-3.3-70B)
-    """
-    try:
-        logger.info("generate_content_pro_agent",
-                    post_type=request.post_type,
-                    platform=request.platform,
-                    sector=request.sector,
-                    topic=request.topic[:50] if request.topic else "")
-
-        # 1. Initialize Agent (Lazy or Global)
-        # In a real scenario, this should be dependency injected or global singleton
-        # For now, we instantiate here to ensure fresh config matching request
+async def _create_pro_agent_and_config(request: ProContentRequest):
+    """Create the Pro ContentCreatorAgent and the SocialPostConfig for a request."""
+    # Prepare Brand Context for Agent
+    agent_brand_context = request.brand_context
+    if request.sector:
+        agent_brand_context = f"{agent_brand_context or ''}\nSETTORE TARGET: {request.sector}"
 
-        # Prepare Brand Context for Agent
-        agent_brand_context = request.brand_context
-        if request.sector:
-            agent_brand_context = f"{agent_brand_context or ''}\nSETTORE TARGET: {request.sector}"
+    if request.additional_context:
+        agent_brand_context = f"{agent_brand_context or ''}\nCONTESTO EXTRA: {request.additional_context}"
 
-        if request.additional_context:
-            agent_brand_context = f"{agent_brand_context or ''}\nCONTESTO EXTRA: {request.additional_context}"
+    # Import locally to avoid circular deps if any, though top level is fine
+    from app.domain.marketing.content_creator import (
+        ContentCreatorAgent, AgentConfig, SocialPostConfig,
+        SocialPlatform, ContentTone
+    )
 
-        # Import locally to avoid circular deps if any, though top level is fine
-        from app.domain.marketing.content_creator import (
-            ContentCreatorAgent, AgentConfig, SocialPostConfig,
-            SocialPlatform, ContentTone
+    # Create Agent Instance
+    agent = ContentCreatorAgent(
+        config=AgentConfig(
+            id="marketing_agent_pro",
+            agent_type="marketing_content_creator",
+            name="StudioCentOS Pro Creator",
+            model="llama-3.3-70b-versatile", # POWERHOUSE MODEL
+            temperature=0.7
         )
+    )
+    await agent.on_start() # Load resources
 
-        # Create Agent Instance
-        agent = ContentCreatorAgent(
-            config=AgentConfig(
-                id="marketing_agent_pro",
-                agent_type="marketing_content_creator",
-                name="StudioCentOS Pro Creator",
-                model="llama-3.3-70b-versatile", # POWERHOUSE MODEL
-                temperature=0.7
-            )
-        )
-        await agent.on_start() # Load resources
+    social_config = SocialPostConfig(
+        platform=request.platform,
+        message=request.topic,
+        post_type=request.post_type,
+        tone="professional",
+        brand_context=agent_brand_context,
+        include_hashtags=True, # Agent generates them in text
+        include_emojis=True
+    )
+    return agent, social_config
 
-        # 2. Generate TEXT using Agent
-        social_config = SocialPostConfig(
-            platform=request.platform,
-            message=request.topic,
-            post_type=request.post_type,
-            tone="professional",
-            brand_context=agent_brand_context,
-            include_hashtags=True, # Agent generates them in text
-            include_emojis=True
-        )
 
-        # Execute Agent Logic
-        result = await agent.generate_social_post(social_config)
-        content = result.content
-
-        # 3. Generate IMAGE PROMPT (Using existing Premium Logic)
-        image_prompt = None
-        if request.generate_image_prompt:
-            image_style = IMAGE_STYLE_BY_POST_TYPE.get(
-                request.post_type,
-                IMAGE_STYLE_BY_POST_TYPE["educational"]
-            )
-            sector_context = SECTOR_IMAGE_CONTEXT.get(
-                request.sector,
-                SECTOR_IMAGE_CONTEXT["tech"]
-            )
+def _build_pro_image_prompt(request: ProContentRequest) -> Optional[str]:
+    """Premium image prompt for a Pro request (None if not requested)."""
+    if not request.generate_image_prompt:
+        return None
 
-            # PREMIUM PROMPT CONSTRUCTION (Preserved from previous fix)
-            image_prompt = f"""
+    image_style = IMAGE_STYLE_BY_POST_TYPE.get(
+        request.post_type,
+        IMAGE_STYLE_BY_POST_TYPE["educational"]
+    )
+    sector_context = SECTOR_IMAGE_CONTEXT.get(
+        request.sector,
+        SECTOR_IMAGE_CONTEXT["tech"]
+    )
+
+    # PREMIUM PROMPT CONSTRUCTION (Preserved from previous fix)
+    return f"""
 Create a PREMIUM marketing image for StudioCentOS - Italian tech excellence.
 
 SUBJECT: {request.topic}
@@ -345,44 +416,104 @@ SECTOR CONTEXT: {sector_context}
 - Premium tech aesthetic: sleek, polished, sophisticated
 """.strip()
 
-        # 4. Helpers (Hashtags & CTAs)
-        # Extract hashtags from content (Agent adds them at the end usually)
-        import re
-        generated_hashtags = re.findall(r"#\w+", content)
-        # Fallback if no hashtags found
-        if not generated_hashtags:
-            base_hashtags = list(BRAND_DNA["hashtags"]["brand"])
-            generated_hashtags = base_hashtags[:5]
-
-        # CTA Options (Static fallback for UI buttons)
-        cta_options_map = {
-            "lancio_prodotto": ["Prenota una demo gratuita →", "Scopri tutte le funzionalità →", "Contattaci ora"],
-            "tip_giorno": ["Salva questo post 📌", "Condividi il tip", "Seguici per altri consigli"],
-            "educational": ["Salva per dopo 📌", "Condividi con colleghi", "Approfondisci sul sito"],
-            "offerta_speciale": ["Blocca l'offerta", "Acquista ora", "Richiedi info"],
-        }
-        cta_options = cta_options_map.get(request.post_type, cta_options_map["educational"])
 
-        return ProContentResponse(
-            content=content,
-            image_prompt=image_prompt,
-            hashtags=generated_hashtags,
-            cta_options=cta_options,
-            metadata={
-                "post_type": request.post_type,
-                "platform": request.platform,
-                "sector": request.sector,
-                "agent": "ContentCreatorAgent",
-                "model": "llama-3.3-70b"
-            },
-            provider="groq"
-        )
+def _build_pro_response(
+    request: ProContentRequest, content: str, image_prompt: Optional[str]
+) -> ProContentResponse:
+    """Extract hashtags / CTA options and assemble the Pro response."""
+    # Extract hashtags from content (Agent adds them at the end usually)
+    import re
+    generated_hashtags = re.findall(r"#\w+", content)
+    # Fallback if no hashtags found
+    if not generated_hashtags:
+        base_hashtags = list(BRAND_DNA["hashtags"]["brand"])
+        generated_hashtags = base_hashtags[:5]
+
+    # CTA Options (Static fallback for UI buttons)
+    cta_options_map = {
+        "lancio_prodotto": ["Prenota una demo gratuita →", "Scopri tutte le funzionalità →", "Contattaci ora"],
+        "tip_giorno": ["Salva questo post 📌", "Condividi il tip", "Seguici per altri consigli"],
+        "educational": ["Salva per dopo 📌", "Condividi con colleghi", "Approfondisci sul sito"],
+        "offerta_speciale": ["Blocca l'offerta", "Acquista ora", "Richiedi info"],
+    }
+    cta_options = cta_options_map.get(request.post_type, cta_options_map["educational"])
+
+    return ProContentResponse(
+        content=content,
+        image_prompt=image_prompt,
+        hashtags=generated_hashtags,
+        cta_options=cta_options,
+        metadata={
+            "post_type": request.post_type,
+            "platform": request.platform,
+            "sector": request.sector,
+            "agent": "ContentCreatorAgent",
+            "model": "llama-3.3-70b"
+        },
+        provider="groq"
+    )
+
+
+@router.post("/content/generate-pro", response_model=ProContentResponse)
+async def generate_content_pro(request: ProContentRequest):
+    """
+    PROFESSIONAL Content Generation with ContentCreatorAgent (Llama-3.3-70B)
+    """
+    try:
+        logger.info("generate_content_pro_agent",
+                    post_type=request.post_type,
+                    platform=request.platform,
+                    sector=request.sector,
+                    topic=request.topic[:50] if request.topic else "")
+
+        # 1. Initialize Agent + config
+        agent, social_config = await _create_pro_agent_and_config(request)
+
+        # 2. Generate TEXT using Agent
+        result = await agent.generate_social_post(social_config)
+
+        # 3. Generate IMAGE PROMPT + 4. Helpers (Hashtags & CTAs)
+        return _build_pro_response(request, result.content, _build_pro_image_prompt(request))
 
     except Exception as e:
         logger.error("generate_content_pro_error", error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/content/generate-pro/stream")
+async def generate_content_pro_stream(request: ProContentRequest):
+    """
+    Streaming variant of /content/generate-pro (Server-Sent Events).
+
+    The image prompt does not depend on the LLM output, so it is sent first
+    (``image_prompt`` event); then ``token`` events follow as the post is
+    written, and ``done`` carries the full ProContentResponse.
+    """
+    logger.info("generate_content_pro_stream",
+                post_type=request.post_type,
+                platform=request.platform,
+                topic=request.topic[:50] if request.topic else "")
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            image_prompt = _build_pro_image_prompt(request)
+            if image_prompt:
+                yield _sse_event("image_prompt", {"image_prompt": image_prompt})
+
+            agent, social_config = await _create_pro_agent_and_config(request)
+            async for event, payload in agent.stream_social_post(social_config):
+                if event == "token":
+                    yield _sse_event("token", {"text": payload})
+                else:
+                    response = _build_pro_response(request, payload.content, image_prompt)
+                    yield _sse_event("done", response.model_dump())
+        except Exception as e:
+            logger.error("generate_content_pro_stream_error", error=str(e), exc_info=True)
+            yield _sse_event("error", {"detail": str(e)})
+
+    return _sse_response(events())
+
+
 # ============================================================================
 # SEO STRATEGY & ANALYSIS
 # ============================================================================
@@ -2868,59 +2999,37 @@ class BatchContentResponse(BaseModel):
     metadata: dict
 
 
-@router.post("/content/batch/generate", response_model=BatchContentResponse)
-async def batch_generate_social_content(request: BatchContentRequest):
-    """
-    🚀 BATCH GENERATOR - Generate complete social media campaign.
-
-    Generates for a full day:
-    - 1 post per platform (Instagram, Facebook, TikTok, LinkedIn)
-    - 3 stories (Instagram/Facebook)
-    - 1 video (Reels/TikTok)
-
-    Example: 1 topic → 4 posts + 3 stories + 1 video = 8 assets ready to publish!
+def _batch_platform_config(platform: str) -> dict:
+    """Estrae config legacy da PLATFORM_CONFIGS globale."""
+    full_config = PLATFORM_CONFIGS.get(platform, PLATFORM_CONFIGS.get("instagram", {}))
+    return {
+        "post_ratio": full_config.get("image_ratio", "1:1"),
+        "story_ratio": "9:16",  # Stories sempre 9:16
+        "hashtag_count": full_config.get("optimal_hashtags", 10),
+        "caption_length": full_config.get("optimal_chars", 150)
+    }
 
-    Perfect for:
-    - Daily content automation
-    - Campaign launches
-    - Product promotions
-    - Event coverage
-    """
-    import asyncio
-    import time
 
-    logger.info("batch_generate_start",
-               topic=request.topic[:50],
-               platforms=request.platforms,
-               posts=request.post_count,
-               stories=request.story_count,
-               videos=request.video_count)
+def _split_caption_hashtags(caption: str, limit: int) -> tuple:
+    """Split a generated caption into (text, hashtags) on the 'Hashtags:' marker."""
+    hashtags = []
+    if "Hashtags:" in caption:
+        hashtag_line = caption.split("Hashtags:")[-1].strip()
+        hashtags = [h.strip() for h in hashtag_line.split("#") if h.strip()][:limit]
+    return caption.split("Hashtags:")[0].strip(), hashtags
 
-    start_time = time.time()
-    items = []
-    total_cost = 0.0
 
-    # Platform specifications - usa PLATFORM_CONFIGS globale con fallback per campi legacy
-    # NOTA: PLATFORM_CONFIGS è definito sotto (linea ~2240), contiene configs complete.
-    # Per retrocompatibilità, estraiamo solo i campi necessari qui.
-    def get_legacy_config(platform: str) -> dict:
-        """Estrae config legacy da PLATFORM_CONFIGS globale."""
-        full_config = PLATFORM_CONFIGS.get(platform, PLATFORM_CONFIGS.get("instagram", {}))
-        return {
-            "post_ratio": full_config.get("image_ratio", "1:1"),
-            "story_ratio": "9:16",  # Stories sempre 9:16
-            "hashtag_count": full_config.get("optimal_hashtags", 10),
-            "caption_length": full_config.get("optimal_chars", 150)
-        }
+def _build_batch_jobs(request: BatchContentRequest) -> List[dict]:
+    """
+    One job per asset: caption prompt (if any) plus the asset it feeds.
 
-    # ========================================================================
-    # STEP 1: Generate captions for all posts
-    # ========================================================================
-    logger.info("batch_step_1", step="Generating captions")
+    Jobs are in response order (posts platform by platform, then stories,
+    then videos); "position" keeps that order once they finish out of order.
+    """
+    jobs = []
 
-    caption_tasks = []
     for platform in request.platforms:
-        config = get_legacy_config(platform)
+        config = _batch_platform_config(platform)
 
         for i in range(request.post_count):
             caption_prompt = f"""
@@ -2939,12 +3048,12 @@ Format:
 
 Hashtags: [hashtags]
 """
-            caption_tasks.append((platform, "post", caption_prompt))
+            jobs.append({"platform": platform, "content_type": "post", "index": i, "prompt": caption_prompt})
 
-    # Generate story captions
-    if request.story_count > 0 and any(p in ["instagram", "facebook"] for p in request.platforms):
-        for i in range(request.story_count):
-            story_prompt = f"""
+    # Story text only makes sense when a story platform is targeted
+    has_story_platform = any(p in ["instagram", "facebook"] for p in request.platforms)
+    for i in range(request.story_count):
+        story_prompt = f"""
 Create Instagram/Facebook story text about: {request.topic}
 
 Requirements:
@@ -2956,12 +3065,15 @@ Requirements:
 Format:
 [Story text]
 """
-            caption_tasks.append(("instagram", "story", story_prompt))
-
-    # Generate video scripts
-    if request.video_count > 0:
-        for i in range(request.video_count):
-            video_prompt = f"""
+        jobs.append({
+            "platform": "instagram",
+            "content_type": "story",
+            "index": i,
+            "prompt": story_prompt if has_story_platform else None,
+        })
+
+    for i in range(request.video_count):
+        video_prompt = f"""
 Create a 15-second video script for Instagram Reel/TikTok about: {request.topic}
 
 Requirements:
@@ -2979,150 +3091,196 @@ Format:
 
 Hashtags: [hashtags]
 """
-            caption_tasks.append(("instagram", "video", video_prompt))
+        jobs.append({"platform": "instagram", "content_type": "video", "index": i, "prompt": video_prompt})
 
-    # Generate all captions in parallel (fast!)
-    caption_results = []
-    for platform, content_type, prompt in caption_tasks:
-        try:
-            content = await generate_with_ai(prompt)
-            caption_results.append((platform, content_type, content))
-        except Exception as e:
-            logger.error("caption_generation_failed", error=str(e))
-            caption_results.append((platform, content_type, "Caption generation failed"))
+    for position, job in enumerate(jobs):
+        job["position"] = position
+    return jobs
 
-    # ========================================================================
-    # STEP 2: Generate images for posts
-    # ========================================================================
-    logger.info("batch_step_2", step="Generating post images")
 
-    image_tasks = []
-    for platform in request.platforms:
-        config = get_legacy_config(platform)
+async def _run_batch_job(
+    job: dict,
+    request: BatchContentRequest,
+    caption_slots: asyncio.Semaphore,
+    video_slots: asyncio.Semaphore,
+) -> tuple:
+    """
+    Run one asset end to end: caption first, then its image/video.
 
-        for i in range(request.post_count):
-            image_req = ImageGenerationRequest(
-                prompt=f"Professional {platform} post image about: {request.topic}. Modern, engaging, premium quality.",
+    Returns (BatchContentItem or None, cost estimate).
+    """
+    from app.core.llm.dispatcher import LLMPriority, llm_priority
+
+    platform = job["platform"]
+    content_type = job["content_type"]
+
+    caption = ""
+    if job["prompt"]:
+        try:
+            async with caption_slots:
+                # Batch lane: yields provider slots to interactive requests
+                with llm_priority(LLMPriority.BATCH):
+                    caption = await generate_with_ai(job["prompt"])
+        except Exception as e:
+            logger.error("caption_generation_failed", platform=platform, content_type=content_type, error=str(e))
+            caption = "Caption generation failed"
+
+    try:
+        if content_type == "post":
+            config = _batch_platform_config(platform)
+            text, hashtags = _split_caption_hashtags(caption, config["hashtag_count"])
+            result = await generate_image(ImageGenerationRequest(
+                prompt=(
+                    f"Professional {platform} post image about: {request.topic}. "
+                    f"Modern, engaging, premium quality. Post message: {text[:200]}"
+                ),
                 style=request.style,
                 aspect_ratio=config["post_ratio"],
                 platform=platform,
                 provider="pro" if request.use_pro_quality else "auto",
                 resolution="4K" if request.use_pro_quality else "1K"
+            ))
+            item = BatchContentItem(
+                platform=platform,
+                content_type="post",
+                image_url=result.image_url,
+                caption=text,
+                hashtags=hashtags,
+                aspect_ratio=config["post_ratio"],
+                metadata=result.metadata
             )
-            image_tasks.append((platform, "post", image_req))
+            # Pro mode ~$0.05/image, standard mode FREE tier
+            return item, 0.05 if request.use_pro_quality else 0.0
+
+        if content_type == "story":
+            result = await generate_image(ImageGenerationRequest(
+                prompt=(
+                    f"Instagram story #{job['index'] + 1} about: {request.topic}. "
+                    f"Eye-catching, vertical format, premium. {caption[:100]}"
+                ),
+                style="creative",
+                aspect_ratio="9:16",
+                platform="instagram",
+                provider="auto"
+            ))
+            item = BatchContentItem(
+                platform="instagram",
+                content_type="story",
+                image_url=result.image_url,
+                caption=caption,
+                hashtags=[],
+                aspect_ratio="9:16",
+                metadata=result.metadata
+            )
+            return item, 0.0
 
-    # Generate images in parallel
-    image_results = await asyncio.gather(*[
-        generate_image(req) for _, _, req in image_tasks
-    ], return_exceptions=True)
+        # Video: bounded slots, runs alongside image generation
+        async with video_slots:
+            video_result = await generate_video(VideoGenerationRequest(
+                prompt=f"Instagram Reel / TikTok video about: {request.topic}. {caption[:200]}",
+                duration=15,
+                aspect_ratio="9:16",
+                platform="instagram",
+                style=request.style
+            ))
+        text, hashtags = _split_caption_hashtags(caption, 5)
+        item = BatchContentItem(
+            platform="instagram",
+            content_type="video",
+            video_url=video_result.video_url,
+            caption=text,
+            hashtags=hashtags,
+            aspect_ratio="9:16",
+            metadata=video_result.metadata
+        )
+        return item, 0.20  # Video ~$0.20 each
 
-    for (platform, content_type, _), result in zip(image_tasks, image_results):
-        if isinstance(result, Exception):
-            logger.error("image_generation_failed", error=str(result))
-            continue
+    except Exception as e:
+        logger.error(f"{content_type}_generation_failed", platform=platform, error=str(e))
+        return None, 0.0
 
-        # Find matching caption
-        caption_match = next((c for p, ct, c in caption_results if p == platform and ct == content_type), "")
 
-        # Extract hashtags
-        hashtags = []
-        if "Hashtags:" in caption_match:
-            hashtag_line = caption_match.split("Hashtags:")[-1].strip()
-            hashtags = [h.strip() for h in hashtag_line.split("#") if h.strip()][:platform_configs[platform]["hashtag_count"]]
+async def _iter_batch_pipeline(request: BatchContentRequest) -> AsyncIterator[tuple]:
+    """
+    Dependency-aware batch pipeline.
 
-        items.append(BatchContentItem(
-            platform=platform,
-            content_type="post",
-            image_url=result.image_url,
-            caption=caption_match.split("Hashtags:")[0].strip() if caption_match else "",
-            hashtags=hashtags,
-            aspect_ratio=platform_configs[platform]["post_ratio"],
-            metadata=result.metadata
-        ))
+    Every asset is an independent chain (caption → image/video): captions
+    run concurrently under settings.BATCH_CAPTION_CONCURRENCY, each image
+    starts as soon as its own caption is ready and videos use
+    settings.BATCH_VIDEO_CONCURRENCY slots. Yields (job, item, cost) in
+    completion order.
+    """
+    caption_slots = asyncio.Semaphore(settings.BATCH_CAPTION_CONCURRENCY)
+    video_slots = asyncio.Semaphore(settings.BATCH_VIDEO_CONCURRENCY)
 
-        # Estimate cost
-        if request.use_pro_quality:
-            total_cost += 0.05  # Pro mode ~$0.05/image
-        else:
-            total_cost += 0.0  # Standard mode FREE tier
+    jobs = _build_batch_jobs(request)
 
-    # ========================================================================
-    # STEP 3: Generate stories
-    # ========================================================================
-    if request.story_count > 0:
-        logger.info("batch_step_3", step=f"Generating {request.story_count} stories")
+    async def run(job: dict) -> tuple:
+        item, cost = await _run_batch_job(job, request, caption_slots, video_slots)
+        return job, item, cost
 
-        story_tasks = []
-        for i in range(request.story_count):
-            story_req = ImageGenerationRequest(
-                prompt=f"Instagram story #{i+1} about: {request.topic}. Eye-catching, vertical format, premium.",
-                style="creative",
-                aspect_ratio="9:16",
-                platform="instagram",
-                provider="auto"
-            )
-            story_tasks.append(story_req)
+    tasks = [asyncio.create_task(run(job)) for job in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
-        story_results = await asyncio.gather(*[
-            generate_image(req) for req in story_tasks
-        ], return_exceptions=True)
 
-        for i, result in enumerate(story_results):
-            if isinstance(result, Exception):
-                continue
+def _batch_metadata(request: BatchContentRequest, total_assets: int) -> dict:
+    return {
+        "topic": request.topic,
+        "platforms": request.platforms,
+        "quality": "PRO (4K)" if request.use_pro_quality else "STANDARD (1K)",
+        "total_posts": request.post_count * len(request.platforms),
+        "total_stories": request.story_count,
+        "total_videos": request.video_count,
+        "total_assets": total_assets
+    }
 
-            story_caption = next((c for p, ct, c in caption_results if ct == "story"), "")
 
-            items.append(BatchContentItem(
-                platform="instagram",
-                content_type="story",
-                image_url=result.image_url,
-                caption=story_caption,
-                hashtags=[],
-                aspect_ratio="9:16",
-                metadata=result.metadata
-            ))
+@router.post("/content/batch/generate", response_model=BatchContentResponse)
+async def batch_generate_social_content(request: BatchContentRequest):
+    """
+    🚀 BATCH GENERATOR - Generate complete social media campaign.
 
-    # ========================================================================
-    # STEP 4: Generate videos (if requested)
-    # ========================================================================
-    if request.video_count > 0:
-        logger.info("batch_step_4", step=f"Generating {request.video_count} videos")
+    Generates for a full day:
+    - 1 post per platform (Instagram, Facebook, TikTok, LinkedIn)
+    - 3 stories (Instagram/Facebook)
+    - 1 video (Reels/TikTok)
 
-        for i in range(request.video_count):
-            try:
-                video_caption = next((c for p, ct, c in caption_results if ct == "video"), "")
-
-                video_req = VideoGenerationRequest(
-                    prompt=f"Instagram Reel / TikTok video about: {request.topic}. {video_caption[:200]}",
-                    duration=15,
-                    aspect_ratio="9:16",
-                    platform="instagram",
-                    style=request.style
-                )
+    Example: 1 topic → 4 posts + 3 stories + 1 video = 8 assets ready to publish!
 
-                video_result = await generate_video(video_req)
+    Assets are produced by a concurrent pipeline (see _iter_batch_pipeline);
+    use /content/batch/generate/stream to receive each asset as it is ready.
 
-                # Extract hashtags from video caption
-                hashtags = []
-                if "Hashtags:" in video_caption:
-                    hashtag_line = video_caption.split("Hashtags:")[-1].strip()
-                    hashtags = [h.strip() for h in hashtag_line.split("#") if h.strip()][:5]
+    Perfect for:
+    - Daily content automation
+    - Campaign launches
+    - Product promotions
+    - Event coverage
+    """
+    import time
 
-                items.append(BatchContentItem(
-                    platform="instagram",
-                    content_type="video",
-                    video_url=video_result.video_url,
-                    caption=video_caption.split("Hashtags:")[0].strip(),
-                    hashtags=hashtags,
-                    aspect_ratio="9:16",
-                    metadata=video_result.metadata
-                ))
+    logger.info("batch_generate_start",
+               topic=request.topic[:50],
+               platforms=request.platforms,
+               posts=request.post_count,
+               stories=request.story_count,
+               videos=request.video_count)
 
-                total_cost += 0.20  # Video ~$0.20 each
+    start_time = time.time()
+    results = []
+    total_cost = 0.0
 
-            except Exception as e:
-                logger.error("video_generation_failed", error=str(e))
+    async for job, item, cost in _iter_batch_pipeline(request):
+        total_cost += cost
+        if item is not None:
+            results.append((job["position"], item))
+
+    # Stable output: same order as _build_batch_jobs
+    items = [item for _, item in sorted(results, key=lambda r: r[0])]
 
     generation_time = time.time() - start_time
 
@@ -3135,18 +3293,49 @@ Hashtags: [hashtags]
         items=items,
         generation_time=generation_time,
         total_cost_estimate=total_cost,
-        metadata={
-            "topic": request.topic,
-            "platforms": request.platforms,
-            "quality": "PRO (4K)" if request.use_pro_quality else "STANDARD (1K)",
-            "total_posts": request.post_count * len(request.platforms),
-            "total_stories": request.story_count,
-            "total_videos": request.video_count,
-            "total_assets": len(items)
-        }
+        metadata=_batch_metadata(request, len(items))
     )
 
 
+@router.post("/content/batch/generate/stream")
+async def batch_generate_social_content_stream(request: BatchContentRequest):
+    """
+    Streaming variant of /content/batch/generate (Server-Sent Events).
+
+    Events:
+    - ``item``: a BatchContentItem as soon as that asset is ready
+    - ``item_error``: ``{"platform", "content_type"}`` for an asset that failed
+    - ``done``: generation_time, total_cost_estimate and metadata
+    """
+    import time
+
+    logger.info("batch_generate_stream_start", topic=request.topic[:50], platforms=request.platforms)
+
+    async def events() -> AsyncIterator[str]:
+        start_time = time.time()
+        total_cost = 0.0
+        produced = 0
+
+        async for job, item, cost in _iter_batch_pipeline(request):
+            total_cost += cost
+            if item is None:
+                yield _sse_event("item_error", {
+                    "platform": job["platform"],
+                    "content_type": job["content_type"],
+                })
+                continue
+            produced += 1
+            yield _sse_event("item", item.model_dump())
+
+        yield _sse_event("done", {
+            "generation_time": time.time() - start_time,
+            "total_cost_estimate": total_cost,
+            "metadata": _batch_metadata(request, produced),
+        })
+
+    return _sse_response(events())
+
+
 @router.post("/leads/search", response_model=List[LeadItem])
 async def search_leads(request: LeadSearchRequest):
     """
@@ -3486,45 +3675,21 @@ class MultiPlatformResponse(BaseModel):
     scheduling_suggestion: dict
 
 
-@router.post("/content/multi-platform", response_model=MultiPlatformResponse)
-async def generate_multi_platform_content(request: MultiPlatformRequest):
-    """
-    🌐 ONE POST → ALL PLATFORMS - Smart Social Content Multiplier
-
-    Takes a single content idea and generates optimized versions for each platform:
-    - Instagram: Visual, emoji-rich, 11 hashtags, casual tone
-    - LinkedIn: Professional, data-driven, 3 hashtags, long-form
-    - Twitter/X: Punchy, max 280 chars, 2 hashtags, provocative
-    - Facebook: Friendly, conversational, medium length
-    - TikTok: Trendy, viral hooks, heavy emojis
-
-    Includes:
-    - Best posting times per platform
-    - Image prompts for each
-    - Engagement optimization tips
-    """
-    from datetime import datetime, timedelta
-    import json
-
-    logger.info("multi_platform_generate", idea=request.idea[:50], platforms=request.platforms)
-
-    platform_contents = []
-
-    for platform in request.platforms:
-        if platform not in PLATFORM_CONFIGS:
-            continue
-
-        config = PLATFORM_CONFIGS[platform]
+async def _generate_platform_content(
+    platform: str, request: MultiPlatformRequest
+) -> Optional[PlatformContent]:
+    """Generate the adapted post for one platform (None on failure)."""
+    config = PLATFORM_CONFIGS[platform]
 
-        # Build platform-specific prompt
-        emoji_instruction = {
-            "very_high": "Usa MOLTE emoji creative in tutto il testo (almeno 5-8)",
-            "high": "Usa emoji appropriate e frequenti (4-6)",
-            "medium": "Usa qualche emoji appropriata (2-3)",
-            "low": "Usa emoji con parsimonia, massimo 1-2 se appropriato",
-        }.get(config["emoji_density"], "")
+    # Build platform-specific prompt
+    emoji_instruction = {
+        "very_high": "Usa MOLTE emoji creative in tutto il testo (almeno 5-8)",
+        "high": "Usa emoji appropriate e frequenti (4-6)",
+        "medium": "Usa qualche emoji appropriata (2-3)",
+        "low": "Usa emoji con parsimonia, massimo 1-2 se appropriato",
+    }.get(config["emoji_density"], "")
 
-        prompt = f"""Adatta questo contenuto per {platform.upper()}:
+    prompt = f"""Adatta questo contenuto per {platform.upper()}:
 
 IDEA ORIGINALE: {request.idea}
 
@@ -3542,51 +3707,52 @@ OUTPUT (JSON valido):
     "image_prompt": "Prompt per generare immagine adatta"
 }}"""
 
+    try:
+        response = await generate_with_ai(prompt, request.brand_context)
+
+        # Parse JSON response
         try:
-            response = await generate_with_ai(prompt, request.brand_context)
+            # Clean response and parse
+            clean_response = response.strip()
+            if clean_response.startswith("```json"):
+                clean_response = clean_response[7:]
+            if clean_response.startswith("```"):
+                clean_response = clean_response[3:]
+            if clean_response.endswith("```"):
+                clean_response = clean_response[:-3]
 
-            # Parse JSON response
-            try:
-                # Clean response and parse
-                clean_response = response.strip()
-                if clean_response.startswith("```json"):
-                    clean_response = clean_response[7:]
-                if clean_response.startswith("```"):
-                    clean_response = clean_response[3:]
-                if clean_response.endswith("```"):
-                    clean_response = clean_response[:-3]
-
-                parsed = json.loads(clean_response)
-                content = parsed.get("content", response)
-                hashtags = parsed.get("hashtags", [])
-                tips = parsed.get("engagement_tips", [])
-                image_prompt = parsed.get("image_prompt", "")
-            except:
-                content = response
-                hashtags = []
-                tips = []
-                image_prompt = f"Professional image for {platform} post about: {request.idea[:50]}"
-
-            platform_contents.append(PlatformContent(
-                platform=platform,
-                content=content,
-                hashtags=hashtags[:config["max_hashtags"]],
-                best_post_time=config["best_times"][0],
-                best_day=config["best_days"][0],
-                char_count=len(content),
-                optimal_char_count=config["optimal_chars"],
-                image_prompt=image_prompt if request.generate_image_prompts else None,
-                image_ratio=config["image_ratio"],
-                engagement_tips=tips[:3]
-            ))
+            parsed = json.loads(clean_response)
+            content = parsed.get("content", response)
+            hashtags = parsed.get("hashtags", [])
+            tips = parsed.get("engagement_tips", [])
+            image_prompt = parsed.get("image_prompt", "")
+        except:
+            content = response
+            hashtags = []
+            tips = []
+            image_prompt = f"Professional image for {platform} post about: {request.idea[:50]}"
 
-        except Exception as e:
-            logger.error("platform_generation_error", platform=platform, error=str(e))
-            continue
+        return PlatformContent(
+            platform=platform,
+            content=content,
+            hashtags=hashtags[:config["max_hashtags"]],
+            best_post_time=config["best_times"][0],
+            best_day=config["best_days"][0],
+            char_count=len(content),
+            optimal_char_count=config["optimal_chars"],
+            image_prompt=image_prompt if request.generate_image_prompts else None,
+            image_ratio=config["image_ratio"],
+            engagement_tips=tips[:3]
+        )
+
+    except Exception as e:
+        logger.error("platform_generation_error", platform=platform, error=str(e))
+        return None
 
-    # Generate smart scheduling suggestion
-    now = datetime.now()
-    scheduling = {
+
+def _build_scheduling_suggestion(request: MultiPlatformRequest) -> dict:
+    """Smart scheduling suggestion across the requested platforms."""
+    return {
         "suggested_week": {
             platform: {
                 "day": PLATFORM_CONFIGS[platform]["best_days"][0],
@@ -3598,14 +3764,82 @@ OUTPUT (JSON valido):
         "strategy": "Stagger posts across platforms over 2-3 days for maximum reach"
     }
 
+
+@router.post("/content/multi-platform", response_model=MultiPlatformResponse)
+async def generate_multi_platform_content(request: MultiPlatformRequest):
+    """
+    🌐 ONE POST → ALL PLATFORMS - Smart Social Content Multiplier
+
+    Takes a single content idea and generates optimized versions for each platform:
+    - Instagram: Visual, emoji-rich, 11 hashtags, casual tone
+    - LinkedIn: Professional, data-driven, 3 hashtags, long-form
+    - Twitter/X: Punchy, max 280 chars, 2 hashtags, provocative
+    - Facebook: Friendly, conversational, medium length
+    - TikTok: Trendy, viral hooks, heavy emojis
+
+    Includes:
+    - Best posting times per platform
+    - Image prompts for each
+    - Engagement optimization tips
+    """
+    from datetime import datetime
+
+    logger.info("multi_platform_generate", idea=request.idea[:50], platforms=request.platforms)
+
+    platforms = [p for p in request.platforms if p in PLATFORM_CONFIGS]
+    results = await asyncio.gather(
+        *(_generate_platform_content(platform, request) for platform in platforms)
+    )
+
     return MultiPlatformResponse(
         original_idea=request.idea,
         generated_at=datetime.now().isoformat(),
-        platform_contents=platform_contents,
-        scheduling_suggestion=scheduling
+        platform_contents=[r for r in results if r is not None],
+        scheduling_suggestion=_build_scheduling_suggestion(request)
     )
 
 
+@router.post("/content/multi-platform/stream")
+async def generate_multi_platform_content_stream(request: MultiPlatformRequest):
+    """
+    Streaming variant of /content/multi-platform (Server-Sent Events).
+
+    All platforms are generated concurrently; each ``platform`` event carries
+    a PlatformContent as soon as that platform is ready (``platform_error``
+    if it failed). ``done`` closes the stream with the scheduling suggestion.
+    """
+    from datetime import datetime
+
+    logger.info("multi_platform_generate_stream", idea=request.idea[:50], platforms=request.platforms)
+
+    async def events() -> AsyncIterator[str]:
+        platforms = [p for p in request.platforms if p in PLATFORM_CONFIGS]
+
+        async def run(platform: str):
+            return platform, await _generate_platform_content(platform, request)
+
+        tasks = [asyncio.create_task(run(platform)) for platform in platforms]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                platform, content = await next_done
+                if content is None:
+                    yield _sse_event("platform_error", {"platform": platform})
+                else:
+                    yield _sse_event("platform", content.model_dump())
+
+            yield _sse_event("done", {
+                "original_idea": request.idea,
+                "generated_at": datetime.now().isoformat(),
+                "scheduling_suggestion": _build_scheduling_suggestion(request),
+            })
+        finally:
+            # Client disconnected: stop any generation still running
+            for task in tasks:
+                task.cancel()
+
+    return _sse_response(events())
+
+
 class PostOptimizerRequest(BaseModel):
     """Request to optimize an existing post."""
     content: str = Field(..., description="Existing post content to optimize")
@@ -8,7 +8,7 @@ Complete RAG functionality:
 """
 import time
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Form
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from typing import List, Optional, Dict, Any
 from app.core.security import verify_api_key
 from app.core.logging import get_logger
@@ -26,11 +26,20 @@ class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1)
     user_id: Optional[int] = None
     k: int = Field(default=5, ge=1, le=20)
-    threshold: float = Field(default=0.7, ge=0.0, le=1.0)
+    min_similarity: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        validation_alias=AliasChoices("min_similarity", "threshold"),
+        description="Minimum cosine similarity of semantic matches; keyword matches are not filtered by it"
+    )
 
 class SearchResultItem(BaseModel):
     text: str
-    similarity: float
+    relevance: float = Field(
+        ...,
+        description="Fused rank score (0-1) of semantic and keyword search, not a cosine similarity"
+    )
     metadata: Dict[str, Any]
     source: Optional[str] = None
 
@@ -180,14 +189,14 @@ async def search_documents(request: SearchRequest):
         results = await rag_service.search(
             query=request.query,
             top_k=request.k,
-            min_score=request.threshold,
+            min_similarity=request.min_similarity,
             user_id=request.user_id
         )
 
         items = [
             SearchResultItem(
                 text=r.document.text,
-                similarity=r.score,
+                relevance=r.score,
                 metadata=r.document.metadata,
                 source=r.document.metadata.get("filename")
             )
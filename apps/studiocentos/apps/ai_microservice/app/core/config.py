@@ -51,6 +51,18 @@ class Settings(BaseSettings):
         default="autuoriciro/studiocentos-ai-qwen-3b",
         description="Custom model name on HuggingFace"
     )
+    CUSTOM_MODEL_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="Max concurrent requests to the custom model endpoint"
+    )
+    CUSTOM_MODEL_MAX_QUEUE: int = Field(
+        default=32,
+        description="Max requests waiting for a custom model slot"
+    )
+    CUSTOM_MODEL_QUEUE_TIMEOUT: float = Field(
+        default=60.0,
+        description="Seconds a request may wait for a custom model slot"
+    )
 
     OLLAMA_HOST: str = Field(
         default="central-ollama",
@@ -69,6 +81,44 @@ class Settings(BaseSettings):
         description="Ollama base URL (constructed from host:port)"
     )
 
+    # LLM Dispatcher (per-provider admission control)
+    LLM_OLLAMA_MAX_CONCURRENCY: int = Field(
+        default=2,
+        description="Max concurrent requests to local Ollama"
+    )
+    LLM_GROQ_MAX_CONCURRENCY: int = Field(
+        default=8,
+        description="Max concurrent requests to Groq"
+    )
+    LLM_GROQ_TOKENS_PER_MINUTE: int = Field(
+        default=12000,
+        description="Groq tokens-per-minute budget (0 = unlimited)"
+    )
+    LLM_DEFAULT_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="Max concurrent requests for other providers"
+    )
+    LLM_BATCH_SHARE: float = Field(
+        default=0.75,
+        description="Share of provider slots batch requests may use"
+    )
+
+    # Batch content pipeline: captions are cheap LLM calls, videos are slow and costly
+    BATCH_CAPTION_CONCURRENCY: int = Field(
+        default=4,
+        description="Max captions generated concurrently in a batch"
+    )
+    BATCH_VIDEO_CONCURRENCY: int = Field(
+        default=2,
+        description="Max videos generated concurrently in a batch"
+    )
+
+    # Workflow engine: finished executions older than this are pruned at startup
+    WORKFLOW_EXECUTION_RETENTION_DAYS: int = Field(
+        default=30,
+        description="Days a finished workflow execution is kept on disk"
+    )
+
     # ChromaDB Configuration
     CHROMADB_HOST: str = Field(default="localhost", description="ChromaDB host")
     CHROMADB_PORT: int = Field(default=8000, description="ChromaDB port")
@@ -104,13 +154,20 @@ class Settings(BaseSettings):
     METRICS_PORT: int = Field(default=9090, description="Metrics port")
 
     # RAG Configuration
-    RAG_CHUNK_SIZE: int = Field(default=500, description="RAG chunk size")
-    RAG_CHUNK_OVERLAP: int = Field(default=50, description="RAG chunk overlap")
+    RAG_CHUNK_SIZE: int = Field(default=200, description="RAG chunk size (tokens)")
+    RAG_CHUNK_OVERLAP: int = Field(default=30, description="RAG chunk overlap (tokens)")
     RAG_SIMILARITY_THRESHOLD: float = Field(
         default=0.7,
         description="RAG similarity threshold"
     )
     RAG_MAX_RESULTS: int = Field(default=5, description="RAG max results")
+    RAG_REGISTRY_PATH: str = Field(
+        default="/data/rag/registry.db",
+        description="SQLite document registry and keyword index"
+    )
+    RAG_EMBED_BATCH_SIZE: int = Field(default=32, description="Chunks per embedding request")
+    RAG_EMBED_CONCURRENCY: int = Field(default=4, description="Parallel embedding requests")
+    RAG_RRF_K: int = Field(default=60, description="Reciprocal-rank fusion constant")
 
     # =========================================================================
     # SOCIAL MEDIA API CREDENTIALS
@@ -169,6 +226,10 @@ class Settings(BaseSettings):
     ZOOMINFO_API_KEY: str = Field(default="", description="ZoomInfo API Key")
     CLEARBIT_API_KEY: str = Field(default="", description="Clearbit API Key")
     HUNTER_API_KEY: str = Field(default="", description="Hunter.io API Key")
+    LEAD_INTELLIGENCE_CHROMA_PATH: str = Field(
+        default="./chroma_db_leads",
+        description="Local Chroma directory for the lead intelligence vector store"
+    )
 
     # Payment/Stripe
     STRIPE_API_KEY: str = Field(default="", description="Stripe Secret Key")
@@ -0,0 +1,367 @@
+"""
+LLM Dispatcher - Central admission control for all LLM provider calls.
+
+Every provider call (Ollama, Groq, litellm providers of UnifiedLLMManager)
+goes through a per-provider lane that enforces:
+- Max concurrent requests per provider
+- Tokens-per-minute budget (token bucket, reconciled with real usage)
+- Priority lanes: INTERACTIVE requests always go before BATCH ones, and
+  BATCH may only use a share of the provider slots
+- Coalescing: identical in-flight prompts share a single provider call
+
+Callers mark batch work with the ``llm_priority`` context manager; the
+priority is carried by a ContextVar, so it propagates into tasks spawned
+from inside the block.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LLMPriority(IntEnum):
+    """Request priority (lower value = served first)."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_current_priority: ContextVar[LLMPriority] = ContextVar(
+    "llm_priority", default=LLMPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority) -> Iterator[None]:
+    """Run the enclosed LLM calls (and tasks spawned inside) at ``priority``."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def estimate_tokens(*texts: Optional[str], max_tokens: int = 0) -> int:
+    """Rough token estimate (~4 chars per token) plus the completion budget."""
+    chars = sum(len(t) for t in texts if t)
+    return chars // 4 + max_tokens
+
+
+class _ProviderLane:
+    """Concurrency slots + token bucket + priority wait queue for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        tokens_per_minute: int = 0,
+        batch_share: float = 0.75,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_limit = max(1, int(self.max_concurrency * batch_share))
+        self.tokens_per_minute = max(0, tokens_per_minute)
+
+        self.in_flight = 0
+        self._tokens = float(self.tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self.completed = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.by_priority: Dict[str, int] = {p.name.lower(): 0 for p in LLMPriority}
+
+    # ------------------------------------------------------------------ #
+    # Token bucket
+    # ------------------------------------------------------------------ #
+
+    def _refill(self) -> None:
+        if not self.tokens_per_minute:
+            return
+        now = time.monotonic()
+        rate = self.tokens_per_minute / 60.0
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._last_refill) * rate,
+        )
+        self._last_refill = now
+
+    def _token_deficit(self, estimated: int) -> float:
+        if not self.tokens_per_minute:
+            return 0.0
+        # A single request larger than the whole budget waits for a full bucket
+        return max(0.0, min(estimated, self.tokens_per_minute) - self._tokens)
+
+    def settle(self, reserved: int, actual: int) -> None:
+        """Refund (or charge) the difference between reserved and actual usage."""
+        if not self.tokens_per_minute or actual <= 0:
+            return
+        self._refill()
+        self._tokens = min(float(self.tokens_per_minute), self._tokens + (reserved - actual))
+        self._dispatch()
+
+    # ------------------------------------------------------------------ #
+    # Slots
+    # ------------------------------------------------------------------ #
+
+    def _can_start(self, priority: int, estimated: int) -> bool:
+        limit = self.max_concurrency if priority == LLMPriority.INTERACTIVE else self.batch_limit
+        return self.in_flight < limit and self._token_deficit(estimated) <= 0
+
+    def _start(self, priority: int, estimated: int) -> None:
+        self.in_flight += 1
+        if self.tokens_per_minute:
+            self._tokens -= min(estimated, self.tokens_per_minute)
+        self.by_priority[LLMPriority(priority).name.lower()] += 1
+
+    async def acquire(self, priority: LLMPriority, estimated: int) -> None:
+        self._refill()
+        if not self._waiters and self._can_start(priority, estimated):
+            self._start(priority, estimated)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), estimated, future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted right before cancellation: hand it back
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiters in priority order while capacity allows."""
+        self._refill()
+        while self._waiters:
+            priority, _, estimated, future = self._waiters[0]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_start(priority, estimated):
+                break
+            heapq.heappop(self._waiters)
+            self._start(priority, estimated)
+            future.set_result(None)
+
+        # Blocked on the token budget only: wake up when enough has refilled
+        if self._waiters and self._wakeup is None and self.tokens_per_minute:
+            priority, _, estimated, _ = self._waiters[0]
+            deficit = self._token_deficit(estimated)
+            if deficit > 0:
+                delay = deficit / (self.tokens_per_minute / 60.0)
+                self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self) -> None:
+        self._wakeup = None
+        self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.errors
+        return {
+            "max_concurrency": self.max_concurrency,
+            "batch_limit": self.batch_limit,
+            "in_flight": self.in_flight,
+            "queue_depth": sum(1 for *_, f in self._waiters if not f.cancelled()),
+            "max_queue_depth": self.max_queue_depth,
+            "tokens_per_minute": self.tokens_per_minute or None,
+            "tokens_available": int(self._tokens) if self.tokens_per_minute else None,
+            "completed": self.completed,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "avg_wait_ms": round(self.total_wait / finished * 1000, 1) if finished else 0.0,
+            "avg_run_ms": round(self.total_run / finished * 1000, 1) if finished else 0.0,
+            "by_priority": dict(self.by_priority),
+        }
+
+
+class LLMDispatcher:
+    """
+    Central async dispatcher in front of every LLM provider.
+
+    Example:
+        >>> dispatcher = get_llm_dispatcher()
+        >>> text = await dispatcher.submit(
+        ...     "ollama",
+        ...     lambda: client.post(...),
+        ...     estimated_tokens=estimate_tokens(prompt, max_tokens=512),
+        ...     coalesce_key=hash_of_prompt,
+        ... )
+        >>> with llm_priority(LLMPriority.BATCH):
+        ...     await asyncio.gather(*(generate(p) for p in prompts))
+    """
+
+    def __init__(self, batch_share: float = 0.75):
+        self.batch_share = batch_share
+        self._lanes: Dict[str, _ProviderLane] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def configure_provider(
+        self,
+        provider: str,
+        max_concurrency: int,
+        tokens_per_minute: int = 0,
+    ) -> None:
+        """Set the budget for a provider (replaces an idle lane)."""
+        lane = self._lanes.get(provider)
+        if lane and (lane.in_flight or lane._waiters):
+            logger.warning(f"LLM lane '{provider}' busy, keeping current budget")
+            return
+        self._lanes[provider] = _ProviderLane(
+            provider, max_concurrency, tokens_per_minute, self.batch_share
+        )
+
+    def _lane(self, provider: str) -> _ProviderLane:
+        if provider not in self._lanes:
+            self.configure_provider(provider, settings.LLM_DEFAULT_MAX_CONCURRENCY)
+        return self._lanes[provider]
+
+    async def submit(
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        estimated_tokens: int = 0,
+        priority: Optional[LLMPriority] = None,
+        coalesce_key: Optional[str] = None,
+        tokens_used: Optional[Callable[[T], int]] = None,
+    ) -> T:
+        """
+        Run ``call`` once a slot and token budget are available on ``provider``.
+
+        Args:
+            provider: Lane name (e.g. "ollama", "groq")
+            call: Zero-arg coroutine factory performing the provider request
+            estimated_tokens: Tokens reserved from the TPM budget up front
+            priority: Overrides the priority from the current context
+            coalesce_key: Identical keys in flight share one provider call
+            tokens_used: Extracts real usage from the result to settle the budget
+        """
+        lane = self._lane(provider)
+        priority = _current_priority.get() if priority is None else priority
+
+        if coalesce_key is not None:
+            key = f"{provider}:{coalesce_key}"
+            existing = self._inflight.get(key)
+            if existing is not None:
+                lane.coalesced += 1
+                return await asyncio.shield(existing)
+
+            task = asyncio.ensure_future(
+                self._run(lane, call, estimated_tokens, priority, tokens_used)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            return await asyncio.shield(task)
+
+        return await self._run(lane, call, estimated_tokens, priority, tokens_used)
+
+    async def _run(
+        self,
+        lane: _ProviderLane,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int,
+        priority: LLMPriority,
+        tokens_used: Optional[Callable[[T], int]],
+    ) -> T:
+        queued_at = time.monotonic()
+        await lane.acquire(priority, estimated_tokens)
+        started_at = time.monotonic()
+        lane.total_wait += started_at - queued_at
+        try:
+            result = await call()
+        except BaseException:
+            lane.errors += 1
+            raise
+        else:
+            lane.completed += 1
+            if tokens_used is not None:
+                try:
+                    lane.settle(estimated_tokens, tokens_used(result))
+                except Exception:
+                    pass
+            return result
+        finally:
+            lane.total_run += time.monotonic() - started_at
+            lane.release()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        provider: str,
+        *,
+        estimated_tokens: int = 0,
+        priority: Optional[LLMPriority] = None,
+    ) -> AsyncIterator[None]:
+        """Hold a provider slot for the duration of a block (used for streaming)."""
+        lane = self._lane(provider)
+        priority = _current_priority.get() if priority is None else priority
+        queued_at = time.monotonic()
+        await lane.acquire(priority, estimated_tokens)
+        started_at = time.monotonic()
+        lane.total_wait += started_at - queued_at
+        try:
+            yield
+        except BaseException:
+            lane.errors += 1
+            raise
+        else:
+            lane.completed += 1
+        finally:
+            lane.total_run += time.monotonic() - started_at
+            lane.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, latency and throughput per provider lane."""
+        return {name: lane.get_stats() for name, lane in self._lanes.items()}
+
+
+# Global instance
+_llm_dispatcher: Optional[LLMDispatcher] = None
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    """Get or create the global LLM dispatcher with budgets from settings."""
+    global _llm_dispatcher
+    if _llm_dispatcher is None:
+        _llm_dispatcher = LLMDispatcher(batch_share=settings.LLM_BATCH_SHARE)
+        _llm_dispatcher.configure_provider(
+            "ollama", settings.LLM_OLLAMA_MAX_CONCURRENCY
+        )
+        _llm_dispatcher.configure_provider(
+            "groq",
+            settings.LLM_GROQ_MAX_CONCURRENCY,
+            settings.LLM_GROQ_TOKENS_PER_MINUTE,
+        )
+    return _llm_dispatcher
+
+
+def reset_llm_dispatcher():
+    """Reset global LLM dispatcher instance."""
+    global _llm_dispatcher
+    _llm_dispatcher = None
@@ -6,6 +6,8 @@ GROQ is FAST and FREE with powerful Llama models!
 Migrated from legacy components/ directory to proper location.
 """
 
+import hashlib
+import json
 import os
 import logging
 from typing import Dict, Any, List, Optional, AsyncIterator
@@ -15,9 +17,16 @@ try:
 except ImportError:
     AsyncGroq = None
 
+from .dispatcher import estimate_tokens, get_llm_dispatcher
+
 logger = logging.getLogger(__name__)
 
 
+def _request_key(request: Dict[str, Any]) -> str:
+    """Stable hash of a chat request, used to coalesce identical prompts."""
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+
 class GroqClient:
     """Centralized Groq client for all LLM operations."""
 
@@ -120,12 +129,20 @@ class GroqClient:
 
             messages.append({"role": "user", "content": prompt})
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature or self.temperature,
-                max_tokens=max_tokens or self.max_tokens,
+            request = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature or self.temperature,
+                "max_tokens": max_tokens or self.max_tokens,
                 **kwargs
+            }
+
+            response = await get_llm_dispatcher().submit(
+                "groq",
+                lambda: self.client.chat.completions.create(**request),
+                estimated_tokens=estimate_tokens(system_prompt, prompt, max_tokens=request["max_tokens"]),
+                coalesce_key=_request_key(request),
+                tokens_used=lambda r: r.usage.total_tokens if r.usage else 0,
             )
 
             content = response.choices[0].message.content
@@ -166,11 +183,14 @@ class GroqClient:
 
         Yields:
             Generated text chunks
+
+        Raises:
+            RuntimeError: If the client is not configured or the stream fails,
+                also after some chunks were yielded
         """
         if not self.client:
             logger.error("Groq client not initialized - missing API key")
-            yield self._fallback_response(prompt)
-            return
+            raise RuntimeError("Groq client not initialized - missing API key")
 
         try:
             messages = []
@@ -180,22 +200,27 @@ class GroqClient:
 
             messages.append({"role": "user", "content": prompt})
 
-            stream = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature or self.temperature,
-                max_tokens=max_tokens or self.max_tokens,
-                stream=True,
-                **kwargs
-            )
-
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            async with get_llm_dispatcher().slot(
+                "groq",
+                estimated_tokens=estimate_tokens(system_prompt, prompt, max_tokens=max_tokens or self.max_tokens),
+            ):
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature or self.temperature,
+                    max_tokens=max_tokens or self.max_tokens,
+                    stream=True,
+                    **kwargs
+                )
+
+                async for chunk in stream:
+                    if chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
 
         except Exception as e:
             logger.error(f"Groq streaming error: {e}")
-            yield self._fallback_response(prompt)
+            # Raise instead of yielding a fallback text: callers cannot tell it from content
+            raise RuntimeError(f"Groq streaming failed: {e}")
 
     async def generate_json(
         self,
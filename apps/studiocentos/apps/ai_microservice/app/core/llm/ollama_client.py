@@ -9,14 +9,23 @@ OLLAMA is PRIMARY for:
 Falls back to Groq if Ollama unavailable.
 """
 
+import hashlib
+import json
 import os
 import logging
 import httpx
 from typing import Dict, Any, Optional, AsyncIterator
 
+from .dispatcher import estimate_tokens, get_llm_dispatcher
+
 logger = logging.getLogger(__name__)
 
 
+def _payload_key(payload: Dict[str, Any]) -> str:
+    """Stable hash of a request payload, used to coalesce identical prompts."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
 class OllamaClient:
     """Centralized Ollama client - Primary LLM provider."""
 
@@ -90,27 +99,35 @@ class OllamaClient:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                content = data.get("message", {}).get("content", "")
-                
-                logger.info(
-                    "ollama_generation_success",
-                    extra={
-                        "model": self.model,
-                        "prompt_length": len(prompt),
-                        "response_length": len(content),
-                    }
-                )
-                
-                return content
-                
+            async def call() -> dict:
+                async with httpx.AsyncClient(timeout=180.0) as client:
+                    response = await client.post(
+                        f"{self.base_url}/api/chat",
+                        json=payload
+                    )
+                    response.raise_for_status()
+                    return response.json()
+
+            data = await get_llm_dispatcher().submit(
+                "ollama",
+                call,
+                estimated_tokens=estimate_tokens(system_prompt, prompt, max_tokens=payload["options"]["num_predict"]),
+                coalesce_key=_payload_key(payload),
+            )
+
+            content = data.get("message", {}).get("content", "")
+
+            logger.info(
+                "ollama_generation_success",
+                extra={
+                    "model": self.model,
+                    "prompt_length": len(prompt),
+                    "response_length": len(content),
+                }
+            )
+
+            return content
+
         except Exception as e:
             logger.error(f"Ollama generation error: {e}")
             raise RuntimeError(f"Ollama generation failed: {e}")
@@ -140,22 +157,25 @@ class OllamaClient:
                 }
             }
             
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/api/chat",
-                    json=payload
-                ) as response:
-                    import json
-                    async for line in response.aiter_lines():
-                        if line:
-                            try:
-                                data = json.loads(line)
-                                content = data.get("message", {}).get("content", "")
-                                if content:
-                                    yield content
-                            except json.JSONDecodeError:
-                                continue
+            async with get_llm_dispatcher().slot(
+                "ollama",
+                estimated_tokens=estimate_tokens(system_prompt, prompt, max_tokens=payload["options"]["num_predict"]),
+            ):
+                async with httpx.AsyncClient(timeout=180.0) as client:
+                    async with client.stream(
+                        "POST",
+                        f"{self.base_url}/api/chat",
+                        json=payload
+                    ) as response:
+                        async for line in response.aiter_lines():
+                            if line:
+                                try:
+                                    data = json.loads(line)
+                                    content = data.get("message", {}).get("content", "")
+                                    if content:
+                                        yield content
+                                except json.JSONDecodeError:
+                                    continue
                                 
         except Exception as e:
             logger.error(f"Ollama streaming error: {e}")
@@ -49,7 +49,7 @@ Example:
 import logging
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -1445,6 +1445,30 @@ class ContentCreatorAgent(BaseAgent):
         # Generate content via LLM
         content = await self._generate_content(prompt, config.brand_context)
 
+        return await self._finalize_blog_post(config, content)
+
+    async def stream_blog_post(
+        self, config: BlogPostConfig
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a blog post as it is generated.
+
+        Yields ``("token", str)`` events while the LLM writes, then a single
+        ``("done", ContentResult)`` event after SEO optimization and scoring.
+        """
+        prompt = self._build_blog_prompt(config)
+
+        chunks: List[str] = []
+        async for chunk in self._generate_content_stream(prompt, config.brand_context):
+            chunks.append(chunk)
+            yield "token", chunk
+
+        yield "done", await self._finalize_blog_post(config, "".join(chunks).strip())
+
+    async def _finalize_blog_post(
+        self, config: BlogPostConfig, content: str
+    ) -> ContentResult:
+        """Optimize a generated blog post for SEO and build the result."""
         # Optimize for SEO
         optimized = await self._optimize_seo(content, config.keywords)
 
@@ -1479,20 +1503,8 @@ class ContentCreatorAgent(BaseAgent):
         Returns:
             ContentResult with social media post and brand validation scorecard
         """
-        # Platform-specific constraints
-        platform_limits = {
-            SocialPlatform.TWITTER: 280,
-            SocialPlatform.FACEBOOK: 63206,
-            SocialPlatform.LINKEDIN: 3000,
-            SocialPlatform.INSTAGRAM: 2200,
-        }
-
-        max_length = config.max_length or platform_limits.get(
-            config.platform, 1000
-        )
-
         # Build prompt (now with few-shot and enhanced creativity)
-        prompt = self._build_social_prompt(config, max_length)
+        prompt = self._build_social_prompt(config, self._social_max_length(config))
 
         # Generate content with higher temperature for creativity
         content = await self._generate_content(prompt, config.brand_context)
@@ -1501,6 +1513,49 @@ class ContentCreatorAgent(BaseAgent):
         if config.include_hashtags:
             content = await self._add_hashtags(content, config.platform)
 
+        return await self._finalize_social_post(config, content)
+
+    async def stream_social_post(
+        self, config: SocialPostConfig
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a social media post as it is generated.
+
+        Yields ``("token", str)`` events while the LLM writes (hashtags are
+        streamed as a trailing token chunk), then a single ``("done",
+        ContentResult)`` event once brand validation and metrics are computed.
+        """
+        prompt = self._build_social_prompt(config, self._social_max_length(config))
+
+        chunks: List[str] = []
+        async for chunk in self._generate_content_stream(prompt, config.brand_context):
+            chunks.append(chunk)
+            yield "token", chunk
+
+        content = "".join(chunks).strip()
+
+        if config.include_hashtags:
+            with_hashtags = await self._add_hashtags(content, config.platform)
+            yield "token", with_hashtags[len(content):]
+            content = with_hashtags
+
+        yield "done", await self._finalize_social_post(config, content)
+
+    def _social_max_length(self, config: SocialPostConfig) -> int:
+        """Max characters for a social post (config override or platform limit)."""
+        # Platform-specific constraints
+        platform_limits = {
+            SocialPlatform.TWITTER: 280,
+            SocialPlatform.FACEBOOK: 63206,
+            SocialPlatform.LINKEDIN: 3000,
+            SocialPlatform.INSTAGRAM: 2200,
+        }
+        return config.max_length or platform_limits.get(config.platform, 1000)
+
+    async def _finalize_social_post(
+        self, config: SocialPostConfig, content: str
+    ) -> ContentResult:
+        """Validate a generated social post, attach image and metrics, build the result."""
         # Check brand compliance (legacy method)
         compliant = await self._check_brand_compliance(content)
 
@@ -2980,30 +3035,14 @@ GENERA LO SCRIPT COMPLETO:"""
             logger.error(f"Failed to parse storyboard: {e}")
             return StoryboardResult(frames=[], total_duration=0, summary="Error generating storyboard.")
 
-    async def _generate_content(
+    async def _build_content_system_prompt(
         self,
         prompt: str,
         brand_context: Optional[str] = None,
         use_rag: bool = True
     ) -> str:
-        """
-        Generate content using LLM with RAG context enrichment and Brand DNA.
-
-        Uses Custom StudioCentOS model by default, falls back to GROQ if disabled.
-        Enriches with RAG knowledge base context when available.
-        Always includes Brand DNA for consistent voice.
-        """
-        from app.core.config import settings
-
-        # Check if custom model is enabled
-        if settings.USE_CUSTOM_MODEL:
-            try:
-                from app.domain.marketing.custom_model_service import custom_model_service
-
-                logger.info("Using custom StudioCentOS model for generation")
-
-                # Build system message with Brand DNA
-                system_message = f"""Sei l'AI Content Creator di {BRAND_DNA["identity"]["name"]}, software house italiana specializzata in AI per PMI.
+        """Build the Brand DNA system prompt, enriched with brand and RAG context."""
+        system_prompt = f"""Sei l'AI Content Creator di {BRAND_DNA["identity"]["name"]}, software house italiana specializzata in AI per PMI.
 
 TONE OF VOICE:
 - {BRAND_DNA["voice"]["primary"]}
@@ -3021,35 +3060,62 @@ REGOLE FONDAMENTALI:
 Genera contenuti professionali, coinvolgenti e ottimizzati.
 Usa formattazione markdown quando appropriato."""
 
-                # Fetch RAG context if enabled
-                rag_context = ""
-                if use_rag:
-                    try:
-                        from app.domain.rag.service import rag_service
-                        rag_context = await rag_service.get_context(
-                            query=prompt[:500],
-                            max_tokens=1500
-                        )
-                        if rag_context:
-                            rag_context = f"\n\n## Knowledge Base Aziendale:\n{rag_context}"
-                    except Exception as rag_error:
-                        logger.warning(f"RAG context fetch failed: {rag_error}")
-
-                # Add contexts to system message
-                if brand_context:
-                    system_message = f"{system_message}\n\n## Brand Context Aggiuntivo:\n{brand_context}"
+        # Fetch RAG context if enabled
+        rag_context = ""
+        if use_rag:
+            try:
+                from app.domain.rag.service import rag_service
+                rag_context = await rag_service.get_context(
+                    query=prompt[:500],
+                    max_tokens=1500
+                )
                 if rag_context:
-                    system_message = f"{system_message}{rag_context}"
+                    rag_context = f"\n\n## Knowledge Base Aziendale:\n{rag_context}"
+            except Exception as rag_error:
+                logger.warning(f"RAG context fetch failed: {rag_error}")
+
+        if brand_context:
+            system_prompt = f"{system_prompt}\n\n## Brand Context Aggiuntivo:\n{brand_context}"
+        if rag_context:
+            system_prompt = f"{system_prompt}{rag_context}"
 
-                # Generate with custom model
-                content = custom_model_service.generate(
+        return system_prompt
+
+    async def _generate_content(
+        self,
+        prompt: str,
+        brand_context: Optional[str] = None,
+        use_rag: bool = True
+    ) -> str:
+        """
+        Generate content using LLM with RAG context enrichment and Brand DNA.
+
+        Uses Custom StudioCentOS model by default, falls back to GROQ if disabled.
+        Enriches with RAG knowledge base context when available.
+        Always includes Brand DNA for consistent voice.
+        """
+        from app.core.config import settings
+
+        system_prompt = await self._build_content_system_prompt(prompt, brand_context, use_rag)
+
+        # Check if custom model is enabled
+        if settings.USE_CUSTOM_MODEL:
+            try:
+                from app.domain.marketing.custom_model_service import custom_model_service
+
+                logger.info("Using custom StudioCentOS model for generation")
+
+                content = await custom_model_service.generate_async(
                     prompt=prompt,
-                    system_message=system_message,
+                    system_message=system_prompt,
                     max_new_tokens=2000,
                     temperature=0.8
                 )
 
-                return content.strip()
+                # Empty output = queue full, wait timeout or failed call
+                if content.strip():
+                    return content.strip()
+                logger.warning("Custom model returned no content, falling back to Ollama")
 
             except Exception as e:
                 logger.warning(f"Custom model generation failed, falling back to Ollama: {e}")
@@ -3061,49 +3127,9 @@ Usa formattazione markdown quando appropriato."""
 
             logger.info("Using Ollama (PRIMARY) for content generation")
             client = get_ollama_client()
-            
+
             # Check availability
             if await client.is_available():
-                # Base system prompt with Brand DNA
-                base_system_prompt = f"""Sei l'AI Content Creator di {BRAND_DNA["identity"]["name"]}, software house italiana specializzata in AI per PMI.
-
-TONE OF VOICE:
-- {BRAND_DNA["voice"]["primary"]}
-- {BRAND_DNA["voice"]["style"]}
-- {BRAND_DNA["voice"]["approach"]}
-
-REGOLE FONDAMENTALI:
-1. Scrivi SEMPRE in italiano corretto
-2. Usa la struttura HOOK → BODY → CTA → HASHTAG
-3. Parla di benefici, non solo feature
-4. Usa numeri e dati concreti
-5. Evita: {", ".join(BRAND_DNA["avoid_words"])}
-6. Target: {BRAND_DNA["target"]["primary"]}
-
-Genera contenuti professionali, coinvolgenti e ottimizzati.
-Usa formattazione markdown quando appropriato."""
-
-                # Fetch RAG context if enabled
-                rag_context = ""
-                if use_rag:
-                    try:
-                        from app.domain.rag.service import rag_service
-                        rag_context = await rag_service.get_context(
-                            query=prompt[:500],
-                            max_tokens=1500
-                        )
-                        if rag_context:
-                            rag_context = f"\n\n## Knowledge Base Aziendale:\n{rag_context}"
-                    except Exception as rag_error:
-                        logger.warning(f"RAG context fetch failed: {rag_error}")
-
-                # Build system prompt with contexts
-                system_prompt = base_system_prompt
-                if brand_context:
-                    system_prompt = f"{base_system_prompt}\n\n## Brand Context Aggiuntivo:\n{brand_context}"
-                if rag_context:
-                    system_prompt = f"{system_prompt}{rag_context}"
-
                 content = await client.generate(
                     prompt=prompt,
                     system_prompt=system_prompt,
@@ -3126,47 +3152,6 @@ Usa formattazione markdown quando appropriato."""
             logger.info("Using GROQ (FALLBACK) for content generation")
             client = get_groq_client(model="llama-3.3-70b")
 
-            # Base system prompt with Brand DNA
-            base_system_prompt = f"""Sei l'AI Content Creator di {BRAND_DNA["identity"]["name"]}, software house italiana specializzata in AI per PMI.
-
-TONE OF VOICE:
-- {BRAND_DNA["voice"]["primary"]}
-- {BRAND_DNA["voice"]["style"]}
-- {BRAND_DNA["voice"]["approach"]}
-
-REGOLE FONDAMENTALI:
-1. Scrivi SEMPRE in italiano corretto
-2. Usa la struttura HOOK → BODY → CTA → HASHTAG
-3. Parla di benefici, non solo feature
-4. Usa numeri e dati concreti
-5. Evita: {", ".join(BRAND_DNA["avoid_words"])}
-6. Target: {BRAND_DNA["target"]["primary"]}
-
-Genera contenuti professionali, coinvolgenti e ottimizzati.
-Usa formattazione markdown quando appropriato."""
-
-            # Fetch RAG context if enabled
-            rag_context = ""
-            if use_rag:
-                try:
-                    from app.domain.rag.service import rag_service
-                    rag_context = await rag_service.get_context(
-                        query=prompt[:500],
-                        max_tokens=1500
-                    )
-                    if rag_context:
-                        rag_context = f"\n\n## Knowledge Base Aziendale:\n{rag_context}"
-                except Exception as rag_error:
-                    import logging
-                    logging.getLogger(__name__).warning(f"RAG context fetch failed: {rag_error}")
-
-            # Build system prompt with contexts
-            system_prompt = base_system_prompt
-            if brand_context:
-                system_prompt = f"{base_system_prompt}\n\n## Brand Context Aggiuntivo:\n{brand_context}"
-            if rag_context:
-                system_prompt = f"{system_prompt}{rag_context}"
-
             content = await client.generate(
                 prompt=prompt,
                 system_prompt=system_prompt,
@@ -3178,10 +3163,97 @@ Usa formattazione markdown quando appropriato."""
             return content.strip()
 
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"All LLM providers failed: {e}")
+            logger.error(f"All LLM providers failed: {e}")
             return f"[Errore generazione contenuto. Riprova più tardi.]"
 
+    async def _generate_content_stream(
+        self,
+        prompt: str,
+        brand_context: Optional[str] = None,
+        use_rag: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream content tokens as they are produced by the LLM.
+
+        Same prompt and provider chain as _generate_content (Ollama → GROQ),
+        but chunks are yielded as they arrive. The custom HuggingFace model has
+        no streaming endpoint, so when enabled its full answer is yielded once.
+
+        Providers are only switched before the first chunk is sent: a failure
+        after that raises, so callers end the stream with an error event
+        instead of appending a second, unrelated generation.
+        """
+        from app.core.config import settings
+
+        system_prompt = await self._build_content_system_prompt(prompt, brand_context, use_rag)
+
+        if settings.USE_CUSTOM_MODEL:
+            try:
+                from app.domain.marketing.custom_model_service import custom_model_service
+
+                content = await custom_model_service.generate_async(
+                    prompt=prompt,
+                    system_message=system_prompt,
+                    max_new_tokens=2000,
+                    temperature=0.8
+                )
+                if content.strip():
+                    yield content.strip()
+                    return
+            except Exception as e:
+                logger.warning(f"Custom model generation failed, falling back to Ollama stream: {e}")
+
+        produced = False
+
+        # === OLLAMA PRIMARY ===
+        try:
+            from app.core.llm.ollama_client import get_ollama_client
+
+            client = get_ollama_client()
+            if await client.is_available():
+                async for chunk in client.generate_stream(
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    temperature=0.8,
+                    max_tokens=2000
+                ):
+                    # generate_stream reports errors in-band
+                    if chunk.startswith("[Ollama error"):
+                        raise RuntimeError(chunk)
+                    produced = True
+                    yield chunk
+                if produced:
+                    return
+            else:
+                logger.warning("Ollama not available, falling back to GROQ stream")
+
+        except Exception as ollama_e:
+            if produced:
+                logger.error(f"Ollama stream failed after partial output: {ollama_e}")
+                raise
+            logger.warning(f"Ollama stream failed, trying GROQ fallback: {ollama_e}")
+
+        # === GROQ FALLBACK ===
+        try:
+            from app.core.llm.groq_client import get_groq_client
+
+            client = get_groq_client(model="llama-3.3-70b")
+            async for chunk in client.generate_stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=0.8,
+                max_tokens=2000
+            ):
+                produced = True
+                yield chunk
+
+        except Exception as e:
+            if produced:
+                logger.error(f"GROQ stream failed after partial output: {e}")
+                raise
+            logger.error(f"All LLM providers failed (stream): {e}")
+            yield "[Errore generazione contenuto. Riprova più tardi.]"
+
     async def _optimize_seo(
         self, content: str, keywords: List[str]
     ) -> str:
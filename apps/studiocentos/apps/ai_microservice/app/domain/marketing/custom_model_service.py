@@ -5,7 +5,9 @@ Versione PRODUCTION: usa HuggingFace Inference API invece di caricare il modello
 Questo permette di usare il modello senza torch nel container Docker.
 """
 
+import asyncio
 import os
+import time
 import httpx
 from typing import Optional
 from app.core.config import settings
@@ -20,10 +22,18 @@ class CustomModelService:
 
     In produzione usa l'Inference API per evitare di caricare il modello
     direttamente nel container (richiede ~16GB RAM + torch).
+
+    Le richieste passano da un limitatore di concorrenza: al massimo
+    CUSTOM_MODEL_MAX_CONCURRENCY chiamate in volo verso l'endpoint, le altre
+    attendono in coda (max CUSTOM_MODEL_MAX_QUEUE) per al massimo
+    CUSTOM_MODEL_QUEUE_TIMEOUT secondi.
     """
 
     _instance: Optional['CustomModelService'] = None
     _client: Optional[httpx.AsyncClient] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _waiting: int = 0
+    _in_flight: int = 0
 
     def __new__(cls):
         if cls._instance is None:
@@ -40,6 +50,11 @@ class CustomModelService:
         # Inference API base URL (updated Dec 2024)
         self.api_url = f"https://router.huggingface.co/hf-inference/models/{self.model_name}"
 
+        # Request-level limiter
+        self.max_concurrency = max(1, settings.CUSTOM_MODEL_MAX_CONCURRENCY)
+        self.max_queue = max(0, settings.CUSTOM_MODEL_MAX_QUEUE)
+        self.queue_timeout = settings.CUSTOM_MODEL_QUEUE_TIMEOUT
+
         logger.info(f"CustomModelService initialized: use_custom={self.use_custom}, model={self.model_name}")
 
     async def _get_client(self) -> httpx.AsyncClient:
@@ -48,6 +63,21 @@ class CustomModelService:
             self._client = httpx.AsyncClient(timeout=120.0)
         return self._client
 
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get or create the concurrency limiter (created lazily inside the loop)."""
+        if CustomModelService._semaphore is None:
+            CustomModelService._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return CustomModelService._semaphore
+
+    def get_queue_stats(self) -> dict:
+        """Stato corrente del limitatore (richieste in volo / in coda)."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": CustomModelService._in_flight,
+            "waiting": CustomModelService._waiting,
+            "max_queue": self.max_queue,
+        }
+
     async def generate_async(
         self,
         prompt: str,
@@ -77,6 +107,45 @@ class CustomModelService:
             logger.error("HuggingFace token not configured")
             return ""
 
+        if CustomModelService._waiting >= self.max_queue and self._get_semaphore().locked():
+            logger.warning(
+                f"Custom model queue full ({CustomModelService._waiting} waiting), rejecting request"
+            )
+            return ""
+
+        semaphore = self._get_semaphore()
+        queued_at = time.monotonic()
+        CustomModelService._waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Custom model queue wait exceeded {self.queue_timeout}s, giving up")
+            return ""
+        finally:
+            CustomModelService._waiting -= 1
+
+        wait_ms = (time.monotonic() - queued_at) * 1000
+        if wait_ms > 100:
+            logger.info(f"Custom model request waited {wait_ms:.0f}ms in queue")
+
+        CustomModelService._in_flight += 1
+        try:
+            return await self._call_inference_api(
+                prompt, system_message, max_new_tokens, temperature, top_p
+            )
+        finally:
+            CustomModelService._in_flight -= 1
+            semaphore.release()
+
+    async def _call_inference_api(
+        self,
+        prompt: str,
+        system_message: str,
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float,
+    ) -> str:
+        """Esegue la chiamata HTTP all'Inference API (già dentro il limitatore)."""
         # Format come durante il training (ChatML format per Qwen)
         formatted_prompt = (
             f"<|im_start|>system\n{system_message}<|im_end|>\n"
@@ -115,7 +184,6 @@ class CustomModelService:
             if response.status_code == 503:
                 # Model is loading, retry after a delay
                 logger.info("Model is loading, waiting...")
-                import asyncio
                 await asyncio.sleep(20)
                 response = await client.post(
                     self.api_url,
@@ -158,25 +226,33 @@ class CustomModelService:
         """
         Genera contenuto (versione sincrona).
 
-        Per retrocompatibilità - chiama la versione async.
+        Solo per script e contesti senza event loop. Dal codice async usare
+        ``await generate_async(...)``: bloccare il loop in attesa della
+        generazione fermerebbe tutte le altre richieste del worker.
         """
-        import asyncio
-
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # In contesto async, crea nuovo task
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        asyncio.run,
-                        self.generate_async(prompt, system_message, max_new_tokens, temperature, top_p)
-                    )
-                    return future.result(timeout=120)
-            else:
-                return loop.run_until_complete(
-                    self.generate_async(prompt, system_message, max_new_tokens, temperature, top_p)
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "CustomModelService.generate() called from a running event loop; "
+                "use 'await generate_async(...)' instead"
+            )
+
+        async def _run() -> str:
+            try:
+                return await self.generate_async(
+                    prompt, system_message, max_new_tokens, temperature, top_p
                 )
+            finally:
+                # Client and limiter are bound to this temporary loop
+                await self.close()
+                self._client = None
+                CustomModelService._semaphore = None
+
+        try:
+            return asyncio.run(_run())
         except Exception as e:
             logger.error(f"Sync generate error: {e}")
             return ""
@@ -95,7 +95,7 @@ class LeadIntelligenceAgent:
                 self.vector_store = ChromaVectorStore(
                     embeddings=self.embeddings,
                     collection_name="lead_intelligence",
-                    persist_directory="./chroma_db_leads"
+                    persist_directory=settings.LEAD_INTELLIGENCE_CHROMA_PATH
                 )
                 self.logger.info("Lead Intelligence vector store initialized")
             else:
@@ -0,0 +1,50 @@
+"""
+Workflow Agents - AgentOrchestrator used by the WorkflowEngine.
+
+The workflow templates address agents by `agent_type`; this module builds
+one started instance per type and registers it on the orchestrator passed
+to `get_workflow_engine()` at startup.
+"""
+
+from typing import Dict, Type
+
+import structlog
+
+from app.infrastructure.agents.base_agent import AgentConfig, BaseAgent
+from app.infrastructure.agents.orchestrator import AgentOrchestrator
+from app.domain.marketing.content_creator import ContentCreatorAgent
+from app.domain.marketing.image_generator_agent import ImageGenerationAgent
+from app.domain.marketing.seo_specialist import SEOAgent
+from app.domain.marketing.social_media_manager import SocialMediaManagerAgent
+
+logger = structlog.get_logger(__name__)
+
+# agent_type used by WorkflowTemplates -> agent class. "email_marketing"
+# (EmailMarketingAgent is still abstract) and "lead_intelligence" (not a
+# BaseAgent) have no runnable agent: their steps fail as unregistered.
+WORKFLOW_AGENTS: Dict[str, Type[BaseAgent]] = {
+    "content_creator": ContentCreatorAgent,
+    "seo_specialist": SEOAgent,
+    "social_media_manager": SocialMediaManagerAgent,
+    "image_generator": ImageGenerationAgent,
+}
+
+
+async def build_workflow_orchestrator() -> AgentOrchestrator:
+    """Create the orchestrator with every workflow agent registered and started."""
+    orchestrator = AgentOrchestrator()
+
+    for agent_type, agent_class in WORKFLOW_AGENTS.items():
+        try:
+            agent = agent_class(config=AgentConfig(
+                agent_id=f"workflow_{agent_type}",
+                agent_type=agent_type,
+                model="llama-3.3-70b-versatile",
+            ))
+            await agent.on_start()
+            orchestrator.register_agent(agent)
+        except Exception as e:
+            logger.error("workflow_agent_init_failed", agent_type=agent_type, error=str(e))
+
+    logger.info("workflow_agents_registered", agents=orchestrator.get_registered_agents())
+    return orchestrator
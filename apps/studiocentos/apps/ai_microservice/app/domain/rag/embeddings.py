@@ -301,6 +301,49 @@ class GoogleEmbeddings(BaseEmbeddings):
 
         return embedding
 
+    async def embed_batch(
+        self, texts: List[str], batch_size: int = 100
+    ) -> List[List[float]]:
+        """Embed in batches of at most 100 (batchEmbedContents limit)."""
+        return await super().embed_batch(texts, batch_size=min(batch_size, 100))
+
+    async def _process_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a whole batch with one batchEmbedContents request."""
+        start_time = time.time()
+
+        response = await self.client.post(
+            f"{self.base_url}/models/{self.model}:batchEmbedContents",
+            params={"key": self.api_key},
+            headers={"Content-Type": "application/json"},
+            json={
+                "requests": [
+                    {
+                        "model": f"models/{self.model}",
+                        "content": {"parts": [{"text": text}]},
+                    }
+                    for text in texts
+                ]
+            },
+        )
+        response.raise_for_status()
+
+        embeddings = [
+            item.get("values", []) for item in response.json().get("embeddings", [])
+        ]
+        if len(embeddings) != len(texts):
+            raise ValueError(
+                f"Google returned {len(embeddings)} embeddings for {len(texts)} texts"
+            )
+
+        elapsed = time.time() - start_time
+        self.stats.total_time += elapsed
+        self.stats.documents_processed += len(texts)
+        self.stats.avg_time_per_doc = (
+            self.stats.total_time / self.stats.documents_processed
+        )
+
+        return embeddings
+
     async def close(self):
         """Close HTTP client."""
         await self.client.aclose()
@@ -0,0 +1,271 @@
+"""
+Document Registry - Persistent RAG document metadata and keyword index.
+
+SQLite database shared by all workers (WAL mode):
+- documents: one row per uploaded document (filename, owner, metadata)
+- chunks: chunk text and metadata, the source of truth for chunk IDs
+- chunks_fts: FTS5 index over chunk text, queried with bm25() for the
+  keyword half of hybrid search
+
+sqlite3 is blocking, so every public method runs in a worker thread.
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Metadata keys are interpolated into json_extract paths
+_FILTER_KEY_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_QUERY_TERM_RE = re.compile(r"\w+", re.UNICODE)
+# Terms that would match almost every chunk (IT/EN)
+STOPWORDS = frozenset(
+    "il lo la le gli un una uno di da in con su per tra fra del della dei delle "
+    "al alla ai alle nel nella che chi non come anche sono the and for with from "
+    "this that are was".split()
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    chunks_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    uploaded_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS ix_documents_user_id ON documents(user_id);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    doc_id TEXT NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    chunk_index INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS ix_chunks_doc_id ON chunks(doc_id);
+CREATE INDEX IF NOT EXISTS ix_chunks_user_id ON chunks(user_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    text,
+    content='chunks',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+"""
+
+
+class DocumentRegistry:
+    """
+    SQLite-backed registry of indexed documents and their chunks.
+
+    Example:
+        >>> registry = DocumentRegistry("/data/rag/registry.db")
+        >>> await registry.save_document(doc, chunks)
+        >>> hits = await registry.keyword_search("brand identity", limit=20)
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize registry.
+
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection: one transaction, committed on success."""
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _document_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "filename": row["filename"],
+            "chunks_count": row["chunks_count"],
+            "user_id": row["user_id"],
+            "uploaded_at": row["uploaded_at"],
+            "content_hash": row["content_hash"],
+            "metadata": json.loads(row["metadata"] or "{}"),
+        }
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def _save_document(self, document: Dict[str, Any], chunks: List[Dict[str, Any]]) -> None:
+        with self._connect() as conn:
+            # Re-upload of the same document replaces its chunks (cascade)
+            conn.execute("DELETE FROM documents WHERE id = ?", (document["id"],))
+            conn.execute(
+                "INSERT INTO documents (id, filename, user_id, chunks_count, content_hash, uploaded_at, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    document["id"],
+                    document["filename"],
+                    document["user_id"],
+                    document["chunks_count"],
+                    document["content_hash"],
+                    document["uploaded_at"],
+                    json.dumps(document.get("metadata") or {}),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO chunks (id, doc_id, chunk_index, user_id, text, tokens, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        chunk["id"],
+                        document["id"],
+                        chunk["chunk_index"],
+                        document["user_id"],
+                        chunk["text"],
+                        chunk["tokens"],
+                        json.dumps(chunk.get("metadata") or {}),
+                    )
+                    for chunk in chunks
+                ],
+            )
+
+    async def save_document(self, document: Dict[str, Any], chunks: List[Dict[str, Any]]) -> None:
+        """Insert or replace a document and its chunks in one transaction."""
+        await asyncio.to_thread(self._save_document, document, chunks)
+
+    def _get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM documents WHERE id = ?", (doc_id,)).fetchone()
+        return self._document_row(row) if row else None
+
+    async def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Document metadata by ID."""
+        return await asyncio.to_thread(self._get_document, doc_id)
+
+    def _list_documents(self, user_id: Optional[int]) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if user_id:
+                rows = conn.execute(
+                    "SELECT * FROM documents WHERE user_id = ? ORDER BY uploaded_at", (user_id,)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM documents ORDER BY uploaded_at").fetchall()
+        return [self._document_row(row) for row in rows]
+
+    async def list_documents(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """All documents, optionally only those owned by `user_id`."""
+        return await asyncio.to_thread(self._list_documents, user_id)
+
+    def _delete_document(self, doc_id: str) -> Optional[List[str]]:
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM documents WHERE id = ?", (doc_id,)).fetchone() is None:
+                return None
+            chunk_ids = [
+                row["id"] for row in conn.execute("SELECT id FROM chunks WHERE doc_id = ?", (doc_id,))
+            ]
+            conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+        return chunk_ids
+
+    async def delete_document(self, doc_id: str) -> Optional[List[str]]:
+        """
+        Delete a document and its chunks.
+
+        Returns:
+            IDs of the deleted chunks, or None if the document does not exist
+        """
+        return await asyncio.to_thread(self._delete_document, doc_id)
+
+    # ------------------------------------------------------------------
+    # Keyword search
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _match_expression(query: str) -> Optional[str]:
+        """FTS5 MATCH expression: any query term (OR), quoted so no syntax leaks in."""
+        terms = [
+            term for term in _QUERY_TERM_RE.findall(query.lower())
+            if len(term) > 2 and term not in STOPWORDS
+        ]
+        if not terms:
+            return None
+        return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+    @staticmethod
+    def _filter_clause(filters: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for key, value in (filters or {}).items():
+            if key == "user_id":
+                clauses.append("c.user_id = ?")
+            elif _FILTER_KEY_RE.match(key):
+                clauses.append(f"json_extract(c.metadata, '$.{key}') = ?")
+            else:
+                raise ValueError(f"Invalid metadata filter key: {key!r}")
+            params.append(value)
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    def _keyword_search(
+        self, query: str, limit: int, filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        match = self._match_expression(query)
+        if match is None:
+            return []
+        where, params = self._filter_clause(filters)
+        sql = (
+            "SELECT c.id, c.text, c.metadata, bm25(chunks_fts) AS rank "
+            "FROM chunks_fts JOIN chunks c ON c.rowid = chunks_fts.rowid "
+            f"WHERE chunks_fts MATCH ?{where} "
+            "ORDER BY rank LIMIT ?"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(sql, (match, *params, limit)).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "text": row["text"],
+                "metadata": json.loads(row["metadata"] or "{}"),
+                # bm25() is negative, lower = better
+                "bm25": -row["rank"],
+            }
+            for row in rows
+        ]
+
+    async def keyword_search(
+        self, query: str, limit: int = 20, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked chunks matching any query term, best first.
+
+        Args:
+            query: Free-text query
+            limit: Max chunks returned
+            filters: Exact-match metadata filters applied before ranking
+
+        Returns:
+            Chunks as {"id", "text", "metadata", "bm25"}
+        """
+        return await asyncio.to_thread(self._keyword_search, query, limit, filters)
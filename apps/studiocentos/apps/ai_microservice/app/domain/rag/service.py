@@ -2,16 +2,19 @@
 RAG Service - Complete document processing and retrieval.
 
 Provides:
-- Document upload with chunking
-- Semantic search with context retrieval
-- Document management (list, delete)
+- Document upload with token-aware chunking and parallel batch embedding
+- Hybrid search (vector + BM25, reciprocal-rank fusion) with context retrieval
+- Persistent document management (list, delete)
 - Context injection for content generation
 """
 
+import asyncio
 import hashlib
 import re
+import sqlite3
+import tempfile
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
 from app.core.config import settings
@@ -19,65 +22,103 @@ from app.core.logging import get_logger
 from app.domain.rag.models import Document, SearchResult, SearchFilter
 from app.domain.rag.embeddings import GoogleEmbeddings, BaseEmbeddings
 from app.domain.rag.stores import ChromaVectorStore, BaseVectorStore
+from app.domain.rag.registry import DocumentRegistry
 
 logger = get_logger(__name__)
 
 
 class TextChunker:
-    """Split text into overlapping chunks for RAG."""
+    """
+    Split text into overlapping, token-bounded chunks for RAG.
+
+    Token counts are approximated with words and punctuation marks, close
+    enough to the embedding models' tokenizers to keep chunks under their
+    input limit without pulling in a tokenizer dependency. Chunks end on
+    sentence boundaries and the overlap carries whole trailing sentences.
+    """
+
+    _TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+    _SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
 
     def __init__(
         self,
-        chunk_size: int = 500,
-        chunk_overlap: int = 50,
-        separators: List[str] = None
+        chunk_size: int = 200,
+        chunk_overlap: int = 30,
     ):
-        self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
-        self.separators = separators or ["\n\n", "\n", ". ", " "]
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_overlap = max(0, min(chunk_overlap, self.chunk_size // 2))
+
+    @classmethod
+    def count_tokens(cls, text: str) -> int:
+        """Approximate token count of `text`."""
+        return len(cls._TOKEN_RE.findall(text))
+
+    def _units(self, text: str) -> List[Tuple[str, int, str]]:
+        """Sentences as (text, tokens, separator before it); long sentences split by words."""
+        units = []
+        for paragraph in text.split("\n\n"):
+            separator = "\n\n"
+            for sentence in self._SENTENCE_RE.split(paragraph.strip()):
+                if not sentence:
+                    continue
+                tokens = self.count_tokens(sentence)
+                if tokens <= self.chunk_size:
+                    units.append((sentence, tokens, separator))
+                    separator = " "
+                    continue
+
+                words, window, window_tokens = sentence.split(), [], 0
+                for word in words:
+                    word_tokens = self.count_tokens(word)
+                    if window and window_tokens + word_tokens > self.chunk_size:
+                        units.append((" ".join(window), window_tokens, separator))
+                        separator = " "
+                        window, window_tokens = [], 0
+                    window.append(word)
+                    window_tokens += word_tokens
+                if window:
+                    units.append((" ".join(window), window_tokens, separator))
+                    separator = " "
+        return units
+
+    @staticmethod
+    def _join(units: List[Tuple[str, int, str]]) -> str:
+        return "".join(
+            (separator if i else "") + text for i, (text, _, separator) in enumerate(units)
+        ).strip()
 
     def split(self, text: str) -> List[str]:
-        """Split text into chunks."""
-        chunks = []
-        current_chunk = ""
-
-        # Split by paragraphs first
-        paragraphs = text.split("\n\n")
-
-        for para in paragraphs:
-            if len(current_chunk) + len(para) <= self.chunk_size:
-                current_chunk += para + "\n\n"
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-
-                # If paragraph itself is too long, split by sentences
-                if len(para) > self.chunk_size:
-                    sentences = re.split(r'(?<=[.!?])\s+', para)
-                    current_chunk = ""
-                    for sentence in sentences:
-                        if len(current_chunk) + len(sentence) <= self.chunk_size:
-                            current_chunk += sentence + " "
-                        else:
-                            if current_chunk:
-                                chunks.append(current_chunk.strip())
-                            current_chunk = sentence + " "
-                else:
-                    current_chunk = para + "\n\n"
-
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-
-        # Add overlap between chunks
-        overlapped_chunks = []
-        for i, chunk in enumerate(chunks):
-            if i > 0 and self.chunk_overlap > 0:
-                # Get last N chars from previous chunk
-                prev_overlap = chunks[i-1][-self.chunk_overlap:]
-                chunk = prev_overlap + " " + chunk
-            overlapped_chunks.append(chunk)
-
-        return overlapped_chunks
+        """Split text into chunks of at most `chunk_size` tokens."""
+        chunks: List[str] = []
+        current: List[Tuple[str, int, str]] = []
+        current_tokens = 0
+        fresh = 0  # units in `current` not already emitted in a previous chunk
+
+        for unit in self._units(text):
+            if current and current_tokens + unit[1] > self.chunk_size:
+                chunks.append(self._join(current))
+
+                # Carry whole trailing sentences as overlap
+                carried: List[Tuple[str, int, str]] = []
+                carried_tokens = 0
+                for previous in reversed(current):
+                    if carried_tokens + previous[1] > self.chunk_overlap:
+                        break
+                    carried.insert(0, previous)
+                    carried_tokens += previous[1]
+                if carried_tokens + unit[1] > self.chunk_size:
+                    carried, carried_tokens = [], 0
+
+                current, current_tokens, fresh = carried, carried_tokens, 0
+
+            current.append(unit)
+            current_tokens += unit[1]
+            fresh += 1
+
+        if current and fresh:
+            chunks.append(self._join(current))
+
+        return chunks
 
 
 class RAGService:
@@ -85,10 +126,12 @@ class RAGService:
     Complete RAG service for document management and retrieval.
 
     Features:
-    - Document upload with automatic chunking
-    - Semantic search
+    - Document upload with token-aware chunking
+    - Chunk embeddings computed in parallel batches
+    - Hybrid search: vector (Chroma) + BM25 (SQLite FTS5), fused with
+      reciprocal-rank fusion, both pre-filtered on metadata
     - Context retrieval for AI generation
-    - Document listing and deletion
+    - Persistent document registry shared by all workers
     """
 
     _instance = None
@@ -113,12 +156,18 @@ class RAGService:
         # Initialize embeddings
         self.embeddings: Optional[BaseEmbeddings] = None
         self.vector_store: Optional[BaseVectorStore] = None
+        self._embed_semaphore = asyncio.Semaphore(max(1, settings.RAG_EMBED_CONCURRENCY))
 
-        # Document metadata storage (in-memory, extend to DB if needed)
-        self._documents: Dict[str, Dict[str, Any]] = {}
+        # Document metadata and keyword index
+        try:
+            self.registry = DocumentRegistry(settings.RAG_REGISTRY_PATH)
+        except (OSError, sqlite3.Error) as e:
+            fallback = str(Path(tempfile.gettempdir()) / "studiocentos_rag_registry.db")
+            logger.warning("registry_fallback", path=settings.RAG_REGISTRY_PATH, fallback=fallback, error=str(e))
+            self.registry = DocumentRegistry(fallback)
 
         RAGService._initialized = True
-        logger.info("rag_service_initialized")
+        logger.info("rag_service_initialized", registry=self.registry.path)
 
     async def _ensure_initialized(self):
         """Lazy initialization of embeddings and vector store."""
@@ -147,6 +196,18 @@ class RAGService:
         hash_input = f"{filename}:{content[:100]}"
         return hashlib.md5(hash_input.encode()).hexdigest()[:16]
 
+    async def _embed_chunks(self, texts: List[str]) -> List[List[float]]:
+        """Embed chunk texts in batches, up to RAG_EMBED_CONCURRENCY requests at a time."""
+        batch_size = max(1, settings.RAG_EMBED_BATCH_SIZE)
+
+        async def embed(batch: List[str]) -> List[List[float]]:
+            async with self._embed_semaphore:
+                return await self.embeddings.embed_batch(batch, batch_size=len(batch))
+
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+        return [embedding for batch in results for embedding in batch]
+
     async def upload_document(
         self,
         filename: str,
@@ -157,6 +218,11 @@ class RAGService:
         """
         Upload and index a document.
 
+        Re-uploading the same content with the same owner and metadata is a
+        no-op; anything else replaces the previous chunks. New chunks are
+        written before stale ones are removed, so a failed re-index leaves
+        the previous version searchable.
+
         Args:
             filename: Document filename
             content: Document text content
@@ -169,9 +235,26 @@ class RAGService:
         await self._ensure_initialized()
 
         doc_id = self._generate_doc_id(filename, content)
+        content_hash = hashlib.sha256(content.encode()).hexdigest()
+
+        existing = await self.registry.get_document(doc_id)
+        if (
+            existing
+            and existing["content_hash"] == content_hash
+            and existing["user_id"] == user_id
+            and existing["metadata"] == (metadata or {})
+        ):
+            logger.info("document_unchanged", doc_id=doc_id, filename=filename)
+            return {
+                "document_id": doc_id,
+                "filename": filename,
+                "chunks_count": existing["chunks_count"],
+                "status": "indexed"
+            }
 
         # Split into chunks
         chunks = self.chunker.split(content)
+        uploaded_at = datetime.utcnow().isoformat()
 
         logger.info(
             "document_chunked",
@@ -192,36 +275,58 @@ class RAGService:
                     "chunk_index": i,
                     "total_chunks": len(chunks),
                     "user_id": user_id,
-                    "uploaded_at": datetime.utcnow().isoformat(),
+                    "uploaded_at": uploaded_at,
                     **(metadata or {})
                 }
             )
             chunk_docs.append(chunk_doc)
 
-        # Add to vector store
-        if self.vector_store:
-            try:
+        try:
+            # Upsert into the vector store (re-indexed chunks keep their IDs)
+            if self.vector_store and chunk_docs:
+                embeddings = await self._embed_chunks([doc.text for doc in chunk_docs])
+                for doc, embedding in zip(chunk_docs, embeddings):
+                    doc.embedding = embedding
                 await self.vector_store.add_documents(chunk_docs)
-                logger.info("document_indexed", doc_id=doc_id, chunks=len(chunks))
-            except Exception as e:
-                logger.error("indexing_failed", error=str(e))
-                return {
-                    "document_id": doc_id,
+
+            # Store document metadata and keyword index
+            await self.registry.save_document(
+                {
+                    "id": doc_id,
                     "filename": filename,
                     "chunks_count": len(chunks),
-                    "status": "error",
-                    "error": str(e)
-                }
+                    "user_id": user_id,
+                    "content_hash": content_hash,
+                    "uploaded_at": uploaded_at,
+                    "metadata": metadata or {}
+                },
+                [
+                    {
+                        "id": doc.id,
+                        "chunk_index": doc.metadata["chunk_index"],
+                        "text": doc.text,
+                        "tokens": self.chunker.count_tokens(doc.text),
+                        "metadata": doc.metadata,
+                    }
+                    for doc in chunk_docs
+                ]
+            )
 
-        # Store document metadata
-        self._documents[doc_id] = {
-            "id": doc_id,
-            "filename": filename,
-            "chunks_count": len(chunks),
-            "user_id": user_id,
-            "uploaded_at": datetime.utcnow().isoformat(),
-            "metadata": metadata or {}
-        }
+            # Drop chunks of the previous version beyond the new chunk count
+            if self.vector_store and existing and existing["chunks_count"] > len(chunks):
+                await self.vector_store.delete(
+                    [f"{doc_id}_chunk_{i}" for i in range(len(chunks), existing["chunks_count"])]
+                )
+            logger.info("document_indexed", doc_id=doc_id, chunks=len(chunks))
+        except Exception as e:
+            logger.error("indexing_failed", error=str(e))
+            return {
+                "document_id": doc_id,
+                "filename": filename,
+                "chunks_count": len(chunks),
+                "status": "error",
+                "error": str(e)
+            }
 
         return {
             "document_id": doc_id,
@@ -230,82 +335,151 @@ class RAGService:
             "status": "indexed"
         }
 
+    async def _vector_search(
+        self,
+        query: str,
+        top_k: int,
+        min_similarity: float,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[SearchResult]:
+        if not self.vector_store:
+            return []
+
+        filter_obj = SearchFilter(
+            min_score=min_similarity,
+            metadata_filters=filters or None  # ChromaDB doesn't accept empty dict
+        )
+        try:
+            return await self.vector_store.search(query=query, top_k=top_k, filter=filter_obj)
+        except Exception as e:
+            logger.error("vector_search_failed", error=str(e))
+            return []
+
+    async def _keyword_search(
+        self,
+        query: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[SearchResult]:
+        try:
+            hits = await self.registry.keyword_search(query, limit=top_k, filters=filters)
+        except (ValueError, sqlite3.Error) as e:
+            logger.error("keyword_search_failed", error=str(e))
+            return []
+
+        return [
+            SearchResult(
+                document=Document(id=hit["id"], text=hit["text"], metadata=hit["metadata"]),
+                score=hit["bm25"] / (1.0 + hit["bm25"]),
+                rank=rank
+            )
+            for rank, hit in enumerate(hits, start=1)
+        ]
+
+    @staticmethod
+    def _fuse(rankings: List[List[SearchResult]], top_k: int) -> List[SearchResult]:
+        """
+        Reciprocal-rank fusion: score(d) = sum(1 / (k + rank)).
+
+        Scores are normalized so a chunk ranked first by every retriever
+        gets 1.0.
+        """
+        k = settings.RAG_RRF_K
+        fused: Dict[str, float] = {}
+        documents: Dict[str, Document] = {}
+
+        for ranking in rankings:
+            for result in ranking:
+                doc_id = result.document.id
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + result.rank)
+                documents.setdefault(doc_id, result.document)
+
+        best = len(rankings) / (k + 1)
+        ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [
+            SearchResult(document=documents[doc_id], score=min(1.0, score / best), rank=rank)
+            for rank, (doc_id, score) in enumerate(ordered, start=1)
+        ]
+
     async def search(
         self,
         query: str,
         top_k: int = 5,
-        min_score: float = 0.7,
-        user_id: Optional[int] = None
+        min_similarity: float = 0.7,
+        user_id: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
         """
-        Search for relevant documents.
+        Hybrid search for relevant chunks.
+
+        Vector and BM25 candidates are retrieved in parallel with the same
+        metadata filters, then merged with reciprocal-rank fusion.
 
         Args:
             query: Search query
             top_k: Number of results
-            min_score: Minimum similarity score
+            min_similarity: Minimum cosine similarity of vector candidates.
+                Keyword (BM25) candidates match the query terms and are not
+                filtered by it.
             user_id: Filter by user (optional)
+            filters: Exact-match metadata filters, e.g. {"type": "case_study"}
 
         Returns:
-            List of search results
+            List of search results. score is the normalized fused rank score
+            (1.0 = ranked first by every retriever), not a similarity.
         """
         await self._ensure_initialized()
 
-        if not self.vector_store:
-            logger.warning("search_no_vector_store")
-            return []
-
-        # Build filter - only if we have actual filter criteria
-        filter_obj = None
+        metadata_filters = dict(filters or {})
         if user_id:
-            # Only create filter if we have an actual user_id filter
-            filter_obj = SearchFilter(
-                min_score=min_score,
-                metadata_filters={"user_id": user_id}
-            )
-        elif min_score > 0:
-            # Just min_score, no metadata filter
-            filter_obj = SearchFilter(
-                min_score=min_score,
-                metadata_filters=None  # ChromaDB doesn't accept empty dict
-            )
+            metadata_filters["user_id"] = user_id
 
-        try:
-            results = await self.vector_store.search(
-                query=query,
-                top_k=top_k,
-                filter=filter_obj
-            )
-            logger.info("search_completed", query_len=len(query), results=len(results))
-            return results
-        except Exception as e:
-            logger.error("search_failed", error=str(e))
-            return []
+        candidates = max(top_k * 4, 20)
+        vector_results, keyword_results = await asyncio.gather(
+            self._vector_search(query, candidates, min_similarity, metadata_filters),
+            self._keyword_search(query, candidates, metadata_filters)
+        )
+
+        # Without a vector store BM25 is the only retriever: don't halve its scores
+        rankings = [vector_results, keyword_results] if self.vector_store else [keyword_results]
+        results = self._fuse(rankings, top_k)
+        logger.info(
+            "search_completed",
+            query_len=len(query),
+            vector=len(vector_results),
+            keyword=len(keyword_results),
+            results=len(results)
+        )
+        return results
 
     async def get_context(
         self,
         query: str,
         max_tokens: int = 2000,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Get context string for AI generation.
 
-        Retrieves relevant documents and formats them as context.
+        Retrieves the best RAG_MAX_RESULTS chunks and packs them, best
+        first, within the token budget.
 
         Args:
             query: Query to find relevant context
             max_tokens: Approximate max tokens in context
             user_id: Filter by user (optional)
+            filters: Exact-match metadata filters (optional)
 
         Returns:
             Formatted context string
         """
         results = await self.search(
             query=query,
-            top_k=10,
-            min_score=settings.RAG_SIMILARITY_THRESHOLD,
-            user_id=user_id
+            top_k=settings.RAG_MAX_RESULTS,
+            min_similarity=settings.RAG_SIMILARITY_THRESHOLD,
+            user_id=user_id,
+            filters=filters
         )
 
         if not results:
@@ -313,17 +487,18 @@ class RAGService:
 
         # Build context from results
         context_parts = []
-        total_chars = 0
-        max_chars = max_tokens * 4  # Approximate chars per token
+        total_tokens = 0
 
         for result in results:
             text = result.document.text
-            if total_chars + len(text) > max_chars:
-                break
+            tokens = self.chunker.count_tokens(text)
+            if total_tokens + tokens > max_tokens:
+                # A smaller, lower-ranked chunk may still fit
+                continue
 
             source = result.document.metadata.get("filename", "unknown")
             context_parts.append(f"[Fonte: {source}]\n{text}")
-            total_chars += len(text)
+            total_tokens += tokens
 
         if context_parts:
             return "\n\n---\n\n".join(context_parts)
@@ -343,12 +518,7 @@ class RAGService:
         Returns:
             List of document metadata
         """
-        docs = list(self._documents.values())
-
-        if user_id:
-            docs = [d for d in docs if d.get("user_id") == user_id]
-
-        return docs
+        return await self.registry.list_documents(user_id=user_id)
 
     async def delete_document(self, doc_id: str) -> bool:
         """
@@ -360,29 +530,25 @@ class RAGService:
         Returns:
             True if deleted, False if not found
         """
-        if doc_id not in self._documents:
-            return False
+        await self._ensure_initialized()
 
-        doc_info = self._documents[doc_id]
-        chunks_count = doc_info.get("chunks_count", 0)
+        chunk_ids = await self.registry.delete_document(doc_id)
+        if chunk_ids is None:
+            return False
 
         # Delete chunks from vector store
-        if self.vector_store and chunks_count > 0:
-            chunk_ids = [f"{doc_id}_chunk_{i}" for i in range(chunks_count)]
+        if self.vector_store and chunk_ids:
             try:
                 await self.vector_store.delete(chunk_ids)
-                logger.info("document_deleted", doc_id=doc_id, chunks=chunks_count)
+                logger.info("document_deleted", doc_id=doc_id, chunks=len(chunk_ids))
             except Exception as e:
                 logger.error("delete_failed", error=str(e))
 
-        # Remove from metadata
-        del self._documents[doc_id]
-
         return True
 
     async def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """Get document metadata by ID."""
-        return self._documents.get(doc_id)
+        return await self.registry.get_document(doc_id)
 
 
 # Singleton instance
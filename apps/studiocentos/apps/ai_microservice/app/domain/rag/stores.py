@@ -268,7 +268,7 @@ class ChromaVectorStore(BaseVectorStore):
         )
 
     async def add_documents(self, documents: List[Document]) -> None:
-        """Add documents to Chroma collection."""
+        """Add (or replace, by ID) documents in Chroma collection."""
         # Generate embeddings
         texts = [doc.text for doc in documents if doc.embedding is None]
         if texts:
@@ -279,8 +279,8 @@ class ChromaVectorStore(BaseVectorStore):
                     doc.embedding = embeddings[embed_idx]
                     embed_idx += 1
 
-        # Add to Chroma
-        self.collection.add(
+        # Upsert: re-indexing a document reuses its chunk IDs
+        self.collection.upsert(
             ids=[doc.id for doc in documents],
             embeddings=[doc.embedding for doc in documents],
             documents=[doc.text for doc in documents],
@@ -297,8 +297,12 @@ class ChromaVectorStore(BaseVectorStore):
         # Generate query embedding
         query_embedding = await self.embeddings.embed_text(query)
 
-        # Build where filter
-        where = filter.metadata_filters if filter else None
+        # Build where filter (Chroma needs $and for more than one condition)
+        conditions = (filter.metadata_filters or {}) if filter else {}
+        if len(conditions) > 1:
+            where = {"$and": [{k: v} for k, v in conditions.items()]}
+        else:
+            where = conditions or None
 
         # Search
         results = self.collection.query(
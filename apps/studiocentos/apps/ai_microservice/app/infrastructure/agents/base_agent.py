@@ -224,6 +224,10 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def on_start(self) -> None:
+        """Initialize agent resources (override in subclasses)."""
+        pass
+    
     async def run(self, task: Task) -> Task:
         """Run a task with full lifecycle management.
         
@@ -3,6 +3,7 @@ Unified LLM Manager - Multi-provider LLM management with automatic fallback.
 
 Provides unified interface for multiple LLM providers with:
     - Automatic fallback chain
+    - Admission control through the central LLMDispatcher
     - Cost tracking and optimization
     - Streaming support
     - Model selection based on task complexity
@@ -20,6 +21,8 @@ from pydantic import BaseModel, Field
 import litellm
 from litellm import acompletion, completion_cost
 
+from app.core.llm.dispatcher import estimate_tokens, get_llm_dispatcher
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers."""
@@ -257,15 +260,29 @@ class UnifiedLLMManager:
         # Try providers in order
         last_error = None
         
+        dispatcher = get_llm_dispatcher()
+        request_key = self._get_cache_key(messages, temperature, max_tokens)
+
         for provider_config in provider_chain:
             try:
-                response = await self._complete_with_provider(
-                    provider_config=provider_config,
-                    messages=messages,
-                    temperature=temperature or self.default_temperature,
-                    max_tokens=max_tokens or self.default_max_tokens,
-                    stream=stream,
-                    **kwargs
+                # Admission control: per-provider concurrency/TPM budget,
+                # priority lanes and coalescing of identical in-flight prompts
+                response = await dispatcher.submit(
+                    provider_config.provider.value,
+                    lambda cfg=provider_config: self._complete_with_provider(
+                        provider_config=cfg,
+                        messages=messages,
+                        temperature=temperature or self.default_temperature,
+                        max_tokens=max_tokens or self.default_max_tokens,
+                        stream=stream,
+                        **kwargs
+                    ),
+                    estimated_tokens=estimate_tokens(
+                        *(m.get("content") for m in messages),
+                        max_tokens=max_tokens or self.default_max_tokens,
+                    ),
+                    coalesce_key=f"{provider_config.model}:{request_key}",
+                    tokens_used=lambda r: r.tokens_used,
                 )
                 
                 # Cache successful response
@@ -316,17 +333,26 @@ class UnifiedLLMManager:
         )
         provider_chain = self.get_provider_chain(selection)
         
+        dispatcher = get_llm_dispatcher()
+
         for provider_config in provider_chain:
             try:
-                async for chunk in self._stream_with_provider(
-                    provider_config=provider_config,
-                    messages=messages,
-                    temperature=temperature or self.default_temperature,
-                    max_tokens=max_tokens or self.default_max_tokens,
-                    **kwargs
+                async with dispatcher.slot(
+                    provider_config.provider.value,
+                    estimated_tokens=estimate_tokens(
+                        *(m.get("content") for m in messages),
+                        max_tokens=max_tokens or self.default_max_tokens,
+                    ),
                 ):
-                    yield chunk
-                
+                    async for chunk in self._stream_with_provider(
+                        provider_config=provider_config,
+                        messages=messages,
+                        temperature=temperature or self.default_temperature,
+                        max_tokens=max_tokens or self.default_max_tokens,
+                        **kwargs
+                    ):
+                        yield chunk
+
                 return  # Success, exit
                 
             except Exception as e:
@@ -516,7 +542,8 @@ class UnifiedLLMManager:
                 if self.requests_count > 0 else 0.0
             ),
             "by_provider": self.provider_usage,
-            "cache_size": len(self._cache)
+            "cache_size": len(self._cache),
+            "dispatcher": get_llm_dispatcher().get_stats()
         }
     
     def clear_cache(self) -> int:
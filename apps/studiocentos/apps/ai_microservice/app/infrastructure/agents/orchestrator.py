@@ -5,15 +5,22 @@ coordinates task execution, handles dependencies, and manages workflows.
 """
 
 import asyncio
+import heapq
+import itertools
+import time
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 from uuid import UUID
 
+import structlog
+
 from .base_agent import BaseAgent
 from .state import StateManager
 from .task import Task, TaskStatus, WorkflowResult
 
+logger = structlog.get_logger(__name__)
+
 
 class OrchestrationStrategy(str, Enum):
     """Strategy for orchestrating multiple agents."""
@@ -49,21 +56,31 @@ class AgentOrchestrator:
         strategy: Orchestration strategy to use
         state_manager: Shared state manager for all agents
         agents: Registered agents by type
+        max_concurrency: Global cap on tasks running at once (dependency strategy)
+        agent_concurrency: Per-agent-type caps (dependency strategy)
     """
     
     def __init__(
         self,
         strategy: OrchestrationStrategy = OrchestrationStrategy.SEQUENTIAL,
-        state_manager: Optional[StateManager] = None
+        state_manager: Optional[StateManager] = None,
+        max_concurrency: int = 8,
+        agent_concurrency: Optional[Dict[str, int]] = None
     ) -> None:
         """Initialize orchestrator.
         
         Args:
             strategy: Orchestration strategy
             state_manager: State manager (creates new if not provided)
+            max_concurrency: Maximum tasks running at once
+            agent_concurrency: Maximum running tasks per agent type
+                (e.g. {"image_generator": 1}); unlisted types only obey
+                the global cap
         """
         self.strategy = strategy
         self.state_manager = state_manager or StateManager()
+        self.max_concurrency = max(1, max_concurrency)
+        self.agent_concurrency: Dict[str, int] = dict(agent_concurrency or {})
         self._agents: Dict[str, BaseAgent] = {}
         self._running_workflows: Dict[UUID, WorkflowResult] = {}
     
@@ -174,7 +191,7 @@ class AgentOrchestrator:
             elif strategy == OrchestrationStrategy.PRIORITY:
                 await self._execute_by_priority(tasks)
             elif strategy == OrchestrationStrategy.DEPENDENCY:
-                await self._execute_by_dependency(tasks)
+                result.metadata["scheduling"] = await self._execute_by_dependency(tasks)
             
             # Update workflow status
             if all(t.status == TaskStatus.COMPLETED for t in tasks):
@@ -225,52 +242,203 @@ class AgentOrchestrator:
         sorted_tasks = sorted(tasks, key=lambda t: t.priority.value)
         await self._execute_sequential(sorted_tasks)
     
-    async def _execute_by_dependency(self, tasks: List[Task]) -> None:
-        """Execute tasks based on dependencies.
+    @staticmethod
+    def _critical_path_lengths(
+        tasks: Dict[UUID, Task],
+        dependents: Dict[UUID, List[UUID]]
+    ) -> Dict[UUID, int]:
+        """Compute the longest downstream chain (in tasks) starting at each task.
         
         Args:
-            tasks: Tasks to execute
+            tasks: Tasks by ID
+            dependents: Task ID -> IDs of tasks depending on it
+            
+        Returns:
+            Task ID -> critical path length (1 for leaf tasks)
             
         Raises:
             WorkflowExecutionError: If circular dependencies detected
         """
-        completed: Set[UUID] = set()
-        remaining = {task.id: task for task in tasks}
-        max_iterations = len(tasks) * 2  # Prevent infinite loops
-        iteration = 0
+        # Kahn's algorithm gives a topological order and detects cycles
+        indegree = {task_id: len(set(task.dependencies)) for task_id, task in tasks.items()}
+        order: List[UUID] = [task_id for task_id, deg in indegree.items() if deg == 0]
+        for task_id in order:
+            for dependent in dependents[task_id]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    order.append(dependent)
         
-        while remaining and iteration < max_iterations:
-            iteration += 1
-            
-            # Find tasks ready to execute
-            ready_tasks = [
-                task for task in remaining.values()
-                if task.is_ready(completed)
-            ]
+        if len(order) != len(tasks):
+            cyclic = [task_id for task_id, deg in indegree.items() if deg > 0]
+            raise WorkflowExecutionError(
+                f"Circular dependency detected. Tasks involved: {cyclic}"
+            )
+        
+        lengths: Dict[UUID, int] = {}
+        for task_id in reversed(order):
+            lengths[task_id] = 1 + max(
+                (lengths[d] for d in dependents[task_id]), default=0
+            )
+        return lengths
+    
+    async def _execute_by_dependency(self, tasks: List[Task]) -> Dict[str, Any]:
+        """Execute tasks based on dependencies.
+        
+        Completion-driven: every task is launched as soon as its own
+        dependencies are done, without waiting for unrelated tasks. Ready
+        tasks are started longest-critical-path first (then by priority),
+        within the global and per-agent-type concurrency limits. Tasks left
+        in RETRY by their agent are queued again.
+        
+        Each task gets ``metadata["scheduling"]`` with its queue wait and
+        run time in milliseconds.
+        
+        Args:
+            tasks: Tasks to execute
             
-            if not ready_tasks:
-                # No tasks ready - possible circular dependency
-                raise WorkflowExecutionError(
-                    f"Circular dependency detected or missing dependencies. "
-                    f"Remaining tasks: {list(remaining.keys())}"
-                )
+        Returns:
+            Scheduling summary (makespan, average/max queue wait, peak concurrency)
             
-            # Execute ready tasks in parallel
-            await asyncio.gather(
-                *[self.execute_task(task) for task in ready_tasks],
-                return_exceptions=True
+        Raises:
+            WorkflowExecutionError: If circular or missing dependencies detected
+        """
+        by_id = {task.id: task for task in tasks}
+        
+        missing = {
+            str(dep_id): str(task.id)
+            for task in tasks
+            for dep_id in task.dependencies
+            if dep_id not in by_id
+        }
+        if missing:
+            raise WorkflowExecutionError(
+                f"Missing dependencies (dependency -> task): {missing}"
+            )
+        
+        dependents: Dict[UUID, List[UUID]] = {task_id: [] for task_id in by_id}
+        for task in tasks:
+            for dep_id in set(task.dependencies):
+                dependents[dep_id].append(task.id)
+        critical_path = self._critical_path_lengths(by_id, dependents)
+        
+        pending_deps = {task.id: len(set(task.dependencies)) for task in tasks}
+        ready: List[tuple] = []
+        seq = itertools.count()
+        ready_at: Dict[UUID, float] = {}
+        timings: Dict[UUID, Dict[str, float]] = {}
+        running: Dict[asyncio.Task, UUID] = {}
+        running_by_agent: Dict[str, int] = {}
+        peak_concurrency = 0
+        workflow_start = time.monotonic()
+        
+        def push_ready(task_id: UUID) -> None:
+            task = by_id[task_id]
+            ready_at[task_id] = time.monotonic()
+            heapq.heappush(
+                ready,
+                (-critical_path[task_id], task.priority.value, next(seq), task_id)
             )
-            
-            # Mark completed
-            for task in ready_tasks:
-                if task.status in {TaskStatus.COMPLETED, TaskStatus.FAILED}:
-                    completed.add(task.id)
-                    remaining.pop(task.id, None)
         
-        if remaining:
+        def agent_has_capacity(agent_type: str) -> bool:
+            limit = self.agent_concurrency.get(agent_type)
+            return limit is None or running_by_agent.get(agent_type, 0) < max(1, limit)
+        
+        for task_id, count in pending_deps.items():
+            if count == 0:
+                push_ready(task_id)
+        
+        try:
+            while ready or running:
+                # Launch as many ready tasks as the limits allow; tasks whose
+                # agent type is saturated wait without blocking the others
+                deferred = []
+                while ready and len(running) < self.max_concurrency:
+                    entry = heapq.heappop(ready)
+                    task = by_id[entry[-1]]
+                    if not agent_has_capacity(task.agent_type):
+                        deferred.append(entry)
+                        continue
+                    
+                    # Retried tasks accumulate wait and run time across attempts
+                    now = time.monotonic()
+                    timing = timings.setdefault(task.id, {"queue_wait": 0.0, "run": 0.0})
+                    timing["queue_wait"] += now - ready_at[task.id]
+                    timing["started"] = now
+                    running_by_agent[task.agent_type] = running_by_agent.get(task.agent_type, 0) + 1
+                    running[asyncio.create_task(self.execute_task(task))] = task.id
+                for entry in deferred:
+                    heapq.heappush(ready, entry)
+                peak_concurrency = max(peak_concurrency, len(running))
+                
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(
+                    running.keys(), return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                for finished in done:
+                    task_id = running.pop(finished)
+                    task = by_id[task_id]
+                    running_by_agent[task.agent_type] -= 1
+                    
+                    timing = timings[task_id]
+                    timing["run"] += time.monotonic() - timing["started"]
+                    task.metadata["scheduling"] = {
+                        "queue_wait_ms": round(timing["queue_wait"] * 1000, 1),
+                        "run_ms": round(timing["run"] * 1000, 1),
+                        "critical_path": critical_path[task_id],
+                        "attempts": task.retry_count + 1,
+                    }
+                    
+                    error = finished.exception()
+                    if error is not None:
+                        # Agent lookup or lifecycle failure: not retryable here
+                        self.handle_agent_failure(task.agent_type, error)
+                        task.error = str(error)
+                        task.status = TaskStatus.FAILED
+                        task.completed_at = datetime.utcnow()
+                    
+                    if task.status == TaskStatus.RETRY:
+                        push_ready(task_id)
+                        continue
+                    
+                    logger.debug(
+                        "dependency_task_finished",
+                        task_id=str(task_id),
+                        agent_type=task.agent_type,
+                        status=task.status.value,
+                        **task.metadata["scheduling"]
+                    )
+                    
+                    if not task.is_terminal:
+                        continue
+                    
+                    # Failed tasks also unblock dependents (same as completed)
+                    for dependent in dependents[task_id]:
+                        pending_deps[dependent] -= 1
+                        if pending_deps[dependent] == 0:
+                            push_ready(dependent)
+        finally:
+            for pending in running:
+                pending.cancel()
+        
+        unfinished = [str(task.id) for task in tasks if not task.is_terminal]
+        if unfinished:
             raise WorkflowExecutionError(
-                f"Workflow did not complete. Remaining tasks: {list(remaining.keys())}"
+                f"Workflow did not complete. Remaining tasks: {unfinished}"
             )
+        
+        waits = [t["queue_wait"] for t in timings.values()]
+        return {
+            "makespan_ms": round((time.monotonic() - workflow_start) * 1000, 1),
+            "avg_queue_wait_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "max_queue_wait_ms": round(max(waits, default=0.0) * 1000, 1),
+            "total_run_ms": round(sum(t["run"] for t in timings.values()) * 1000, 1),
+            "peak_concurrency": peak_concurrency,
+            "max_concurrency": self.max_concurrency,
+            "agent_concurrency": dict(self.agent_concurrency),
+        }
     
     def get_agent_status(self) -> Dict[str, Dict]:
         """Get status of all registered agents.
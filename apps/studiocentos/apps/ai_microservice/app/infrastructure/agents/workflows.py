@@ -15,14 +15,19 @@ REFERENCE:
 """
 
 import asyncio
-from datetime import datetime
+import fcntl
+import os
+from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 import structlog
 
+from app.core.config import settings
+
 from .task import Task, TaskStatus, TaskPriority, WorkflowResult
 from .base_agent import BaseAgent
 from .orchestrator import AgentOrchestrator, OrchestrationStrategy
@@ -507,6 +512,105 @@ class WorkflowTemplates:
         }
 
 
+# =============================================================================
+# EXECUTION PERSISTENCE
+# =============================================================================
+
+
+class WorkflowExecutionStore:
+    """
+    Persistenza execution su file JSON (uno per execution).
+
+    Ogni cambio di stato di uno step viene salvato, così un'execution
+    interrotta da un restart può essere ripresa dagli step non completati.
+
+    Con più worker sulla stessa directory, un'execution viene eseguita solo
+    dal processo che ne ha il lock (claim); le execution terminate da più
+    di retention_days vengono eliminate al caricamento.
+    """
+
+    FINISHED_STATUSES = {
+        WorkflowStatus.COMPLETED.value,
+        WorkflowStatus.FAILED.value,
+        WorkflowStatus.CANCELLED.value,
+    }
+
+    def __init__(self, storage_path: Optional[Path] = None, retention_days: Optional[int] = None):
+        self.storage_path = storage_path or Path(__file__).parent.parent.parent / "data" / "workflows"
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.retention_days = (
+            settings.WORKFLOW_EXECUTION_RETENTION_DAYS if retention_days is None else retention_days
+        )
+        self._claims: Dict[str, int] = {}
+
+    def _execution_file(self, execution_id: str) -> Path:
+        return self.storage_path / f"{execution_id}.json"
+
+    def _lock_file(self, execution_id: str) -> Path:
+        return self.storage_path / f"{execution_id}.lock"
+
+    def write(self, execution_id: str, payload: str) -> None:
+        """Scrive un'execution già serializzata (scrittura atomica: tmp + rename)."""
+        target = self._execution_file(execution_id)
+        tmp = target.with_name(f"{target.name}.{uuid4().hex}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, target)
+
+    def save(self, execution: WorkflowExecution) -> None:
+        """Salva execution."""
+        self.write(execution.id, execution.model_dump_json(indent=2))
+
+    def claim(self, execution_id: str) -> bool:
+        """
+        Lock esclusivo (flock) sull'execution per questo processo.
+
+        False se un altro worker la sta già eseguendo. Il kernel rilascia
+        il lock se il processo termina, quindi un worker morto non blocca
+        la ripresa.
+        """
+        if execution_id in self._claims:
+            return True
+        fd = os.open(self._lock_file(execution_id), os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._claims[execution_id] = fd
+        return True
+
+    def release(self, execution_id: str) -> None:
+        """Rilascia il lock ottenuto con claim()."""
+        fd = self._claims.pop(execution_id, None)
+        if fd is not None:
+            os.close(fd)
+
+    def _is_expired(self, execution: WorkflowExecution, cutoff: datetime) -> bool:
+        return (
+            execution.status in self.FINISHED_STATUSES
+            and execution.completed_at is not None
+            and execution.completed_at < cutoff
+        )
+
+    def load_all(self) -> List[WorkflowExecution]:
+        """Carica le execution salvate, eliminando quelle oltre la retention."""
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        executions = []
+        for path in self.storage_path.glob("*.json"):
+            try:
+                execution = WorkflowExecution.model_validate_json(path.read_text(encoding="utf-8"))
+            except Exception as e:
+                logger.warning("workflow_execution_load_failed", path=str(path), error=str(e))
+                continue
+
+            if self._is_expired(execution, cutoff):
+                path.unlink(missing_ok=True)
+                self._lock_file(execution.id).unlink(missing_ok=True)
+                continue
+            executions.append(execution)
+        return executions
+
+
 # =============================================================================
 # ADVANCED WORKFLOW ENGINE
 # =============================================================================
@@ -523,7 +627,8 @@ class WorkflowEngine:
     - Conditional branching
     - Error recovery
     - Progress tracking
-    - Persistence (in-memory per ora)
+    - Parallel DAG execution (max_parallel_steps step concorrenti)
+    - Persistence su file JSON con ripresa dopo restart
 
     Usage:
         engine = WorkflowEngine(orchestrator)
@@ -538,16 +643,30 @@ class WorkflowEngine:
         progress = engine.get_progress(execution.id)
     """
 
-    def __init__(self, orchestrator: AgentOrchestrator):
+    def __init__(
+        self,
+        orchestrator: AgentOrchestrator,
+        max_parallel_steps: int = 4,
+        store: Optional[WorkflowExecutionStore] = None
+    ):
         self.orchestrator = orchestrator
+        self.max_parallel_steps = max(1, max_parallel_steps)
         self._workflows: Dict[str, WorkflowDefinition] = {}
         self._executions: Dict[str, WorkflowExecution] = {}
+        self._runners: Dict[str, asyncio.Task] = {}
         self._templates = WorkflowTemplates.get_all_templates()
+        self._store = store or WorkflowExecutionStore()
+        # Serializza le scritture: l'ultimo snapshot salvato è sempre il più recente
+        self._persist_lock = asyncio.Lock()
 
         # Load templates into workflows
         for template_type, template in self._templates.items():
             self._workflows[template.id] = template
 
+        # Load persisted executions (history + interrupted runs)
+        for execution in self._store.load_all():
+            self._executions[execution.id] = execution
+
     # =========================================================================
     # WORKFLOW MANAGEMENT
     # =========================================================================
@@ -614,7 +733,7 @@ class WorkflowEngine:
         self._executions[execution.id] = execution
 
         # Start execution in background
-        asyncio.create_task(self._run_execution(execution))
+        self._start_runner(execution)
 
         logger.info(
             "workflow_execution_started",
@@ -651,9 +770,78 @@ class WorkflowEngine:
             created_by=created_by
         )
 
+    def _start_runner(self, execution: WorkflowExecution) -> bool:
+        """
+        Avvia _run_execution in background e ne tiene il riferimento.
+
+        False se l'execution è già in carico a un altro worker.
+        """
+        if not self._store.claim(execution.id):
+            return False
+        runner = asyncio.create_task(self._run_execution(execution))
+        self._runners[execution.id] = runner
+        runner.add_done_callback(lambda _: self._on_runner_done(execution.id))
+        return True
+
+    def _on_runner_done(self, execution_id: str) -> None:
+        self._runners.pop(execution_id, None)
+        self._store.release(execution_id)
+
+    async def _persist(self, execution: WorkflowExecution) -> None:
+        """Salva lo stato execution senza bloccare il loop."""
+        try:
+            async with self._persist_lock:
+                # Snapshot sul loop: i runner continuano a modificare l'execution
+                payload = execution.model_dump_json(indent=2)
+                await asyncio.to_thread(self._store.write, execution.id, payload)
+        except Exception as e:
+            logger.warning("workflow_execution_persist_failed", execution_id=execution.id, error=str(e))
+
+    async def resume_interrupted_executions(self) -> List[str]:
+        """
+        Riprende le execution rimaste RUNNING/PENDING (es. dopo un restart).
+
+        Gli step completati vengono mantenuti; quelli in corso al momento
+        dell'interruzione tornano PENDING e vengono rieseguiti. Con più
+        worker ogni execution viene ripresa da uno solo (vedi claim()).
+        """
+        resumed = []
+        for execution in self._executions.values():
+            if execution.status not in (WorkflowStatus.RUNNING.value, WorkflowStatus.PENDING.value):
+                continue
+            if execution.id in self._runners or not self._store.claim(execution.id):
+                continue
+            for step in execution.steps:
+                if step.status == TaskStatus.IN_PROGRESS.value:
+                    step.status = TaskStatus.PENDING
+                    step.started_at = None
+            self._start_runner(execution)
+            resumed.append(execution.id)
+
+        if resumed:
+            logger.info("workflow_executions_resumed", count=len(resumed), execution_ids=resumed)
+        return resumed
+
+    async def shutdown(self) -> None:
+        """
+        Ferma i runner attivi (shutdown del servizio).
+
+        Le execution restano RUNNING su disco e vengono riprese al prossimo
+        avvio da resume_interrupted_executions().
+        """
+        runners = list(self._runners.values())
+        for runner in runners:
+            runner.cancel()
+        await asyncio.gather(*runners, return_exceptions=True)
+
     async def _run_execution(self, execution: WorkflowExecution) -> None:
         """
-        Esegue workflow steps.
+        Esegue workflow steps come DAG event-driven.
+
+        Ogni step pronto (dipendenze soddisfatte) parte subito, fino a
+        max_parallel_steps in contemporanea; al completamento di uno step i
+        suoi dipendenti vengono schedulati immediatamente. Lo stato viene
+        salvato dopo ogni step.
 
         Gestisce:
         - Risoluzione variabili
@@ -662,52 +850,54 @@ class WorkflowEngine:
         - Progress updates
         """
         execution.status = WorkflowStatus.RUNNING
-        execution.started_at = datetime.utcnow()
-
-        try:
-            completed_steps: Set[str] = set()
-            step_map = {step.id: step for step in execution.steps}
-
-            while len(completed_steps) < len(execution.steps):
-                # Find ready steps
-                ready_steps = [
-                    step for step in execution.steps
-                    if step.id not in completed_steps
-                    and step.status != TaskStatus.FAILED
-                    and all(dep in completed_steps for dep in step.depends_on)
-                ]
+        execution.started_at = execution.started_at or datetime.utcnow()
+
+        step_map = {step.id: step for step in execution.steps}
+        # Steps already done (resumed execution) count as settled
+        settled: Set[str] = {
+            step.id for step in execution.steps
+            if step.status in (TaskStatus.COMPLETED.value, TaskStatus.FAILED.value)
+            and not (step.status == TaskStatus.FAILED.value and step.on_failure)
+        }
+        running: Dict[asyncio.Task, str] = {}
+        slots = asyncio.Semaphore(self.max_parallel_steps)
 
-                if not ready_steps:
-                    # Check if we're stuck
-                    pending = [s for s in execution.steps if s.id not in completed_steps]
-                    if pending and all(s.status == TaskStatus.FAILED for s in pending):
-                        break
-                    if not pending:
-                        break
+        async def run_step(step: WorkflowStep) -> None:
+            async with slots:
+                execution.current_step_id = step.id
+                await self._execute_step(execution, step)
 
-                    # Wait a bit and retry
-                    await asyncio.sleep(1)
+        def launch_ready_steps() -> None:
+            for step in execution.steps:
+                if (
+                    step.id in settled
+                    or step.id in running.values()
+                    or step.status == TaskStatus.FAILED.value
+                    or not all(dep in settled for dep in step.depends_on)
+                ):
                     continue
+                running[asyncio.create_task(run_step(step))] = step.id
+
+        await self._persist(execution)
+
+        try:
+            launch_ready_steps()
 
-                # Execute ready steps (parallel where possible)
-                parallel_steps = [s for s in ready_steps if s.step_type != StepType.PARALLEL]
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
 
-                for step in parallel_steps:
-                    execution.current_step_id = step.id
+                for finished in done:
+                    step = step_map[running.pop(finished)]
+                    error = finished.exception()
 
-                    try:
-                        await self._execute_step(execution, step)
-                        completed_steps.add(step.id)
-                        execution.steps_completed = len(completed_steps)
-                        execution.progress_percent = int(
-                            (execution.steps_completed / execution.steps_total) * 100
-                        )
-                    except Exception as e:
+                    if error is None:
+                        settled.add(step.id)
+                    else:
                         step.status = TaskStatus.FAILED
-                        step.error = str(e)
+                        step.error = str(error)
                         execution.errors.append({
                             "step_id": step.id,
-                            "error": str(e),
+                            "error": str(error),
                             "timestamp": datetime.utcnow().isoformat()
                         })
 
@@ -716,7 +906,16 @@ class WorkflowEngine:
                             # Branch to failure handler
                             pass
                         else:
-                            completed_steps.add(step.id)
+                            settled.add(step.id)
+
+                    execution.steps_completed = len(settled)
+                    execution.progress_percent = int(
+                        (execution.steps_completed / execution.steps_total) * 100
+                    )
+
+                # Schedule dependents of the steps that just finished
+                launch_ready_steps()
+                await self._persist(execution)
 
             # Determine final status
             failed_steps = [s for s in execution.steps if s.status == TaskStatus.FAILED]
@@ -726,7 +925,25 @@ class WorkflowEngine:
                 execution.status = WorkflowStatus.COMPLETED
                 execution.progress_percent = 100
 
+        except asyncio.CancelledError:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+            # CANCELLED only comes from cancel_execution(); a runner cancelled
+            # by shutdown stays RUNNING so resume_interrupted_executions() picks it up
+            execution.current_step_id = None
+            await self._persist(execution)
+            logger.info(
+                "workflow_execution_runner_cancelled",
+                execution_id=execution.id,
+                status=execution.status
+            )
+            raise
+
         except Exception as e:
+            for task in running:
+                task.cancel()
             execution.status = WorkflowStatus.FAILED
             execution.errors.append({
                 "error": str(e),
@@ -734,16 +951,16 @@ class WorkflowEngine:
             })
             logger.error("workflow_execution_failed", execution_id=execution.id, error=str(e))
 
-        finally:
-            execution.completed_at = datetime.utcnow()
-            execution.current_step_id = None
+        execution.completed_at = datetime.utcnow()
+        execution.current_step_id = None
+        await self._persist(execution)
 
-            logger.info(
-                "workflow_execution_completed",
-                execution_id=execution.id,
-                status=execution.status,
-                duration=(execution.completed_at - execution.started_at).total_seconds()
-            )
+        logger.info(
+            "workflow_execution_completed",
+            execution_id=execution.id,
+            status=execution.status,
+            duration=(execution.completed_at - execution.started_at).total_seconds()
+        )
 
     async def _execute_step(
         self,
@@ -947,9 +1164,21 @@ class WorkflowEngine:
         if execution.status in [WorkflowStatus.COMPLETED, WorkflowStatus.FAILED, WorkflowStatus.CANCELLED]:
             return False
 
+        runner = self._runners.get(execution_id)
+        if runner is None and not self._store.claim(execution_id):
+            # Running on another worker
+            return False
+
         execution.status = WorkflowStatus.CANCELLED
         execution.completed_at = datetime.utcnow()
 
+        if runner:
+            # Stops running steps; the runner persists the final state
+            runner.cancel()
+        else:
+            await self._persist(execution)
+            self._store.release(execution_id)
+
         logger.info("workflow_execution_cancelled", execution_id=execution_id)
 
         return True
@@ -980,12 +1209,17 @@ _workflow_engine: Optional[WorkflowEngine] = None
 
 
 def get_workflow_engine(orchestrator: Optional[AgentOrchestrator] = None) -> WorkflowEngine:
-    """Get singleton WorkflowEngine instance."""
+    """
+    Get singleton WorkflowEngine instance.
+
+    The first call (app startup) must pass the orchestrator with the
+    workflow agents registered; later calls return the same engine.
+    """
     global _workflow_engine
 
     if _workflow_engine is None:
         if orchestrator is None:
-            orchestrator = AgentOrchestrator()
+            raise RuntimeError("WorkflowEngine not initialized: pass the orchestrator with the workflow agents")
         _workflow_engine = WorkflowEngine(orchestrator)
 
     return _workflow_engine
@@ -14,6 +14,8 @@ from prometheus_client import make_asgi_app
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
 from app.core.api.v1 import rag, support, marketing, health, demo, toolai
+from app.infrastructure.agents.workflows import get_workflow_engine
+from app.domain.marketing.workflow_agents import build_workflow_orchestrator
 
 # Setup logging
 setup_logging()
@@ -34,11 +36,18 @@ async def lifespan(app: FastAPI):
     # Initialize services
     logger.info("services_initialization_started")
     # Add service initializers here as needed
+    workflow_engine = get_workflow_engine(await build_workflow_orchestrator())
+    try:
+        await workflow_engine.resume_interrupted_executions()
+    except Exception as e:
+        logger.error("workflow_resume_failed", error=str(e))
     logger.info("services_initialization_complete")
 
     yield
 
     # Shutdown
+    # In-flight workflow executions stay RUNNING and resume on next startup
+    await workflow_engine.shutdown()
     logger.info("ai_service_shutdown")
 
 
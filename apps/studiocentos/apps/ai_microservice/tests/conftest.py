@@ -0,0 +1,10 @@
+"""
+Shared test configuration.
+"""
+
+import os
+import tempfile
+
+# Importing the marketing modules creates the lead intelligence Chroma store:
+# keep it out of the working tree
+os.environ.setdefault("LEAD_INTELLIGENCE_CHROMA_PATH", tempfile.mkdtemp(prefix="chroma_db_leads_"))
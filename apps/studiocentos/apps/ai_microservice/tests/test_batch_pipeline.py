@@ -0,0 +1,65 @@
+"""
+Tests for the batch content pipeline concurrency limits.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core.api.v1 import marketing
+from app.core.config import settings
+
+
+class TestBatchPipeline:
+
+    @pytest.mark.asyncio
+    async def test_captions_respect_configured_concurrency(self):
+        running, peak = 0, 0
+
+        async def generate_with_ai(prompt):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "Caption\nHashtags: #one #two"
+
+        async def generate_image(request):
+            return SimpleNamespace(image_url="https://img.example/1.png", metadata={})
+
+        request = marketing.BatchContentRequest(topic="Launch", post_count=2, story_count=0, video_count=0)
+        with patch.object(settings, "BATCH_CAPTION_CONCURRENCY", 2), \
+                patch.object(marketing, "generate_with_ai", generate_with_ai), \
+                patch.object(marketing, "generate_image", generate_image):
+            results = [result async for result in marketing._iter_batch_pipeline(request)]
+
+        assert len(results) == 8
+        assert peak == 2
+        assert all(item.hashtags == ["one", "two"] for _, item, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_response_keeps_platform_order(self):
+        """Posts come back platform by platform whatever order they finish in."""
+        platforms = ["instagram", "facebook", "linkedin"]
+
+        async def generate_with_ai(prompt):
+            # Later platforms finish first
+            rank = next(i for i, p in enumerate(platforms) if p.upper() in prompt)
+            await asyncio.sleep(0.01 * (len(platforms) - rank))
+            return "Caption\nHashtags: #one"
+
+        async def generate_image(request):
+            return SimpleNamespace(image_url="https://img.example/1.png", metadata={})
+
+        request = marketing.BatchContentRequest(
+            topic="Launch", platforms=platforms, post_count=2, story_count=0, video_count=0
+        )
+        with patch.object(marketing, "generate_with_ai", generate_with_ai), \
+                patch.object(marketing, "generate_image", generate_image):
+            response = await marketing.batch_generate_social_content(request)
+
+        assert [item.platform for item in response.items] == [
+            "instagram", "instagram", "facebook", "facebook", "linkedin", "linkedin"
+        ]
@@ -0,0 +1,118 @@
+"""
+Tests for ContentCreatorAgent streaming: provider fallback vs. mid-stream errors.
+
+The real Ollama and GROQ clients are used; only their transports are faked
+(httpx for Ollama, the Groq SDK client for GROQ), so in-band error chunks and
+exceptions reach the agent exactly as in production.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.llm import ollama_client as ollama_module
+from app.core.llm.groq_client import GroqClient
+from app.core.llm.ollama_client import OllamaClient
+from app.domain.marketing.content_creator import ContentCreatorAgent
+
+AsyncClient = httpx.AsyncClient
+ERROR_SENTINEL = "[Errore generazione contenuto. Riprova più tardi.]"
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """Response body that sends `lines`, then drops the connection if `fail`."""
+
+    def __init__(self, lines, fail):
+        self.lines = lines
+        self.fail = fail
+
+    async def __aiter__(self):
+        for line in self.lines:
+            yield line
+        if self.fail:
+            raise httpx.ReadError("connection reset")
+
+
+def ollama(*chunks, available=True, fail=False):
+    """Real OllamaClient whose HTTP server streams `chunks` (NDJSON)."""
+    lines = [json.dumps({"message": {"content": chunk}}).encode() + b"\n" for chunk in chunks]
+
+    def handler(request):
+        if request.url.path == "/api/tags":
+            return httpx.Response(200 if available else 503)
+        return httpx.Response(200, stream=BrokenStream(lines, fail))
+
+    transport = httpx.MockTransport(handler)
+    client_class = lambda **kwargs: AsyncClient(transport=transport, **kwargs)
+    return OllamaClient(host="ollama"), patch.object(ollama_module.httpx, "AsyncClient", client_class)
+
+
+def groq(*chunks, fail=None, configured=True):
+    """Real GroqClient whose SDK stream yields `chunks`, then raises `fail`."""
+    async def stream():
+        for chunk in chunks:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])
+        if fail is not None:
+            raise fail
+
+    client = GroqClient(api_key="test-key")
+    if configured:
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            create=AsyncMock(side_effect=lambda **kwargs: stream())
+        )))
+    else:
+        client.client = None
+    return client
+
+
+async def collect(ollama_setup, groq_client, received):
+    """Stream into `received`, so chunks sent before an error stay visible."""
+    ollama_client, transport_patch = ollama_setup
+    agent = ContentCreatorAgent.__new__(ContentCreatorAgent)
+    agent._build_content_system_prompt = AsyncMock(return_value="system")
+    with transport_patch, patch.object(settings, "USE_CUSTOM_MODEL", False), \
+            patch("app.core.llm.ollama_client.get_ollama_client", return_value=ollama_client), \
+            patch("app.core.llm.groq_client.get_groq_client", return_value=groq_client):
+        async for chunk in agent._generate_content_stream("prompt segreto"):
+            received.append(chunk)
+
+
+class TestGenerateContentStream:
+
+    @pytest.mark.asyncio
+    async def test_ollama_output_is_streamed(self):
+        received = []
+        await collect(ollama("Ciao ", "mondo"), groq("groq"), received)
+        assert received == ["Ciao ", "mondo"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_groq_before_first_chunk(self):
+        received = []
+        await collect(ollama(fail=True), groq("da groq"), received)
+        assert received == ["da groq"]
+
+    @pytest.mark.asyncio
+    async def test_ollama_failure_after_output_ends_stream(self):
+        """The Ollama error chunk is not sent as content and GROQ is not appended."""
+        received = []
+        with pytest.raises(RuntimeError, match="Ollama error"):
+            await collect(ollama("Ciao ", fail=True), groq("da groq"), received)
+        assert received == ["Ciao "]
+
+    @pytest.mark.asyncio
+    async def test_groq_failure_after_output_ends_stream(self):
+        received = []
+        with pytest.raises(RuntimeError, match="Groq streaming failed"):
+            await collect(ollama(available=False), groq("Ciao ", fail=ConnectionError("reset")), received)
+        assert received == ["Ciao "]
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_yields_sentinel(self):
+        """The user's prompt is never streamed back as content."""
+        received = []
+        await collect(ollama(available=False), groq(configured=False), received)
+        assert received == [ERROR_SENTINEL]
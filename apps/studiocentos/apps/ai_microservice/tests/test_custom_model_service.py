@@ -0,0 +1,116 @@
+"""
+Tests for the CustomModelService concurrency limiter and its callers.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.domain.marketing.content_creator import ContentCreatorAgent
+from app.domain.marketing.custom_model_service import CustomModelService
+
+
+@pytest.fixture
+def service():
+    with patch.object(CustomModelService, "_instance", None), \
+            patch.object(CustomModelService, "_semaphore", None), \
+            patch.object(CustomModelService, "_waiting", 0), \
+            patch.object(CustomModelService, "_in_flight", 0):
+        service = CustomModelService()
+        service.use_custom = True
+        service.hf_token = "hf_test"
+        service.max_concurrency = 2
+        service.max_queue = 4
+        service.queue_timeout = 1.0
+        yield service
+
+
+def slow_inference(service, release):
+    """Inference call that records its peak concurrency and waits for `release`."""
+    service.peak = 0
+
+    async def call(*args):
+        service.peak = max(service.peak, CustomModelService._in_flight)
+        await release.wait()
+        return "generated"
+
+    service._call_inference_api = call
+
+
+class TestGenerateAsync:
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_capped(self, service):
+        release = asyncio.Event()
+        slow_inference(service, release)
+
+        calls = [asyncio.create_task(service.generate_async("p")) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        stats = service.get_queue_stats()
+        release.set()
+
+        assert await asyncio.gather(*calls) == ["generated"] * 4
+        assert (stats["in_flight"], stats["waiting"]) == (2, 2)
+        assert service.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_immediately(self, service):
+        release = asyncio.Event()
+        slow_inference(service, release)
+        service.max_concurrency, service.max_queue = 1, 1
+
+        running = [asyncio.create_task(service.generate_async("p")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+
+        assert await service.generate_async("p") == ""
+        release.set()
+        assert await asyncio.gather(*running) == ["generated"] * 2
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_gives_up(self, service):
+        release = asyncio.Event()
+        slow_inference(service, release)
+        service.max_concurrency, service.queue_timeout = 1, 0.01
+
+        running = asyncio.create_task(service.generate_async("p"))
+        await asyncio.sleep(0)
+
+        assert await service.generate_async("p") == ""
+        assert service.get_queue_stats()["waiting"] == 0
+        release.set()
+        await running
+
+    @pytest.mark.asyncio
+    async def test_sync_generate_refuses_running_loop(self, service):
+        with pytest.raises(RuntimeError, match="generate_async"):
+            service.generate("p")
+
+
+class TestGenerateContentFallback:
+
+    @pytest.mark.asyncio
+    async def test_rejected_custom_request_falls_back_to_ollama(self, service):
+        """A full queue returns "", which must not be served as the content."""
+        release = asyncio.Event()
+        slow_inference(service, release)
+        service.max_concurrency, service.max_queue = 1, 0
+        running = asyncio.create_task(service.generate_async("p"))
+        await asyncio.sleep(0.01)
+
+        agent = ContentCreatorAgent.__new__(ContentCreatorAgent)
+        agent._build_content_system_prompt = AsyncMock(return_value="system")
+        ollama = SimpleNamespace(
+            is_available=AsyncMock(return_value=True),
+            generate=AsyncMock(return_value=" da ollama "),
+        )
+        with patch.object(settings, "USE_CUSTOM_MODEL", True), \
+                patch("app.domain.marketing.custom_model_service.custom_model_service", service), \
+                patch("app.core.llm.ollama_client.get_ollama_client", return_value=ollama):
+            content = await agent._generate_content("prompt")
+
+        assert content == "da ollama"
+        release.set()
+        await running
@@ -0,0 +1,133 @@
+"""
+Tests for the LLM dispatcher: provider slots, priority lanes, budget, coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.llm.dispatcher import LLMDispatcher, LLMPriority, llm_priority
+
+
+def dispatcher(max_concurrency=1, tokens_per_minute=0, batch_share=0.75):
+    dispatcher = LLMDispatcher(batch_share=batch_share)
+    dispatcher.configure_provider("test", max_concurrency, tokens_per_minute)
+    return dispatcher
+
+
+class Recorder:
+    """Provider calls that record start order and peak concurrency."""
+
+    def __init__(self):
+        self.started = []
+        self.running = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+
+    def call(self, name, result=None):
+        async def run():
+            self.started.append(name)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await self.release.wait()
+            self.running -= 1
+            return result if result is not None else name
+        return run
+
+
+class TestSlots:
+
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_is_capped(self):
+        d, rec = dispatcher(max_concurrency=2), Recorder()
+
+        calls = [asyncio.create_task(d.submit("test", rec.call(i))) for i in range(5)]
+        await asyncio.sleep(0.01)
+        queued = d.get_stats()["test"]["queue_depth"]
+        rec.release.set()
+
+        assert await asyncio.gather(*calls) == list(range(5))
+        assert rec.peak == 2
+        assert queued == 3
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_queued_batch(self):
+        d, rec = dispatcher(max_concurrency=1), Recorder()
+        first = asyncio.create_task(d.submit("test", rec.call("first")))
+        await asyncio.sleep(0)
+
+        with llm_priority(LLMPriority.BATCH):
+            batch = asyncio.create_task(d.submit("test", rec.call("batch")))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(d.submit("test", rec.call("interactive")))
+        await asyncio.sleep(0)
+        rec.release.set()
+        await asyncio.gather(first, batch, interactive)
+
+        assert rec.started == ["first", "interactive", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_slots_free_for_interactive(self):
+        d, rec = dispatcher(max_concurrency=4, batch_share=0.5), Recorder()
+
+        with llm_priority(LLMPriority.BATCH):
+            batch = [asyncio.create_task(d.submit("test", rec.call(i))) for i in range(4)]
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(d.submit("test", rec.call("interactive")))
+        await asyncio.sleep(0.01)
+
+        assert rec.started == [0, 1, "interactive"]
+        rec.release.set()
+        await asyncio.gather(*batch, interactive)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        d, rec = dispatcher(max_concurrency=1), Recorder()
+        first = asyncio.create_task(d.submit("test", rec.call("first")))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(d.submit("test", rec.call("cancelled")))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        rec.release.set()
+        await first
+
+        assert await d.submit("test", rec.call("next")) == "next"
+        assert d.get_stats()["test"]["in_flight"] == 0
+
+
+class TestTokenBudget:
+
+    @pytest.mark.asyncio
+    async def test_waits_for_budget_until_usage_is_settled(self):
+        d, rec = dispatcher(max_concurrency=4, tokens_per_minute=6000), Recorder()
+
+        first = asyncio.create_task(
+            d.submit("test", rec.call("first", result=10), estimated_tokens=6000, tokens_used=lambda n: n)
+        )
+        second = asyncio.create_task(d.submit("test", rec.call("second"), estimated_tokens=3000))
+        await asyncio.sleep(0.01)
+        assert rec.started == ["first"]
+
+        rec.release.set()
+        await asyncio.gather(first, second)
+
+        assert rec.started == ["first", "second"]
+
+
+class TestCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_identical_prompts_share_one_call(self):
+        d, rec = dispatcher(max_concurrency=4), Recorder()
+
+        calls = [
+            asyncio.create_task(d.submit("test", rec.call("answer"), coalesce_key="same-prompt"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        rec.release.set()
+
+        assert await asyncio.gather(*calls) == ["answer"] * 3
+        assert rec.started == ["answer"]
+        assert d.get_stats()["test"]["coalesced"] == 2
@@ -0,0 +1,94 @@
+"""
+Tests for AgentOrchestrator dependency scheduling.
+"""
+
+import asyncio
+
+import pytest
+
+from app.infrastructure.agents.orchestrator import AgentOrchestrator, WorkflowExecutionError
+from app.infrastructure.agents.task import Task, TaskStatus
+
+
+def make_task(name, *dependencies, agent_type="writer"):
+    return Task(
+        task_type=name,
+        agent_type=agent_type,
+        dependencies=[dep.id for dep in dependencies],
+    )
+
+
+def orchestrator_recording(order, **kwargs):
+    """Orchestrator whose tasks complete after a short sleep, in `order`."""
+    orchestrator = AgentOrchestrator(**kwargs)
+
+    async def execute_task(task):
+        order.append(task.task_type)
+        await asyncio.sleep(0.01)
+        task.status = TaskStatus.COMPLETED
+        return task
+
+    orchestrator.execute_task = execute_task
+    return orchestrator
+
+
+class TestExecuteByDependency:
+
+    @pytest.mark.asyncio
+    async def test_duplicate_dependencies_count_once(self):
+        """A dependency listed twice does not block the task or fake a cycle."""
+        order = []
+        research = make_task("research")
+        draft = make_task("draft", research, research)
+
+        await orchestrator_recording(order)._execute_by_dependency([research, draft])
+
+        assert order == ["research", "draft"]
+        assert draft.status == TaskStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_longest_critical_path_starts_first(self):
+        order = []
+        leaf = make_task("leaf")
+        head = make_task("head")
+        middle = make_task("middle", head, head)
+        tail = make_task("tail", middle)
+
+        await orchestrator_recording(order, max_concurrency=1)._execute_by_dependency(
+            [leaf, head, middle, tail]
+        )
+
+        assert order[0] == "head"
+        assert tail.metadata["scheduling"]["critical_path"] == 1
+        assert head.metadata["scheduling"]["critical_path"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cycle_is_rejected(self):
+        first = make_task("first")
+        second = make_task("second", first)
+        first.dependencies = [second.id]
+
+        with pytest.raises(WorkflowExecutionError, match="Circular"):
+            await orchestrator_recording([])._execute_by_dependency([first, second])
+
+    @pytest.mark.asyncio
+    async def test_agent_concurrency_limit(self):
+        running, peak = 0, 0
+        orchestrator = AgentOrchestrator(max_concurrency=4, agent_concurrency={"image": 1})
+
+        async def execute_task(task):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            task.status = TaskStatus.COMPLETED
+            return task
+
+        orchestrator.execute_task = execute_task
+        tasks = [make_task(f"image_{i}", agent_type="image") for i in range(3)]
+
+        summary = await orchestrator._execute_by_dependency(tasks)
+
+        assert peak == 1
+        assert summary["peak_concurrency"] == 1
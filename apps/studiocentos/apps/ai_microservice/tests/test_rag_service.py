@@ -0,0 +1,171 @@
+"""
+Tests for the RAG service: chunking, reciprocal-rank fusion, search, re-upload.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.api.v1.rag import SearchRequest
+from app.core.config import settings
+from app.domain.rag.models import Document, SearchResult
+from app.domain.rag.service import RAGService, TextChunker
+
+
+class FakeEmbeddings:
+    async def embed_batch(self, texts, batch_size=100):
+        return [[float(len(text))] for text in texts]
+
+
+class FakeVectorStore:
+    """Vector store keyed by chunk ID, recording the order of writes."""
+
+    def __init__(self):
+        self.docs = {}
+        self.calls = []
+        self.fail_add = False
+        self.similarities = {}
+
+    async def add_documents(self, documents):
+        self.calls.append("add")
+        if self.fail_add:
+            raise RuntimeError("vector store down")
+        self.docs.update({doc.id: doc for doc in documents})
+
+    async def search(self, query, top_k, filter):
+        ranked = sorted(self.similarities.items(), key=lambda item: item[1], reverse=True)
+        return [
+            SearchResult(document=self.docs[doc_id], score=score, rank=rank)
+            for rank, (doc_id, score) in enumerate(ranked, start=1)
+            if score >= filter.min_score
+        ][:top_k]
+
+    async def delete(self, doc_ids):
+        self.calls.append("delete")
+        for doc_id in doc_ids:
+            self.docs.pop(doc_id, None)
+
+
+@pytest.fixture
+def rag(tmp_path):
+    with patch.object(RAGService, "_instance", None), \
+            patch.object(RAGService, "_initialized", False), \
+            patch.object(settings, "RAG_REGISTRY_PATH", str(tmp_path / "registry.db")):
+        service = RAGService()
+        service.embeddings = FakeEmbeddings()
+        service.vector_store = FakeVectorStore()
+        service.chunker = TextChunker(chunk_size=20, chunk_overlap=5)
+        yield service
+
+
+def sentences(count, prefix="Frase"):
+    return " ".join(f"{prefix} numero {i} del documento di prova." for i in range(count))
+
+
+def result(doc_id, rank):
+    return SearchResult(document=Document(id=doc_id, text=doc_id), score=0.5, rank=rank)
+
+
+class TestTextChunker:
+
+    def test_chunks_respect_token_bound(self):
+        chunker = TextChunker(chunk_size=20, chunk_overlap=5)
+        text = sentences(12) + "\n\n" + " ".join(["parola"] * 70)
+
+        chunks = chunker.split(text)
+
+        assert len(chunks) > 3
+        assert all(chunker.count_tokens(chunk) <= 20 for chunk in chunks)
+
+    def test_overlap_carries_trailing_sentence(self):
+        chunker = TextChunker(chunk_size=20, chunk_overlap=10)
+        chunks = chunker.split(sentences(4))
+
+        first_last_sentence = chunks[0].split(". ")[-1]
+        assert chunks[1].startswith(first_last_sentence.rstrip("."))
+
+    def test_short_text_is_one_chunk(self):
+        assert TextChunker(chunk_size=20).split("Una frase breve.") == ["Una frase breve."]
+
+
+class TestFuse:
+
+    def test_documents_ranked_by_both_retrievers_come_first(self):
+        vector = [result("a", 1), result("b", 2), result("c", 3)]
+        keyword = [result("c", 1), result("d", 2), result("b", 3)]
+
+        fused = RAGService._fuse([vector, keyword], top_k=4)
+
+        assert [r.document.id for r in fused] == ["c", "b", "a", "d"]
+        assert [r.rank for r in fused] == [1, 2, 3, 4]
+
+    def test_top_in_every_ranking_scores_one(self):
+        fused = RAGService._fuse([[result("a", 1)], [result("a", 1)]], top_k=1)
+        assert fused[0].score == pytest.approx(1.0)
+
+
+class TestSearch:
+
+    @pytest.mark.asyncio
+    async def test_min_similarity_filters_vector_candidates_only(self, rag):
+        await rag.upload_document("vector.txt", "Consulenza digitale per le imprese.")
+        await rag.upload_document("keyword.txt", "Listino prezzi manutenzione sito.")
+        vector_doc, keyword_doc = rag.vector_store.docs
+        rag.vector_store.similarities = {vector_doc: 0.95, keyword_doc: 0.4}
+
+        results = await rag.search("prezzi manutenzione", min_similarity=0.9)
+
+        # keyword.txt is below min_similarity but matches the query terms
+        assert {r.document.metadata["filename"] for r in results} == {"vector.txt", "keyword.txt"}
+        assert all(r.score <= 0.5 for r in results)
+
+    def test_api_accepts_legacy_threshold(self):
+        assert SearchRequest(query="prezzi", threshold=0.9).min_similarity == 0.9
+
+
+class TestUploadDocument:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_reupload_is_noop(self, rag):
+        first = await rag.upload_document("doc.txt", sentences(6), metadata={"type": "guide"}, user_id=1)
+        rag.vector_store.calls.clear()
+
+        again = await rag.upload_document("doc.txt", sentences(6), metadata={"type": "guide"}, user_id=1)
+
+        assert again["chunks_count"] == first["chunks_count"]
+        assert rag.vector_store.calls == []
+
+    @pytest.mark.asyncio
+    async def test_new_owner_or_metadata_reindexes(self, rag):
+        await rag.upload_document("doc.txt", sentences(6), metadata={"type": "guide"}, user_id=1)
+
+        uploaded = await rag.upload_document("doc.txt", sentences(6), metadata={"type": "case_study"}, user_id=2)
+        document = await rag.registry.get_document(uploaded["document_id"])
+
+        assert document["user_id"] == 2
+        assert document["metadata"] == {"type": "case_study"}
+        assert all(doc.metadata["user_id"] == 2 for doc in rag.vector_store.docs.values())
+
+    @pytest.mark.asyncio
+    async def test_shorter_content_drops_stale_chunks_after_adding(self, rag):
+        first = await rag.upload_document("doc.txt", sentences(8))
+        rag.vector_store.calls.clear()
+
+        second = await rag.upload_document("doc.txt", sentences(3))
+
+        assert second["document_id"] == first["document_id"]
+        assert second["chunks_count"] < first["chunks_count"]
+        assert rag.vector_store.calls == ["add", "delete"]
+        assert len(rag.vector_store.docs) == second["chunks_count"]
+
+    @pytest.mark.asyncio
+    async def test_failed_reindex_keeps_previous_version(self, rag):
+        first = await rag.upload_document("doc.txt", sentences(8))
+        rag.vector_store.fail_add = True
+
+        failed = await rag.upload_document("doc.txt", sentences(3))
+        document = await rag.registry.get_document(first["document_id"])
+
+        assert failed["status"] == "error"
+        assert document["chunks_count"] == first["chunks_count"]
+        assert len(rag.vector_store.docs) == first["chunks_count"]
@@ -0,0 +1,155 @@
+"""
+Tests for WorkflowEngine DAG execution: shutdown vs. cancel, resume, store.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure.agents import workflows
+from app.infrastructure.agents.task import TaskStatus
+from app.infrastructure.agents.workflows import (
+    WorkflowDefinition,
+    WorkflowEngine,
+    WorkflowExecution,
+    WorkflowExecutionStore,
+    WorkflowStatus,
+    WorkflowStep,
+)
+
+
+class FakeSteps:
+    """Agent step runner that blocks on `gate` for the steps listed in `block`."""
+
+    def __init__(self, block=()):
+        self.block = set(block)
+        self.gate = asyncio.Event()
+        self.calls = []
+
+    async def __call__(self, execution, step):
+        self.calls.append(step.id)
+        if step.id in self.block:
+            await self.gate.wait()
+        step.status = TaskStatus.COMPLETED
+
+
+def make_engine(store, steps):
+    engine = WorkflowEngine(SimpleNamespace(), store=store)
+    engine._execute_agent_step = steps
+    engine.register_workflow(WorkflowDefinition(
+        id="wf",
+        name="Two steps",
+        steps=[
+            WorkflowStep(id="a", name="a", agent_type="fake"),
+            WorkflowStep(id="b", name="b", agent_type="fake", depends_on=["a"]),
+        ],
+    ))
+    return engine
+
+
+async def wait_for(predicate, timeout=2.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+def persisted(store, execution_id):
+    return next(e for e in store.load_all() if e.id == execution_id)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WorkflowExecutionStore(storage_path=tmp_path)
+
+
+class TestWorkflowResume:
+
+    @pytest.mark.asyncio
+    async def test_shutdown_keeps_execution_running_and_resume_finishes_it(self, store):
+        """Shutdown is not a user cancel: the execution resumes from the pending step."""
+        agent = FakeSteps(block={"b"})
+        engine = make_engine(store, agent)
+
+        execution = await engine.execute_workflow("wf", inputs={})
+        await wait_for(lambda: agent.calls == ["a", "b"])
+        await engine.shutdown()
+
+        saved = persisted(store, execution.id)
+        assert saved.status == WorkflowStatus.RUNNING.value
+        assert saved.steps[0].status == TaskStatus.COMPLETED.value
+
+        resumed_agent = FakeSteps()
+        restarted = make_engine(store, resumed_agent)
+        assert await restarted.resume_interrupted_executions() == [execution.id]
+        await restarted._runners[execution.id]
+
+        assert resumed_agent.calls == ["b"]
+        assert persisted(store, execution.id).status == WorkflowStatus.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_cancelled_execution_is_not_resumed(self, store):
+        """cancel_execution() is final: CANCELLED on disk, skipped on restart."""
+        agent = FakeSteps(block={"a"})
+        engine = make_engine(store, agent)
+
+        execution = await engine.execute_workflow("wf", inputs={})
+        await wait_for(lambda: agent.calls == ["a"])
+        runner = engine._runners[execution.id]
+
+        assert await engine.cancel_execution(execution.id)
+        with pytest.raises(asyncio.CancelledError):
+            await runner
+
+        assert persisted(store, execution.id).status == WorkflowStatus.CANCELLED.value
+
+        restarted = make_engine(store, FakeSteps())
+        assert await restarted.resume_interrupted_executions() == []
+
+    @pytest.mark.asyncio
+    async def test_execution_claimed_by_another_worker_is_not_resumed(self, store, tmp_path):
+        agent = FakeSteps(block={"b"})
+        engine = make_engine(store, agent)
+        execution = await engine.execute_workflow("wf", inputs={})
+        await wait_for(lambda: agent.calls == ["a", "b"])
+        await engine.shutdown()
+
+        other_worker = WorkflowExecutionStore(storage_path=tmp_path)
+        assert other_worker.claim(execution.id)
+        restarted = make_engine(WorkflowExecutionStore(storage_path=tmp_path), FakeSteps())
+
+        assert await restarted.resume_interrupted_executions() == []
+        assert not await restarted.cancel_execution(execution.id)
+
+        other_worker.release(execution.id)
+        assert await restarted.resume_interrupted_executions() == [execution.id]
+        await restarted._runners[execution.id]
+
+
+class TestWorkflowExecutionStore:
+
+    def test_finished_executions_past_retention_are_pruned(self, tmp_path):
+        store = WorkflowExecutionStore(storage_path=tmp_path, retention_days=7)
+        old = datetime.utcnow() - timedelta(days=8)
+        store.save(WorkflowExecution(
+            id="old", workflow_id="wf", workflow_name="wf",
+            status=WorkflowStatus.COMPLETED, completed_at=old,
+        ))
+        store.save(WorkflowExecution(
+            id="interrupted", workflow_id="wf", workflow_name="wf",
+            status=WorkflowStatus.RUNNING, started_at=old,
+        ))
+
+        assert [e.id for e in store.load_all()] == ["interrupted"]
+        assert not (tmp_path / "old.json").exists()
+
+
+class TestGetWorkflowEngine:
+
+    def test_requires_orchestrator_on_first_call(self, monkeypatch):
+        monkeypatch.setattr(workflows, "_workflow_engine", None)
+
+        with pytest.raises(RuntimeError):
+            workflows.get_workflow_engine()
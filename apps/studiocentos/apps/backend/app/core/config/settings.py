@@ -30,6 +30,10 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = os.getenv("PROJECT_NAME", "StudioCentOS Portfolio API")
     VERSION: str = os.getenv("VERSION", "2.1.0")
     ENABLE_RATE_LIMITING: bool = os.getenv("ENABLE_RATE_LIMITING", "True").lower() == "true"
+    # Rate limiting: local token pre-allocation for hot keys
+    RATE_LIMIT_PREALLOC_BATCH: int = Field(default=10, description="Tokens pre-allocated per Redis round trip")
+    RATE_LIMIT_PREALLOC_HOT_RPS: int = Field(default=20, description="Requests/s above which a key is pre-allocated")
+    RATE_LIMIT_PREALLOC_LEASE: float = Field(default=1.0, description="Lifetime in seconds of pre-allocated tokens")
 
     # Security - CRITICAL FIX: No auto-generation in production
     SECRET_KEY: str = Field(default="")
@@ -1,9 +1,10 @@
 """Enterprise Rate Limiting - Per-Endpoint Protection with Redis."""
 
 import asyncio
+import math
 import time
 from functools import wraps
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 
 from fastapi import HTTPException, Request, status
 from redis import asyncio as aioredis
@@ -40,12 +41,118 @@ class RateLimitConfig:
     # Global limits
     GLOBAL_PER_IP = {"requests": 300, "window": 60}  # 300 req / 1 min per IP
 
+# GCRA (Generic Cell Rate Algorithm) in un solo round trip.
+# Per chiave viene salvato un solo valore: il "theoretical arrival time" (TAT)
+# in ms. `limit` richieste per `window` equivalgono a un'emissione ogni
+# window/limit ms con un burst massimo di `limit` richieste.
+# Il tempo viene da Redis (TIME), non dai worker: niente clock skew.
+#
+# ARGV: limit, window_ms, requested. Concede fino a `requested` token
+# (min 1): il pre-allocamento locale chiede più token in una sola chiamata.
+# Ritorna: {granted, remaining, retry_after_ms, reset_after_ms}
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = window / limit
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+-- Token disponibili adesso: spazio tra il TAT e la fine della finestra
+local available = math.floor((now + window - tat) / emission)
+if available < 1 then
+    local retry_after = tat + emission - window - now
+    return {0, 0, math.ceil(retry_after), math.ceil(tat - now)}
+end
+
+local granted = math.min(requested, available)
+local new_tat = tat + granted * emission
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {granted, available - granted, 0, math.ceil(new_tat - now)}
+"""
+
+
+class _LocalLease:
+    """Token pre-allocati da Redis per una chiave molto trafficata."""
+
+    __slots__ = ("tokens", "expires_at", "remaining", "reset_after")
+
+    def __init__(self, tokens: int, expires_at: float, remaining: int, reset_after: float):
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.remaining = remaining
+        self.reset_after = reset_after
+
+
 class RateLimiter:
-    """Enterprise-grade rate limiter with Redis backend."""
+    """
+    Enterprise-grade rate limiter with Redis backend.
+
+    Ogni controllo è un solo EVALSHA (script GCRA) con O(1) memoria per chiave.
+    Per le chiavi molto trafficate (es. un IP che supera
+    RATE_LIMIT_PREALLOC_HOT_RPS) il limiter pre-alloca un blocco di token
+    (RATE_LIMIT_PREALLOC_BATCH) e li consuma in locale fino alla scadenza del
+    lease (RATE_LIMIT_PREALLOC_LEASE secondi). I token non usati scadono con il
+    lease: il limite globale non viene mai superato, al più è leggermente
+    conservativo per quella chiave.
+    """
+
+    KEY_PREFIX = "ratelimit:gcra:"
+    MAX_LOCAL_KEYS = 10_000
 
     def __init__(self, redis_client: Optional[aioredis.Redis] = None):
         self.redis = redis_client
         self.enabled = settings.ENABLE_RATE_LIMITING
+        self.prealloc_batch = settings.RATE_LIMIT_PREALLOC_BATCH
+        self.prealloc_hot_rps = settings.RATE_LIMIT_PREALLOC_HOT_RPS
+        self.prealloc_lease = settings.RATE_LIMIT_PREALLOC_LEASE
+
+        self._script = redis_client.register_script(_GCRA_SCRIPT) if redis_client else None
+        self._leases: Dict[str, _LocalLease] = {}
+        # Richieste per chiave nel secondo corrente (rilevamento chiavi calde)
+        self._hits: Dict[str, int] = {}
+        self._hits_second = 0
+
+    def _batch_size(self, key: str, max_requests: int) -> int:
+        """Token da chiedere a Redis: >1 solo per le chiavi calde."""
+        if self.prealloc_batch <= 1:
+            return 1
+
+        second = int(time.monotonic())
+        if second != self._hits_second:
+            self._hits.clear()
+            self._hits_second = second
+        hits = self._hits.get(key, 0) + 1
+        self._hits[key] = hits
+
+        if hits < self.prealloc_hot_rps:
+            return 1
+        # Mai più di un decimo del limite in locale: i limiti stretti restano esatti
+        return max(1, min(self.prealloc_batch, max_requests // 10))
+
+    def _take_local(self, key: str) -> Optional[_LocalLease]:
+        lease = self._leases.get(key)
+        if lease is None:
+            return None
+        if lease.tokens <= 0 or lease.expires_at <= time.monotonic():
+            del self._leases[key]
+            return None
+        lease.tokens -= 1
+        return lease
+
+    def _store_lease(self, key: str, lease: _LocalLease) -> None:
+        if len(self._leases) >= self.MAX_LOCAL_KEYS:
+            now = time.monotonic()
+            self._leases = {k: v for k, v in self._leases.items() if v.expires_at > now}
+            if len(self._leases) >= self.MAX_LOCAL_KEYS:
+                return
+        self._leases[key] = lease
 
     async def check_rate_limit(
         self, key: str, max_requests: int, window_seconds: int
@@ -61,52 +168,58 @@ class RateLimiter:
         Returns:
             tuple: (is_allowed, limit_info)
         """
-        if not self.enabled or not self.redis:
+        if not self.enabled or not self._script:
             return True, {}
 
-        current_time = int(time.time())
-        window_start = current_time - window_seconds
-
-        # Redis sorted set key
-        cache_key = f"ratelimit:{key}"
-
-        try:
-            # Remove old entries outside window
-            await self.redis.zremrangebyscore(cache_key, 0, window_start)
-
-            # Count requests in current window
-            request_count = await self.redis.zcard(cache_key)
-
-            if request_count >= max_requests:
-                # Rate limit exceeded
-                ttl = await self.redis.ttl(cache_key)
-
-                return False, {
-                    "allowed": False,
-                    "limit": max_requests,
-                    "remaining": 0,
-                    "reset_in": ttl if ttl > 0 else window_seconds,
-                    "retry_after": ttl if ttl > 0 else window_seconds,
-                }
-
-            # Add current request
-            await self.redis.zadd(cache_key, {str(current_time): current_time})
-
-            # Set expiration
-            await self.redis.expire(cache_key, window_seconds)
-
+        lease = self._take_local(key)
+        if lease is not None:
             return True, {
                 "allowed": True,
                 "limit": max_requests,
-                "remaining": max_requests - request_count - 1,
-                "reset_in": window_seconds,
+                "remaining": lease.remaining + lease.tokens,
+                "reset_in": math.ceil(lease.reset_after),
             }
 
+        requested = self._batch_size(key, max_requests)
+
+        try:
+            granted, remaining, retry_after_ms, reset_after_ms = await self._script(
+                keys=[f"{self.KEY_PREFIX}{key}"],
+                args=[max_requests, window_seconds * 1000, requested],
+            )
         except Exception as e:
             logger.error(f"Rate limiting error: {e}")
             # Fail open - allow request if Redis is down
             return True, {}
 
+        granted = int(granted)
+        if granted < 1:
+            retry_after = max(1, math.ceil(int(retry_after_ms) / 1000))
+            return False, {
+                "allowed": False,
+                "limit": max_requests,
+                "remaining": 0,
+                "reset_in": retry_after,
+                "retry_after": retry_after,
+            }
+
+        reset_in = int(reset_after_ms) / 1000
+        if granted > 1:
+            # Un token per questa richiesta, il resto servito in locale
+            self._store_lease(key, _LocalLease(
+                tokens=granted - 1,
+                expires_at=time.monotonic() + self.prealloc_lease,
+                remaining=int(remaining),
+                reset_after=reset_in,
+            ))
+
+        return True, {
+            "allowed": True,
+            "limit": max_requests,
+            "remaining": int(remaining) + granted - 1,
+            "reset_in": math.ceil(reset_in),
+        }
+
     async def check_global_limit(self, ip_address: str) -> tuple[bool, dict]:
         """Check global rate limit per IP."""
         config = RateLimitConfig.GLOBAL_PER_IP
@@ -125,19 +238,23 @@ class RateLimiter:
 
     async def reset_limit(self, key: str):
         """Reset rate limit for a key (admin override)."""
+        self._leases.pop(key, None)
         if not self.redis:
             return
 
-        cache_key = f"ratelimit:{key}"
-        await self.redis.delete(cache_key)
+        await self.redis.delete(f"{self.KEY_PREFIX}{key}")
         logger.info(f"Rate limit reset for key: {key}")
 
+_rate_limiter: Optional[RateLimiter] = None
+
 # Dependency for FastAPI
 async def get_rate_limiter() -> RateLimiter:
-    """Get rate limiter instance."""
-    # Initialize Redis connection
-    redis_client = aioredis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-    return RateLimiter(redis_client)
+    """Get rate limiter instance (shared Redis pool, script and local leases)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        redis_client = aioredis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+        _rate_limiter = RateLimiter(redis_client)
+    return _rate_limiter
 
 # Decorator for route protection
 def rate_limit(category: str = "DEFAULT", per_user: bool = True, per_ip: bool = True):
@@ -231,24 +348,21 @@ class RateLimitMiddleware:
 
         if not is_allowed:
             # Rate limit exceeded
-            response_body = {"detail": "Too many requests. Please try again later.", **limit_info}
-
-            async def send_rate_limit_response(message):
-                if message["type"] == "http.response.start":
-                    message["status"] = 429
-                    message["headers"].append([b"content-type", b"application/json"])
-                    message["headers"].append(
-                        [b"retry-after", str(limit_info.get("retry_after", 60)).encode()]
-                    )
-                elif message["type"] == "http.response.body":
-                    import json
-
-                    message["body"] = json.dumps(response_body).encode()
-
-                await send(message)
-
-            await send_rate_limit_response({"type": "http.response.start"})
-            await send_rate_limit_response({"type": "http.response.body"})
+            import json
+
+            body = json.dumps(
+                {"detail": "Too many requests. Please try again later.", **limit_info}
+            ).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(limit_info.get("retry_after", 60)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
             return
 
         # Continue with request
@@ -15,6 +15,7 @@ from .admin_schemas import (
     ServiceCreateRequest, ServiceUpdateRequest, ServiceResponse, ServiceListResponse,
     BulkOrderUpdate, BulkDeleteRequest, BulkToggleRequest
 )
+from .snapshot import portfolio_snapshots
 
 router = APIRouter(prefix="/api/v1/admin/portfolio", tags=["admin-portfolio"])
 
@@ -91,6 +92,7 @@ def create_project(
 
     new_id = result.fetchone()[0]
     db.commit()
+    portfolio_snapshots.invalidate()
 
     # 4. Recupera progetto creato
     select_query = text("""
@@ -365,6 +367,7 @@ def update_project(
 
     db.execute(update_query, params)
     db.commit()
+    portfolio_snapshots.invalidate()
 
     # 6. Recupera progetto aggiornato
     select_query = text("""
@@ -426,6 +429,7 @@ def delete_project(
     delete_query = text("DELETE FROM projects WHERE id = :project_id")
     db.execute(delete_query, {"project_id": project_id})
     db.commit()
+    portfolio_snapshots.invalidate()
 
     return {"message": "Progetto eliminato con successo"}
 
@@ -7,6 +7,7 @@ from sqlalchemy import select, func, or_
 from fastapi import HTTPException, status
 
 from .models import Project, Service
+from .snapshot import portfolio_snapshots
 from .admin_schemas import (
     ProjectCreateRequest, ProjectUpdateRequest, ProjectResponse, ProjectListResponse,
     ServiceCreateRequest, ServiceUpdateRequest, ServiceResponse, ServiceListResponse
@@ -37,6 +38,7 @@ class PortfolioAdminService:
         project = Project(**data.model_dump())
         db.add(project)
         db.commit()
+        portfolio_snapshots.invalidate()
         db.refresh(project)
         
         return project
@@ -144,6 +146,7 @@ class PortfolioAdminService:
             setattr(project, field, value)
         
         db.commit()
+        portfolio_snapshots.invalidate()
         db.refresh(project)
         
         return project
@@ -154,6 +157,7 @@ class PortfolioAdminService:
         project = PortfolioAdminService.get_project(db, project_id)
         db.delete(project)
         db.commit()
+        portfolio_snapshots.invalidate()
     
     @staticmethod
     def bulk_update_order(db: Session, items: List[Dict[str, int]]):
@@ -168,6 +172,7 @@ class PortfolioAdminService:
                     project.order = order
         
         db.commit()
+        portfolio_snapshots.invalidate()
     
     @staticmethod
     def bulk_delete(db: Session, ids: List[int]):
@@ -182,6 +187,7 @@ class PortfolioAdminService:
                 db.delete(project)
         
         db.commit()
+        portfolio_snapshots.invalidate()
     
     @staticmethod
     def bulk_toggle(db: Session, ids: List[int], field: str, value: bool):
@@ -200,6 +206,7 @@ class PortfolioAdminService:
                 setattr(project, field, value)
         
         db.commit()
+        portfolio_snapshots.invalidate()
     
     # ========================================================================
     # SERVICES CRUD
@@ -222,6 +229,7 @@ class PortfolioAdminService:
         service = Service(**data.model_dump())
         db.add(service)
         db.commit()
+        portfolio_snapshots.invalidate()
         db.refresh(service)
         
         return service
@@ -323,6 +331,7 @@ class PortfolioAdminService:
             setattr(service, field, value)
         
         db.commit()
+        portfolio_snapshots.invalidate()
         db.refresh(service)
         
         return service
@@ -333,6 +342,7 @@ class PortfolioAdminService:
         service = PortfolioAdminService.get_service(db, service_id)
         db.delete(service)
         db.commit()
+        portfolio_snapshots.invalidate()
     
     @staticmethod
     def bulk_update_service_order(db: Session, items: List[Dict[str, int]]):
@@ -347,6 +357,7 @@ class PortfolioAdminService:
                     service.order = order
         
         db.commit()
+        portfolio_snapshots.invalidate()
     
     @staticmethod
     def bulk_delete_services(db: Session, ids: List[int]):
@@ -357,6 +368,7 @@ class PortfolioAdminService:
                 db.delete(service)
         
         db.commit()
+        portfolio_snapshots.invalidate()
     
     @staticmethod
     def bulk_toggle_services(db: Session, ids: List[int], field: str, value: bool):
@@ -375,3 +387,4 @@ class PortfolioAdminService:
                 setattr(service, field, value)
         
         db.commit()
+        portfolio_snapshots.invalidate()
@@ -19,6 +19,7 @@ from .schemas import (
     ContactRequestResponse,
     PortfolioPublicResponse
 )
+from .snapshot import portfolio_snapshots
 
 router = APIRouter(prefix="/api/v1/portfolio", tags=["portfolio"])
 
@@ -107,22 +108,8 @@ def localize_service(service: Service, lang: str = "it") -> dict:
 # PUBLIC ENDPOINTS - Portfolio pubblico
 # ============================================================================
 
-@router.get("/public", response_model=PortfolioPublicResponse)
-def get_public_portfolio(
-    lang: str = Query("it", description="Lingua (it, en, es)"),
-    db: Session = Depends(get_db)
-):
-    """
-    Get public portfolio data (projects + services) from DATABASE.
-
-    Endpoint pubblico per la landing page StudiocentOS.
-    Legge dati REALI dal database PostgreSQL.
-    Supporta traduzioni multilingua tramite parametro ?lang=
-    """
-    # Valida lingua
-    if lang not in ["it", "en", "es"]:
-        lang = "it"
-
+def build_public_portfolio(db: Session, lang: str) -> bytes:
+    """Carica e serializza il portfolio pubblico (projects + services) per una lingua."""
     # Get public projects from database
     projects_query = select(Project).where(
         Project.is_public == True,
@@ -157,11 +144,38 @@ def get_public_portfolio(
     localized_projects = [localize_project(p, lang) for p in projects]
     localized_services = [localize_service(s, lang) for s in services]
 
-    return {
+    return PortfolioPublicResponse.model_validate({
         "projects": localized_projects,
         "services": localized_services,
         "stats": stats
-    }
+    }).model_dump_json().encode()
+
+
+@router.get("/public", response_model=PortfolioPublicResponse)
+def get_public_portfolio(
+    request: Request,
+    lang: str = Query("it", description="Lingua (it, en, es)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get public portfolio data (projects + services) from DATABASE.
+
+    Endpoint pubblico per la landing page StudiocentOS.
+    Legge dati REALI dal database PostgreSQL.
+    Supporta traduzioni multilingua tramite parametro ?lang=
+
+    Servito da uno snapshot precalcolato per lingua (ETag + 304),
+    ricostruito dopo ogni modifica admin.
+    """
+    # Valida lingua
+    if lang not in ["it", "en", "es"]:
+        lang = "it"
+
+    snapshot = portfolio_snapshots.get(
+        ("public", lang),
+        lambda: build_public_portfolio(db, lang)
+    )
+    return portfolio_snapshots.respond(request, snapshot)
 
 
 @router.get("/projects", response_model=List[ProjectResponse])
@@ -189,21 +203,26 @@ def get_projects(
 @router.get("/projects/{slug}", response_model=ProjectResponse)
 def get_project_by_slug(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Get project by slug."""
-    query = select(Project).where(
-        Project.slug == slug,
-        Project.is_public == True
-    )
+    """Get project by slug (snapshot precalcolato, ETag + 304)."""
+    def build() -> bytes:
+        query = select(Project).where(
+            Project.slug == slug,
+            Project.is_public == True
+        )
 
-    result = db.execute(query)
-    project = result.scalar_one_or_none()
+        result = db.execute(query)
+        project = result.scalar_one_or_none()
 
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
 
-    return ProjectResponse.model_validate(project)
+        return ProjectResponse.model_validate(project).model_dump_json().encode()
+
+    snapshot = portfolio_snapshots.get(("project", slug), build)
+    return portfolio_snapshots.respond(request, snapshot)
 
 
 @router.get("/services", response_model=List[ServiceResponse])
@@ -232,21 +251,26 @@ def get_services(
 @router.get("/services/{slug}", response_model=ServiceResponse)
 def get_service_by_slug(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """Get service by slug."""
-    query = select(Service).where(
-        Service.slug == slug,
-        Service.is_active == True
-    )
+    """Get service by slug (snapshot precalcolato, ETag + 304)."""
+    def build() -> bytes:
+        query = select(Service).where(
+            Service.slug == slug,
+            Service.is_active == True
+        )
 
-    result = db.execute(query)
-    service = result.scalar_one_or_none()
+        result = db.execute(query)
+        service = result.scalar_one_or_none()
 
-    if not service:
-        raise HTTPException(status_code=404, detail="Service not found")
+        if not service:
+            raise HTTPException(status_code=404, detail="Service not found")
 
-    return ServiceResponse.model_validate(service)
+        return ServiceResponse.model_validate(service).model_dump_json().encode()
+
+    snapshot = portfolio_snapshots.get(("service", slug), build)
+    return portfolio_snapshots.respond(request, snapshot)
 
 
 @router.post("/contact", response_model=ContactRequestResponse, status_code=201)
@@ -331,6 +355,7 @@ def admin_create_service(
 
     db.add(new_service)
     db.commit()
+    portfolio_snapshots.invalidate()
     db.refresh(new_service)
 
     return ServiceResponse.model_validate(new_service)
@@ -367,6 +392,7 @@ def admin_update_service(
     service.translations = service_update.translations
 
     db.commit()
+    portfolio_snapshots.invalidate()
     db.refresh(service)
 
     return ServiceResponse.model_validate(service)
@@ -388,6 +414,7 @@ def admin_delete_service(
 
     db.delete(service)
     db.commit()
+    portfolio_snapshots.invalidate()
 
     return None
 
@@ -430,6 +457,7 @@ def admin_create_project(
 
     db.add(new_project)
     db.commit()
+    portfolio_snapshots.invalidate()
     db.refresh(new_project)
 
     return ProjectResponse.model_validate(new_project)
@@ -467,6 +495,7 @@ def admin_update_project(
     project.translations = project_update.translations
 
     db.commit()
+    portfolio_snapshots.invalidate()
     db.refresh(project)
 
     return ProjectResponse.model_validate(project)
@@ -488,6 +517,7 @@ def admin_delete_project(
 
     db.delete(project)
     db.commit()
+    portfolio_snapshots.invalidate()
 
     return None
 
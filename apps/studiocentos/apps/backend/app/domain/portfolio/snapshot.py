@@ -0,0 +1,127 @@
+"""
+Portfolio Snapshot - Risposte pubbliche precalcolate con ETag.
+
+`/public`, `/projects/{slug}` e `/services/{slug}` sono gli endpoint più
+chiamati della landing page ma cambiano solo quando un admin modifica il
+portfolio. Ogni worker tiene in memoria il JSON già serializzato (bytes)
+per lingua/slug, con un ETag forte calcolato una volta sola.
+
+Invalidazione:
+- ogni mutazione admin chiama `portfolio_snapshots.invalidate()`, che
+  incrementa la versione condivisa su Redis (`portfolio_snapshot:version`)
+- a ogni richiesta il worker confronta la sua versione con quella su Redis
+  e, se è cambiata, scarta gli snapshot e li ricostruisce al primo accesso
+- PORTFOLIO_SNAPSHOT_MAX_AGE limita comunque la vita di uno snapshot
+  (scritture fuori dagli endpoint admin, Redis non disponibile)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+from app.infrastructure.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "portfolio_snapshot:version"
+MAX_AGE_SECONDS = int(os.getenv("PORTFOLIO_SNAPSHOT_MAX_AGE", "300"))
+CACHE_CONTROL = os.getenv(
+    "PORTFOLIO_CACHE_CONTROL",
+    "public, max-age=60, stale-while-revalidate=300",
+)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Risposta serializzata con il suo ETag."""
+    body: bytes
+    etag: str
+    built_at: float
+
+
+class PortfolioSnapshotStore:
+    """
+    Snapshot per-worker delle risposte pubbliche del portfolio.
+
+    Usage:
+        snapshot = portfolio_snapshots.get(("public", lang), build)
+        return portfolio_snapshots.respond(request, snapshot)
+    """
+
+    def __init__(self):
+        self._snapshots: dict[Hashable, Snapshot] = {}
+        self._version: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    def _shared_version(self) -> Optional[bytes]:
+        if not cache.is_available:
+            return None
+        try:
+            return cache.redis_client.get(VERSION_KEY) or b"0"
+        except Exception as e:
+            logger.warning(f"Portfolio snapshot version unavailable: {e}")
+            return None
+
+    def get(self, key: Hashable, build: Callable[[], bytes]) -> Snapshot:
+        """
+        Snapshot per `key`, ricostruito con `build()` se assente, scaduto
+        o invalidato da un altro worker.
+        """
+        version = self._shared_version()
+        if version is not None and version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._snapshots.clear()
+                    self._version = version
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and time.time() - snapshot.built_at < MAX_AGE_SECONDS:
+            return snapshot
+
+        built_for = self._version
+        body = build()
+        snapshot = Snapshot(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            built_at=time.time(),
+        )
+        # Non salvare uno snapshot costruito a cavallo di un'invalidazione
+        if built_for == self._version:
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Scarta gli snapshot di tutti i worker (da chiamare dopo il commit)."""
+        with self._lock:
+            self._snapshots.clear()
+            self._version = None
+        if not cache.is_available:
+            return
+        try:
+            cache.redis_client.incr(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Portfolio snapshot invalidation not propagated: {e}")
+
+    @staticmethod
+    def respond(request: Request, snapshot: Snapshot) -> Response:
+        """200 con il body precalcolato, o 304 se il client ha già questo ETag."""
+        headers = {"ETag": snapshot.etag, "Cache-Control": CACHE_CONTROL}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # If-None-Match usa il confronto debole: W/"x" equivale a "x"
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if snapshot.etag in candidates or "*" in candidates:
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+# Singleton instance
+portfolio_snapshots = PortfolioSnapshotStore()
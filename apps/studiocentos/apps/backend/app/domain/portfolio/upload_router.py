@@ -10,6 +10,7 @@ from app.core.api.dependencies.auth_deps import get_current_admin_user
 from app.infrastructure.database.session import get_db
 from .upload_service import ImageUploadService
 from .models import Project
+from .snapshot import portfolio_snapshots
 
 
 router = APIRouter(prefix="/upload", tags=["upload"])
@@ -57,6 +58,7 @@ async def set_project_cover(
     project.cover_image = result["image_url"]
     project.thumbnail_url = result["thumbnail_url"]
     db.commit()
+    portfolio_snapshots.invalidate()
 
     return {
         "success": True,
@@ -95,6 +97,7 @@ def delete_project_cover(
     project.cover_image = None
     project.thumbnail_url = None
     db.commit()
+    portfolio_snapshots.invalidate()
 
     return {
         "success": True,
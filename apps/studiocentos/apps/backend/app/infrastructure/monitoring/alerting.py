@@ -262,7 +262,7 @@ class AlertManager:
                     resolved=alert.resolved,
                     acknowledged=alert.acknowledged,
                     escalated=alert.escalated,
-                    metadata=alert.metadata,
+                    alert_metadata=alert.metadata,
                     timestamp=alert.timestamp,
                 )
                 
@@ -1,102 +1,114 @@
 """Logging Middleware for FastAPI
 Integrates structured logging with request/response cycle.
+
+Pure ASGI: a differenza di BaseHTTPMiddleware non avvolge richiesta e
+risposta in task e memory stream aggiuntivi, quindi le risposte in streaming
+(SSE, download) passano chunk per chunk senza buffering.
+Un solo middleware per request ID, timing, log strutturati, metriche
+(MetricsRegistry) e gestione delle eccezioni non catturate.
+
+Configurazione (env):
+- LOG_SAMPLE_RATE_2XX: frazione dei log delle risposte < 400 da emettere (default 0.1)
+- LOG_SLOW_REQUEST_MS: oltre questa durata il log è sempre emesso (default 1000)
 """
 
+import json
+import os
+import random
 import time
 import uuid
-from collections.abc import Callable
-
-from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict, Optional
 
 from app.infrastructure.monitoring.logging import (
     clear_request_context,
     get_logger,
     set_request_context,
 )
+from app.infrastructure.monitoring.metrics import (
+    active_requests,
+    metrics_registry,
+    request_count,
+    request_duration,
+)
+
+# Risposte per classe di status (2xx, 3xx, 4xx, 5xx)
+_status_counters = {
+    status_class: metrics_registry.register_counter(
+        f"http_responses_{status_class}_total", f"Total HTTP {status_class} responses"
+    )
+    for status_class in ("2xx", "3xx", "4xx", "5xx")
+}
+request_exceptions = metrics_registry.register_counter(
+    "http_request_exceptions_total", "Total unhandled exceptions in HTTP requests"
+)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for structured request/response logging."""
 
-    def __init__(self, app, service_name: str = "portfolio-backend"):
-        super().__init__(app)
+class LoggingMiddleware:
+    """Middleware ASGI per request ID, logging strutturato e metriche."""
+
+    def __init__(
+        self,
+        app,
+        service_name: str = "portfolio-backend",
+        sample_rate: Optional[float] = None,
+        slow_request_ms: Optional[float] = None,
+    ):
+        self.app = app
         self.service_name = service_name
         self.logger = get_logger("app.middleware")
+        self.sample_rate = (
+            sample_rate if sample_rate is not None
+            else float(os.getenv("LOG_SAMPLE_RATE_2XX", "0.1"))
+        )
+        self.slow_request_ms = (
+            slow_request_ms if slow_request_ms is not None
+            else float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+        )
 
         # Paths to exclude from logging (health checks, static files)
-        self.exclude_paths = {"/health", "/metrics", "/static"}
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip logging for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
+        self.exclude_paths = ("/health", "/metrics", "/static")
 
-        # Generate request ID and start timing
-        request_id = str(uuid.uuid4())
-        start_time = time.time()
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
 
-        # Extract client info
-        client_ip = self._get_client_ip(request)
-        user_agent = request.headers.get("User-Agent", "Unknown")
+        headers = _headers(scope)
+        # Propaga il request ID del proxy/client se presente (tracing end-to-end)
+        request_id = headers.get("x-request-id") or uuid.uuid4().hex
+        request_id_header = request_id.encode("latin-1")
+        start_time = time.perf_counter()
+        response = {"status": 500, "size": 0, "started": False}
 
-        # Set request context for structured logging
         set_request_context(request_id=request_id)
+        active_requests.inc()
 
-        # Log request start
-        self.logger.info(
-            "Request started",
-            extra={
-                "event_type": "request_start",
-                "http_method": request.method,
-                "http_path": request.url.path,
-                "http_query": str(request.query_params) if request.query_params else None,
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-                "content_type": request.headers.get("Content-Type"),
-                "content_length": request.headers.get("Content-Length"),
-            },
-        )
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["started"] = True
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id_header)]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
 
         try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate timing
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Log successful request completion
-            self.logger.info(
-                "Request completed",
-                extra={
-                    "event_type": "request_complete",
-                    "http_method": request.method,
-                    "http_path": request.url.path,
-                    "status_code": response.status_code,
-                    "response_size": response.headers.get("Content-Length"),
-                    "duration_ms": round(duration_ms, 2),
-                },
-            )
-
-            # Log performance metrics if needed
-            # Performance tracking can be added here if required
-
-            # Add request ID to response headers for tracing
-            response.headers["X-Request-ID"] = request_id
-
-            return response
+            await self.app(scope, receive, send_wrapper)
 
         except Exception as exc:
-            # Calculate timing for failed requests
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            request_exceptions.inc()
 
             # Log request error
             self.logger.error(
                 "Request failed with exception",
                 extra={
                     "event_type": "request_error",
-                    "http_method": request.method,
-                    "http_path": request.url.path,
+                    "request_id": request_id,
+                    "http_method": scope["method"],
+                    "http_path": scope["path"],
+                    "client_ip": _client_ip(scope, headers),
+                    "user_agent": headers.get("user-agent"),
                     "duration_ms": round(duration_ms, 2),
                     "exception_type": type(exc).__name__,
                     "exception_message": str(exc),
@@ -104,39 +116,88 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 exc_info=True,
             )
 
-            # Return structured error response
-            error_response = JSONResponse(
-                status_code=500,
-                content={
-                    "error": "Internal Server Error",
-                    "request_id": request_id,
-                    "message": "An unexpected error occurred",
-                },
-            )
-            error_response.headers["X-Request-ID"] = request_id
+            if response["started"]:
+                # Risposta già parzialmente inviata: non si può più cambiare lo status
+                raise
 
-            return error_response
+            # Return structured error response
+            response["status"] = 500
+            body = json.dumps({
+                "error": "An internal server error occurred",
+                "code": "INTERNAL_SERVER_ERROR",
+                "error_id": request_id,
+                "request_id": request_id,
+                "message": "Our team has been notified. Please contact support with this error ID.",
+            }).encode()
+            await send_wrapper({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send_wrapper({"type": "http.response.body", "body": body})
+
+        else:
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            status_code = response["status"]
+
+            # 4xx/5xx e richieste lente sempre, 2xx/3xx campionate
+            if (
+                status_code >= 400
+                or duration_ms >= self.slow_request_ms
+                or random.random() < self.sample_rate
+            ):
+                log = self.logger.warning if status_code >= 500 else self.logger.info
+                log(
+                    "Request completed",
+                    extra={
+                        "event_type": "request_complete",
+                        "request_id": request_id,
+                        "http_method": scope["method"],
+                        "http_path": scope["path"],
+                        "http_query": scope.get("query_string", b"").decode("latin-1") or None,
+                        "client_ip": _client_ip(scope, headers),
+                        "user_agent": headers.get("user-agent", "Unknown"),
+                        "status_code": status_code,
+                        "response_size": response["size"],
+                        "duration_ms": round(duration_ms, 2),
+                        "sampled": status_code < 400 and duration_ms < self.slow_request_ms,
+                    },
+                )
 
         finally:
+            active_requests.dec()
+            request_count.inc()
+            request_duration.observe(time.perf_counter() - start_time)
+            _status_counters.get(f"{response['status'] // 100}xx", _status_counters["5xx"]).inc()
             # Clear request context
             clear_request_context()
 
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP address considering proxy headers."""
-        # Check for forwarded IP headers (from load balancers, proxies)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
 
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
+def _headers(scope) -> Dict[str, str]:
+    """Header della richiesta (chiavi minuscole, l'ultimo valore vince)."""
+    return {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+
+
+def _client_ip(scope, headers: Dict[str, str]) -> str:
+    """Extract client IP address considering proxy headers."""
+    # Check for forwarded IP headers (from load balancers, proxies)
+    forwarded_for = headers.get("x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    real_ip = headers.get("x-real-ip")
+    if real_ip:
+        return real_ip
 
-        # Fall back to direct client IP
-        if hasattr(request.client, "host"):
-            return request.client.host
+    # Fall back to direct client IP
+    client = scope.get("client")
+    if client:
+        return client[0]
 
-        return "unknown"
+    return "unknown"
 
 class DatabaseLoggingMiddleware:
     """SQLAlchemy event listeners for database query logging."""
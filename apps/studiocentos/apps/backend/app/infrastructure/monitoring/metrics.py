@@ -117,7 +117,6 @@ class Histogram:
         self.name = name
         self.description = description
         self.buckets = buckets or [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
-        self._observations = []
         self._bucket_counts = defaultdict(int)
         self._sum = 0.0
         self._count = 0
@@ -130,7 +129,6 @@ class Histogram:
             value: Value to observe
         """
         with self._lock:
-            self._observations.append(value)
             self._sum += value
             self._count += 1
 
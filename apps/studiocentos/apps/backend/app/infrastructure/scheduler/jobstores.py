@@ -0,0 +1,30 @@
+"""
+Job store APScheduler persistente.
+
+I job vengono salvati su Postgres (una tabella per scheduler, altrimenti
+ogni scheduler eseguirebbe anche i job degli altri): le pubblicazioni
+programmate sopravvivono a restart e cambi di leader.
+SCHEDULER_JOBSTORE=memory ripristina il job store in memoria.
+
+Nota: il job store persistente salva solo riferimenti importabili alle
+funzioni, per questo i job usano funzioni a livello di modulo e non metodi bound.
+"""
+
+import os
+
+from apscheduler.jobstores.base import BaseJobStore
+from apscheduler.jobstores.memory import MemoryJobStore
+
+from app.core.config import settings
+
+
+def create_jobstore(tablename: str) -> BaseJobStore:
+    """Crea il job store per uno scheduler."""
+    backend = os.getenv("SCHEDULER_JOBSTORE", "sqlalchemy").lower()
+
+    if backend == "sqlalchemy" and settings.DATABASE_URL:
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+
+        return SQLAlchemyJobStore(url=settings.DATABASE_URL, tablename=tablename)
+
+    return MemoryJobStore()
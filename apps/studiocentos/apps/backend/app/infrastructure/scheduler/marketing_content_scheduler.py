@@ -19,9 +19,9 @@ import json
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.jobstores.memory import MemoryJobStore
 
 from app.infrastructure.database import SessionLocal
+from app.infrastructure.scheduler.jobstores import create_jobstore
 from app.domain.marketing.models import ScheduledPost, PostStatus
 
 logger = structlog.get_logger(__name__)
@@ -46,7 +46,7 @@ class MarketingContentScheduler:
 
     def __init__(self):
         self.scheduler = AsyncIOScheduler(
-            jobstores={'default': MemoryJobStore()},
+            jobstores={'default': create_jobstore('apscheduler_marketing_jobs')},
             job_defaults={
                 'coalesce': True,
                 'max_instances': 1,
@@ -122,7 +122,7 @@ class MarketingContentScheduler:
 
             # Job giornaliero alle 07:00 AM CET
             self.scheduler.add_job(
-                self._generate_daily_content,
+                run_daily_generation,
                 trigger=CronTrigger(
                     hour=self.schedule_hour,
                     minute=self.schedule_minute,
@@ -137,7 +137,7 @@ class MarketingContentScheduler:
                 from datetime import datetime, timedelta
                 test_time = datetime.now() + timedelta(minutes=2)
                 self.scheduler.add_job(
-                    self._generate_daily_content,
+                    run_daily_generation,
                     trigger='date',
                     run_date=test_time,
                     id='marketing_test_generation',
@@ -479,3 +479,7 @@ async def trigger_jit_post(
         generate_image=generate_image
     )
 
+
+# Job callable a livello di modulo (serializzabile dal job store persistente)
+async def run_daily_generation():
+    return await marketing_content_scheduler._generate_daily_content()
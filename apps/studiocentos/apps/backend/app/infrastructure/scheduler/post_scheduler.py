@@ -13,10 +13,10 @@ import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.jobstores.memory import MemoryJobStore
 from sqlalchemy import select, and_
 
 from app.infrastructure.database import SessionLocal
+from app.infrastructure.scheduler.jobstores import create_jobstore
 from app.domain.marketing.models import ScheduledPost, PostStatus
 from app.integrations.social_media import SocialMediaIntegration
 
@@ -38,7 +38,7 @@ class PostScheduler:
 
     def __init__(self):
         self.scheduler = AsyncIOScheduler(
-            jobstores={'default': MemoryJobStore()},
+            jobstores={'default': create_jobstore('apscheduler_post_jobs')},
             job_defaults={
                 'coalesce': True,
                 'max_instances': 3,
@@ -68,7 +68,7 @@ class PostScheduler:
 
             # Job periodico per controllare post da pubblicare
             self.scheduler.add_job(
-                self._check_pending_posts,
+                run_check_pending_posts,
                 trigger=IntervalTrigger(minutes=1),
                 id='check_pending_posts',
                 replace_existing=True
@@ -76,7 +76,7 @@ class PostScheduler:
 
             # Job per aggiornamento metriche
             self.scheduler.add_job(
-                self._update_metrics,
+                run_update_metrics,
                 trigger=IntervalTrigger(hours=1),
                 id='update_metrics',
                 replace_existing=True
@@ -109,6 +109,12 @@ class PostScheduler:
         Returns:
             True se schedulato con successo
         """
+        if not self._is_running:
+            # Worker non leader: il post è già sul database, il leader lo
+            # programma al prossimo _check_pending_posts
+            logger.info("post_schedule_deferred_to_leader", post_id=post_id)
+            return True
+
         try:
             job_id = f"publish_post_{post_id}"
 
@@ -118,7 +124,7 @@ class PostScheduler:
 
             # Aggiungi nuovo job
             self.scheduler.add_job(
-                self._publish_post,
+                run_publish_post,
                 trigger=DateTrigger(run_date=scheduled_at),
                 args=[post_id],
                 id=job_id,
@@ -134,6 +140,10 @@ class PostScheduler:
 
     async def cancel_post(self, post_id: int) -> bool:
         """Cancella uno scheduled post."""
+        if not self._is_running:
+            # Worker non leader: il job del leader vede lo stato aggiornato e salta
+            return False
+
         try:
             job_id = f"publish_post_{post_id}"
 
@@ -191,11 +201,12 @@ class PostScheduler:
 
                 for post in posts:
                     job_id = f"publish_post_{post.id}"
-                    if not self.scheduler.get_job(job_id):
-                        if post.scheduled_at <= now:
-                            asyncio.create_task(self._publish_post(post.id))
-                        else:
-                            await self.schedule_post(post.id, post.scheduled_at)
+                    if post.scheduled_at > now:
+                        # Anche se il job esiste: l'orario può essere stato
+                        # cambiato da un altro worker
+                        await self.schedule_post(post.id, post.scheduled_at)
+                    elif not self.scheduler.get_job(job_id):
+                        asyncio.create_task(self._publish_post(post.id))
             finally:
                 db.close()
 
@@ -223,6 +234,11 @@ class PostScheduler:
                 logger.warning("post_invalid_status", post_id=post_id, status=post.status.value)
                 return
 
+            if post.scheduled_at and post.scheduled_at > datetime.utcnow() + timedelta(minutes=1):
+                # Job con l'orario precedente: post riprogrammato da un altro worker
+                logger.info("post_publish_skipped_rescheduled", post_id=post_id)
+                return
+
             # Aggiorna status a PUBLISHING
             post.status = PostStatus.PUBLISHING
             db.commit()
@@ -339,3 +355,16 @@ async def start_post_scheduler():
 async def stop_post_scheduler():
     """Ferma il post scheduler."""
     await post_scheduler.stop()
+
+
+# Job callables a livello di modulo (serializzabili dal job store persistente)
+async def run_check_pending_posts():
+    await post_scheduler._check_pending_posts()
+
+
+async def run_update_metrics():
+    await post_scheduler._update_metrics()
+
+
+async def run_publish_post(post_id: int):
+    await post_scheduler._publish_post(post_id)
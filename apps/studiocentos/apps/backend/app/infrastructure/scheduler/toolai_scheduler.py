@@ -18,11 +18,11 @@ import structlog
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.jobstores.memory import MemoryJobStore
 
 from app.infrastructure.database import SessionLocal
 from app.domain.toolai.models import ToolAIPost, AITool, ToolAIPostStatus
 from app.infrastructure.ai.toolai_scraper import ToolAIScraper
+from app.infrastructure.scheduler.jobstores import create_jobstore
 
 logger = structlog.get_logger(__name__)
 
@@ -42,7 +42,7 @@ class ToolAIScheduler:
 
     def __init__(self):
         self.scheduler = AsyncIOScheduler(
-            jobstores={'default': MemoryJobStore()},
+            jobstores={'default': create_jobstore('apscheduler_toolai_jobs')},
             job_defaults={
                 'coalesce': True,
                 'max_instances': 1,
@@ -80,7 +80,7 @@ class ToolAIScheduler:
 
             # Job giornaliero alle 08:30 AM CET
             self.scheduler.add_job(
-                self._generate_daily_post,
+                run_daily_post_generation,
                 trigger=CronTrigger(
                     hour=self.schedule_hour,
                     minute=self.schedule_minute,
@@ -94,7 +94,7 @@ class ToolAIScheduler:
             from datetime import datetime, timedelta
             test_time = datetime.now() + timedelta(minutes=5)
             self.scheduler.add_job(
-                self._generate_daily_post,
+                run_daily_post_generation,
                 trigger='date',
                 run_date=test_time,
                 id='toolai_test_generation',
@@ -383,3 +383,8 @@ async def stop_toolai_scheduler():
 async def trigger_toolai_generation():
     """Trigger manuale per testing."""
     return await toolai_scheduler.trigger_now()
+
+
+# Job callable a livello di modulo (serializzabile dal job store persistente)
+async def run_daily_post_generation():
+    return await toolai_scheduler._generate_daily_post()
@@ -2,7 +2,6 @@
 Architettura modulare con Domain-Driven Design.
 """
 
-import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -74,8 +73,6 @@ from app.infrastructure.monitoring import setup_logging
 from app.infrastructure.scheduler import (
     start_trial_reminder_scheduler,
     stop_trial_reminder_scheduler,
-    start_all_schedulers,
-    stop_all_schedulers,
 )
 from app.infrastructure.startup import startup_manager
 
@@ -116,20 +113,13 @@ async def lifespan(app: FastAPI):
     configure_all_models()
     logger.info("SQLAlchemy models configured")
 
-    # Start ALL schedulers (ToolAI, Marketing Content, Post Publishing, etc.)
-    try:
-        asyncio.create_task(start_all_schedulers())
-        logger.info("All schedulers started (ToolAI, Marketing Content, Post Publishing)")
-    except Exception as e:
-        logger.error(f"Failed to start schedulers: {e}")
-        # Don't crash the application, continue without scheduler
+    # Schedulers (ToolAI, Marketing Content, Post Publishing) are started by
+    # startup_manager.initialize_database(): only the elected leader worker runs jobs
 
     yield  # Application runs here
 
     # Shutdown procedures
     logger.info("Shutting down Portfolio Backend...")
-    await stop_all_schedulers()
-    logger.info("All schedulers stopped")
     await startup_manager.shutdown_procedures()
 
 app = FastAPI(
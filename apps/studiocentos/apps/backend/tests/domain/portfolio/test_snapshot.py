@@ -0,0 +1,112 @@
+"""
+Test per gli snapshot pubblici del portfolio: ETag, 304 e invalidazione.
+"""
+
+import fakeredis
+import pytest
+from starlette.requests import Request
+
+from app.domain.portfolio import snapshot as snapshot_module
+from app.domain.portfolio.snapshot import PortfolioSnapshotStore, VERSION_KEY
+
+
+def request_with(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class Builder:
+    """Build function che conta le ricostruzioni."""
+
+    def __init__(self, body=b'{"projects": []}'):
+        self.body = body
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.body
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(snapshot_module.cache, "redis_client", client)
+    monkeypatch.setattr(snapshot_module.cache, "is_available", True)
+    return client
+
+
+class TestSnapshotStore:
+
+    def test_snapshot_is_built_once(self, redis):
+        store, build = PortfolioSnapshotStore(), Builder()
+
+        first = store.get(("public", "it"), build)
+        second = store.get(("public", "it"), build)
+
+        assert build.calls == 1
+        assert first is second
+        assert first.etag.startswith('"') and first.etag.endswith('"')
+
+    def test_invalidation_reaches_other_workers(self, redis):
+        worker_a, worker_b = PortfolioSnapshotStore(), PortfolioSnapshotStore()
+        build = Builder()
+        worker_a.get("public", build)
+        worker_b.get("public", build)
+
+        worker_a.invalidate()
+        worker_b.get("public", build)
+
+        assert redis.get(VERSION_KEY) == b"1"
+        assert build.calls == 3
+
+    def test_expired_snapshot_is_rebuilt(self, redis, monkeypatch):
+        store, build = PortfolioSnapshotStore(), Builder()
+        store.get("public", build)
+
+        monkeypatch.setattr(snapshot_module, "MAX_AGE_SECONDS", 0)
+        store.get("public", build)
+
+        assert build.calls == 2
+
+    def test_works_without_redis(self, monkeypatch):
+        monkeypatch.setattr(snapshot_module.cache, "is_available", False)
+        store, build = PortfolioSnapshotStore(), Builder()
+        store.get("public", build)
+
+        store.invalidate()
+        store.get("public", build)
+
+        assert build.calls == 2
+
+
+class TestRespond:
+
+    @pytest.fixture
+    def snapshot(self, redis):
+        return PortfolioSnapshotStore().get("public", Builder())
+
+    def test_full_response_carries_etag(self, snapshot):
+        response = PortfolioSnapshotStore.respond(request_with(), snapshot)
+
+        assert response.status_code == 200
+        assert response.body == b'{"projects": []}'
+        assert response.headers["etag"] == snapshot.etag
+        assert response.headers["cache-control"] == snapshot_module.CACHE_CONTROL
+
+    def test_matching_etag_returns_304(self, snapshot):
+        response = PortfolioSnapshotStore.respond(request_with(if_none_match=snapshot.etag), snapshot)
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == snapshot.etag
+
+    def test_weak_etag_in_list_matches(self, snapshot):
+        header = f'"stale", W/{snapshot.etag}'
+        response = PortfolioSnapshotStore.respond(request_with(if_none_match=header), snapshot)
+
+        assert response.status_code == 304
+
+    def test_other_etag_returns_body(self, snapshot):
+        response = PortfolioSnapshotStore.respond(request_with(if_none_match='"stale"'), snapshot)
+
+        assert response.status_code == 200
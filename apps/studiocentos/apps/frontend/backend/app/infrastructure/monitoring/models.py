@@ -50,8 +50,8 @@ class AlertLog(Base):
     acknowledged = Column(Boolean, default=False, nullable=False)
     escalated = Column(Boolean, default=False, nullable=False)
     
-    # Metadata
-    metadata = Column(JSON, nullable=True)
+    # Metadata ("metadata" is reserved by the Declarative API)
+    alert_metadata = Column("metadata", JSON, nullable=True)
     
     # Timestamps
     timestamp = Column(DateTime, nullable=False, default=func.now(), index=True)
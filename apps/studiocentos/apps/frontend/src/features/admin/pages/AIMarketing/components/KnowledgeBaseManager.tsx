@@ -45,7 +45,7 @@ interface RAGDocument {
 
 interface SearchResult {
   text: string;
-  similarity: number;
+  relevance: number;
   source: string;
 }
 
@@ -99,7 +99,7 @@ const RAGApiService = {
         ...this.getHeaders(),
         'Content-Type': 'application/json',
       },
-      body: JSON.stringify({ query, k: 5, threshold: 0.5 }),
+      body: JSON.stringify({ query, k: 5, min_similarity: 0.5 }),
     });
     if (!res.ok) throw new Error('Search failed');
     const data = await res.json();
@@ -334,7 +334,7 @@ export function KnowledgeBaseManager() {
                       📄 {result.source || 'Unknown'}
                     </span>
                     <span className="text-xs text-green-400">
-                      {(result.similarity * 100).toFixed(1)}% match
+                      {(result.relevance * 100).toFixed(1)}% relevance
                     </span>
                   </div>
                   <p className={`text-sm ${textPrimary}`}>